@@ -0,0 +1,63 @@
+"""add_chat_message_natural_key
+
+Revision ID: j2k3l4m5n6o7
+Revises: 829f30858087
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision: str = 'j2k3l4m5n6o7'
+down_revision: Union[str, None] = '829f30858087'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    tables = inspector.get_table_names()
+
+    if 'chat_messages' in tables:
+        constraints = [c['name'] for c in inspector.get_unique_constraints('chat_messages')]
+        if 'uq_chat_messages_file_platform_message' not in constraints:
+            # Keep the oldest row of every (file_id, platform, message_id) group before adding the constraint
+            op.execute(sa.text("""
+                DELETE FROM chat_messages a
+                USING chat_messages b
+                WHERE a.id > b.id
+                  AND a.file_id = b.file_id
+                  AND a.platform = b.platform
+                  AND a.message_id = b.message_id
+            """))
+            op.create_unique_constraint(
+                'uq_chat_messages_file_platform_message',
+                'chat_messages',
+                ['file_id', 'platform', 'message_id'],
+            )
+
+    if 'social_media' in tables:
+        indexes = [i['name'] for i in inspector.get_indexes('social_media')]
+        if 'idx_social_media_file_id' not in indexes:
+            op.create_index('idx_social_media_file_id', 'social_media', ['file_id'])
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    tables = inspector.get_table_names()
+
+    if 'social_media' in tables:
+        indexes = [i['name'] for i in inspector.get_indexes('social_media')]
+        if 'idx_social_media_file_id' in indexes:
+            op.drop_index('idx_social_media_file_id', table_name='social_media')
+
+    if 'chat_messages' in tables:
+        constraints = [c['name'] for c in inspector.get_unique_constraints('chat_messages')]
+        if 'uq_chat_messages_file_platform_message' in constraints:
+            op.drop_constraint('uq_chat_messages_file_platform_message', 'chat_messages', type_='unique')
@@ -0,0 +1,62 @@
+"""add_converted_sdp_files_table
+
+Revision ID: k3l4m5n6o7p8
+Revises: j2k3l4m5n6o7
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision: str = 'k3l4m5n6o7p8'
+down_revision: Union[str, None] = 'j2k3l4m5n6o7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    tables = inspector.get_table_names()
+
+    if 'converted_sdp_files' in tables:
+        return
+
+    # Replaces data/uploads/converted/converted_files.json; existing entries are imported on first use.
+    op.create_table(
+        'converted_sdp_files',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('original_filename', sa.String(length=255), nullable=False),
+        sa.Column('converted_filename', sa.String(length=255), nullable=False),
+        sa.Column('original_size', sa.BigInteger(), nullable=True),
+        sa.Column('encrypted_size', sa.BigInteger(), nullable=True),
+        sa.Column('total_chunks', sa.Integer(), nullable=True),
+        sa.Column('sha256', sa.String(length=64), nullable=True),
+        sa.Column('format_version', sa.String(length=10), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('converted_filename')
+    )
+    op.create_index(op.f('ix_converted_sdp_files_id'), 'converted_sdp_files', ['id'], unique=False)
+    op.create_index(op.f('ix_converted_sdp_files_original_filename'), 'converted_sdp_files', ['original_filename'], unique=False)
+    op.create_index(op.f('ix_converted_sdp_files_sha256'), 'converted_sdp_files', ['sha256'], unique=False)
+    op.create_index(op.f('ix_converted_sdp_files_created_at'), 'converted_sdp_files', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    tables = inspector.get_table_names()
+
+    if 'converted_sdp_files' not in tables:
+        return
+
+    op.drop_index(op.f('ix_converted_sdp_files_created_at'), table_name='converted_sdp_files')
+    op.drop_index(op.f('ix_converted_sdp_files_sha256'), table_name='converted_sdp_files')
+    op.drop_index(op.f('ix_converted_sdp_files_original_filename'), table_name='converted_sdp_files')
+    op.drop_index(op.f('ix_converted_sdp_files_id'), table_name='converted_sdp_files')
+    op.drop_table('converted_sdp_files')
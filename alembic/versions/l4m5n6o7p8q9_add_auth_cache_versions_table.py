@@ -0,0 +1,49 @@
+"""add_auth_cache_versions_table
+
+Revision ID: l4m5n6o7p8q9
+Revises: k3l4m5n6o7p8
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision: str = 'l4m5n6o7p8q9'
+down_revision: Union[str, None] = 'k3l4m5n6o7p8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    tables = inspector.get_table_names()
+
+    if 'auth_cache_versions' in tables:
+        return
+
+    # Single-row counter bumped on logout and user changes; every worker polls it to
+    # invalidate its in-process token cache.
+    op.create_table(
+        'auth_cache_versions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.execute("INSERT INTO auth_cache_versions (id, version) VALUES (1, 0)")
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    tables = inspector.get_table_names()
+
+    if 'auth_cache_versions' not in tables:
+        return
+
+    op.drop_table('auth_cache_versions')
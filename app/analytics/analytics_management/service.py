@@ -1,13 +1,14 @@
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from app.analytics.analytics_management.models import Analytic, AnalyticDevice
 from app.analytics.device_management.models import Device, File
 from app.analytics.analytics_management.models import ApkAnalytic, AnalyticFile
 from typing import List
 from app.utils.timezone import get_indonesia_time
-from app.analytics.utils.scan_apk import load_suspicious_indicators
-from app.core.config import settings
-import os, json, hashlib, requests, re, logging
-from datetime import datetime
+from app.analytics.utils.suspicious_indicators import indicator_index_for
+from app.analytics.utils.mobsf_client import get_mobsf_client
+from app.analytics.utils.apk_manifest import ManifestError, manifest_permissions, read_apk_manifest
+import os, re, logging
 
 def store_analytic(db: Session, analytic_name: str, method: str = None, summary: str = None, created_by: str = None):
     new_analytic = Analytic(
@@ -142,45 +143,70 @@ def normalize_permission_entry(entry):
     else:
         return str(entry), ""
 
-def get_mobsf_api_key():
-    secret_path = os.path.expanduser("~/.MobSF/secret")
-    if not os.path.exists(secret_path):
-        raise FileNotFoundError("File ~/.MobSF/secret tidak ditemukan.")
-    with open(secret_path, "r") as f:
-        secret = f.read().strip()
-    print("[*] MobSF secret loaded successfully.")
-    return hashlib.sha256(secret.encode()).hexdigest()
-
-
-def load_suspicious_indicators(script_dir):
-    indicators_file = os.path.join(script_dir, 'suspicious_indicators.json')
-    if not os.path.exists(indicators_file):
-        print("[!] suspicious_indicators.json tidak ditemukan, skip.")
-        return set()
-    try:
-        with open(indicators_file, 'r') as f:
-            data = json.load(f)
-        suspicious = {
-            item['name']
-            for item in data
-            if item.get('platform') == 'android' and item.get('type') == 'permission'
-        }
-        print(f"[*] Loaded {len(suspicious)} suspicious indicators.")
-        return suspicious
-    except Exception as e:
-        print(f"[!] Gagal load suspicious_indicators.json: {e}")
-        return set()
-
-
-def log_response(prefix: str, resp):
-    print(f"    → {prefix} response: {resp.status_code}")
-    try:
-        data = resp.json()
-        dump = json.dumps(data, indent=2)[:500]
-        print(f"       Response JSON (truncated):\n{dump}")
-    except Exception:
-        print(f"       Response text (truncated): {resp.text[:500]}")
-def analyze_apk_from_file(db, file_id: int, analytic_id: int):
+def _permission_row(row: ApkAnalytic) -> dict:
+    return {"id": row.id, "item": row.item, "status": row.status, "description": row.description}
+
+def save_apk_permissions(db: Session, analytic_file_id: int, permissions, scoring: str) -> List[dict]:
+    # One multi-row INSERT ... RETURNING per analytic file; re-analysing an APK whose permissions,
+    # statuses and score are unchanged leaves the stored rows alone. Rows are returned as
+    # dicts taken before the commit so callers don't trigger a reload per row.
+    rows = []
+    for perm, value in permissions.items():
+        status, desc = normalize_permission_entry(value)
+        rows.append({
+            "item": perm,
+            "status": status or "unknown",
+            "description": desc,
+            "malware_scoring": scoring,
+            "analytic_file_id": analytic_file_id,
+        })
+
+    existing = (
+        db.query(ApkAnalytic)
+        .filter(ApkAnalytic.analytic_file_id == analytic_file_id)
+        .order_by(ApkAnalytic.id)
+        .all()
+    )
+    fields = ("item", "status", "description", "malware_scoring")
+    if sorted(tuple(getattr(row, f) for f in fields) for row in existing) == sorted(
+        tuple(row[f] for f in fields) for row in rows
+    ):
+        print(f"[*] Permission set unchanged, keeping {len(existing)} stored rows.")
+        stored = [_permission_row(row) for row in existing]
+        db.commit()
+        return stored
+
+    db.query(ApkAnalytic).filter(ApkAnalytic.analytic_file_id == analytic_file_id).delete(synchronize_session=False)
+    inserted = []
+    if rows:
+        inserted = sorted(
+            (_permission_row(row) for row in db.scalars(insert(ApkAnalytic).returning(ApkAnalytic), rows)),
+            key=lambda row: row["id"],
+        )
+    db.commit()
+    print(f"[*] Stored {len(inserted)} permission rows.")
+    return inserted
+
+def build_apk_report(file_path: str, deep_scan: bool = False):
+    # The built-in manifest parser covers permission scoring in well under a second;
+    # MobSF is only needed for a deep scan or when the manifest cannot be decoded locally.
+    if not deep_scan and file_path.lower().endswith(".apk"):
+        try:
+            manifest = read_apk_manifest(file_path)
+            print(f"[*] Parsed AndroidManifest.xml locally ({manifest['package_name']})")
+            return {
+                "package_name": manifest["package_name"],
+                "permissions": manifest_permissions(manifest),
+                "manifest": manifest,
+                "scan_source": "local",
+            }
+        except ManifestError as e:
+            print(f"[!] Local manifest parsing failed, falling back to MobSF: {e}")
+
+    report_json = get_mobsf_client().get_report(file_path)
+    return {**report_json, "scan_source": "mobsf"}
+
+def analyze_apk_from_file(db, file_id: int, analytic_id: int, deep_scan: bool = False):
     print(f"\n==== Starting analysis for file_id={file_id}, analytic_id={analytic_id} ====")
 
     file_obj = db.query(File).filter(File.id == file_id).first()
@@ -198,47 +224,15 @@ def analyze_apk_from_file(db, file_id: int, analytic_id: int):
 
     print(f"[*] File found: {file_path}")
 
-    ext = os.path.splitext(file_path)[1].lower()
-    scan_type = "apk" if ext == ".apk" else "ipa" if ext == ".ipa" else "app"
-
-    api_key = get_mobsf_api_key()
-    headers = {"Authorization": api_key}
-
-    print("[*] Uploading to MobSF...")
-    with open(file_path, "rb") as f:
-        files = {"file": (os.path.basename(file_path), f, "application/octet-stream")}
-        resp = requests.post(f"{settings.MOBSF_URL}/api/v1/upload", files=files, headers=headers)
-
-    log_response("Upload", resp)
-    if resp.status_code != 200:
-        raise RuntimeError(f"Upload gagal: {resp.text}")
-
-    resp_json = resp.json()
-    file_hash = resp_json.get("hash")
-    if not file_hash:
-        raise RuntimeError("Tidak dapat membaca hash dari response upload")
-
-    print("[*] Starting MobSF scan...")
-    scan_resp = requests.post(f"{settings.MOBSF_URL}/api/v1/scan", data={"hash": file_hash}, headers=headers)
-    log_response("Scan", scan_resp)
-    if scan_resp.status_code != 200:
-        raise RuntimeError(f"Scan gagal: {scan_resp.text}")
-
-    print("[*] Fetching MobSF JSON report...")
-    json_resp = requests.post(f"{settings.MOBSF_URL}/api/v1/report_json", data={"hash": file_hash}, headers=headers)
-    log_response("Report JSON", json_resp)
-    if json_resp.status_code != 200:
-        raise RuntimeError(f"Gagal ambil report JSON: {json_resp.text}")
-
-    report_json = json_resp.json()
+    report_json = build_apk_report(file_path, deep_scan)
 
     permissions = report_json.get("permissions", {})
     print(f"[*] Extracted {len(permissions)} permissions from report.")
 
-    suspicious_set = load_suspicious_indicators(os.path.dirname(os.path.realpath(__file__)))
+    indicators = indicator_index_for(os.path.dirname(os.path.realpath(__file__)))
 
     safety_score, classification, reason, dangerous_list, risk_weight = classify_permissions(
-        permissions, suspicious_set
+        permissions, indicators.permissions
     )
     security_score = report_json.get("appsec", {}).get("security_score")
 
@@ -251,35 +245,21 @@ def analyze_apk_from_file(db, file_id: int, analytic_id: int):
     if not analytic_file:
         raise RuntimeError("AnalyticFile tidak ditemukan! Pastikan endpoint store-analytic-file dipanggil terlebih dahulu.")
 
-    analytic_file.scoring = security_score or safety_score
+    scoring = str(security_score if security_score is not None else safety_score)
+    analytic_file.scoring = scoring
     analytic_file.status = "scanned"
-    db.commit()
 
     print("[*] Saving analysis results to database...")
-
-    db.query(ApkAnalytic).filter(ApkAnalytic.analytic_file_id == analytic_file.id).delete()
-
-    for perm, value in permissions.items():
-        status, desc = normalize_permission_entry(value)
-        print(f"    • {perm} → status={status}")
-
-        db.add(
-            ApkAnalytic(
-                item=perm,
-                status=status,
-                description=desc,
-                malware_scoring=security_score,
-                analytic_file_id=analytic_file.id,
-                created_at=datetime.utcnow(),
-            )
-        )
-
-    db.commit()
+    permission_rows = save_apk_permissions(db, analytic_file.id, permissions, scoring)
 
     result = {
         "file": os.path.basename(file_path),
         "package": report_json.get("package_name", "N/A"),
+        "scan_source": report_json["scan_source"],
+        "manifest": report_json.get("manifest"),
         "permissions": permissions,
+        "permission_rows": permission_rows,
+        "scoring": scoring,
         "permission_analysis": {
             "security_score": security_score,
             "safety_score": safety_score,
@@ -289,6 +269,7 @@ def analyze_apk_from_file(db, file_id: int, analytic_id: int):
             "risk_weight": risk_weight,
             "total_permissions": len(permissions),
             "dangerous_count": len(dangerous_list),
+            "suspicious_permissions": indicators.match_permissions(permissions),
         }
     }
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Boolean, BigInteger, Index
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Boolean, BigInteger, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 from app.utils.timezone import get_indonesia_time
@@ -60,6 +60,19 @@ class File(Base):
     )
 
 
+class ConvertedSdpFile(Base):
+    __tablename__ = "converted_sdp_files"
+
+    id = Column(Integer, primary_key=True, index=True)
+    original_filename = Column(String(255), nullable=False, index=True)
+    converted_filename = Column(String(255), nullable=False, unique=True)
+    original_size = Column(BigInteger, nullable=True)
+    encrypted_size = Column(BigInteger, nullable=True)
+    total_chunks = Column(Integer, nullable=True)
+    sha256 = Column(String(64), nullable=True, index=True)
+    format_version = Column(String(10), nullable=True)
+    created_at = Column(DateTime, default=get_indonesia_time, index=True)
+
 class Device(Base):
     __tablename__ = "devices"
 
@@ -154,6 +167,9 @@ class SocialMedia(Base):
     updated_at = Column(DateTime, default=get_indonesia_time, onupdate=get_indonesia_time)
 
     file = relationship("File", back_populates="social_media")
+    __table_args__ = (
+        Index("idx_social_media_file_id", "file_id"),
+    )
 
 
 class Call(Base):
@@ -202,3 +218,6 @@ class ChatMessage(Base):
     updated_at = Column(DateTime, default=get_indonesia_time, onupdate=get_indonesia_time)
 
     file = relationship("File", back_populates="chat_messages")
+    __table_args__ = (
+        UniqueConstraint("file_id", "platform", "message_id", name="uq_chat_messages_file_platform_message"),
+    )
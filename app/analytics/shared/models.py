@@ -1,6 +1,6 @@
 from app.analytics.analytics_management.models import Analytic, AnalyticDevice
 from app.analytics.device_management.models import (
-    File, Device, HashFile, Contact, Call, SocialMedia, ChatMessage
+    File, Device, HashFile, Contact, Call, SocialMedia, ChatMessage, ConvertedSdpFile
 )
 
 __all__ = [
@@ -12,5 +12,6 @@ __all__ = [
     "Contact",
     "Call",
     "SocialMedia",
-    "ChatMessage"
+    "ChatMessage",
+    "ConvertedSdpFile"
 ]
@@ -0,0 +1,55 @@
+from fastapi.responses import JSONResponse
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Type, TypeVar
+
+# Rows fetched per round trip when the correlation helpers stream their source tables.
+CORRELATION_FETCH_SIZE = 5000
+
+
+class ContactCorrelation(NamedTuple):
+    contact_number: str
+    devices_found_in: List[Dict[str, Any]]
+
+
+class HashfileCorrelation(NamedTuple):
+    hash_value: str
+    file_name: Optional[str]
+    file_type: Optional[str]
+    devices: List[str]
+
+
+RowT = TypeVar("RowT", ContactCorrelation, HashfileCorrelation)
+
+
+class AnalyticsResult:
+    """Analytics payload shared by the JSON endpoints and the PDF exporters.
+
+    Takes the same ``content``/``status_code`` arguments as ``JSONResponse`` but keeps
+    the payload as Python objects, so exporters can read it without a JSON round trip.
+    The helpers still build the payload in full; ``iter_rows`` gives typed rows over it.
+    """
+
+    __slots__ = ("content", "status_code")
+
+    def __init__(self, content: Dict[str, Any], status_code: int = 200):
+        self.content = content
+        self.status_code = status_code
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status_code < 300
+
+    @property
+    def message(self) -> Optional[str]:
+        return self.content.get("message")
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        data = self.content.get("data")
+        return data if isinstance(data, dict) else {}
+
+    def iter_rows(self, key: str, row_type: Type[RowT]) -> Iterator[RowT]:
+        for row in self.data.get(key) or []:
+            yield row_type._make(row.get(field) for field in row_type._fields)
+
+    def to_response(self) -> JSONResponse:
+        return JSONResponse(content=self.content, status_code=self.status_code)
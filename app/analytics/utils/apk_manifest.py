@@ -0,0 +1,308 @@
+from typing import Any, Dict, List, Optional, Tuple
+import struct, zipfile, zlib
+import xml.etree.ElementTree as ET
+
+# Offline APK static analysis: AndroidManifest.xml is read straight out of the APK zip and
+# its binary XML (AXML) is decoded here, so permissions can be scored without MobSF.
+
+MANIFEST_ENTRY = "AndroidManifest.xml"
+# Real manifests are tens of kilobytes; anything bigger is refused before it is inflated
+# so a zip bomb cannot exhaust memory, and the analysis falls back to MobSF.
+MAX_MANIFEST_BYTES = 4 * 1024 * 1024
+ANDROID_NS = "http://schemas.android.com/apk/res/android"
+
+RES_STRING_POOL_TYPE = 0x0001
+RES_XML_TYPE = 0x0003
+RES_XML_START_ELEMENT_TYPE = 0x0102
+RES_XML_END_ELEMENT_TYPE = 0x0103
+RES_XML_RESOURCE_MAP_TYPE = 0x0180
+UTF8_FLAG = 1 << 8
+NO_INDEX = 0xFFFFFFFF
+
+TYPE_REFERENCE = 0x01
+TYPE_STRING = 0x03
+TYPE_INT_DEC = 0x10
+TYPE_INT_HEX = 0x11
+TYPE_INT_BOOLEAN = 0x12
+
+CHUNK_HEADER = struct.Struct("<HHI")
+STRING_POOL_HEADER = struct.Struct("<IIIII")
+START_ELEMENT = struct.Struct("<IIIIHHHHHH")
+ATTRIBUTE = struct.Struct("<IIIHBBI")
+
+# Obfuscators often blank the attribute name strings; the android:* resource id still
+# identifies the attribute.
+ANDROID_ATTR_IDS = {
+    0x01010003: "name",
+    0x01010010: "exported",
+    0x0101020C: "minSdkVersion",
+    0x0101021B: "versionCode",
+    0x0101021C: "versionName",
+    0x01010270: "targetSdkVersion",
+    0x01010271: "maxSdkVersion",
+    0x01010009: "protectionLevel",
+}
+
+COMPONENT_TAGS = {
+    "activity": "activities",
+    "activity-alias": "activities",
+    "service": "services",
+    "receiver": "receivers",
+    "provider": "providers",
+}
+
+# Runtime ("dangerous") permissions from the Android permission reference.
+DANGEROUS_PERMISSIONS = frozenset(
+    f"android.permission.{name}" for name in (
+        "ACCEPT_HANDOVER", "ACCESS_BACKGROUND_LOCATION", "ACCESS_COARSE_LOCATION",
+        "ACCESS_FINE_LOCATION", "ACCESS_MEDIA_LOCATION", "ACTIVITY_RECOGNITION",
+        "ADD_VOICEMAIL", "ANSWER_PHONE_CALLS", "BLUETOOTH_ADVERTISE", "BLUETOOTH_CONNECT",
+        "BLUETOOTH_SCAN", "BODY_SENSORS", "BODY_SENSORS_BACKGROUND", "CALL_PHONE", "CAMERA",
+        "GET_ACCOUNTS", "NEARBY_WIFI_DEVICES", "POST_NOTIFICATIONS", "PROCESS_OUTGOING_CALLS",
+        "READ_CALENDAR", "READ_CALL_LOG", "READ_CONTACTS", "READ_EXTERNAL_STORAGE",
+        "READ_MEDIA_AUDIO", "READ_MEDIA_IMAGES", "READ_MEDIA_VIDEO",
+        "READ_MEDIA_VISUAL_USER_SELECTED", "READ_PHONE_NUMBERS", "READ_PHONE_STATE",
+        "READ_SMS", "RECEIVE_MMS", "RECEIVE_SMS", "RECEIVE_WAP_PUSH", "RECORD_AUDIO",
+        "SEND_SMS", "USE_SIP", "UWB_RANGING", "WRITE_CALENDAR", "WRITE_CALL_LOG",
+        "WRITE_CONTACTS", "WRITE_EXTERNAL_STORAGE",
+    )
+)
+
+# Special-access permissions (overlay, accessibility, installing further packages) are
+# not runtime permissions but are the usual malware indicators, so they score as dangerous.
+SPECIAL_ACCESS_PERMISSIONS = frozenset(
+    f"android.permission.{name}" for name in (
+        "BIND_ACCESSIBILITY_SERVICE", "BIND_DEVICE_ADMIN", "BIND_NOTIFICATION_LISTENER_SERVICE",
+        "MANAGE_EXTERNAL_STORAGE", "PACKAGE_USAGE_STATS", "QUERY_ALL_PACKAGES",
+        "REQUEST_INSTALL_PACKAGES", "SYSTEM_ALERT_WINDOW", "WRITE_SETTINGS",
+        "INSTALL_PACKAGES", "DELETE_PACKAGES", "READ_LOGS", "WRITE_SECURE_SETTINGS",
+    )
+)
+
+PERMISSION_DESCRIPTIONS = {
+    "dangerous": "Runtime permission that grants access to private user data or device features.",
+    "special": "Special-access permission commonly abused by malware.",
+    "normal": "Install-time permission with low risk to user privacy.",
+    "unknown": "Custom or unrecognised permission.",
+}
+
+
+class ManifestError(ValueError):
+    pass
+
+
+def _read_length(data: bytes, pos: int, utf8: bool) -> Tuple[int, int]:
+    if utf8:
+        length = data[pos]
+        if length & 0x80:
+            return ((length & 0x7F) << 8) | data[pos + 1], pos + 2
+        return length, pos + 1
+    length = struct.unpack_from("<H", data, pos)[0]
+    if length & 0x8000:
+        return ((length & 0x7FFF) << 16) | struct.unpack_from("<H", data, pos + 2)[0], pos + 4
+    return length, pos + 2
+
+
+def _parse_string_pool(data: bytes, start: int, header_size: int) -> List[str]:
+    count, _, flags, strings_start, _ = STRING_POOL_HEADER.unpack_from(data, start + CHUNK_HEADER.size)
+    utf8 = bool(flags & UTF8_FLAG)
+    offsets = struct.unpack_from(f"<{count}I", data, start + header_size)
+    base = start + strings_start
+
+    strings = []
+    for offset in offsets:
+        pos = base + offset
+        if utf8:
+            _, pos = _read_length(data, pos, True)
+            size, pos = _read_length(data, pos, True)
+            strings.append(data[pos:pos + size].decode("utf-8", errors="replace"))
+        else:
+            size, pos = _read_length(data, pos, False)
+            strings.append(data[pos:pos + size * 2].decode("utf-16-le", errors="replace"))
+    return strings
+
+
+def _attribute_value(strings: List[str], raw: int, data_type: int, value: int) -> Any:
+    if raw != NO_INDEX and raw < len(strings):
+        return strings[raw]
+    if data_type == TYPE_STRING:
+        return strings[value] if value < len(strings) else ""
+    if data_type == TYPE_INT_BOOLEAN:
+        return value != 0
+    if data_type in (TYPE_INT_DEC, TYPE_INT_HEX):
+        return value
+    if data_type == TYPE_REFERENCE:
+        return f"@{value:08x}"
+    return value
+
+
+def parse_axml(data: bytes) -> List[Tuple[str, Dict[str, Any], int]]:
+    # Returns (tag, attributes, depth) for every start element, in document order.
+    if len(data) < CHUNK_HEADER.size:
+        raise ManifestError("Binary manifest is truncated")
+    chunk_type, header_size, total_size = CHUNK_HEADER.unpack_from(data, 0)
+    if chunk_type != RES_XML_TYPE:
+        raise ManifestError("Not a binary Android XML document")
+
+    strings: List[str] = []
+    resource_ids: List[int] = []
+    elements = []
+    depth = 0
+    pos = header_size
+    end = min(total_size, len(data))
+
+    try:
+        while pos + CHUNK_HEADER.size <= end:
+            chunk_type, chunk_header_size, chunk_size = CHUNK_HEADER.unpack_from(data, pos)
+            if chunk_size < CHUNK_HEADER.size:
+                raise ManifestError(f"Corrupt chunk at offset {pos}")
+
+            if chunk_type == RES_STRING_POOL_TYPE and not strings:
+                strings = _parse_string_pool(data, pos, chunk_header_size)
+            elif chunk_type == RES_XML_RESOURCE_MAP_TYPE:
+                count = (chunk_size - chunk_header_size) // 4
+                resource_ids = list(struct.unpack_from(f"<{count}I", data, pos + chunk_header_size))
+            elif chunk_type == RES_XML_START_ELEMENT_TYPE:
+                (_, _, _, name_index, attr_start, attr_size, attr_count,
+                 _, _, _) = START_ELEMENT.unpack_from(data, pos + CHUNK_HEADER.size)
+                attrs = {}
+                attr_pos = pos + chunk_header_size + attr_start
+                for i in range(attr_count):
+                    _, attr_name, raw, _, _, data_type, value = ATTRIBUTE.unpack_from(data, attr_pos + i * attr_size)
+                    name = strings[attr_name] if attr_name < len(strings) else ""
+                    if not name and attr_name < len(resource_ids):
+                        name = ANDROID_ATTR_IDS.get(resource_ids[attr_name], "")
+                    if name:
+                        attrs[name] = _attribute_value(strings, raw, data_type, value)
+                tag = strings[name_index] if name_index < len(strings) else ""
+                elements.append((tag, attrs, depth))
+                depth += 1
+            elif chunk_type == RES_XML_END_ELEMENT_TYPE:
+                depth = max(0, depth - 1)
+
+            pos += chunk_size
+    except struct.error as e:
+        raise ManifestError(f"Binary manifest is truncated: {e}") from e
+
+    return elements
+
+
+def _parse_text_xml(data: bytes) -> List[Tuple[str, Dict[str, Any], int]]:
+    # Some tools repack APKs with a plain-text manifest; handle it the same way.
+    try:
+        root = ET.fromstring(data)
+    except ET.ParseError as e:
+        raise ManifestError(f"Invalid manifest XML: {e}") from e
+
+    prefix = f"{{{ANDROID_NS}}}"
+    elements = []
+
+    def walk(node, depth):
+        attrs = {key[len(prefix):] if key.startswith(prefix) else key: value for key, value in node.attrib.items()}
+        elements.append((node.tag, attrs, depth))
+        for child in node:
+            walk(child, depth + 1)
+
+    walk(root, 0)
+    return elements
+
+
+def _as_int(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _component_name(package: str, name: Any) -> str:
+    name = str(name or "")
+    if name.startswith("."):
+        return f"{package}{name}"
+    if name and "." not in name and package:
+        return f"{package}.{name}"
+    return name
+
+
+def parse_manifest(data: bytes) -> Dict[str, Any]:
+    elements = _parse_text_xml(data) if data.lstrip()[:1] == b"<" else parse_axml(data)
+    if not elements or elements[0][0] != "manifest":
+        raise ManifestError("Manifest root element is not <manifest>")
+
+    root = elements[0][1]
+    package = str(root.get("package", ""))
+    manifest = {
+        "package_name": package,
+        "version_code": _as_int(root.get("versionCode")),
+        "version_name": root.get("versionName"),
+        "min_sdk": None,
+        "target_sdk": None,
+        "max_sdk": None,
+        "permissions": [],
+        "declared_permissions": [],
+        "activities": [],
+        "services": [],
+        "receivers": [],
+        "providers": [],
+    }
+
+    for tag, attrs, _ in elements[1:]:
+        if tag in ("uses-permission", "uses-permission-sdk-23", "uses-permission-sdk-m"):
+            name = attrs.get("name")
+            if name and name not in manifest["permissions"]:
+                manifest["permissions"].append(str(name))
+        elif tag == "permission" and attrs.get("name"):
+            manifest["declared_permissions"].append(str(attrs["name"]))
+        elif tag == "uses-sdk":
+            manifest["min_sdk"] = _as_int(attrs.get("minSdkVersion"))
+            manifest["target_sdk"] = _as_int(attrs.get("targetSdkVersion"))
+            manifest["max_sdk"] = _as_int(attrs.get("maxSdkVersion"))
+        elif tag in COMPONENT_TAGS:
+            exported = attrs.get("exported")
+            if isinstance(exported, str):
+                exported = exported.lower() == "true"
+            manifest[COMPONENT_TAGS[tag]].append({
+                "name": _component_name(package, attrs.get("name")),
+                "exported": exported,
+            })
+
+    return manifest
+
+
+def read_apk_manifest(apk_path: str) -> Dict[str, Any]:
+    try:
+        with zipfile.ZipFile(apk_path) as apk:
+            try:
+                info = apk.getinfo(MANIFEST_ENTRY)
+            except KeyError:
+                raise ManifestError(f"{MANIFEST_ENTRY} not found in APK")
+            if info.file_size > MAX_MANIFEST_BYTES:
+                raise ManifestError(f"{MANIFEST_ENTRY} is {info.file_size} bytes, over the {MAX_MANIFEST_BYTES} byte limit")
+            # zipfile stops inflating at the declared size, so this bound holds for the read.
+            data = apk.read(info)
+    except (zipfile.BadZipFile, zlib.error) as e:
+        raise ManifestError(f"Not a valid APK archive: {e}") from e
+    return parse_manifest(data)
+
+
+def permission_level(permission: str) -> str:
+    if permission in DANGEROUS_PERMISSIONS:
+        return "dangerous"
+    if permission in SPECIAL_ACCESS_PERMISSIONS:
+        return "special"
+    if permission.startswith("android.permission.") or permission.startswith("com.google.android."):
+        return "normal"
+    return "unknown"
+
+
+def manifest_permissions(manifest: Dict[str, Any]) -> Dict[str, Dict[str, str]]:
+    # Same shape as the "permissions" block of a MobSF report, so classify_permissions
+    # and the ApkAnalytic rows work unchanged.
+    permissions = {}
+    for permission in manifest.get("permissions", []):
+        level = permission_level(permission)
+        permissions[permission] = {
+            "status": "dangerous" if level == "special" else level,
+            "info": permission.rsplit(".", 1)[-1].replace("_", " ").lower(),
+            "description": PERMISSION_DESCRIPTIONS[level],
+        }
+    return permissions
@@ -2,9 +2,11 @@ import pandas as pd
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from sqlalchemy.orm import Session
-from app.analytics.device_management.models import SocialMedia, ChatMessage
+from app.analytics.device_management.models import SocialMedia
 from app.db.session import get_db
 from .file_validator import file_validator
+from .dedup_writer import save_chat_messages, social_media_index, mark_social_media_saved, SOCIAL_MEDIA_ID_COLUMNS
+from .sheet_mapping import AXIOM, count_rows, find_mapping, parse_sheet
 from pathlib import Path
 import re, traceback, logging, warnings
 
@@ -100,28 +102,17 @@ class AxiomParser:
         return new_acc
     
     def _check_existing_social_media(self, acc: Dict[str, Any]) -> bool:
-        query = self.db.query(SocialMedia).filter(
-            SocialMedia.file_id == acc.get("file_id")
-        )
+        index = social_media_index(self.db, acc.get("file_id"))
         
-        if acc.get("instagram_id"):
-            query = query.filter(SocialMedia.instagram_id == acc.get("instagram_id"))
-        elif acc.get("facebook_id"):
-            query = query.filter(SocialMedia.facebook_id == acc.get("facebook_id"))
-        elif acc.get("whatsapp_id"):
-            query = query.filter(SocialMedia.whatsapp_id == acc.get("whatsapp_id"))
-        elif acc.get("telegram_id"):
-            query = query.filter(SocialMedia.telegram_id == acc.get("telegram_id"))
-        elif acc.get("X_id"):
-            query = query.filter(SocialMedia.X_id == acc.get("X_id"))
-        elif acc.get("tiktok_id"):
-            query = query.filter(SocialMedia.tiktok_id == acc.get("tiktok_id"))
-        elif acc.get("account_name"):
-            query = query.filter(SocialMedia.account_name == acc.get("account_name"))
-        else:
-            return False
+        key_column = next((column for column in SOCIAL_MEDIA_ID_COLUMNS if acc.get(column)), None)
+        if key_column is None:
+            if not acc.get("account_name"):
+                return False
+            key_column = "account_name"
         
-        return query.first() is not None
+        if index.find(acc, [key_column]):
+            return True
+        return False
     
     def _safe_int(self, value: Any) -> Optional[int]:
         if value is None:
@@ -150,35 +141,11 @@ class AxiomParser:
                 sheet_name_str = str(sheet_name)
                 print(f"Processing sheet: {sheet_name_str}")
 
-                if 'Instagram Profiles' in sheet_name_str:
-                    results.extend(self._parse_axiom_instagram_profiles(file_path, sheet_name, file_id))
-                elif 'Android Instagram Following' in sheet_name_str:
-                    results.extend(self._parse_axiom_instagram_following(file_path, sheet_name, file_id))
-                elif 'Android Instagram Users' in sheet_name_str:
-                    results.extend(self._parse_axiom_instagram_users(file_path, sheet_name, file_id))
-
-                elif 'Twitter Users' in sheet_name_str:
-                    results.extend(self._parse_axiom_twitter_users(file_path, sheet_name, file_id))
-
-                elif 'Telegram Accounts' in sheet_name_str:
-                    results.extend(self._parse_axiom_telegram_accounts(file_path, sheet_name, file_id))
-                elif 'User Accounts' in sheet_name_str:
-                    results.extend(self._parse_axiom_user_accounts(file_path, sheet_name, file_id))
-
-                elif 'TikTok Contacts' in sheet_name_str:
-                    results.extend(self._parse_axiom_tiktok_contacts(file_path, sheet_name, file_id))
-
-                elif 'Facebook Contacts' in sheet_name_str:
-                    results.extend(self._parse_axiom_facebook_contacts(file_path, sheet_name, file_id))
-                elif 'Facebook User-Friends' in sheet_name_str:
-                    results.extend(self._parse_axiom_facebook_users(file_path, sheet_name, file_id))
-
-                elif 'WhatsApp Contacts - Android' in sheet_name_str:
-                    results.extend(self._parse_axiom_whatsapp_contacts(file_path, sheet_name, file_id))
+                mapping = find_mapping("Magnet Axiom", sheet_name_str, target="social_media")
+                if mapping:
+                    results.extend(parse_sheet(mapping, file_path, sheet_name, file_id))
                 elif 'WhatsApp User Profiles - Androi' in sheet_name_str:
                     results.extend(self._parse_axiom_whatsapp_users(file_path, sheet_name, file_id))
-                elif 'WhatsApp Accounts Information' in sheet_name_str:
-                    results.extend(self._parse_axiom_whatsapp_accounts(file_path, sheet_name, file_id))
 
                 elif 'Android WhatsApp Accounts Infor' in sheet_name_str:
                     results.extend(self._parse_axiom_whatsapp_accounts_info(file_path, sheet_name, file_id))
@@ -264,7 +231,8 @@ class AxiomParser:
                             skipped_count += 1
                             continue
 
-                            self.db.add(SocialMedia(**acc))
+                        self.db.add(SocialMedia(**acc))
+                        mark_social_media_saved(self.db, acc)
                         batch_saved += 1
 
                     self.db.commit()
@@ -301,383 +269,11 @@ class AxiomParser:
             else:
                 engine = 'openpyxl'
 
-            xls = pd.ExcelFile(file_path, engine=engine)
-            total_count = 0
-
-            for sheet_name in xls.sheet_names:
-                try:
-                    sheet_name_str = str(sheet_name)
-                    if 'Instagram Profiles' in sheet_name_str:
-                        df = pd.read_excel(file_path, sheet_name=sheet_name, engine=engine, dtype=str)
-                        if 'User ID' in df.columns:
-                            total_count += len(df[df['User ID'].notna()])
-                    elif 'Twitter Users' in sheet_name_str:
-                        df = pd.read_excel(file_path, sheet_name=sheet_name, engine=engine, dtype=str)
-                        if 'User ID' in df.columns:
-                            total_count += len(df[df['User ID'].notna()])
-                    elif 'Telegram Accounts' in sheet_name_str:
-                        df = pd.read_excel(file_path, sheet_name=sheet_name, engine=engine, dtype=str)
-                        if 'Account ID' in df.columns:
-                            total_count += len(df[df['Account ID'].notna()])
-                    elif 'TikTok Contacts' in sheet_name_str:
-                        df = pd.read_excel(file_path, sheet_name=sheet_name, engine=engine, dtype=str)
-                        if 'ID' in df.columns:
-                            total_count += len(df[df['ID'].notna()])
-                    elif 'Facebook Contacts' in sheet_name_str:
-                        df = pd.read_excel(file_path, sheet_name=sheet_name, engine=engine, dtype=str)
-                        if 'Profile ID' in df.columns:
-                            total_count += len(df[df['Profile ID'].notna()])
-                    elif 'Facebook User-Friends' in sheet_name_str:
-                        df = pd.read_excel(file_path, sheet_name=sheet_name, engine=engine, dtype=str)
-                        if 'User ID' in df.columns:
-                            total_count += len(df[df['User ID'].notna()])
-                    elif 'WhatsApp Contacts' in sheet_name_str:
-                        df = pd.read_excel(file_path, sheet_name=sheet_name, engine=engine, dtype=str)
-                        if 'ID' in df.columns:
-                            total_count += len(df[df['ID'].notna()])
-                    elif 'WhatsApp User Profiles' in sheet_name_str:
-                        df = pd.read_excel(file_path, sheet_name=sheet_name, engine=engine, dtype=str)
-                        if 'Phone Number' in df.columns:
-                            total_count += len(df[df['Phone Number'].notna()])
-                except Exception:
-                    continue
-
-            return total_count
+            return count_rows(AXIOM, file_path, engine)
 
         except Exception as e:
             return 0
 
-    def _parse_axiom_instagram_profiles(self, file_path: str, sheet_name: str, file_id: int) -> List[Dict[str, Any]]:
-        results = []
-
-        try:
-            df = pd.read_excel(file_path, sheet_name=sheet_name, engine='openpyxl', dtype=str)
-
-            for _, row in df.iterrows():
-                if self._is_na(row.get('User Name')):
-                    continue
-
-                following_value = self._clean(row.get('Following'))
-                followers_value = self._clean(row.get('Is Followed By'))
-
-                following_count = 1 if following_value and following_value.lower() == 'yes' else None
-                followers_count = 1 if followers_value and followers_value.lower() == 'yes' else None
-
-                user_id_value = self._clean(row.get('User ID'))
-                user_name_value = self._clean(row.get('User Name'))
-
-                account_id_value = user_id_value if user_id_value else user_name_value
-
-                acc = {
-                    "platform": "Instagram",
-                    "account_name": user_name_value,
-                    "account_id": account_id_value,
-                    "user_id": user_id_value,
-                    "full_name": self._clean(row.get('Name')),
-                    "following": following_count,
-                    "followers": followers_count,
-                    "phone_number": self._clean(row.get('Phone Number')),
-                    "source_tool": "Axiom",
-                    "sheet_name": "Instagram Profiles",
-                    "file_id": file_id,
-                }
-                results.append(acc)
-
-        except Exception as e:
-            print(f"Error parsing Instagram Profiles: {e}")
-
-        return results
-
-    def _parse_axiom_instagram_following(self, file_path: str, sheet_name: str, file_id: int) -> List[Dict[str, Any]]:
-        results = []
-
-        try:
-            df = pd.read_excel(file_path, sheet_name=sheet_name, engine='openpyxl', dtype=str)
-
-            for _, row in df.iterrows():
-                if self._is_na(row.get('User Name')):
-                    continue
-
-                following_value = self._clean(row.get('Status'))
-                following_count = 1 if following_value and following_value.lower() == 'following' else None
-
-                user_id_value = self._clean(row.get('ID'))
-                user_name_value = self._clean(row.get('User Name'))
-
-                account_id_value = user_id_value if user_id_value else user_name_value
-
-                acc = {
-                    "platform": "Instagram",
-                    "account_name": user_name_value,
-                    "account_id": account_id_value,
-                    "user_id": user_id_value,
-                    "full_name": self._clean(row.get('Full Name')),
-                    "following": following_count,
-                    "followers": None,
-                    "phone_number": None,
-                    "source_tool": "Axiom",
-                    "sheet_name": "Android Instagram Following",
-                    "file_id": file_id,
-                }
-                results.append(acc)
-
-        except Exception as e:
-            print(f"Error parsing Android Instagram Following: {e}")
-
-        return results
-
-
-    def _parse_axiom_instagram_users(self, file_path: str, sheet_name: str, file_id: int) -> List[Dict[str, Any]]:
-        results = []
-        try:
-            df = pd.read_excel(file_path, sheet_name=sheet_name, engine='openpyxl', dtype=str)
-
-            for _, row in df.iterrows():
-                if self._is_na(row.get('User Name')):
-                    continue
-
-                user_id_value = self._clean(row.get('ID'))
-                user_name_value = self._clean(row.get('User Name'))
-                account_id_value = user_id_value if user_id_value else user_name_value
-                acc = {
-                    "platform": "Instagram",
-                    "account_name": user_name_value,
-                    "account_id": account_id_value,
-                    "user_id": user_id_value,
-                    "full_name": self._clean(row.get('Full Name')),
-                    "following": None,
-                    "followers": None,
-                    "phone_number": None,
-                    "source_tool": "Axiom",
-                    "sheet_name": "Android Instagram Users",
-                    "file_id": file_id,
-                }
-                results.append(acc)
-        except Exception as e:
-            print(f"Error parsing Android Instagram Users: {e}")
-        return results
-
-    def _parse_axiom_user_accounts(self, file_path: str, sheet_name: str, file_id: int) -> List[Dict[str, Any]]:
-        results = []
-        try:
-            df = pd.read_excel(file_path, sheet_name=sheet_name, engine='openpyxl', dtype=str)
-            for _, row in df.iterrows():
-                service_name = self._clean(row.get('Service Name', ''))
-                user_name = self._clean(row.get('User Name', ''))
-                user_id = self._clean(row.get('User ID', ''))
-                if not service_name or 'telegram' not in service_name.lower():
-                    continue
-                if not user_name and not user_id:
-                    continue
-
-                acc = {
-                    "platform": "Telegram",
-                    "account_name": user_name or user_id,
-                    "account_id": user_id or user_name,
-                    "user_id": user_id,
-                    "full_name": user_name,
-                    "following": None,
-                    "followers": None,
-                    "phone_number": self._clean(row.get('Phone Number(s)')),
-                    "source_tool": "Axiom",
-                    "sheet_name": "User Accounts",
-                    "file_id": file_id,
-                }
-                results.append(acc)
-
-        except Exception as e:
-            print(f"Error parsing User Accounts: {e}")
-        return results
-
-    def _parse_axiom_whatsapp_accounts(self, file_path: str, sheet_name: str, file_id: int) -> List[Dict[str, Any]]:
-        results = []
-        try:
-            df = pd.read_excel(file_path, sheet_name=sheet_name, engine='openpyxl', dtype=str)
-            for _, row in df.iterrows():
-                whatsapp_name = self._clean(row.get('WhatsApp Name'))
-                phone_number = self._clean(row.get('Phone Number'))
-                if not whatsapp_name and not phone_number:
-                    continue
-
-                acc = {
-                    "platform": "WhatsApp",
-                    "account_name": whatsapp_name or phone_number,
-                    "account_id": phone_number or whatsapp_name,
-                    "user_id": phone_number,
-                    "full_name": whatsapp_name,
-                    "following": None,
-                    "followers": None,
-                    "phone_number": phone_number,
-                    "source_tool": "Axiom",
-                    "sheet_name": "WhatsApp Accounts Information",
-                    "file_id": file_id,
-                }
-                results.append(acc)
-        except Exception as e:
-            print(f"Error parsing WhatsApp Accounts Information: {e}")
-        return results
-
-    def _parse_axiom_twitter_users(self, file_path: str, sheet_name: str, file_id: int) -> List[Dict[str, Any]]:
-        results = []
-        try:
-            df = pd.read_excel(file_path, sheet_name=sheet_name, engine='openpyxl', dtype=str)
-            for _, row in df.iterrows():
-                if self._is_na(row.get('User Name')):
-                    continue
-
-                user_id_value = self._clean(row.get('User ID'))
-                screen_name_value = self._clean(row.get('Screen Name'))
-                user_name_value = self._clean(row.get('User Name')) or screen_name_value
-
-                account_id_value = user_id_value if user_id_value else user_name_value
-
-                acc = {
-                    "platform": "X",
-                    "account_name": user_name_value or screen_name_value,
-                    "account_id": account_id_value,
-                    "user_id": user_id_value,
-                    "full_name": self._clean(row.get('Full Name')),
-                    "following": self._safe_int(row.get('Following')),
-                    "followers": self._safe_int(row.get('Followers')),
-                    "source_tool": "Axiom",
-                    "sheet_name": "Twitter Users",
-                    "file_id": file_id,
-                }
-                results.append(acc)
-        except Exception as e:
-            print(f"Error parsing Twitter Users: {e}")
-        return results
-
-    def _parse_axiom_telegram_accounts(self, file_path: str, sheet_name: str, file_id: int) -> List[Dict[str, Any]]:
-        results = []
-        try:
-            df = pd.read_excel(file_path, sheet_name=sheet_name, engine='openpyxl', dtype=str)
-
-            for _, row in df.iterrows():
-                if self._is_na(row.get('User ID')):
-                    continue
-
-                first_name = self._clean(row.get('First Name', ''))
-                last_name = self._clean(row.get('Last Name', ''))
-                full_name = f"{first_name} {last_name}".strip()
-                user_name = self._clean(row.get('User Name'))
-                account_id_value = self._clean(row.get('Account ID'))
-                user_id_value = self._clean(row.get('User ID'))
-                account_name_value = user_name or full_name or str(user_id_value) if user_id_value else None
-                account_id_final = account_id_value if account_id_value else user_id_value
-                acc = {
-                    "platform": "Telegram",
-                    "account_name": account_name_value,
-                    "account_id": account_id_final,
-                    "user_id": user_id_value,
-                    "full_name": full_name,
-                    "phone_number": self._clean(row.get('Phone Number')),
-                    "source_tool": "Axiom",
-                    "sheet_name": "Telegram Accounts",
-                    "file_id": file_id,
-                }
-                results.append(acc)
-        except Exception as e:
-            print(f"Error parsing Telegram Accounts: {e}")
-        return results
-
-    def _parse_axiom_tiktok_contacts(self, file_path: str, sheet_name: str, file_id: int) -> List[Dict[str, Any]]:
-        results = []
-        try:
-            df = pd.read_excel(file_path, sheet_name=sheet_name, engine="openpyxl", dtype=str)
-            for _, row in df.iterrows():
-                if self._is_na(row.get("ID")):
-                    continue
-                nickname = self._clean(row.get("Nickname"))
-                user_name = self._clean(row.get("User Name"))
-                account_name = nickname or user_name
-
-                acc = {
-                    "platform": "TikTok",
-                    "account_name": account_name,
-                    "account_id": self._clean(row.get("ID")),
-                    "user_id": self._clean(row.get("ID")),
-                    "full_name": nickname or user_name,
-                    "following": None,
-                    "followers": None,
-                    "source_tool": "Axiom",
-                    "sheet_name": "TikTok Contacts",
-                    "file_id": file_id,
-                }
-
-                results.append(acc)
-        except Exception as e:
-            print(f"Error parsing TikTok Contacts: {e}")
-        return results
-
-    def _parse_axiom_facebook_contacts(self, file_path: str, sheet_name: str, file_id: int) -> List[Dict[str, Any]]:
-        results = []
-        try:
-            df = pd.read_excel(file_path, sheet_name=sheet_name, engine='openpyxl', dtype=str)
-            for _, row in df.iterrows():
-                if self._is_na(row.get('Profile ID')):
-                    continue
-                acc = {
-                    "platform": "Facebook",
-                    "account_name": self._clean(row.get('Display Name')),
-                    "account_id": self._clean(row.get('Profile ID')),
-                    "user_id": self._clean(row.get('Profile ID')),
-                    "full_name": f"{self._clean(row.get('First Name'))} {self._clean(row.get('Last Name'))}".strip(),
-                    "phone_number": self._clean(row.get('Phone Numbers')),
-                    "source_tool": "Axiom",
-                    "file_id": file_id,
-                }
-                results.append(acc)
-        except Exception as e:
-            print(f"Error parsing Facebook Contacts: {e}")
-        return results
-
-    def _parse_axiom_facebook_users(self, file_path: str, sheet_name: str, file_id: int) -> List[Dict[str, Any]]:
-        results = []
-        try:
-            df = pd.read_excel(file_path, sheet_name=sheet_name, engine='openpyxl', dtype=str)
-
-            for _, row in df.iterrows():
-                if self._is_na(row.get('User ID')):
-                    continue
-                acc = {
-                    "platform": "Facebook",
-                    "account_name": self._clean(row.get('Display Name')),
-                    "account_id": self._clean(row.get('User ID')),
-                    "user_id": self._clean(row.get('User ID')),
-                    "full_name": f"{self._clean(row.get('First Name'))} {self._clean(row.get('Last Name'))}".strip(),
-                    "phone_number": self._clean(row.get('Phone Number')),
-                    "source_tool": "Axiom",
-                    "file_id": file_id,
-                }
-                results.append(acc)
-        except Exception as e:
-            print(f"Error parsing Facebook Users: {e}")
-        return results
-
-    def _parse_axiom_whatsapp_contacts(self, file_path: str, sheet_name: str, file_id: int) -> List[Dict[str, Any]]:
-        results = []
-        try:
-            df = pd.read_excel(file_path, sheet_name=sheet_name, engine='openpyxl', dtype=str)
-
-            for _, row in df.iterrows():
-                if self._is_na(row.get('ID')):
-                    continue
-                acc = {
-                    "platform": "WhatsApp",
-                    "account_name": self._clean(row.get('WhatsApp Name')),
-                    "account_id": self._clean(row.get('ID')),
-                    "user_id": self._clean(row.get('ID')),
-                    "full_name": f"{self._clean(row.get('Given Name'))} {self._clean(row.get('Family Name'))}".strip(),
-                    "phone_number": self._clean(row.get('Phone Number')),
-                    "source_tool": "Axiom",
-                    "file_id": file_id,
-                }
-                results.append(acc)
-        except Exception as e:
-            print(f"Error parsing WhatsApp Contacts: {e}")
-        return results
-
     def _parse_axiom_whatsapp_users(self, file_path: str, sheet_name: str, file_id: int) -> List[Dict[str, Any]]:
         results = []
         try:
@@ -747,7 +343,7 @@ class AxiomParser:
 
             if 'Twitter Direct Messages' in xls.sheet_names:
                 logger.info(f"[CHAT PARSER] Found Twitter Direct Messages sheet, parsing...")
-                twitter_results = self._parse_twitter_messages(file_path, 'Twitter Direct Messages', file_id)
+                twitter_results = parse_sheet(find_mapping("Magnet Axiom", 'Twitter Direct Messages', target="chat_messages"), file_path, 'Twitter Direct Messages', file_id)
                 results.extend(twitter_results)
                 logger.info(f"[CHAT PARSER] Twitter/X: Parsed {len(twitter_results)} messages")
             else:
@@ -764,24 +360,7 @@ class AxiomParser:
                            f"to={sample_msg.get('to_name')}, "
                            f"timestamp={sample_msg.get('timestamp')}")
 
-            saved_count = 0
-            skipped_count = 0
-            for msg in results:
-                existing = (
-                    self.db.query(ChatMessage)
-                    .filter(
-                        ChatMessage.file_id == msg["file_id"],
-                        ChatMessage.platform == msg["platform"],
-                        ChatMessage.message_id == msg["message_id"]
-                    )
-                    .first()
-                )
-                if not existing:
-                    self.db.add(ChatMessage(**msg))
-                    saved_count += 1
-                else:
-                    skipped_count += 1
-
+            saved_count, skipped_count = save_chat_messages(self.db, results)
             self.db.commit()
             logger.info(f"[CHAT PARSER] Successfully saved {saved_count} chat messages to database (skipped {skipped_count} duplicates)")
             print(f"Successfully saved {saved_count} chat messages to database (skipped {skipped_count} duplicates)")
@@ -948,55 +527,6 @@ class AxiomParser:
 
         return results
 
-    def _parse_twitter_messages(self, file_path: str, sheet_name: str, file_id: int) -> List[Dict[str, Any]]:
-        results = []
-
-        try:
-            logger.debug(f"[TWITTER/X PARSER] Reading sheet: {sheet_name}")
-            df = pd.read_excel(file_path, sheet_name=sheet_name, engine='openpyxl', dtype=str)
-            logger.debug(f"[TWITTER/X PARSER] Sheet loaded: {len(df)} rows")
-            
-            processed_count = 0
-            skipped_count = 0
-
-            for idx, row in df.iterrows():
-                if self._is_na(row.get('Text')) or not str(row.get('Text')).strip():
-                    skipped_count += 1
-                    continue
-
-                message_data = {                    
-                    "file_id": file_id,
-                    "platform": "X",
-                    "message_text": str(row.get('Text', '')),
-                    "from_name": str(row.get('Sender Name', '')),
-                    "sender_number": str(row.get('Sender ID', '')),
-                    "to_name": str(row.get('Recipient Name(s)', '')),
-                    "recipient_number": str(row.get('Recipient ID(s)', '')),
-                    "timestamp": str(row.get('Sent/Received Date/Time - UTC+00:00 (dd/MM/yyyy)', '')),
-                    "thread_id": str(row.get('_ThreadID', '')),
-                    "chat_id": "",
-                    "message_id": str(row.get('Item ID', '')),
-                    "message_type": "text",
-                    "direction": str(row.get('Direction', '')),
-                    "source_tool": "Magnet Axiom",
-                    "sheet_name": sheet_name
-                }
-
-                if processed_count == 0:
-                    logger.debug(f"[TWITTER/X PARSER] First message sample: message_id={message_data['message_id']}, "
-                               f"sender={message_data['sender_name']}, receiver={message_data['receiver_name']}")
-
-                results.append(message_data)
-                processed_count += 1
-
-            logger.info(f"[TWITTER/X PARSER] Processed {processed_count} messages, skipped {skipped_count} empty rows")
-
-        except Exception as e:
-            logger.error(f"[TWITTER/X PARSER] Error parsing Twitter messages from {sheet_name}: {e}", exc_info=True)
-            print(f"Error parsing Twitter messages: {e}")
-
-        return results
-
     def _parse_axiom_whatsapp_accounts_info(self, file_path: str, sheet_name: str, file_id: int) -> List[Dict[str, Any]]:
         results = []
 
@@ -1,13 +1,35 @@
 import pandas as pd
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 from sqlalchemy.orm import Session
-from app.analytics.device_management.models import ChatMessage
+from app.analytics.utils.dedup_writer import save_chat_messages
+from app.analytics.utils.sheet_scheduler import parser_task, mapping_task, run_sheet_tasks
 from datetime import datetime
 import pytz, traceback, logging, re
 
 logger = logging.getLogger(__name__)
 
+AXIOM_CHAT_SHEETS = [
+    ('Telegram Messages - iOS', 'Telegram', '_parse_telegram_messages'),
+    ('Telegram Messages - Android', 'Telegram', '_parse_telegram_messages'),
+    ('Instagram Direct Messages', 'Instagram', '_parse_instagram_messages'),
+    ('TikTok Messages', 'TikTok', '_parse_tiktok_messages'),
+    ('Twitter Direct Messages', 'Twitter/X', None),
+    ('Facebook Messenger Messages', 'Facebook', '_parse_facebook_messages'),
+    ('WhatsApp Messages - Android', 'WhatsApp', '_parse_whatsapp_messages'),
+    ('WhatsApp Messages - iOS', 'WhatsApp', '_parse_whatsapp_messages'),
+    ('Android WhatsApp Messages', 'WhatsApp', '_parse_whatsapp_messages'),
+    ('iOS WhatsApp Messages', 'WhatsApp', '_parse_whatsapp_messages'),
+]
+
+def _counted_rows(rows: Iterable[Dict[str, Any]], stats: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    for row in rows:
+        if stats["sample"] is None:
+            stats["sample"] = row
+        stats["parsed"] += 1
+        yield row
+
+
 class ChatMessagesParserExtended:
     
     def _normalize_direction(self, direction_raw: str) -> str:
@@ -118,7 +140,7 @@ class ChatMessagesParserExtended:
         
         return False
 
-    def parse_cellebrite_chat_messages(self, file_path: str, file_id: int) -> List[Dict[str, Any]]:
+    def parse_cellebrite_chat_messages(self, file_path: str, file_id: int) -> int:
         results = []
         
         try:
@@ -145,11 +167,8 @@ class ChatMessagesParserExtended:
                             f"to={sample_msg.get('receiver')}, "
                             f"timestamp={sample_msg.get('timestamp')}")
             
-            saved_count = 0
-            skipped_count = 0
-
-            for msg in results:
-                chat_message_data = {
+            chat_messages_data = (
+                {
                     "file_id": msg.get("file_id"),
                     "platform": msg.get("platform", "Unknown"),
                     "message_text": msg.get("message_text"),
@@ -171,23 +190,10 @@ class ChatMessagesParserExtended:
                     "source_tool": "Cellebrite",
                     "sheet_name": "Chats",
                 }
+                for msg in results
+            )
 
-                existing = (
-                    self.db.query(ChatMessage)
-                    .filter(
-                        ChatMessage.file_id == chat_message_data["file_id"],
-                        ChatMessage.platform == chat_message_data["platform"],
-                        ChatMessage.message_id == chat_message_data["message_id"]
-                    )
-                    .first()
-                )
-
-                if not existing:
-                    self.db.add(ChatMessage(**chat_message_data))
-                    saved_count += 1
-                else:
-                    skipped_count += 1
-
+            saved_count, skipped_count = save_chat_messages(self.db, chat_messages_data)
             self.db.commit()
             logger.info(f"[CELLEBRITE CHAT PARSER] Saved {saved_count} messages (skipped {skipped_count} duplicates)")
             print(f"Saved {saved_count} Cellebrite chat messages (skipped {skipped_count} duplicates)")
@@ -198,7 +204,7 @@ class ChatMessagesParserExtended:
             self.db.rollback()
             raise e
 
-        return results
+        return len(results)
 
     def _parse_cellebrite_chats_messages(self, file_path: str, sheet_name: str, file_id: int) -> List[Dict[str, Any]]:
         results: List[Dict[str, Any]] = []
@@ -558,8 +564,10 @@ class ChatMessagesParserExtended:
         except Exception:
             return None
 
-    def parse_oxygen_chat_messages(self, file_path: str, file_id: int) -> List[Dict[str, Any]]:
-        results = []
+    def parse_oxygen_chat_messages(self, file_path: str, file_id: int) -> int:
+        stats = {"parsed": 0, "sample": None}
+        saved_count = 0
+        skipped_count = 0
         
         try:
             logger.info(f"[OXYGEN CHAT PARSER] Starting to parse chat messages from file_id={file_id}, file_path={file_path}")
@@ -652,16 +660,13 @@ class ChatMessagesParserExtended:
                 print(f"[OXYGEN CHAT PARSER] Found '{messages_sheet}' sheet - will parse all platforms from this sheet ONLY")
                 print(f"[OXYGEN CHAT PARSER] Skipping ALL individual platform sheets (Telegram, Instagram, Twitter, WhatsApp, etc.)")
                 
-                try:
-                    messages_results = self._parse_oxygen_messages_sheet(file_path, messages_sheet, file_id, engine)
-                    results.extend(messages_results)
-                    logger.info(f"[OXYGEN CHAT PARSER] Messages sheet: Parsed {len(messages_results)} messages from all platforms")
-                    print(f"[OXYGEN CHAT PARSER] Messages sheet: Parsed {len(messages_results)} messages from all platforms")
-                except Exception as e:
-                    logger.error(f"[OXYGEN CHAT PARSER] Error parsing Messages sheet: {e}", exc_info=True)
-                    print(f"[OXYGEN CHAT PARSER] ERROR parsing Messages sheet: {e}")
-                    
-                    traceback.print_exc()
+                # Rows go from the sheet iterator straight into the batched writer,
+                # so the parsed messages are never held as one list.
+                saved_count, skipped_count = save_chat_messages(
+                    self.db, _counted_rows(self._iter_oxygen_messages_sheet(file_path, messages_sheet, file_id, engine), stats)
+                )
+                logger.info(f"[OXYGEN CHAT PARSER] Messages sheet: Parsed {stats['parsed']} messages from all platforms")
+                print(f"[OXYGEN CHAT PARSER] Messages sheet: Parsed {stats['parsed']} messages from all platforms")
             else:
                 logger.warning(f"[OXYGEN CHAT PARSER] Messages sheet not found! Will NOT parse from individual platform sheets.")
                 print(f"[OXYGEN CHAT PARSER] WARNING: Messages sheet not found!")
@@ -669,11 +674,11 @@ class ChatMessagesParserExtended:
                 print(f"[OXYGEN CHAT PARSER] Parser only accepts 'Messages' sheet. No data will be parsed.")
                 logger.warning(f"[OXYGEN CHAT PARSER] Skipping all individual platform sheets as per requirement - only 'Messages' sheet is allowed.")
             
-            logger.info(f"[OXYGEN CHAT PARSER] Total parsed messages: {len(results)}")
-            print(f"[OXYGEN CHAT PARSER] Total parsed messages: {len(results)}")
+            logger.info(f"[OXYGEN CHAT PARSER] Total parsed messages: {stats['parsed']}")
+            print(f"[OXYGEN CHAT PARSER] Total parsed messages: {stats['parsed']}")
             
-            if results:
-                sample_msg = results[0]
+            if stats["sample"]:
+                sample_msg = stats["sample"]
                 logger.info(f"[OXYGEN CHAT PARSER] Sample message data: platform={sample_msg.get('platform')}, "
                            f"sheet_name={sample_msg.get('sheet_name')}, "
                            f"message_id={sample_msg.get('message_id')}, "
@@ -700,31 +705,13 @@ class ChatMessagesParserExtended:
                 if potential_sheets:
                     print(f"[OXYGEN CHAT PARSER] Potential message-containing sheets: {', '.join(potential_sheets[:10])}")
             
-            saved_count = 0
-            skipped_count = 0
-            for msg in results:
-                existing = (
-                    self.db.query(ChatMessage)
-                    .filter(
-                        ChatMessage.file_id == msg["file_id"],
-                        ChatMessage.platform == msg["platform"],
-                        ChatMessage.message_id == msg["message_id"]
-                    )
-                    .first()
-                )
-                if not existing:
-                    self.db.add(ChatMessage(**msg))
-                    saved_count += 1
-                else:
-                    skipped_count += 1
-            
             self.db.commit()
             logger.info(f"[OXYGEN CHAT PARSER] Successfully saved {saved_count} chat messages to database (skipped {skipped_count} duplicates)")
             print(f"[OXYGEN CHAT PARSER] Successfully saved {saved_count} chat messages to database (skipped {skipped_count} duplicates)")
             
-            if saved_count == 0 and len(results) > 0:
-                logger.warning(f"[OXYGEN CHAT PARSER] All {len(results)} messages were duplicates or failed to save!")
-                print(f"[OXYGEN CHAT PARSER] WARNING: All {len(results)} messages were duplicates or failed to save!")
+            if saved_count == 0 and stats["parsed"] > 0:
+                logger.warning(f"[OXYGEN CHAT PARSER] All {stats['parsed']} messages were duplicates or failed to save!")
+                print(f"[OXYGEN CHAT PARSER] WARNING: All {stats['parsed']} messages were duplicates or failed to save!")
             
         except Exception as e:
             logger.error(f"[OXYGEN CHAT PARSER] Error parsing Oxygen chat messages: {e}", exc_info=True)
@@ -732,11 +719,9 @@ class ChatMessagesParserExtended:
             self.db.rollback()
             raise e
         
-        return results
+        return stats["parsed"]
 
-    def _parse_oxygen_messages_sheet(self, file_path: str, sheet_name: str, file_id: int, engine: str) -> List[Dict[str, Any]]:
-        results = []
-        
+    def _iter_oxygen_messages_sheet(self, file_path: str, sheet_name: str, file_id: int, engine: str) -> Iterator[Dict[str, Any]]:
         try:
             logger.debug(f"[OXYGEN MESSAGES PARSER] Reading sheet: {sheet_name}")
             print(f"[OXYGEN MESSAGES PARSER] Reading sheet: {sheet_name}")
@@ -1249,7 +1234,7 @@ class ChatMessagesParserExtended:
                     logger.debug(f"[OXYGEN MESSAGES PARSER] First {platform} message: message_id={message_data['message_id']}, "
                                f"from={message_data['from_name']}, text_preview={str(message_data['message_text'])[:50]}...")
                 
-                results.append(message_data)
+                yield message_data
                 processed_count += 1
             
             logger.info(f"[OXYGEN MESSAGES PARSER] Processed {processed_count} messages, skipped {skipped_count} rows")
@@ -1262,8 +1247,6 @@ class ChatMessagesParserExtended:
             print(f"[OXYGEN MESSAGES PARSER] Error parsing Messages sheet: {e}")
             
             traceback.print_exc()
-        
-        return results
 
 
     def _parse_oxygen_whatsapp_messages(self, file_path: str, sheet_name: str, file_id: int, engine: str) -> List[Dict[str, Any]]:
@@ -2322,8 +2305,11 @@ class ChatMessagesParserExtended:
         
         return results
 
-    def parse_axiom_chat_messages(self, file_path: str, file_id: int) -> List[Dict[str, Any]]:
-        results = []
+    def parse_axiom_chat_messages(self, file_path: str, file_id: int) -> int:
+        parsed_count = 0
+        saved_count = 0
+        skipped_count = 0
+        sample_msg = None
         
         try:
             logger.info(f"[CHAT PARSER] Starting to parse chat messages from file_id={file_id}, file_path={file_path}")
@@ -2332,104 +2318,36 @@ class ChatMessagesParserExtended:
             logger.info(f"[CHAT PARSER] Available sheets: {', '.join(xls.sheet_names[:10])}...")
             
             platform_counts = {}
+            tasks = []
             
-            if 'Telegram Messages - iOS' in xls.sheet_names:
-                logger.info(f"[CHAT PARSER] Found Telegram Messages - iOS sheet, parsing...")
-                telegram_results = self._parse_telegram_messages(file_path, 'Telegram Messages - iOS', file_id)
-                results.extend(telegram_results)
-                platform_counts['Telegram'] = platform_counts.get('Telegram', 0) + len(telegram_results)
-                logger.info(f"[CHAT PARSER] Telegram Messages - iOS: Parsed {len(telegram_results)} messages")
-            else:
-                logger.debug(f"[CHAT PARSER] Telegram Messages - iOS sheet not found")
-
-            if 'Telegram Messages - Android' in xls.sheet_names:
-                logger.info(f"[CHAT PARSER] Found Telegram Messages - Android sheet, parsing...")
-                telegram_android_results = self._parse_telegram_messages(file_path, 'Telegram Messages - Android', file_id)
-                results.extend(telegram_android_results)
-                platform_counts['Telegram'] = platform_counts.get('Telegram', 0) + len(telegram_android_results)
-                logger.info(f"[CHAT PARSER] Telegram Messages - Android: Parsed {len(telegram_android_results)} messages")
-            else:
-                logger.debug(f"[CHAT PARSER] Telegram Messages - Android sheet not found")
-            
-            if 'Instagram Direct Messages' in xls.sheet_names:
-                logger.info(f"[CHAT PARSER] Found Instagram Direct Messages sheet, parsing...")
-                instagram_results = self._parse_instagram_messages(file_path, 'Instagram Direct Messages', file_id)
-                results.extend(instagram_results)
-                platform_counts['Instagram'] = len(instagram_results)
-                logger.info(f"[CHAT PARSER] Instagram: Parsed {len(instagram_results)} messages")
-            else:
-                logger.warning(f"[CHAT PARSER] Instagram Direct Messages sheet not found")
-            
-            if 'TikTok Messages' in xls.sheet_names:
-                logger.info(f"[CHAT PARSER] Found TikTok Messages sheet, parsing...")
-                tiktok_results = self._parse_tiktok_messages(file_path, 'TikTok Messages', file_id)
-                results.extend(tiktok_results)
-                platform_counts['TikTok'] = len(tiktok_results)
-                logger.info(f"[CHAT PARSER] TikTok: Parsed {len(tiktok_results)} messages")
-            else:
-                logger.warning(f"[CHAT PARSER] TikTok Messages sheet not found")
-
-            if 'Twitter Direct Messages' in xls.sheet_names:
-                logger.info(f"[CHAT PARSER] Found Twitter Direct Messages sheet, parsing...")
-                twitter_results = self._parse_twitter_messages(file_path, 'Twitter Direct Messages', file_id)
-                results.extend(twitter_results)
-                platform_counts['Twitter/X'] = len(twitter_results)
-                logger.info(f"[CHAT PARSER] Twitter/X: Parsed {len(twitter_results)} messages")
-            else:
-                logger.warning(f"[CHAT PARSER] Twitter Direct Messages sheet not found")
-            
-            if 'Facebook Messenger Messages' in xls.sheet_names:
-                logger.info(f"[CHAT PARSER] Found Facebook Messenger Messages sheet, parsing...")
-                facebook_results = self._parse_facebook_messages(file_path, 'Facebook Messenger Messages', file_id)
-                results.extend(facebook_results)
-                platform_counts['Facebook'] = len(facebook_results)
-                logger.info(f"[CHAT PARSER] Facebook Messenger Messages: Parsed {len(facebook_results)} messages")
-            else:
-                logger.debug(f"[CHAT PARSER] Facebook Messenger Messages sheet not found")
-            
-            if 'WhatsApp Messages - Android' in xls.sheet_names:
-                logger.info(f"[CHAT PARSER] Found WhatsApp Messages - Android sheet, parsing...")
-                whatsapp_android_results = self._parse_whatsapp_messages(file_path, 'WhatsApp Messages - Android', file_id)
-                results.extend(whatsapp_android_results)
-                platform_counts['WhatsApp'] = platform_counts.get('WhatsApp', 0) + len(whatsapp_android_results)
-                logger.info(f"[CHAT PARSER] WhatsApp Messages - Android: Parsed {len(whatsapp_android_results)} messages")
-            else:
-                logger.debug(f"[CHAT PARSER] WhatsApp Messages - Android sheet not found")
-            
-            if 'WhatsApp Messages - iOS' in xls.sheet_names:
-                logger.info(f"[CHAT PARSER] Found WhatsApp Messages - iOS sheet, parsing...")
-                whatsapp_ios_results = self._parse_whatsapp_messages(file_path, 'WhatsApp Messages - iOS', file_id)
-                results.extend(whatsapp_ios_results)
-                platform_counts['WhatsApp'] = platform_counts.get('WhatsApp', 0) + len(whatsapp_ios_results)
-                logger.info(f"[CHAT PARSER] WhatsApp Messages - iOS: Parsed {len(whatsapp_ios_results)} messages")
-            else:
-                logger.debug(f"[CHAT PARSER] WhatsApp Messages - iOS sheet not found")
-            
-            if 'Android WhatsApp Messages' in xls.sheet_names:
-                logger.info(f"[CHAT PARSER] Found Android WhatsApp Messages sheet, parsing...")
-                android_whatsapp_results = self._parse_whatsapp_messages(file_path, 'Android WhatsApp Messages', file_id)
-                results.extend(android_whatsapp_results)
-                platform_counts['WhatsApp'] = platform_counts.get('WhatsApp', 0) + len(android_whatsapp_results)
-                logger.info(f"[CHAT PARSER] Android WhatsApp Messages: Parsed {len(android_whatsapp_results)} messages")
-            else:
-                logger.debug(f"[CHAT PARSER] Android WhatsApp Messages sheet not found")
-            
-            if 'iOS WhatsApp Messages' in xls.sheet_names:
-                logger.info(f"[CHAT PARSER] Found iOS WhatsApp Messages sheet, parsing...")
-                ios_whatsapp_results = self._parse_whatsapp_messages(file_path, 'iOS WhatsApp Messages', file_id)
-                results.extend(ios_whatsapp_results)
-                platform_counts['WhatsApp'] = platform_counts.get('WhatsApp', 0) + len(ios_whatsapp_results)
-                logger.info(f"[CHAT PARSER] iOS WhatsApp Messages: Parsed {len(ios_whatsapp_results)} messages")
-            else:
-                logger.debug(f"[CHAT PARSER] iOS WhatsApp Messages sheet not found")
-            
-            logger.info(f"[CHAT PARSER] Total parsed messages: {len(results)}")
+            for sheet_name, platform, method_name in AXIOM_CHAT_SHEETS:
+                if sheet_name not in xls.sheet_names:
+                    logger.debug(f"[CHAT PARSER] {sheet_name} sheet not found")
+                    continue
+                
+                logger.info(f"[CHAT PARSER] Found {sheet_name} sheet, parsing...")
+                if method_name:
+                    tasks.append(parser_task(type(self), method_name, file_path, sheet_name, file_id, label=platform))
+                else:
+                    tasks.append(mapping_task("Magnet Axiom", "chat_messages", file_path, sheet_name, file_id, label=platform))
+            
+            # Each batch is written as it arrives so only one batch of rows is held at a time.
+            for task, sheet_results in run_sheet_tasks(tasks):
+                if sample_msg is None and sheet_results:
+                    sample_msg = sheet_results[0]
+                sheet_saved, sheet_skipped = save_chat_messages(self.db, sheet_results)
+                parsed_count += len(sheet_results)
+                saved_count += sheet_saved
+                skipped_count += sheet_skipped
+                platform_counts[task.label] = platform_counts.get(task.label, 0) + len(sheet_results)
+                logger.info(f"[CHAT PARSER] {task.sheet_name}: Parsed batch of {len(sheet_results)} messages (saved {sheet_saved}, skipped {sheet_skipped} duplicates)")
+            
+            logger.info(f"[CHAT PARSER] Total parsed messages: {parsed_count}")
             if platform_counts:
                 platform_summary = ", ".join([f"{platform}: {count}" for platform, count in platform_counts.items()])
                 logger.info(f"[CHAT PARSER] Breakdown by platform: {platform_summary}")
 
-            if results:
-                sample_msg = results[0]
+            if sample_msg:
                 logger.debug(f"[CHAT PARSER] Sample message data: platform={sample_msg.get('platform')}, "
                            f"sheet_name={sample_msg.get('sheet_name')}, "
                            f"message_id={sample_msg.get('message_id')}, "
@@ -2437,24 +2355,6 @@ class ChatMessagesParserExtended:
                            f"to={sample_msg.get('to_name')}, "
                            f"timestamp={sample_msg.get('timestamp')}")
             
-            saved_count = 0
-            skipped_count = 0
-            for msg in results:
-                existing = (
-                    self.db.query(ChatMessage)
-                    .filter(
-                        ChatMessage.file_id == msg["file_id"],
-                        ChatMessage.platform == msg["platform"],
-                        ChatMessage.message_id == msg["message_id"]
-                    )
-                    .first()
-                )
-                if not existing:
-                    self.db.add(ChatMessage(**msg))
-                    saved_count += 1
-                else:
-                    skipped_count += 1
-            
             self.db.commit()
             logger.info(f"[CHAT PARSER] Successfully saved {saved_count} chat messages to database (skipped {skipped_count} duplicates)")
             print(f"Successfully saved {saved_count} chat messages to database (skipped {skipped_count} duplicates)")
@@ -2465,7 +2365,7 @@ class ChatMessagesParserExtended:
             self.db.rollback()
             raise e
         
-        return results
+        return parsed_count
 
     def _parse_telegram_messages(self, file_path: str, sheet_name: str, file_id: int) -> List[Dict[str, Any]]:
         results = []
@@ -2918,106 +2818,6 @@ class ChatMessagesParserExtended:
 
         return results
 
-    def _parse_twitter_messages(self, file_path: str, sheet_name: str, file_id: int) -> List[Dict[str, Any]]:
-        results = []
-        
-        try:
-            logger.debug(f"[TWITTER/X PARSER] Reading sheet: {sheet_name}")
-            df = pd.read_excel(file_path, sheet_name=sheet_name, engine='openpyxl', dtype=str)
-            total_rows = len(df)
-            logger.debug(f"[TWITTER/X PARSER] Sheet loaded: {total_rows} rows")
-            
-            processed_count = 0
-            skipped_count = 0
-            
-            for idx, row in df.iterrows():
-                message_text = str(row.get('Text', '')).strip() if self._not_na(row.get('Text')) else ''
-                
-                if not message_text:
-                    skipped_count += 1
-                    if skipped_count <= 5:
-                        logger.debug(f"[TWITTER/X PARSER] Row {idx} skipped: No message text")
-                    continue
-                
-                timestamp = ''
-                timestamp_columns = [
-                    'Sent/Received Date/Time - UTC+00:00 (dd/MM/yyyy)',
-                    'Message Date/Time - UTC+00:00 (dd/MM/yyyy)',
-                    'Created Date/Time - UTC+00:00 (dd/MM/yyyy)',
-                    'Timestamp',
-                    'Date/Time'
-                ]
-                for col in timestamp_columns:
-                    if col in df.columns:
-                        timestamp = str(row.get(col, '')).strip() if self._not_na(row.get(col)) else ''
-                        if timestamp:
-                            break
-                
-                sender_id = str(row.get('Sender ID', '')).strip() if self._not_na(row.get('Sender ID')) else ''
-                sender_name = str(row.get('Sender Name', '')).strip() if self._not_na(row.get('Sender Name')) else ''
-                
-                recipient_id = str(row.get('Recipient ID(s)', '')).strip() if self._not_na(row.get('Recipient ID(s)')) else ''
-                recipient_name = str(row.get('Recipient Name(s)', '')).strip() if self._not_na(row.get('Recipient Name(s)')) else ''
-                
-                direction_raw = str(row.get('Direction', '')).strip() if self._not_na(row.get('Direction')) else ''
-                direction = self._normalize_direction(direction_raw)
-                valid_directions = {"sent", "received"}
-                dir_clean = direction_raw.lower().strip()
-
-                if not dir_clean or dir_clean not in valid_directions:
-                    skipped_count += 1
-                    if skipped_count <= 5:
-                        logger.debug(f"[TWITTER/X PARSER] Row {idx} skipped: invalid direction -> '{direction_raw}'")
-                    continue
-                
-                thread_id = str(row.get('_ThreadID', '')).strip() if self._not_na(row.get('_ThreadID')) else ''
-                
-                chat_id = thread_id
-                if not chat_id:
-                    participants = sorted([p for p in [sender_id, recipient_id] if p])
-                    if len(participants) >= 2:
-                        chat_id = "_".join(participants)
-                        thread_id = chat_id
-                    elif participants:
-                        chat_id = participants[0]
-                        thread_id = chat_id
-                
-                item_id = str(row.get('Item ID', '')).strip() if self._not_na(row.get('Item ID')) else ''
-                message_id = item_id or f"twitter_{file_id}_{idx}"
-                
-                message_data = {
-                    "file_id": file_id,
-                    "platform": "X",
-                    "message_text": message_text,
-                    "from_name": sender_name,
-                    "sender_number": sender_id,
-                    "to_name": recipient_name,
-                    "recipient_number": recipient_id,
-                    "timestamp": timestamp,
-                    "thread_id": thread_id,
-                    "chat_id": chat_id,
-                    "message_id": message_id,
-                    "message_type": "text",
-                    "direction": direction,
-                    "source_tool": "Magnet Axiom",
-                    "sheet_name": sheet_name
-                }
-                
-                if processed_count == 0:
-                    logger.debug(f"[TWITTER/X PARSER] First message sample: message_id={message_data['message_id']}, "
-                               f"from={message_data['from_name']}, to={message_data['to_name']}")
-                
-                results.append(message_data)
-                processed_count += 1
-            
-            logger.info(f"[TWITTER/X PARSER] Total rows in sheet: {total_rows}, Processed: {processed_count}, Skipped: {skipped_count}")
-        
-        except Exception as e:
-            logger.error(f"[TWITTER/X PARSER] Error parsing Twitter messages from {sheet_name}: {e}", exc_info=True)
-            print(f"Error parsing Twitter messages: {e}")
-        
-        return results
-
     def _parse_facebook_messages(self, file_path: str, sheet_name: str, file_id: int) -> List[Dict[str, Any]]:
         results = []
         
@@ -0,0 +1,152 @@
+from typing import List, Dict, Any, Iterable, Optional, Set, Tuple
+from sqlalchemy import event, insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from app.analytics.device_management.models import ChatMessage, SocialMedia
+import logging
+
+logger = logging.getLogger(__name__)
+
+CHAT_MESSAGE_UNIQUE_CONSTRAINT = "uq_chat_messages_file_platform_message"
+CHAT_MESSAGE_KEY_COLUMNS = ("file_id", "platform", "message_id")
+
+SOCIAL_MEDIA_ID_COLUMNS = ("instagram_id", "facebook_id", "whatsapp_id", "telegram_id", "X_id", "tiktok_id")
+SOCIAL_MEDIA_KEY_COLUMNS = SOCIAL_MEDIA_ID_COLUMNS + ("account_name",)
+
+_SOCIAL_MEDIA_INDEX_KEY = "social_media_index"
+
+
+def _chat_message_insert(db: Session):
+    # RETURNING only yields the rows that were actually written, so rows dropped by
+    # ON CONFLICT DO NOTHING are counted as skipped rather than saved.
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        statement = pg_insert(ChatMessage).on_conflict_do_nothing(constraint=CHAT_MESSAGE_UNIQUE_CONSTRAINT)
+    elif dialect == "sqlite":
+        statement = sqlite_insert(ChatMessage).on_conflict_do_nothing(index_elements=list(CHAT_MESSAGE_KEY_COLUMNS))
+    else:
+        statement = insert(ChatMessage)
+    return statement.returning(ChatMessage.id)
+
+
+def _insert_chat_messages(db: Session, statement, batch: List[Dict[str, Any]]) -> int:
+    return len(db.execute(statement, batch).all())
+
+
+def load_existing_chat_message_keys(db: Session, file_id: int) -> Set[Tuple[str, str]]:
+    rows = (
+        db.query(ChatMessage.platform, ChatMessage.message_id)
+        .filter(ChatMessage.file_id == file_id, ChatMessage.message_id.isnot(None))
+        .all()
+    )
+    return {(platform, message_id) for platform, message_id in rows}
+
+
+def save_chat_messages(db: Session, messages: Iterable[Dict[str, Any]], batch_size: int = 1000) -> Tuple[int, int]:
+    existing_by_file: Dict[int, Set[Tuple[str, str]]] = {}
+    saved_count = 0
+    skipped_count = 0
+    batch: List[Dict[str, Any]] = []
+    statement = _chat_message_insert(db)
+
+    for msg in messages:
+        file_id = msg.get("file_id")
+        if file_id not in existing_by_file:
+            existing_by_file[file_id] = load_existing_chat_message_keys(db, file_id)
+
+        message_id = msg.get("message_id")
+        if message_id is not None:
+            key = (msg.get("platform"), message_id)
+            seen = existing_by_file[file_id]
+            if key in seen:
+                skipped_count += 1
+                continue
+            seen.add(key)
+
+        batch.append(msg)
+        if len(batch) >= batch_size:
+            inserted = _insert_chat_messages(db, statement, batch)
+            saved_count += inserted
+            skipped_count += len(batch) - inserted
+            batch = []
+
+    if batch:
+        inserted = _insert_chat_messages(db, statement, batch)
+        saved_count += inserted
+        skipped_count += len(batch) - inserted
+
+    return saved_count, skipped_count
+
+
+class SocialMediaIndex:
+    # Key values of the social media rows of one file. Rows added in the current
+    # transaction are held as pending and only become part of the index once the
+    # session commits; a rollback discards them.
+
+    def __init__(self, file_id: int):
+        self.file_id = file_id
+        self._values: Dict[str, Set[str]] = {column: set() for column in SOCIAL_MEDIA_KEY_COLUMNS}
+        self._pending: Dict[str, Set[str]] = {column: set() for column in SOCIAL_MEDIA_KEY_COLUMNS}
+
+    @classmethod
+    def load(cls, db: Session, file_id: int) -> "SocialMediaIndex":
+        index = cls(file_id)
+        columns = [getattr(SocialMedia, column) for column in SOCIAL_MEDIA_KEY_COLUMNS]
+        with db.no_autoflush:
+            for row in db.query(*columns).filter(SocialMedia.file_id == file_id).yield_per(5000):
+                _add_values(index._values, dict(zip(SOCIAL_MEDIA_KEY_COLUMNS, row)))
+        return index
+
+    def add(self, acc: Dict[str, Any]) -> None:
+        _add_values(self._pending, acc)
+
+    def find(self, acc: Dict[str, Any], columns: Iterable[str]) -> Optional[str]:
+        for column in columns:
+            value = acc.get(column)
+            if value and (value in self._values[column] or value in self._pending[column]):
+                return column
+        return None
+
+    def commit(self) -> None:
+        for column, values in self._pending.items():
+            self._values[column].update(values)
+            values.clear()
+
+    def rollback(self) -> None:
+        for values in self._pending.values():
+            values.clear()
+
+
+def _add_values(target: Dict[str, Set[str]], acc: Dict[str, Any]) -> None:
+    for column in SOCIAL_MEDIA_KEY_COLUMNS:
+        value = acc.get(column)
+        if value:
+            target[column].add(value)
+
+
+def social_media_index(db: Session, file_id: int) -> SocialMediaIndex:
+    index = db.info.get(_SOCIAL_MEDIA_INDEX_KEY)
+    if index is None or index.file_id != file_id:
+        if _SOCIAL_MEDIA_INDEX_KEY not in db.info:
+            event.listen(db, "after_commit", _commit_social_media_index)
+            event.listen(db, "after_rollback", _rollback_social_media_index)
+        index = SocialMediaIndex.load(db, file_id)
+        db.info[_SOCIAL_MEDIA_INDEX_KEY] = index
+    return index
+
+
+def mark_social_media_saved(db: Session, acc: Dict[str, Any]) -> None:
+    # Call after the row has been added to the session; it counts as existing for the
+    # rest of the transaction and stays in the index only if the transaction commits.
+    index = db.info.get(_SOCIAL_MEDIA_INDEX_KEY)
+    if index is not None and index.file_id == acc.get("file_id"):
+        index.add(acc)
+
+
+def _commit_social_media_index(session: Session) -> None:
+    session.info[_SOCIAL_MEDIA_INDEX_KEY].commit()
+
+
+def _rollback_social_media_index(session: Session) -> None:
+    session.info[_SOCIAL_MEDIA_INDEX_KEY].rollback()
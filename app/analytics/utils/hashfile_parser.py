@@ -1,7 +1,7 @@
 import pandas as pd
 import warnings
 from pathlib import Path
-from typing import List, Dict, Any, Optional, TYPE_CHECKING
+from typing import List, Dict, Any, Optional, Set, TYPE_CHECKING
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from app.analytics.device_management.models import HashFile
@@ -100,6 +100,46 @@ def safe_datetime(value) -> Optional[datetime]:
     return None
 
 
+class HashFileBatchWriter:
+    # Rows are flushed every flush_size records but only committed by finish(), so a
+    # failure part way through rolls back the whole file instead of leaving a
+    # partial import behind.
+    def __init__(self, parser: "HashFileParser", file_id: int, upload_id: str = None, progress_callback = None, flush_size: int = 10000):
+        self.parser = parser
+        self.file_id = file_id
+        self.upload_id = upload_id
+        self.progress_callback = progress_callback
+        self.flush_size = flush_size
+        self.existing_md5s = parser._load_existing_md5s(file_id)
+        self.pending: List[Dict[str, Any]] = []
+        self.parsed_count = 0
+        self.inserted_count = 0
+
+    def append(self, record: Dict[str, Any]) -> None:
+        self.pending.append(record)
+        self.parsed_count += 1
+        if len(self.pending) >= self.flush_size:
+            self.flush()
+
+    def flush(self) -> int:
+        if self.pending:
+            self.inserted_count += self.parser._bulk_insert_ultrafast(
+                self.pending, self.file_id, self.upload_id, self.progress_callback,
+                self.parsed_count, existing_md5s=self.existing_md5s,
+                inserted_before=self.inserted_count, commit=False
+            )
+            self.pending = []
+        return self.inserted_count
+
+    def finish(self) -> int:
+        self.flush()
+        self.parser.db.commit()
+        return self.inserted_count
+
+    def __len__(self) -> int:
+        return self.parsed_count
+
+
 class HashFileParser:
     def __init__(self, db: Session):
         self.db = db
@@ -187,16 +227,20 @@ class HashFileParser:
                 "modified_at_original": None
             }
 
-    def _bulk_insert_ultrafast(self, data: List[Dict[str, Any]], file_id: int, upload_id: str = None, progress_callback = None, total_records: int = 0):
-        if not data:
-            return 0
-
-        existing_md5s = set(
+    def _load_existing_md5s(self, file_id: int) -> Set[str]:
+        return set(
             h[0] for h in self.db.query(HashFile.md5_hash)
             .filter(HashFile.file_id == file_id, HashFile.md5_hash.isnot(None))
             .all()
         )
 
+    def _bulk_insert_ultrafast(self, data: List[Dict[str, Any]], file_id: int, upload_id: str = None, progress_callback = None, total_records: int = 0, existing_md5s: Optional[Set[str]] = None, inserted_before: int = 0, commit: bool = True):
+        if not data:
+            return 0
+
+        if existing_md5s is None:
+            existing_md5s = self._load_existing_md5s(file_id)
+
         records = [d for d in data if d.get("md5_hash") not in existing_md5s]
         if not records:
             print("No new hashfiles to insert (all duplicates).")
@@ -247,7 +291,11 @@ class HashFileParser:
             for batch_idx in range(0, len(records), batch_size):
                 batch = records[batch_idx:batch_idx + batch_size]
                 
-                if engine and hasattr(engine, 'connect'):
+                if not commit:
+                    # Stays in the session's transaction; the caller commits once at the end.
+                    self.db.execute(insert_query, batch)
+                    inserted += len(batch)
+                elif engine and hasattr(engine, 'connect'):
                     with engine.connect() as conn:
                         trans = conn.begin()
                         try:
@@ -261,15 +309,22 @@ class HashFileParser:
                     self.db.execute(insert_query, batch)
                     inserted += len(batch)
                 
-                self.db.commit()
+                if commit:
+                    self.db.commit()
                 
                 if progress_callback and upload_id:
                     current_batch = (batch_idx // batch_size) + 1
-                    progress_percent = 97.5 + (current_batch / total_batches) * 1.5
+                    done = inserted_before + inserted
+                    if total_records:
+                        progress_percent = 97.5 + min(done / total_records, 1.0) * 1.5
+                        message = f"Inserting hashfiles ({done:,} of {total_records:,} records)..."
+                    else:
+                        progress_percent = 97.5 + (current_batch / total_batches) * 1.5
+                        message = f"Inserting hashfiles batch {current_batch}/{total_batches} ({done:,} records inserted)..."
                     progress_callback(upload_id, {
-                        "message": f"Inserting hashfiles batch {current_batch}/{total_batches} ({inserted:,} records inserted)...",
+                        "message": message,
                         "percent": min(progress_percent, 99.0),
-                        "amount_of_data": inserted
+                        "amount_of_data": done
                     })
                 
                 print(f"Inserted batch {batch_idx // batch_size + 1}/{total_batches}: {len(batch)} records (Total: {inserted:,})")
@@ -295,7 +350,6 @@ class HashFileParser:
             raise ValueError(f"Unsupported tool: {tools}. Supported tools: Magnet Axiom, Cellebrite, Oxygen, Encase")
 
     def parse_axiom_hashfile(self, file_path: str, file_id: int, original_file_path: str = None, upload_id: str = None, progress_callback = None):
-        results = []
         try:
             file_type = self._get_file_type_from_extension(file_path)
             
@@ -387,9 +441,8 @@ class HashFileParser:
                     })
                     
                     if len(batch_results) >= batch_size:
-                        inserted = self._bulk_insert_ultrafast(batch_results, file_id, upload_id, progress_callback, total_rows)
+                        inserted = self._bulk_insert_ultrafast(batch_results, file_id, upload_id, progress_callback, total_rows, inserted_before=total_inserted)
                         total_inserted += inserted
-                        results.extend(batch_results)
                         batch_results = []
                         
                         if progress_callback and upload_id:
@@ -401,9 +454,8 @@ class HashFileParser:
                             })
                 
                 if batch_results:
-                    inserted = self._bulk_insert_ultrafast(batch_results, file_id, upload_id, progress_callback, total_rows)
+                    inserted = self._bulk_insert_ultrafast(batch_results, file_id, upload_id, progress_callback, total_rows, inserted_before=total_inserted)
                     total_inserted += inserted
-                    results.extend(batch_results)
                     batch_results = []
 
             inserted_count = total_inserted
@@ -425,8 +477,8 @@ class HashFileParser:
             raise ValueError("Upload hash data not found in file")
 
     def parse_cellebrite_hashfile(self, file_path: str, file_id: int, original_file_path: str = None, upload_id: str = None, progress_callback = None):
-        results = []
         try:
+            results = HashFileBatchWriter(self, file_id, upload_id, progress_callback)
             file_type = self._get_file_type_from_extension(file_path)
             
             xls = pd.ExcelFile(file_path, engine='openpyxl')
@@ -710,7 +762,7 @@ class HashFileParser:
                 print(error_msg)
                 raise ValueError("Upload hash data not found in file")
 
-            inserted_count = self._bulk_insert_ultrafast(results, file_id, upload_id, progress_callback, len(results))
+            inserted_count = results.finish()
             print(f"Successfully saved {inserted_count} Cellebrite hashfiles to database")
             return inserted_count
 
@@ -720,8 +772,8 @@ class HashFileParser:
             raise e
 
     def parse_oxygen_hashfile(self, file_path: str, file_id: int, original_file_path: str = None, upload_id: str = None, progress_callback = None):
-        results = []
         try:
+            results = HashFileBatchWriter(self, file_id, upload_id, progress_callback)
             file_type = self._get_file_type_from_extension(file_path)
             
             file_path_obj = Path(file_path)
@@ -794,7 +846,7 @@ class HashFileParser:
                 print(f"[OXYGEN HASHFILE] No valid hashfile data found after parsing.")
                 raise ValueError("Upload hash data not found in file")
 
-            inserted_count = self._bulk_insert_ultrafast(results, file_id, upload_id, progress_callback, len(results))
+            inserted_count = results.finish()
             print(f"Successfully saved {inserted_count} Oxygen hashfiles to database")
             return inserted_count
 
@@ -808,8 +860,8 @@ class HashFileParser:
             raise ValueError("Upload hash data not found in file")
 
     def parse_encase_hashfile(self, file_path: str, file_id: int, original_file_path: str = None, upload_id: str = None, progress_callback = None):
-        results = []
         try:
+            results = HashFileBatchWriter(self, file_id, upload_id, progress_callback)
             file_type = self._get_file_type_from_extension(file_path)
             
             file_extension = Path(file_path).suffix.lower()
@@ -955,7 +1007,7 @@ class HashFileParser:
                 print(f"[ENCASE HASHFILE] No valid hashfile data found after parsing.")
                 raise ValueError("Upload hash data not found in file")
 
-            inserted_count = self._bulk_insert_ultrafast(results, file_id, upload_id, progress_callback, len(results))
+            inserted_count = results.finish()
             print(f"Successfully saved {inserted_count} EnCase hashfiles to database")
             return inserted_count
 
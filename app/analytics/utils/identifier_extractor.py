@@ -0,0 +1,187 @@
+from functools import lru_cache
+from typing import Optional, NamedTuple
+import re
+
+_FLAGS = re.IGNORECASE
+
+PLATFORM_ID_PATTERNS = {
+    "instagram_id": re.compile(r"Instagram\s+ID[:\s]*(\d+)", _FLAGS),
+    "facebook_id": re.compile(r"Facebook\s+ID[:\s]*(\d+)", _FLAGS),
+    "whatsapp_id": re.compile(r"WhatsApp\s+ID[:\s]*([\+\d\s\-\(\)]+)|Phone\s+number[:\s]*([\+\d\s\-\(\)]+)", _FLAGS),
+    "telegram_id": re.compile(r"Telegram\s+ID[:\s]*(\d+)", _FLAGS),
+    "x_id": re.compile(r"(?:X|Twitter)\s+ID[:\s]*(\d+)", _FLAGS),
+    "tiktok_id": re.compile(r"TikTok\s+ID[:\s]*(\d+)", _FLAGS),
+}
+
+PLATFORM_FIELDS = {
+    "instagram": "instagram_id",
+    "facebook": "facebook_id",
+    "whatsapp": "whatsapp_id",
+    "telegram": "telegram_id",
+    "x": "x_id",
+    "twitter": "x_id",
+    "tiktok": "tiktok_id",
+}
+
+NICKNAME_RE = re.compile(r"Nickname[:\s]+([^\n]+)", _FLAGS)
+LOCATION_RE = re.compile(r"Location[:\s]+([^\n]+)", _FLAGS)
+PHONE_LABEL_RE = re.compile(r"Phone\s+number[:\s]+([\+\d\s\-\(\)@\.]+)", _FLAGS)
+PHONE_TYPE_RE = re.compile(r"(?:Home|Mobile|Work|Cell|Phone|Office)[:\s]+([\+\d\s\-\(\)]+)", _FLAGS)
+WHATSAPP_ID_RE = re.compile(r"WhatsApp\s+ID[:\s]+([^\n\r]+)", _FLAGS)
+TELEGRAM_ID_RE = re.compile(r"Telegram\s+ID[:\s]+(\d+)", _FLAGS)
+TELEGRAM_USERNAME_RE = re.compile(r"(?:Telegram|Username)[:\s]+@?([a-zA-Z0-9_]+)", _FLAGS)
+TIKTOK_ID_RE = re.compile(r"TikTok\s+(?:ID|Username)[:\s]+@?([a-zA-Z0-9_\.]+)", _FLAGS)
+TIKTOK_USERNAME_RE = re.compile(r"TikTok[:\s]+@?([a-zA-Z0-9_\.]+)", _FLAGS)
+X_ID_RE = re.compile(r"(?:Twitter|X)\s+ID[:\s]+([a-zA-Z0-9_]+)", _FLAGS)
+X_USERNAME_RE = re.compile(r"(?:Twitter|X)[:\s]+@?([a-zA-Z0-9_]+)", _FLAGS)
+FACEBOOK_ID_RE = re.compile(r"Facebook\s+ID[:\s]+(\d+)", _FLAGS)
+FACEBOOK_USERNAME_RE = re.compile(r"Facebook[:\s]+(?:profile/)?([a-zA-Z0-9_\.]+)", _FLAGS)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_NON_DIGIT_RE = re.compile(r"[^\d]")
+_LEADING_NON_DIGIT_RE = re.compile(r"^[^\d]+")
+_TRAILING_NON_DIGIT_RE = re.compile(r"[^\d]+$")
+
+_PHONE_TYPE_LABELS = ("home", "mobile", "work", "cell", "phone", "office")
+
+
+class Identifiers(NamedTuple):
+    instagram_id: Optional[str] = None
+    facebook_id: Optional[str] = None
+    whatsapp_id: Optional[str] = None
+    telegram_id: Optional[str] = None
+    x_id: Optional[str] = None
+    tiktok_id: Optional[str] = None
+    whatsapp_account: Optional[str] = None
+    telegram_account: Optional[str] = None
+    tiktok_account: Optional[str] = None
+    x_account: Optional[str] = None
+    facebook_account: Optional[str] = None
+    nickname: Optional[str] = None
+    location: Optional[str] = None
+    phone_number: Optional[str] = None
+
+
+EMPTY_IDENTIFIERS = Identifiers()
+
+
+def _first_group(pattern: re.Pattern, text: str) -> Optional[str]:
+    match = pattern.search(text)
+    if match:
+        for group in match.groups():
+            if group:
+                return group.strip()
+    return None
+
+
+def _normalize_phone(raw: str) -> Optional[str]:
+    phone = raw.strip().replace('@s.whatsapp.net', '')
+    phone = _WHITESPACE_RE.sub('', phone)
+    if phone.startswith('+'):
+        phone = '+' + _NON_DIGIT_RE.sub('', phone[1:])
+    else:
+        phone = _NON_DIGIT_RE.sub('', phone)
+    if phone and len(phone) >= 8 and phone not in ['0', '+0']:
+        return phone
+    return None
+
+
+def _strip_to_digits(value: str) -> str:
+    value = _LEADING_NON_DIGIT_RE.sub('', value)
+    value = _TRAILING_NON_DIGIT_RE.sub('', value)
+    if value and value.isdigit() and len(value) >= 11 and value.startswith('8'):
+        value = value[1:]
+    return value
+
+
+def _phone_number(text: str, lower: str) -> Optional[str]:
+    if "phone" in lower:
+        match = PHONE_LABEL_RE.search(text)
+        if match:
+            phone = _normalize_phone(match.group(1))
+            if phone:
+                return phone
+
+    if any(label in lower for label in _PHONE_TYPE_LABELS):
+        match = PHONE_TYPE_RE.search(text)
+        if match:
+            return _normalize_phone(match.group(1))
+    return None
+
+
+def _whatsapp_account(text: str) -> Optional[str]:
+    match = WHATSAPP_ID_RE.search(text)
+    if not match:
+        return None
+
+    raw = match.group(1).strip()
+    if '@s.whatsapp.net' in raw:
+        number = _strip_to_digits(raw.split('@s.whatsapp.net')[0].strip())
+        if number and number.isdigit() and len(number) >= 8:
+            return f"{number}@s.whatsapp.net"
+        return None
+
+    number = _strip_to_digits(raw)
+    if number and number.isdigit() and len(number) >= 8:
+        return number
+    return None
+
+
+def _labelled_or_username(id_pattern: re.Pattern, username_pattern: re.Pattern, text: str, digits_only: bool = False) -> Optional[str]:
+    match = id_pattern.search(text)
+    if match:
+        value = match.group(1).strip()
+        if value and (not digits_only or value.isdigit()):
+            return value
+
+    match = username_pattern.search(text)
+    if match:
+        value = match.group(1).strip()
+        if value:
+            return value
+    return None
+
+
+@lru_cache(maxsize=65536)
+def extract_identifiers(text: str) -> Identifiers:
+    if not text:
+        return EMPTY_IDENTIFIERS
+
+    lower = text.lower()
+    has_instagram = "instagram" in lower
+    has_facebook = "facebook" in lower
+    has_whatsapp = "whatsapp" in lower
+    has_telegram = "telegram" in lower
+    has_tiktok = "tiktok" in lower
+    has_x = "x" in lower or "twitter" in lower
+
+    return Identifiers(
+        instagram_id=_first_group(PLATFORM_ID_PATTERNS["instagram_id"], text) if has_instagram else None,
+        facebook_id=_first_group(PLATFORM_ID_PATTERNS["facebook_id"], text) if has_facebook else None,
+        whatsapp_id=_first_group(PLATFORM_ID_PATTERNS["whatsapp_id"], text) if has_whatsapp or "phone" in lower else None,
+        telegram_id=_first_group(PLATFORM_ID_PATTERNS["telegram_id"], text) if has_telegram else None,
+        x_id=_first_group(PLATFORM_ID_PATTERNS["x_id"], text) if has_x else None,
+        tiktok_id=_first_group(PLATFORM_ID_PATTERNS["tiktok_id"], text) if has_tiktok else None,
+        whatsapp_account=_whatsapp_account(text) if has_whatsapp else None,
+        telegram_account=_labelled_or_username(TELEGRAM_ID_RE, TELEGRAM_USERNAME_RE, text, digits_only=True) if has_telegram or "username" in lower else None,
+        tiktok_account=_labelled_or_username(TIKTOK_ID_RE, TIKTOK_USERNAME_RE, text) if has_tiktok else None,
+        x_account=_labelled_or_username(X_ID_RE, X_USERNAME_RE, text) if has_x else None,
+        facebook_account=_labelled_or_username(FACEBOOK_ID_RE, FACEBOOK_USERNAME_RE, text, digits_only=True) if has_facebook else None,
+        nickname=_first_group(NICKNAME_RE, text) if "nickname" in lower else None,
+        location=_first_group(LOCATION_RE, text) if "location" in lower else None,
+        phone_number=_phone_number(text, lower),
+    )
+
+
+def identifiers_for(value) -> Identifiers:
+    if not value:
+        return EMPTY_IDENTIFIERS
+    return extract_identifiers(str(value))
+
+
+def extract_platform_id(text, platform: str) -> Optional[str]:
+    field = PLATFORM_FIELDS.get(platform.lower())
+    if field is None:
+        return None
+    return getattr(identifiers_for(text), field)
+
@@ -0,0 +1,156 @@
+from typing import Any, Dict, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from app.core.config import settings
+import hashlib, json, logging, os, threading, requests
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class MobSFError(RuntimeError):
+    pass
+
+
+def get_mobsf_api_key() -> str:
+    secret_path = os.path.expanduser("~/.MobSF/secret")
+    if not os.path.exists(secret_path):
+        raise FileNotFoundError("File ~/.MobSF/secret tidak ditemukan.")
+    with open(secret_path, "r") as f:
+        secret = f.read().strip()
+    print("[*] MobSF secret loaded successfully.")
+    return hashlib.sha256(secret.encode()).hexdigest()
+
+
+def file_sha256(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class MobSFClient:
+    # One pooled session for all MobSF calls. Reports are cached on disk by the APK's
+    # SHA-256, so a binary that was already scanned never gets uploaded again.
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        cache_dir: Optional[str] = None,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        pool_size: Optional[int] = None,
+    ):
+        self.base_url = (base_url or settings.MOBSF_URL).rstrip("/")
+        self.cache_dir = cache_dir or settings.MOBSF_CACHE_DIR
+        self.timeout = (
+            connect_timeout or settings.MOBSF_CONNECT_TIMEOUT,
+            read_timeout or settings.MOBSF_READ_TIMEOUT,
+        )
+        self._api_key = api_key
+        self._lock = threading.Lock()
+        self._hash_locks: Dict[str, threading.Lock] = {}
+
+        pool_size = pool_size or settings.MOBSF_POOL_SIZE
+        # Only connection failures are retried; a scan that timed out is not resubmitted.
+        retry = Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.5, allowed_methods=None)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    @property
+    def api_key(self) -> str:
+        if self._api_key is None:
+            self._api_key = get_mobsf_api_key()
+        return self._api_key
+
+    def _post(self, endpoint: str, label: str, **kwargs) -> Dict[str, Any]:
+        url = f"{self.base_url}/api/v1/{endpoint}"
+        try:
+            resp = self.session.post(url, headers={"Authorization": self.api_key}, timeout=self.timeout, **kwargs)
+        except requests.RequestException as e:
+            raise MobSFError(f"{label} gagal: {e}") from e
+
+        print(f"    → {label} response: {resp.status_code}")
+        if resp.status_code != 200:
+            raise MobSFError(f"{label} gagal: {resp.text[:500]}")
+        try:
+            return resp.json()
+        except ValueError as e:
+            raise MobSFError(f"{label} gagal: invalid JSON response") from e
+
+    def upload(self, file_path: str) -> str:
+        with open(file_path, "rb") as f:
+            files = {"file": (os.path.basename(file_path), f, "application/octet-stream")}
+            data = self._post("upload", "Upload", files=files)
+        scan_hash = data.get("hash")
+        if not scan_hash:
+            raise MobSFError("Tidak dapat membaca hash dari response upload")
+        return scan_hash
+
+    def scan(self, scan_hash: str) -> Dict[str, Any]:
+        return self._post("scan", "Scan", data={"hash": scan_hash})
+
+    def report_json(self, scan_hash: str) -> Dict[str, Any]:
+        return self._post("report_json", "Report JSON", data={"hash": scan_hash})
+
+    def _cache_path(self, sha256: str) -> str:
+        return os.path.join(self.cache_dir, f"{sha256}.json")
+
+    def cached_report(self, sha256: str) -> Optional[Dict[str, Any]]:
+        path = self._cache_path(sha256)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"[MOBSF] Ignoring unreadable cached report {sha256}: {e}")
+            return None
+
+    def _store_report(self, sha256: str, report: Dict[str, Any]) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._cache_path(sha256)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(report, f)
+        os.replace(tmp_path, path)
+
+    def _hash_lock(self, sha256: str) -> threading.Lock:
+        with self._lock:
+            return self._hash_locks.setdefault(sha256, threading.Lock())
+
+    def get_report(self, file_path: str) -> Dict[str, Any]:
+        sha256 = file_sha256(file_path)
+        # The same APK submitted twice at once is scanned only once; the second caller
+        # waits and then reads the cached report.
+        with self._hash_lock(sha256):
+            report = self.cached_report(sha256)
+            if report is not None:
+                print(f"[*] Using cached MobSF report for {sha256[:12]}")
+                return report
+
+            print("[*] Uploading to MobSF...")
+            scan_hash = self.upload(file_path)
+            print("[*] Starting MobSF scan...")
+            self.scan(scan_hash)
+            print("[*] Fetching MobSF JSON report...")
+            report = self.report_json(scan_hash)
+
+            self._store_report(sha256, report)
+            return report
+
+
+_client: Optional[MobSFClient] = None
+_client_lock = threading.Lock()
+
+
+def get_mobsf_client() -> MobSFClient:
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = MobSFClient()
+        return _client
@@ -0,0 +1,244 @@
+from concurrent.futures import ProcessPoolExecutor, Future
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+from app.core.config import settings
+from app.analytics.utils.report_jobs import report_progress
+from app.utils.pdf_resources import paragraph_style
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+from reportlab.platypus import SimpleDocTemplate, Paragraph
+from pypdf import PdfReader, PdfWriter
+import io, logging, multiprocessing, os, shutil, tempfile, threading, time
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+class PdfSegment(NamedTuple):
+    builder: Callable[..., List[Any]]
+    args: Tuple[Any, ...]
+
+
+def draw_page_footer(canvas_obj, footer_text: str, current_page: int, total_pages: int) -> None:
+    canvas_obj.setFont("Helvetica", 10)
+    canvas_obj.setFillColor(colors.HexColor("#333333"))
+
+    canvas_obj.setStrokeColor(colors.HexColor("#466086"))
+    canvas_obj.setLineWidth(1.5)
+    canvas_obj.line(30, 40, 569, 40)
+
+    padding_y = 25
+
+    footer_style = paragraph_style(
+        "FooterStyle",
+        fontName="Helvetica",
+        fontSize=10,
+        leading=12,
+        textColor=colors.HexColor("#333333"),
+        wordWrap="CJK",
+    )
+
+    para = Paragraph(footer_text, footer_style)
+
+    max_width = 480
+    w, h = para.wrap(max_width, 100)
+
+    para.drawOn(canvas_obj, 30, padding_y - (h - 10))
+
+    page_label = f"Page {current_page} of {total_pages}"
+    canvas_obj.drawRightString(575, padding_y, page_label)
+
+
+def _render_segment(segment: PdfSegment, file_path: str, doc_kwargs: Dict[str, Any], on_page: Optional[Callable]) -> str:
+    story = segment.builder(*segment.args)
+    doc = SimpleDocTemplate(file_path, pagesize=A4, **doc_kwargs)
+    if on_page is not None:
+        doc.build(story, onFirstPage=on_page, onLaterPages=on_page)
+    else:
+        doc.build(story)
+    return file_path
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.PDF_RENDER_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def _reset_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def shutdown_pdf_pool() -> None:
+    _reset_pool()
+
+
+def _segment_rendered(done: int, total: int) -> None:
+    # Segment rendering covers 60-95% of a report job's progress.
+    report_progress(message=f"Rendering PDF (segment {done} of {total})...", progress=60 + 35 * done // total)
+
+
+def _render_inline(segments: List[PdfSegment], paths: List[str], doc_kwargs: Dict[str, Any], on_page: Optional[Callable], start: int = 0) -> None:
+    for index in range(start, len(segments)):
+        _render_segment(segments[index], paths[index], doc_kwargs, on_page)
+        _segment_rendered(index + 1, len(segments))
+
+
+def _render_all(segments: List[PdfSegment], paths: List[str], doc_kwargs: Dict[str, Any], on_page: Optional[Callable]) -> None:
+    if len(segments) < 2 or settings.PDF_RENDER_WORKERS <= 1:
+        _render_inline(segments, paths, doc_kwargs, on_page)
+        return
+
+    try:
+        pool = _get_pool()
+        futures: List[Future] = [
+            pool.submit(_render_segment, segment, path, doc_kwargs, on_page)
+            for segment, path in zip(segments, paths)
+        ]
+    except (BrokenProcessPool, RuntimeError, OSError) as e:
+        logger.warning(f"[PDF SEGMENTS] Process pool unavailable, rendering {len(segments)} segments sequentially: {e}")
+        _reset_pool()
+        _render_inline(segments, paths, doc_kwargs, on_page)
+        return
+
+    for index, future in enumerate(futures):
+        try:
+            future.result()
+        except BrokenProcessPool as e:
+            logger.warning(f"[PDF SEGMENTS] Worker pool broke on segment {index + 1}, finishing sequentially: {e}")
+            _reset_pool()
+            _render_inline(segments, paths, doc_kwargs, on_page, start=index)
+            return
+        _segment_rendered(index + 1, len(segments))
+
+
+def map_in_pdf_pool(func: Callable[..., Any], args_list: List[Tuple[Any, ...]]) -> List[Any]:
+    # Returns func(*args) for each args in order, computed across the PDF pool. Layout
+    # measurements use it; errors raised by func propagate to the caller.
+    if len(args_list) < 2 or settings.PDF_RENDER_WORKERS <= 1:
+        return [func(*args) for args in args_list]
+
+    try:
+        pool = _get_pool()
+        futures: List[Future] = [pool.submit(func, *args) for args in args_list]
+    except (BrokenProcessPool, RuntimeError, OSError) as e:
+        logger.warning(f"[PDF SEGMENTS] Process pool unavailable, running {len(args_list)} tasks sequentially: {e}")
+        _reset_pool()
+        return [func(*args) for args in args_list]
+
+    results: List[Any] = []
+    for index, future in enumerate(futures):
+        try:
+            results.append(future.result())
+        except BrokenProcessPool as e:
+            logger.warning(f"[PDF SEGMENTS] Worker pool broke on task {index + 1}, finishing sequentially: {e}")
+            _reset_pool()
+            results.extend(func(*args) for args in args_list[index:])
+            break
+    return results
+
+
+def render_documents(jobs: List[Tuple[Callable[[Any, str], Any], Any, str]]) -> List[Optional[str]]:
+    # Renders whole documents (render(data, output_path)) across the PDF pool. Returns an
+    # error message per job, or None when that document rendered.
+    errors: List[Optional[str]] = [None] * len(jobs)
+
+    def render_inline(indexes):
+        for index in indexes:
+            render, data, output_path = jobs[index]
+            try:
+                render(data, output_path)
+            except Exception as e:
+                logger.error(f"[PDF SEGMENTS] Failed to render {os.path.basename(output_path)}: {e}", exc_info=True)
+                errors[index] = str(e)
+
+    if len(jobs) < 2 or settings.PDF_RENDER_WORKERS <= 1:
+        render_inline(range(len(jobs)))
+        return errors
+
+    try:
+        pool = _get_pool()
+        futures: List[Future] = [pool.submit(render, data, output_path) for render, data, output_path in jobs]
+    except (BrokenProcessPool, RuntimeError, OSError) as e:
+        logger.warning(f"[PDF SEGMENTS] Process pool unavailable, rendering {len(jobs)} documents sequentially: {e}")
+        _reset_pool()
+        render_inline(range(len(jobs)))
+        return errors
+
+    for index, future in enumerate(futures):
+        try:
+            future.result()
+        except BrokenProcessPool as e:
+            logger.warning(f"[PDF SEGMENTS] Worker pool broke on document {index + 1}, finishing sequentially: {e}")
+            _reset_pool()
+            render_inline(range(index, len(jobs)))
+            break
+        except Exception as e:
+            logger.error(f"[PDF SEGMENTS] Failed to render {os.path.basename(jobs[index][2])}: {e}")
+            errors[index] = str(e)
+
+    return errors
+
+
+def _footer_overlay(footer_text: str, page_sizes: List[Tuple[float, float]]) -> PdfReader:
+    buffer = io.BytesIO()
+    overlay = canvas.Canvas(buffer, pagesize=page_sizes[0] if page_sizes else A4)
+    total_pages = len(page_sizes)
+    for page_number, page_size in enumerate(page_sizes, start=1):
+        overlay.setPageSize(page_size)
+        draw_page_footer(overlay, footer_text, page_number, total_pages)
+        overlay.showPage()
+    overlay.save()
+    buffer.seek(0)
+    return PdfReader(buffer)
+
+
+def render_pdf_segments(
+    file_path: str,
+    segments: List[PdfSegment],
+    doc_kwargs: Dict[str, Any],
+    on_page: Optional[Callable] = None,
+    footer_text: Optional[str] = None,
+) -> int:
+    # Each segment is an independent document starting on a fresh page. Segments render in
+    # worker processes, then are merged in order and stamped with global "Page X of Y" footers.
+    # builder and on_page must be picklable (module-level functions or partials of them).
+    start_time = time.time()
+    work_dir = tempfile.mkdtemp(prefix="pdf_segments_", dir=os.path.dirname(os.path.abspath(file_path)))
+    try:
+        paths = [os.path.join(work_dir, f"segment_{index:05d}.pdf") for index in range(len(segments))]
+        _render_all(segments, paths, doc_kwargs, on_page)
+
+        writer = PdfWriter()
+        for path in paths:
+            writer.append(path)
+
+        if footer_text is not None:
+            page_sizes = [(float(page.mediabox.width), float(page.mediabox.height)) for page in writer.pages]
+            overlay = _footer_overlay(footer_text, page_sizes)
+            for page, footer_page in zip(writer.pages, overlay.pages):
+                page.merge_page(footer_page)
+
+        with open(file_path, "wb") as f:
+            writer.write(f)
+
+        total_pages = len(writer.pages)
+        logger.info(
+            f"[PDF SEGMENTS] Rendered {len(segments)} segments ({total_pages} pages) into {os.path.basename(file_path)} "
+            f"in {time.time() - start_time:.2f}s"
+        )
+        return total_pages
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
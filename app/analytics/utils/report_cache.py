@@ -0,0 +1,147 @@
+from datetime import timedelta
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+from app.core.config import settings
+from app.utils.timezone import get_indonesia_time
+import fcntl, hashlib, json, logging, os, tempfile, threading
+
+logger = logging.getLogger(__name__)
+
+REPORT_CACHE_INDEX = "report_cache.json"
+
+_cache_lock = threading.Lock()
+
+
+def report_cache_key(analytic_id: int, method: str, filters: Dict[str, Any], data_version: str, summary: Optional[str]) -> str:
+    summary_hash = hashlib.sha256((summary or "").encode("utf-8")).hexdigest()
+    payload = json.dumps(
+        {
+            "analytic_id": analytic_id,
+            "method": method,
+            "filters": {k: v for k, v in sorted(filters.items()) if v is not None},
+            "data_version": data_version,
+            "summary_hash": summary_hash,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _index_path() -> str:
+    return os.path.join(settings.REPORTS_DIR, REPORT_CACHE_INDEX)
+
+
+@contextmanager
+def _locked_index() -> Iterator[None]:
+    # The index is shared by every uvicorn worker, so hold an exclusive flock for the
+    # whole read-modify-write, not just the thread lock.
+    os.makedirs(settings.REPORTS_DIR, exist_ok=True)
+    with _cache_lock, open(f"{_index_path()}.lock", "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _load_index() -> Dict[str, Dict[str, Any]]:
+    path = _index_path()
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except Exception as e:
+        logger.warning(f"Report cache index unreadable, starting empty: {e}")
+        return {}
+
+
+def _save_index(index: Dict[str, Dict[str, Any]]) -> None:
+    path = _index_path()
+    fd, tmp_path = tempfile.mkstemp(prefix=f"{REPORT_CACHE_INDEX}.", suffix=".tmp", dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _remove_entry(index: Dict[str, Dict[str, Any]], key: str) -> None:
+    entry = index.pop(key, None)
+    if entry and os.path.exists(entry["file_path"]):
+        try:
+            os.remove(entry["file_path"])
+        except OSError as e:
+            logger.warning(f"Failed to remove cached report {entry['file_path']}: {e}")
+
+
+def _evict(index: Dict[str, Dict[str, Any]]) -> None:
+    cutoff = (get_indonesia_time() - timedelta(hours=settings.REPORT_CACHE_MAX_AGE_HOURS)).isoformat()
+    for key in [k for k, entry in index.items() if entry["created_at"] < cutoff or not os.path.exists(entry["file_path"])]:
+        _remove_entry(index, key)
+
+    max_bytes = settings.REPORT_CACHE_MAX_MB * 1024 * 1024
+    total = sum(entry["size"] for entry in index.values())
+    # Least recently served reports go first.
+    for key in sorted(index, key=lambda k: index[k]["last_access"]):
+        if total <= max_bytes:
+            break
+        total -= index[key]["size"]
+        _remove_entry(index, key)
+
+
+def get_cached_report(key: str) -> Optional[Tuple[str, str]]:
+    if not settings.REPORT_CACHE_ENABLED:
+        return None
+
+    with _locked_index():
+        index = _load_index()
+        entry = index.get(key)
+        if not entry:
+            return None
+
+        if not os.path.exists(entry["file_path"]):
+            index.pop(key, None)
+            _save_index(index)
+            return None
+
+        entry["last_access"] = get_indonesia_time().isoformat()
+        entry["hits"] = entry.get("hits", 0) + 1
+        _save_index(index)
+        return entry["file_path"], entry["filename"]
+
+
+def store_report(key: str, analytic_id: int, method: str, file_path: str, filename: str) -> None:
+    if not settings.REPORT_CACHE_ENABLED or not os.path.exists(file_path):
+        return
+
+    with _locked_index():
+        index = _load_index()
+        previous = index.get(key)
+        if previous and previous["file_path"] != file_path:
+            _remove_entry(index, key)
+
+        now = get_indonesia_time().isoformat()
+        index[key] = {
+            "analytic_id": analytic_id,
+            "method": method,
+            "file_path": file_path,
+            "filename": filename,
+            "size": os.path.getsize(file_path),
+            "created_at": now,
+            "last_access": now,
+            "hits": 0,
+        }
+        _evict(index)
+        _save_index(index)
+
+
+
+def is_cached_report(file_path: str) -> bool:
+    with _locked_index():
+        return any(entry["file_path"] == file_path for entry in _load_index().values())
@@ -0,0 +1,261 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from app.core.config import settings
+from app.analytics.utils.report_cache import is_cached_report
+from app.utils.timezone import get_indonesia_time
+import fcntl, json, logging, os, tempfile, threading, uuid
+
+logger = logging.getLogger(__name__)
+
+# Job state is kept as one JSON file per job under REPORTS_DIR/jobs, so any uvicorn worker
+# on the host can answer status and download polls. Only the worker that runs a job writes it.
+REPORT_JOBS_DIR = "jobs"
+ACTIVE_STATUSES = ("queued", "running")
+
+_jobs_lock = threading.Lock()
+_current_job = threading.local()
+_executor = ThreadPoolExecutor(max_workers=settings.REPORT_JOB_WORKERS, thread_name_prefix="report-job")
+
+
+class ReportJobError(Exception):
+    pass
+
+
+class ReportJobLimitExceeded(ReportJobError):
+    pass
+
+
+def _jobs_dir() -> str:
+    return os.path.join(settings.REPORTS_DIR, REPORT_JOBS_DIR)
+
+
+def _job_path(job_id: str) -> str:
+    return os.path.join(_jobs_dir(), f"{job_id}.json")
+
+
+@contextmanager
+def _locked_jobs() -> Iterator[None]:
+    # Serialises submits and pruning across threads and worker processes.
+    os.makedirs(_jobs_dir(), exist_ok=True)
+    with _jobs_lock, open(os.path.join(_jobs_dir(), ".lock"), "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _save_job(job: Dict[str, Any]) -> None:
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{job['job_id']}.", suffix=".tmp", dir=_jobs_dir())
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(job, f, ensure_ascii=False)
+        os.replace(tmp_path, _job_path(job["job_id"]))
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _update_job(job_id: str, **fields: Any) -> None:
+    job = _load_job(job_id)
+    if job is None:
+        return
+    job.update(fields)
+    _save_job(job)
+
+
+def _is_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _load_job(job_id: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(_job_path(job_id), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except ValueError as e:
+        logger.warning(f"Report job {job_id} state unreadable: {e}")
+        return None
+
+
+def _check_worker(job: Dict[str, Any]) -> Dict[str, Any]:
+    # A job whose worker process exited (restart, crash) will never finish.
+    if job["status"] in ACTIVE_STATUSES and not _is_alive(job["pid"]):
+        job.update({
+            "status": "failed",
+            "message": "Report worker stopped before the report finished. Please export again.",
+            "finished_at": get_indonesia_time().isoformat(),
+        })
+        _save_job(job)
+    return job
+
+
+def _list_jobs() -> List[Dict[str, Any]]:
+    jobs = []
+    for name in os.listdir(_jobs_dir()):
+        if name.endswith(".json"):
+            job = _load_job(name[:-len(".json")])
+            if job is not None:
+                jobs.append(_check_worker(job))
+    return jobs
+
+
+def _remove_job_files(job: Dict[str, Any]) -> None:
+    file_path = job.get("file_path")
+    # Reports also held by the report cache are removed by its own eviction.
+    if file_path and os.path.exists(file_path) and not is_cached_report(file_path):
+        try:
+            os.remove(file_path)
+        except OSError as e:
+            logger.warning(f"Failed to remove report file {file_path}: {e}")
+    try:
+        os.remove(_job_path(job["job_id"]))
+    except FileNotFoundError:
+        pass
+
+
+def _prune_finished_jobs(jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    cutoff = (get_indonesia_time() - timedelta(hours=settings.REPORT_JOB_RETENTION_HOURS)).isoformat()
+    kept = []
+    for job in jobs:
+        if job["status"] not in ACTIVE_STATUSES and job["finished_at"] and job["finished_at"] < cutoff:
+            _remove_job_files(job)
+        else:
+            kept.append(job)
+    return kept
+
+
+def submit_report_job(user_id: int, analytic_id: int, method: str, build: Callable[[], Tuple[str, str]]) -> Dict[str, Any]:
+    with _locked_jobs():
+        jobs = _prune_finished_jobs(_list_jobs())
+        active = sum(1 for job in jobs if job["user_id"] == user_id and job["status"] in ACTIVE_STATUSES)
+        if active >= settings.REPORT_JOBS_PER_USER:
+            raise ReportJobLimitExceeded(
+                f"You already have {active} report(s) in progress. Please wait until one finishes."
+            )
+
+        job_id = uuid.uuid4().hex
+        job = {
+            "job_id": job_id,
+            "user_id": user_id,
+            "analytic_id": analytic_id,
+            "method": method,
+            "pid": os.getpid(),
+            "status": "queued",
+            "progress": 0,
+            "message": "Waiting for a report worker...",
+            "records_processed": 0,
+            "batches": 0,
+            "last_batch_seconds": None,
+            "file_path": None,
+            "filename": None,
+            "created_at": get_indonesia_time().isoformat(),
+            "started_at": None,
+            "finished_at": None,
+        }
+        _save_job(job)
+
+    _executor.submit(_run_report_job, job_id, build)
+    logger.info(f"Report job queued - job_id={job_id}, analytic_id={analytic_id}, user_id={user_id}")
+    return job_status(job)
+
+
+def _run_report_job(job_id: str, build: Callable[[], Tuple[str, str]]) -> None:
+    _current_job.job_id = job_id
+    _update_job(
+        job_id,
+        status="running",
+        progress=5,
+        message="Generating report...",
+        started_at=get_indonesia_time().isoformat(),
+    )
+
+    try:
+        file_path, filename = build()
+        result = {
+            "status": "completed",
+            "progress": 100,
+            "message": "Report ready for download.",
+            "file_path": file_path,
+            "filename": filename,
+        }
+        logger.info(f"Report job completed - job_id={job_id}, file={filename}")
+    except ReportJobError as e:
+        result = {"status": "failed", "message": str(e)}
+        logger.warning(f"Report job failed - job_id={job_id}: {e}")
+    except Exception as e:
+        result = {"status": "failed", "message": "Failed to generate PDF. Please try again later."}
+        logger.error(f"Report job failed - job_id={job_id}: {e}", exc_info=True)
+    finally:
+        _current_job.job_id = None
+
+    _update_job(job_id, finished_at=get_indonesia_time().isoformat(), **result)
+
+
+def report_progress(
+    records_processed: Optional[int] = None,
+    message: Optional[str] = None,
+    batch_seconds: Optional[float] = None,
+    progress: Optional[int] = None,
+) -> None:
+    # progress is a percentage for build stages (sections, rendering); without it,
+    # progress creeps toward 95% with the number of records fetched.
+    job_id = getattr(_current_job, "job_id", None)
+    if not job_id:
+        return
+
+    job = _load_job(job_id)
+    if not job:
+        return
+
+    if batch_seconds is not None:
+        job["batches"] += 1
+        job["last_batch_seconds"] = round(batch_seconds, 3)
+
+    if records_processed is not None:
+        job["records_processed"] = records_processed
+        job["message"] = message or f"Generating report... {records_processed:,} records processed"
+        progress = max(progress or 0, 5 + records_processed // 10000)
+    elif message:
+        job["message"] = message
+
+    if progress is not None:
+        job["progress"] = min(95, max(job["progress"], progress))
+
+    _save_job(job)
+
+
+def get_report_job(job_id: str) -> Optional[Dict[str, Any]]:
+    if not job_id.isalnum():
+        return None
+    job = _load_job(job_id)
+    return _check_worker(job) if job else None
+
+
+def job_status(job: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "job_id": job["job_id"],
+        "analytic_id": job["analytic_id"],
+        "method": job["method"],
+        "status": job["status"],
+        "progress": job["progress"],
+        "message": job["message"],
+        "records_processed": job["records_processed"],
+        "batches": job["batches"],
+        "last_batch_seconds": job["last_batch_seconds"],
+        "filename": job["filename"],
+        "download_ready": job["status"] == "completed" and bool(job["file_path"]) and os.path.exists(job["file_path"]),
+        "created_at": job["created_at"],
+        "started_at": job["started_at"],
+        "finished_at": job["finished_at"],
+    }
@@ -1,5 +1,11 @@
 import json, sys, os, re
 
+if not __package__:
+    # Allow running as `python scan_apk.py report.json` from anywhere.
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+
+from app.analytics.utils.suspicious_indicators import indicator_index_for
+
 def classify_permissions(permissions, suspicious_set=None):
     if not permissions:
         print("[!] No permissions found in report.")
@@ -77,64 +83,58 @@ def classify_permissions(permissions, suspicious_set=None):
     )
 
 def load_suspicious_indicators(script_dir):
-    indicators_file = os.path.join(script_dir, "suspicious_indicators.json")
-    if not os.path.exists(indicators_file):
-        print("[!] suspicious_indicators.json not found, skipping suspicious check.")
-        return set()
-
-    try:
-        with open(indicators_file, "r") as f:
-            data = json.load(f)
-        suspicious = {
-            item["name"]
-            for item in data
-            if item.get("platform") == "android" and item.get("type") == "permission"
-        }
-        print(f"[*] Loaded {len(suspicious)} suspicious indicators.")
-        return suspicious
-    except Exception as e:
-        print(f"[!] Failed to load suspicious_indicators.json: {e}")
-        return set()
+    # Kept for callers that want the plain permission set; the compiled index is cached
+    # per process and only reloaded when the JSON file changes.
+    return indicator_index_for(script_dir).permissions
+
+def classify_reports(reports, index=None):
+    # Batch classification: the indicator index is resolved once for the whole batch.
+    if index is None:
+        index = indicator_index_for(os.path.dirname(os.path.realpath(__file__)))
+    results = []
+    for report_json in reports:
+        permissions = report_json.get("permissions", {}) or {}
+        safety_score, classification, reason, dangerous_list, risk_weight = classify_permissions(
+            permissions, index.permissions
+        )
+        results.append({
+            "file_name": report_json.get("file_name", "N/A"),
+            "package_name": report_json.get("package_name", "N/A"),
+            "permissions": permissions,
+            "permission_analysis": {
+                "safety_score": safety_score,
+                "classification": classification,
+                "reason": reason,
+                "dangerous_permissions": dangerous_list,
+                "risk_weight": risk_weight,
+                "total_permissions": len(permissions),
+                "dangerous_count": len(dangerous_list),
+                "suspicious_permissions": index.match_permissions(permissions),
+            },
+        })
+    return results
 
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python scan_apk.py <report.json>", file=sys.stderr)
+    if len(sys.argv) < 2:
+        print("Usage: python scan_apk.py <report.json> [<report.json> ...]", file=sys.stderr)
         sys.exit(1)
 
-    json_path = sys.argv[1]
-    script_dir = os.path.dirname(os.path.realpath(__file__))
-
-    with open(json_path, "r", encoding="utf-8") as f:
-        report_json = json.load(f)
+    reports = []
+    for json_path in sys.argv[1:]:
+        with open(json_path, "r", encoding="utf-8") as f:
+            report_json = json.load(f)
+        if not report_json.get('permissions'):
+            print(f"[!] No permissions found in {json_path}, skipping.")
+            continue
+        reports.append(report_json)
 
-    permissions = report_json.get('permissions', {})
-    if not permissions:
-        print("[!] No permissions found in manifest_analysis.")
+    if not reports:
         sys.exit(0)
 
-    suspicious_set = load_suspicious_indicators(script_dir)
-
-    safety_score, classification, reason, dangerous_list, risk_weight = classify_permissions(
-        permissions, suspicious_set
-    )
-
-    result = {
-        "file_name": report_json.get("file_name", "N/A"),
-        "package_name": report_json.get("package_name", "N/A"),
-        "permissions": permissions,
-        "permission_analysis": {
-            "safety_score": safety_score,
-            "classification": classification,
-            "reason": reason,
-            "dangerous_permissions": dangerous_list,
-            "risk_weight": risk_weight,
-            "total_permissions": len(permissions),
-            "dangerous_count": len(dangerous_list),
-        },
-    }
+    results = classify_reports(reports)
 
     print("\n===================== FINAL ANALYSIS =====================")
-    print(json.dumps(result, indent=2, ensure_ascii=False))
+    print(json.dumps(results[0] if len(results) == 1 else results, indent=2, ensure_ascii=False))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,163 @@
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.analytics.device_management.models import ConvertedSdpFile
+from app.analytics.utils.sdp_crypto.container import describe_sdp
+from app.utils.timezone import get_indonesia_time
+import fcntl, json, logging, os, threading
+
+logger = logging.getLogger(__name__)
+
+LEGACY_METADATA_FILE = "converted_files.json"
+
+_legacy_lock = threading.Lock()
+_legacy_checked = set()
+
+
+def _sdp_summary(file_path: str) -> Dict[str, Any]:
+    try:
+        return describe_sdp(file_path)
+    except (OSError, ValueError) as e:
+        logger.warning(f"[SDP CATALOG] Could not read SDP summary for {os.path.basename(file_path)}: {e}")
+        return {}
+
+
+def record_conversion(db: Session, converted_dir: str, original_filename: str, converted_filename: str) -> ConvertedSdpFile:
+    summary = _sdp_summary(os.path.join(converted_dir, converted_filename))
+    entry = ConvertedSdpFile(
+        original_filename=original_filename,
+        converted_filename=converted_filename,
+        original_size=summary.get("original_size"),
+        encrypted_size=summary.get("encrypted_size"),
+        total_chunks=summary.get("total_chunks"),
+        sha256=summary.get("sha256"),
+        format_version=summary.get("version"),
+    )
+    db.add(entry)
+    db.commit()
+    db.refresh(entry)
+    return entry
+
+
+@contextmanager
+def _locked_legacy_import(converted_dir: str) -> Iterator[None]:
+    # Every uvicorn worker runs the import on its first listing, so serialise it across
+    # processes as well; the worker that waits finds the file already retired.
+    with _legacy_lock, open(os.path.join(converted_dir, f"{LEGACY_METADATA_FILE}.lock"), "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def import_legacy_metadata(db: Session, converted_dir: str) -> int:
+    # One-off import of the former converted_files.json; the file is renamed once its
+    # entries are committed so it is never read again.
+    metadata_path = os.path.join(converted_dir, LEGACY_METADATA_FILE)
+    if converted_dir in _legacy_checked:
+        return 0
+    if not os.path.exists(metadata_path):
+        _legacy_checked.add(converted_dir)
+        return 0
+
+    with _locked_legacy_import(converted_dir):
+        if converted_dir in _legacy_checked or not os.path.exists(metadata_path):
+            _legacy_checked.add(converted_dir)
+            return 0
+
+        try:
+            with open(metadata_path, "r", encoding="utf-8") as f:
+                records = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"[SDP CATALOG] Skipping unreadable {LEGACY_METADATA_FILE}: {e}")
+            records = []
+
+        known = {
+            name for (name,) in db.query(ConvertedSdpFile.converted_filename).all()
+        }
+        entries = []
+        for record in records if isinstance(records, list) else []:
+            converted_filename = record.get("converted_filename")
+            if not converted_filename or converted_filename in known:
+                continue
+            summary = _sdp_summary(os.path.join(converted_dir, converted_filename))
+            try:
+                created_at = datetime.fromisoformat(record["timestamp"])
+            except (KeyError, TypeError, ValueError):
+                created_at = get_indonesia_time()
+            entries.append(dict(
+                original_filename=record.get("original_filename") or converted_filename,
+                converted_filename=converted_filename,
+                original_size=summary.get("original_size"),
+                encrypted_size=summary.get("encrypted_size"),
+                total_chunks=summary.get("total_chunks"),
+                sha256=summary.get("sha256"),
+                format_version=summary.get("version"),
+                created_at=created_at,
+            ))
+            known.add(converted_filename)
+
+        try:
+            db.add_all([ConvertedSdpFile(**entry) for entry in entries])
+            db.commit()
+            imported = len(entries)
+        except IntegrityError:
+            # A conversion recorded one of these names since the catalog was read; insert
+            # row by row so only the conflicting entries are skipped.
+            db.rollback()
+            imported = 0
+            for entry in entries:
+                try:
+                    db.add(ConvertedSdpFile(**entry))
+                    db.commit()
+                    imported += 1
+                except IntegrityError:
+                    db.rollback()
+
+        os.replace(metadata_path, f"{metadata_path}.imported")
+        _legacy_checked.add(converted_dir)
+        logger.info(f"[SDP CATALOG] Imported {imported} entries from {LEGACY_METADATA_FILE}")
+        return imported
+
+
+def list_conversions(
+    db: Session,
+    skip: int = 0,
+    limit: int = 20,
+    search: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+) -> Tuple[List[ConvertedSdpFile], int]:
+    query = db.query(ConvertedSdpFile)
+    if search:
+        query = query.filter(ConvertedSdpFile.original_filename.ilike(f"%{search}%"))
+    if date_from:
+        query = query.filter(ConvertedSdpFile.created_at >= date_from)
+    if date_to:
+        query = query.filter(ConvertedSdpFile.created_at <= date_to)
+
+    total = query.count()
+    rows = (
+        query.order_by(ConvertedSdpFile.created_at.desc(), ConvertedSdpFile.id.desc())
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+    return rows, total
+
+
+def catalog_entry(entry: ConvertedSdpFile) -> Dict[str, Any]:
+    return {
+        "id": entry.id,
+        "original_filename": entry.original_filename,
+        "converted_filename": entry.converted_filename,
+        "original_size": entry.original_size,
+        "encrypted_size": entry.encrypted_size,
+        "total_chunks": entry.total_chunks,
+        "sha256": entry.sha256,
+        "format_version": entry.format_version,
+        "timestamp": entry.created_at.isoformat() if entry.created_at else None,
+    }
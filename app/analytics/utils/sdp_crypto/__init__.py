@@ -1,7 +1,9 @@
 from .core import SDPCrypto
+from .stream import SDPStreamDecryptor
+from .reader import SDPReader
 
 generate_keypair = SDPCrypto.generate_keypair
 encrypt_to_sdp = SDPCrypto.encrypt_to_sdp  
 decrypt_from_sdp = SDPCrypto.decrypt_from_sdp
 
-__all__ = ['generate_keypair', 'encrypt_to_sdp', 'decrypt_from_sdp']
\ No newline at end of file
+__all__ = ['generate_keypair', 'encrypt_to_sdp', 'decrypt_from_sdp', 'SDPStreamDecryptor', 'SDPReader']
\ No newline at end of file
@@ -0,0 +1,133 @@
+import base64, bisect, hashlib, io
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from .container import HASH_SIZE, is_v3, read_header, read_trailer, scan_v2_entries
+from .core import SDPCrypto
+
+def header_cipher(header, recipient_private_key):
+    ephemeral_public = base64.b64decode(header['ephemeral_public_key'])
+    salt = base64.b64decode(header['salt'])
+    aes_key = SDPCrypto.derive_symmetric_key(recipient_private_key, ephemeral_public, salt)
+    return AESGCM(aes_key), base64.b64decode(header['base_nonce'])
+
+class SDPReader(io.RawIOBase):
+    # Read-only, seekable view of the plaintext inside an SDP file. Only the chunks
+    # covering the requested range are decrypted; v3 chunks are also checked against
+    # their indexed SHA-256.
+    def __init__(self, path, recipient_private_key):
+        super().__init__()
+        if not recipient_private_key or len(recipient_private_key) != 32:
+            raise ValueError("Invalid recipient private key (must be 32 bytes)")
+
+        self._file = open(path, 'rb')
+        try:
+            self._file.seek(0, io.SEEK_END)
+            file_size = self._file.tell()
+            self._file.seek(0)
+            self.header, data_start = read_header(self._file)
+            self._aesgcm, self._base_nonce = header_cipher(self.header, recipient_private_key)
+
+            if is_v3(self.header):
+                self.entries, self.file_hash, _ = read_trailer(self._file, file_size, self._aesgcm, self._base_nonce)
+            else:
+                self.entries = scan_v2_entries(self._file, data_start, file_size)
+                self._file.seek(file_size - HASH_SIZE)
+                self.file_hash = self._file.read(HASH_SIZE)
+        except Exception:
+            self._file.close()
+            raise
+
+        self._starts = []
+        total = 0
+        for entry in self.entries:
+            self._starts.append(total)
+            total += entry[2]
+        self.size = total
+        self._position = 0
+        self._cached_index = None
+        self._cached_chunk = b""
+
+    @property
+    def filename(self):
+        return self.header.get('filename')
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if position < 0:
+            raise ValueError("Negative seek position")
+        self._position = position
+        return position
+
+    def readinto(self, buffer):
+        data = self.read_at(self._position, len(buffer))
+        buffer[:len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+    def read_at(self, offset, size):
+        if offset >= self.size or size <= 0:
+            return b""
+        end = min(offset + size, self.size)
+        parts = []
+        index = self._chunk_for(offset)
+        while offset < end:
+            chunk = self.read_chunk(index)
+            chunk_start = self._starts[index]
+            part = chunk[offset - chunk_start:end - chunk_start]
+            parts.append(part)
+            offset += len(part)
+            index += 1
+        return b"".join(parts)
+
+    def read_chunk(self, index):
+        if index == self._cached_index:
+            return self._cached_chunk
+
+        offset, encrypted_size, plain_size, digest = self.entries[index]
+        self._file.seek(offset)
+        encrypted_chunk = self._file.read(encrypted_size)
+        if len(encrypted_chunk) != encrypted_size:
+            raise ValueError(f"Incomplete chunk data at position {offset}")
+
+        nonce = self._base_nonce + index.to_bytes(4, 'big')
+        try:
+            chunk = self._aesgcm.decrypt(nonce, encrypted_chunk, None)
+        except Exception as e:
+            raise ValueError(f"Decryption failed for chunk {index}: {str(e)}")
+        if len(chunk) != plain_size or (digest is not None and hashlib.sha256(chunk).digest() != digest):
+            raise ValueError(f"Integrity check failed for chunk {index}")
+
+        self._cached_index, self._cached_chunk = index, chunk
+        return chunk
+
+    def verify(self):
+        sha256_hash = hashlib.sha256()
+        for index in range(len(self.entries)):
+            sha256_hash.update(self.read_chunk(index))
+        if sha256_hash.digest() != self.file_hash:
+            raise ValueError("Integrity check failed: SHA256 hash mismatch")
+        return True
+
+    def close(self):
+        if not self.closed:
+            self._file.close()
+            self._cached_chunk = b""
+        super().close()
+
+    def _chunk_for(self, offset):
+        return bisect.bisect_right(self._starts, offset) - 1
@@ -0,0 +1,154 @@
+import base64, hashlib, json, os
+from typing import Optional
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from .container import REQUIRED_FIELDS, is_v3, parse_trailer
+from .core import SDPCrypto
+
+class SDPStreamDecryptor:
+    # Incremental counterpart of SDPCrypto.decrypt_from_sdp: bytes are fed as they arrive
+    # and every AES-GCM chunk is decrypted straight into output_path as soon as it is complete.
+    # Handles both v2 (trailing SHA-256) and v3 (chunk index + footer) containers.
+
+    def __init__(self, recipient_private_key, output_path: str):
+        if not recipient_private_key or len(recipient_private_key) != 32:
+            raise ValueError("Invalid recipient private key (must be 32 bytes)")
+
+        self.recipient_private_key = recipient_private_key
+        self.output_path = output_path
+        self.header: Optional[dict] = None
+        self.chunk_index = 0
+        self.bytes_written = 0
+
+        self._buffer = bytearray()
+        self._consumed = 0
+        self._aesgcm: Optional[AESGCM] = None
+        self._base_nonce = b""
+        self._sha256 = hashlib.sha256()
+        self._outfile = None
+        # v3 only: (offset, encrypted size, plain size, sha256) of each chunk as it was read,
+        # compared entry by entry with the chunk index once the trailer arrives.
+        self._chunks = []
+
+    def feed(self, data: bytes) -> int:
+        # Returns the number of plaintext bytes written by this call.
+        self._buffer.extend(data)
+        written = 0
+
+        if self.header is None and not self._parse_header():
+            return written
+
+        while self._chunk_pending():
+            chunk_len = int.from_bytes(self._buffer[:SDPCrypto.CHUNK_SIZE_BYTES], 'big')
+            chunk_end = SDPCrypto.CHUNK_SIZE_BYTES + chunk_len
+            if len(self._buffer) < chunk_end:
+                break
+
+            encrypted_chunk = bytes(self._buffer[SDPCrypto.CHUNK_SIZE_BYTES:chunk_end])
+            chunk_offset = self._consumed + SDPCrypto.CHUNK_SIZE_BYTES
+            del self._buffer[:chunk_end]
+            self._consumed += chunk_end
+            written += self._decrypt_chunk(encrypted_chunk, chunk_offset)
+
+        return written
+
+    def finish(self) -> str:
+        try:
+            if self.header is None:
+                raise ValueError("Invalid SDP file: incomplete header")
+            if is_v3(self.header):
+                entries, file_hash, _ = parse_trailer(self._buffer, self._aesgcm, self._base_nonce, self._consumed)
+                for position, (entry, chunk) in enumerate(zip(entries, self._chunks)):
+                    if entry != chunk:
+                        raise ValueError(f"Invalid SDP v3 file: chunk {position} does not match the chunk index")
+                if len(entries) != len(self._chunks):
+                    raise ValueError("Invalid SDP file: chunk index does not match chunk data")
+            elif len(self._buffer) != SDPCrypto.HASH_SIZE:
+                raise ValueError("Invalid SDP file: truncated chunk data or missing hash")
+            else:
+                file_hash = bytes(self._buffer)
+
+            if self._outfile is None:
+                self._open_output()
+            self._outfile.close()
+
+            if self._sha256.digest() != file_hash:
+                raise ValueError("Integrity check failed: SHA256 hash mismatch")
+
+            expected_size = self.header.get('file_size')
+            if expected_size is not None and self.bytes_written != expected_size:
+                raise ValueError(
+                    f"File size mismatch. Expected: {expected_size}, Got: {self.bytes_written}"
+                )
+        except Exception:
+            self.abort()
+            raise
+
+        self._buffer = bytearray()
+        return self.output_path
+
+    def abort(self) -> None:
+        if self._outfile is not None and not self._outfile.closed:
+            self._outfile.close()
+        if self._outfile is not None and os.path.exists(self.output_path):
+            os.remove(self.output_path)
+        self._buffer = bytearray()
+
+    def _parse_header(self) -> bool:
+        if len(self._buffer) < SDPCrypto.HEADER_SIZE_BYTES:
+            return False
+        header_len = int.from_bytes(self._buffer[:SDPCrypto.HEADER_SIZE_BYTES], 'big')
+        header_end = SDPCrypto.HEADER_SIZE_BYTES + header_len
+        if len(self._buffer) < header_end:
+            return False
+
+        try:
+            header = json.loads(bytes(self._buffer[SDPCrypto.HEADER_SIZE_BYTES:header_end]).decode('utf-8'))
+        except (ValueError, UnicodeDecodeError) as e:
+            raise ValueError(f"Invalid SDP header: {str(e)}")
+
+        for field in REQUIRED_FIELDS:
+            if field not in header:
+                raise ValueError(f"Missing required field in header: {field}")
+
+        ephemeral_public = base64.b64decode(header['ephemeral_public_key'])
+        salt = base64.b64decode(header['salt'])
+        aes_key = SDPCrypto.derive_symmetric_key(self.recipient_private_key, ephemeral_public, salt)
+
+        self._aesgcm = AESGCM(aes_key)
+        self._base_nonce = base64.b64decode(header['base_nonce'])
+        self.header = header
+        del self._buffer[:header_end]
+        self._consumed += header_end
+        return True
+
+    def _chunk_pending(self) -> bool:
+        if is_v3(self.header):
+            # v3 declares its chunk count up front; whatever follows is the index and footer.
+            return self.chunk_index < self.header.get('total_chunks', 0) and len(self._buffer) >= SDPCrypto.CHUNK_SIZE_BYTES
+        # v2 always ends with the plaintext SHA-256, so anything beyond the last HASH_SIZE
+        # bytes must be a length-prefixed chunk.
+        return len(self._buffer) > SDPCrypto.HASH_SIZE
+
+    def _open_output(self) -> None:
+        output_dir = os.path.dirname(self.output_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        self._outfile = open(self.output_path, 'wb')
+
+    def _decrypt_chunk(self, encrypted_chunk: bytes, chunk_offset: int) -> int:
+        nonce = self._base_nonce + self.chunk_index.to_bytes(4, 'big')
+        try:
+            decrypted_chunk = self._aesgcm.decrypt(nonce, encrypted_chunk, None)
+        except Exception as e:
+            raise ValueError(f"Decryption failed for chunk {self.chunk_index}: {str(e)}")
+
+        if self._outfile is None:
+            self._open_output()
+        self._outfile.write(decrypted_chunk)
+        self._sha256.update(decrypted_chunk)
+        if is_v3(self.header):
+            self._chunks.append((chunk_offset, len(encrypted_chunk), len(decrypted_chunk), hashlib.sha256(decrypted_chunk).digest()))
+
+        self.chunk_index += 1
+        self.bytes_written += len(decrypted_chunk)
+        return len(decrypted_chunk)
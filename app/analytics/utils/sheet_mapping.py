@@ -0,0 +1,436 @@
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Tuple, Callable
+import pandas as pd
+import logging
+
+logger = logging.getLogger(__name__)
+
+NULL_TOKENS = ("", "nan", "none", "null", "n/a")
+
+Transform = Callable[[pd.Series], pd.Series]
+FrameFunc = Callable[[pd.DataFrame, Dict[str, Any]], pd.Series]
+
+
+def clean(series: pd.Series) -> pd.Series:
+    text = series.astype("string").str.strip()
+    return text.mask(text.str.lower().isin(NULL_TOKENS))
+
+
+def strip(series: pd.Series) -> pd.Series:
+    text = series.astype("string").str.strip()
+    return text.mask(text == "")
+
+
+def lower(series: pd.Series) -> pd.Series:
+    return series.str.lower()
+
+
+@dataclass(frozen=True)
+class ColumnRule:
+    target: str
+    sources: Tuple[str, ...]
+    transforms: Tuple[Transform, ...] = (clean,)
+    join: Optional[str] = None
+    default: Any = None
+
+    def evaluate(self, df: pd.DataFrame) -> pd.Series:
+        values = [self._apply(df[source]) for source in self.sources if source in df.columns]
+
+        if self.join is not None:
+            # Joined columns (names) keep the parsers' "" for "nothing to join", and a
+            # missing part no longer leaves a stray separator.
+            joined = pd.Series("", index=df.index, dtype="string")
+            for value in values:
+                part = value.fillna("")
+                joined = joined.where(part == "", joined.where(joined == "", joined + self.join) + part)
+            return joined.str.strip()
+
+        if not values:
+            return pd.Series(pd.NA, index=df.index, dtype="string")
+
+        result = values[0]
+        for value in values[1:]:
+            result = result.fillna(value)
+        return result
+
+    def _apply(self, series: pd.Series) -> pd.Series:
+        for transform in self.transforms:
+            series = transform(series)
+        return series
+
+
+@dataclass(frozen=True)
+class SheetMapping:
+    tool: str
+    sheet: str
+    target: str
+    columns: Tuple[ColumnRule, ...]
+    constants: Dict[str, Any] = field(default_factory=dict)
+    key_columns: Tuple[str, ...] = ()
+    required_sources: Tuple[str, ...] = ()
+    require_any: Tuple[str, ...] = ()
+    filters: Tuple[FrameFunc, ...] = ()
+    derived: Tuple[Tuple[str, FrameFunc], ...] = ()
+    drop_columns: Tuple[str, ...] = ()
+    sheet_label: Optional[str] = None
+    exact: bool = False
+
+    def matches(self, sheet_name: str) -> bool:
+        if self.exact:
+            return str(sheet_name) == self.sheet
+        return self.sheet in str(sheet_name)
+
+    def apply(self, df: pd.DataFrame, file_id: int, sheet_name: str) -> pd.DataFrame:
+        context = {"file_id": file_id, "sheet_name": sheet_name}
+
+        for source in self.required_sources:
+            if source not in df.columns:
+                return pd.DataFrame(columns=self.output_columns)
+            df = df[df[source].notna()]
+
+        frame = pd.DataFrame(index=df.index)
+        for rule in self.columns:
+            frame[rule.target] = rule.evaluate(df)
+
+        if self.require_any:
+            frame = frame[frame[list(self.require_any)].notna().any(axis=1)]
+
+        for row_filter in self.filters:
+            frame = frame[row_filter(frame, context).fillna(False).astype(bool)]
+
+        frame = frame.copy()
+        for target, func in self.derived:
+            frame[target] = func(frame, context)
+
+        for rule in self.columns:
+            if rule.default is not None:
+                frame[rule.target] = frame[rule.target].fillna(rule.default)
+
+        frame = frame.drop(columns=list(self.drop_columns))
+        frame["file_id"] = file_id
+        for column, value in self.constants.items():
+            frame[column] = value
+        frame["sheet_name"] = self.sheet_label or sheet_name
+
+        if self.key_columns:
+            frame = frame.drop_duplicates(subset=list(self.key_columns), keep="first")
+
+        return frame
+
+    def records(self, df: pd.DataFrame, file_id: int, sheet_name: str) -> List[Dict[str, Any]]:
+        frame = self.apply(df, file_id, sheet_name)
+        if frame.empty:
+            return []
+        frame = frame.astype(object).where(frame.notna(), None)
+        return frame.to_dict("records")
+
+    @property
+    def output_columns(self) -> List[str]:
+        columns = [rule.target for rule in self.columns] + [target for target, _ in self.derived]
+        columns = [column for column in columns if column not in self.drop_columns]
+        return list(dict.fromkeys(columns + ["file_id", *self.constants.keys(), "sheet_name"]))
+
+
+_REGISTRY: Dict[str, List[SheetMapping]] = {}
+
+
+def register_mapping(mapping: SheetMapping) -> SheetMapping:
+    _REGISTRY.setdefault(mapping.tool, []).append(mapping)
+    return mapping
+
+
+def find_mapping(tool: str, sheet_name: str, target: Optional[str] = None) -> Optional[SheetMapping]:
+    for mapping in _REGISTRY.get(tool, []):
+        if target is not None and mapping.target != target:
+            continue
+        if mapping.matches(sheet_name):
+            return mapping
+    return None
+
+
+def mappings_for(tool: str, target: Optional[str] = None) -> List[SheetMapping]:
+    return [m for m in _REGISTRY.get(tool, []) if target is None or m.target == target]
+
+
+def parse_sheet(mapping: SheetMapping, file_path: str, sheet_name: str, file_id: int, engine: str = "openpyxl") -> List[Dict[str, Any]]:
+    try:
+        df = pd.read_excel(file_path, sheet_name=sheet_name, engine=engine, dtype=str)
+        results = mapping.records(df, file_id, sheet_name)
+    except Exception as e:
+        logger.error(f"[SHEET MAPPING] Error parsing {mapping.tool} sheet '{sheet_name}': {e}", exc_info=True)
+        print(f"Error parsing {sheet_name}: {e}")
+        return []
+
+    logger.info(f"[SHEET MAPPING] {mapping.tool} / {sheet_name}: {len(results)} of {len(df)} rows mapped to {mapping.target}")
+    return results
+
+
+@dataclass(frozen=True)
+class SheetCount:
+    tool: str
+    sheet: str
+    column: str
+
+    def matches(self, sheet_name: str) -> bool:
+        return self.sheet in str(sheet_name)
+
+
+_COUNTS: Dict[str, List[SheetCount]] = {}
+
+
+def register_count(count: SheetCount) -> SheetCount:
+    _COUNTS.setdefault(count.tool, []).append(count)
+    return count
+
+
+def find_count(tool: str, sheet_name: str) -> Optional[SheetCount]:
+    for count in _COUNTS.get(tool, []):
+        if count.matches(sheet_name):
+            return count
+    return None
+
+
+def count_rows(tool: str, file_path: str, engine: str = "openpyxl") -> int:
+    # Counts the rows with a value in each matching sheet's count column; only that
+    # column is read from the sheet.
+    xls = pd.ExcelFile(file_path, engine=engine)
+    total = 0
+    for sheet_name in xls.sheet_names:
+        count = find_count(tool, sheet_name)
+        if count is None:
+            continue
+        try:
+            df = pd.read_excel(xls, sheet_name=sheet_name, dtype=str, usecols=lambda column: column == count.column)
+        except Exception:
+            continue
+        if count.column in df.columns:
+            total += int(df[count.column].notna().sum())
+    return total
+
+
+def _coalesce(*columns: str) -> FrameFunc:
+    # Like `a or b or c`: empty strings fall through as well as nulls.
+    def func(frame: pd.DataFrame, context: Dict[str, Any]) -> pd.Series:
+        result = frame[columns[0]].mask(frame[columns[0]] == "")
+        for column in columns[1:]:
+            result = result.fillna(frame[column].mask(frame[column] == ""))
+        return result
+    return func
+
+
+def _direction_is_sent_or_received(frame: pd.DataFrame, context: Dict[str, Any]) -> pd.Series:
+    return frame["direction"].str.lower().isin(["sent", "received"])
+
+
+def _direction_from_sent_received(frame: pd.DataFrame, context: Dict[str, Any]) -> pd.Series:
+    return frame["direction"].str.lower().map({"sent": "Outgoing", "received": "Incoming"})
+
+
+def _thread_from_participants(frame: pd.DataFrame, context: Dict[str, Any]) -> pd.Series:
+    sender = frame["sender_number"].fillna("")
+    recipient = frame["recipient_number"].fillna("")
+    low = sender.where((sender <= recipient) | (recipient == ""), recipient)
+    high = recipient.where(low == sender, sender)
+    # Only join with "_" when both sides are present; IDs may themselves contain "_".
+    participants = (low + "_" + high).where((low != "") & (high != ""), low + high)
+    return frame["thread_id"].fillna(participants)
+
+
+def _indexed_message_id(prefix: str) -> FrameFunc:
+    def func(frame: pd.DataFrame, context: Dict[str, Any]) -> pd.Series:
+        fallback = pd.Series([f"{prefix}_{context['file_id']}_{idx}" for idx in frame.index], index=frame.index, dtype="string")
+        return frame["message_id"].fillna(fallback)
+    return func
+
+
+def _contains_telegram(column: str) -> FrameFunc:
+    def func(frame: pd.DataFrame, context: Dict[str, Any]) -> pd.Series:
+        return frame[column].str.contains("telegram", case=False, regex=False)
+    return func
+
+
+# Only Axiom exports are mapped. Oxygen and Cellebrite sheets carry their headers in a
+# data row, pick the target id column per row from a Source/Service Type value, or pull
+# values out of free-text fields with regexes, none of which is a column-to-column rule;
+# they keep their hand-written parsers.
+AXIOM = "Magnet Axiom"
+
+register_mapping(SheetMapping(
+    tool=AXIOM, sheet="Instagram Profiles", target="social_media", sheet_label="Instagram Profiles",
+    required_sources=("User Name",),
+    columns=(
+        ColumnRule("account_name", ("User Name",)),
+        ColumnRule("full_name", ("Name",)),
+        ColumnRule("phone_number", ("Phone Number",)),
+        ColumnRule("instagram_id", ("User ID", "User Name")),
+    ),
+    constants={"source": "Instagram"},
+))
+
+register_mapping(SheetMapping(
+    tool=AXIOM, sheet="Android Instagram Following", target="social_media", sheet_label="Android Instagram Following",
+    required_sources=("User Name",),
+    columns=(
+        ColumnRule("account_name", ("User Name",)),
+        ColumnRule("full_name", ("Full Name",)),
+        ColumnRule("instagram_id", ("ID", "User Name")),
+    ),
+    constants={"source": "Instagram"},
+))
+
+register_mapping(SheetMapping(
+    tool=AXIOM, sheet="Android Instagram Users", target="social_media", sheet_label="Android Instagram Users",
+    required_sources=("User Name",),
+    columns=(
+        ColumnRule("account_name", ("User Name",)),
+        ColumnRule("full_name", ("Full Name",)),
+        ColumnRule("instagram_id", ("ID", "User Name")),
+    ),
+    constants={"source": "Instagram"},
+))
+
+register_mapping(SheetMapping(
+    tool=AXIOM, sheet="Twitter Users", target="social_media", sheet_label="Twitter Users",
+    required_sources=("User Name",),
+    columns=(
+        ColumnRule("account_name", ("User Name", "Screen Name")),
+        ColumnRule("full_name", ("Full Name",)),
+        ColumnRule("X_id", ("User ID", "User Name", "Screen Name")),
+    ),
+    constants={"source": "X (Twitter)"},
+))
+
+register_mapping(SheetMapping(
+    tool=AXIOM, sheet="Telegram Accounts", target="social_media", sheet_label="Telegram Accounts",
+    required_sources=("User ID",),
+    columns=(
+        ColumnRule("user_name", ("User Name",)),
+        ColumnRule("full_name", ("First Name", "Last Name"), join=" "),
+        ColumnRule("user_id", ("User ID",)),
+        ColumnRule("phone_number", ("Phone Number",)),
+        ColumnRule("telegram_id", ("Account ID", "User ID")),
+    ),
+    derived=(
+        ("account_name", _coalesce("user_name", "full_name", "user_id")),
+    ),
+    constants={"source": "Telegram"},
+    drop_columns=("user_name", "user_id"),
+))
+
+register_mapping(SheetMapping(
+    tool=AXIOM, sheet="User Accounts", target="social_media", sheet_label="User Accounts",
+    columns=(
+        ColumnRule("service_name", ("Service Name",)),
+        ColumnRule("full_name", ("User Name",)),
+        ColumnRule("account_name", ("User Name", "User ID")),
+        ColumnRule("phone_number", ("Phone Number(s)",)),
+        ColumnRule("telegram_id", ("User ID", "User Name")),
+    ),
+    require_any=("account_name",),
+    filters=(_contains_telegram("service_name"),),
+    constants={"source": "Telegram"},
+    drop_columns=("service_name",),
+))
+
+register_mapping(SheetMapping(
+    tool=AXIOM, sheet="TikTok Contacts", target="social_media", sheet_label="TikTok Contacts",
+    required_sources=("ID",),
+    columns=(
+        ColumnRule("account_name", ("Nickname", "User Name")),
+        ColumnRule("full_name", ("Nickname", "User Name")),
+        ColumnRule("tiktok_id", ("ID",)),
+    ),
+    constants={"source": "TikTok"},
+))
+
+register_mapping(SheetMapping(
+    tool=AXIOM, sheet="Facebook Contacts", target="social_media",
+    required_sources=("Profile ID",),
+    columns=(
+        ColumnRule("account_name", ("Display Name",)),
+        ColumnRule("full_name", ("First Name", "Last Name"), join=" "),
+        ColumnRule("phone_number", ("Phone Numbers",)),
+        ColumnRule("facebook_id", ("Profile ID",)),
+    ),
+    constants={"source": "Facebook"},
+))
+
+register_mapping(SheetMapping(
+    tool=AXIOM, sheet="Facebook User-Friends", target="social_media",
+    required_sources=("User ID",),
+    columns=(
+        ColumnRule("account_name", ("Display Name",)),
+        ColumnRule("full_name", ("First Name", "Last Name"), join=" "),
+        ColumnRule("phone_number", ("Phone Number",)),
+        ColumnRule("facebook_id", ("User ID",)),
+    ),
+    constants={"source": "Facebook"},
+))
+
+register_mapping(SheetMapping(
+    tool=AXIOM, sheet="WhatsApp Contacts - Android", target="social_media",
+    required_sources=("ID",),
+    columns=(
+        ColumnRule("account_name", ("WhatsApp Name",)),
+        ColumnRule("full_name", ("Given Name", "Family Name"), join=" "),
+        ColumnRule("phone_number", ("Phone Number",)),
+        ColumnRule("whatsapp_id", ("ID",)),
+    ),
+    constants={"source": "WhatsApp"},
+))
+
+register_mapping(SheetMapping(
+    tool=AXIOM, sheet="WhatsApp Accounts Information", target="social_media", sheet_label="WhatsApp Accounts Information",
+    columns=(
+        ColumnRule("account_name", ("WhatsApp Name", "Phone Number")),
+        ColumnRule("full_name", ("WhatsApp Name",)),
+        ColumnRule("phone_number", ("Phone Number",)),
+        ColumnRule("whatsapp_id", ("Phone Number", "WhatsApp Name")),
+    ),
+    require_any=("account_name",),
+    constants={"source": "WhatsApp"},
+))
+
+register_mapping(SheetMapping(
+    tool=AXIOM, sheet="Twitter Direct Messages", target="chat_messages", exact=True,
+    columns=(
+        ColumnRule("message_text", ("Text",), transforms=(strip,)),
+        ColumnRule("from_name", ("Sender Name",), transforms=(strip,), default=""),
+        ColumnRule("sender_number", ("Sender ID",), transforms=(strip,), default=""),
+        ColumnRule("to_name", ("Recipient Name(s)",), transforms=(strip,), default=""),
+        ColumnRule("recipient_number", ("Recipient ID(s)",), transforms=(strip,), default=""),
+        ColumnRule("timestamp", (
+            "Sent/Received Date/Time - UTC+00:00 (dd/MM/yyyy)",
+            "Message Date/Time - UTC+00:00 (dd/MM/yyyy)",
+            "Created Date/Time - UTC+00:00 (dd/MM/yyyy)",
+            "Timestamp",
+            "Date/Time",
+        ), transforms=(strip,), default=""),
+        ColumnRule("thread_id", ("_ThreadID",), transforms=(strip,)),
+        ColumnRule("message_id", ("Item ID",), transforms=(strip,)),
+        ColumnRule("direction", ("Direction",), transforms=(strip,)),
+    ),
+    require_any=("message_text",),
+    filters=(_direction_is_sent_or_received,),
+    derived=(
+        ("direction", _direction_from_sent_received),
+        ("thread_id", _thread_from_participants),
+        ("chat_id", _coalesce("thread_id")),
+        ("message_id", _indexed_message_id("twitter")),
+    ),
+    constants={"platform": "X", "message_type": "text", "source_tool": AXIOM},
+    key_columns=("platform", "message_id"),
+))
+
+
+for sheet, column in (
+    ("Instagram Profiles", "User ID"),
+    ("Twitter Users", "User ID"),
+    ("Telegram Accounts", "Account ID"),
+    ("TikTok Contacts", "ID"),
+    ("Facebook Contacts", "Profile ID"),
+    ("Facebook User-Friends", "User ID"),
+    ("WhatsApp Contacts", "ID"),
+    ("WhatsApp User Profiles", "Phone Number"),
+):
+    register_count(SheetCount(tool=AXIOM, sheet=sheet, column=column))
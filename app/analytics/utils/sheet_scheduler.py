@@ -0,0 +1,160 @@
+from concurrent.futures import ProcessPoolExecutor, Future
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Any, Callable, Iterator, NamedTuple, Optional, Tuple
+from app.core.config import settings
+from app.analytics.utils.sheet_mapping import find_mapping, parse_sheet
+import logging, multiprocessing, os, pickle, tempfile, threading
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+class SheetTask(NamedTuple):
+    sheet_name: str
+    func: Callable[..., List[Dict[str, Any]]]
+    args: Tuple[Any, ...]
+    label: Optional[str] = None
+
+
+def call_parser_method(parser_cls: type, method_name: str, *args: Any) -> List[Dict[str, Any]]:
+    parser = parser_cls(None)
+    return getattr(parser, method_name)(*args)
+
+
+def parse_registered_sheet(tool: str, target: str, file_path: str, sheet_name: str, file_id: int) -> List[Dict[str, Any]]:
+    mapping = find_mapping(tool, sheet_name, target=target)
+    if mapping is None:
+        return []
+    return parse_sheet(mapping, file_path, sheet_name, file_id)
+
+
+def run_spooled(func: Callable[..., List[Dict[str, Any]]], args: Tuple[Any, ...], batch_size: int) -> Tuple[str, int]:
+    # Runs in the worker. Rows are pickled to a temp file one batch at a time, so the
+    # parent reads them back batch by batch instead of receiving the whole sheet.
+    rows = func(*args)
+    fd, path = tempfile.mkstemp(prefix="sheet-", suffix=".pickle")
+    try:
+        with os.fdopen(fd, "wb") as spool:
+            for start in range(0, len(rows), batch_size):
+                pickle.dump(rows[start:start + batch_size], spool, protocol=pickle.HIGHEST_PROTOCOL)
+    except BaseException:
+        _remove_spool(path)
+        raise
+    return path, len(rows)
+
+
+def _remove_spool(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _read_spool(path: str) -> Iterator[List[Dict[str, Any]]]:
+    try:
+        with open(path, "rb") as spool:
+            while True:
+                try:
+                    yield pickle.load(spool)
+                except EOFError:
+                    return
+    finally:
+        _remove_spool(path)
+
+
+def _discard_result(future: Future) -> None:
+    if not future.cancelled() and future.exception() is None:
+        _remove_spool(future.result()[0])
+
+
+def parser_task(parser_cls: type, method_name: str, file_path: str, sheet_name: str, file_id: int, label: Optional[str] = None) -> SheetTask:
+    return SheetTask(sheet_name, call_parser_method, (parser_cls, method_name, file_path, sheet_name, file_id), label)
+
+
+def mapping_task(tool: str, target: str, file_path: str, sheet_name: str, file_id: int, label: Optional[str] = None) -> SheetTask:
+    return SheetTask(sheet_name, parse_registered_sheet, (tool, target, file_path, sheet_name, file_id), label)
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Spawned workers do not inherit the API process's DB connections or threads.
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.SHEET_PARSER_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def _reset_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def shutdown_sheet_pool() -> None:
+    _reset_pool()
+
+
+def _run_inline(tasks: List[SheetTask], batch_size: int) -> Iterator[Tuple[SheetTask, List[Dict[str, Any]]]]:
+    for task in tasks:
+        rows = task.func(*task.args)
+        for start in range(0, len(rows), batch_size):
+            yield task, rows[start:start + batch_size]
+
+
+def run_sheet_tasks(tasks: List[SheetTask], batch_size: Optional[int] = None) -> Iterator[Tuple[SheetTask, List[Dict[str, Any]]]]:
+    # Yields (task, batch) pairs; a sheet may span several batches. Callers write each
+    # batch as it arrives.
+    batch_size = batch_size or settings.ANALYTICS_BATCH_SIZE
+    if len(tasks) < 2 or settings.SHEET_PARSER_WORKERS <= 1:
+        yield from _run_inline(tasks, batch_size)
+        return
+
+    try:
+        pool = _get_pool()
+        futures: List[Future] = [pool.submit(run_spooled, task.func, task.args, batch_size) for task in tasks]
+    except Exception as e:
+        logger.warning(f"[SHEET SCHEDULER] Process pool unavailable, parsing {len(tasks)} sheets sequentially: {e}")
+        _reset_pool()
+        yield from _run_inline(tasks, batch_size)
+        return
+
+    logger.info(f"[SHEET SCHEDULER] Parsing {len(tasks)} sheets across {settings.SHEET_PARSER_WORKERS} workers")
+
+    # Results are handed back in submission order so the single writer
+    # sees the same row order as a sequential parse.
+    index = 0
+    try:
+        for index, (task, future) in enumerate(zip(tasks, futures)):
+            try:
+                path, _ = future.result()
+            except BrokenProcessPool as e:
+                logger.warning(f"[SHEET SCHEDULER] Worker pool broke on sheet '{task.sheet_name}', finishing sequentially: {e}")
+                _reset_pool()
+                # Sheets that finished before the pool broke are re-parsed inline, so
+                # their spools are dropped here rather than left in the temp dir.
+                for pending in futures[index:]:
+                    pending.add_done_callback(_discard_result)
+                remaining, index = tasks[index:], len(tasks)
+                yield from _run_inline(remaining, batch_size)
+                return
+            except Exception as e:
+                # Pickling failures and worker-side errors; the sheet is retried in this
+                # process, where a genuine parse error surfaces as it would sequentially.
+                logger.warning(f"[SHEET SCHEDULER] Sheet '{task.sheet_name}' failed in worker, parsing it inline: {e}")
+                yield from _run_inline([task], batch_size)
+                continue
+            for batch in _read_spool(path):
+                yield task, batch
+        index = len(tasks)
+    finally:
+        # The caller stopped early or a sheet failed: drop results still in flight.
+        for future in futures[index + 1:]:
+            future.cancel()
+            future.add_done_callback(_discard_result)
@@ -5,7 +5,9 @@ from sqlalchemy.orm import Session
 from app.analytics.device_management.models import SocialMedia, ChatMessage
 from app.db.session import get_db
 from .file_validator import file_validator
-from .social_media_parsers_extended import SocialMediaParsersExtended
+from .dedup_writer import social_media_index, mark_social_media_saved, SOCIAL_MEDIA_ID_COLUMNS
+from .identifier_extractor import identifiers_for, extract_platform_id
+from .social_media_parsers_extended import SocialMediaBatchWriter, SocialMediaParsersExtended
 import io, sys, warnings, re, traceback, logging
 
 warnings.filterwarnings('ignore')
@@ -51,6 +53,7 @@ except:
 
 SOCIAL_MEDIA_PLATFORMS = ["instagram", "facebook", "whatsapp", "telegram", "x", "tiktok"]
 
+
 class SocialMediaParser(SocialMediaParsersExtended):
 
     def __init__(self, db: Session):
@@ -175,7 +178,8 @@ class SocialMediaParser(SocialMediaParsersExtended):
                             skipped_count += 1
                             continue
 
-                            self.db.add(SocialMedia(**acc))
+                        self.db.add(SocialMedia(**acc))
+                        mark_social_media_saved(self.db, acc)
                         batch_saved += 1
                     
                     self.db.commit()
@@ -459,8 +463,8 @@ class SocialMediaParser(SocialMediaParsersExtended):
         
         return results
 
-    def parse_oxygen_social_media(self, file_path: str, file_id: int) -> List[Dict[str, Any]]:
-        results = []
+    def parse_oxygen_social_media(self, file_path: str, file_id: int) -> int:
+        writer = SocialMediaBatchWriter(self)
 
         validation = file_validator.validate_excel_file(Path(file_path))
         file_validator.print_validation_summary(validation)
@@ -491,100 +495,26 @@ class SocialMediaParser(SocialMediaParsersExtended):
                 print("FOCUS: Parsing Instagram only (other platforms disabled)")
                 print("=" * 60)
                 
-                results.extend(self._parse_oxygen_instagram_sheets(file_path, xls, file_id, engine))
-                results.extend(self._parse_oxygen_contacts_sheet(file_path, xls, file_id, engine))
-
-            unique_results = []
-            seen_accounts = set()
-            
-            for acc in results:
-                if "platform" in acc:
-                    account_key = f"{acc.get('platform', '')}_{acc.get('account_id', '')}_{acc.get('account_name', '')}"
-                else:
-                    platform_ids = []
-                    if acc.get('instagram_id'):
-                        platform_ids.append(f"ig:{acc['instagram_id']}")
-                    if acc.get('facebook_id'):
-                        platform_ids.append(f"fb:{acc['facebook_id']}")
-                    if acc.get('whatsapp_id'):
-                        platform_ids.append(f"wa:{acc['whatsapp_id']}")
-                    if acc.get('telegram_id'):
-                        platform_ids.append(f"tg:{acc['telegram_id']}")
-                    if acc.get('X_id'):
-                        platform_ids.append(f"x:{acc['X_id']}")
-                    if acc.get('tiktok_id'):
-                        platform_ids.append(f"tt:{acc['tiktok_id']}")
-                    account_key = f"{acc.get('account_name', '')}_{'_'.join(platform_ids)}"
-                
-                if account_key not in seen_accounts:
-                    seen_accounts.add(account_key)
-                    unique_results.append(acc)
-            
-            print(f"Removed {len(results) - len(unique_results)} duplicate records")
-            print(f"Unique social media accounts: {len(unique_results)}")
-            
-            batch_size = 50
-            saved_count = 0
-            skipped_count = 0
-            invalid_count = 0
-            
-            for i in range(0, len(unique_results), batch_size):
-                batch = unique_results[i:i + batch_size]
-                batch_saved = 0
-                
-                try:
-                    for acc in batch:
-                        is_valid, error_msg = self._validate_social_media_data(acc)
-                        if not is_valid:
-                            invalid_count += 1
-                            if invalid_count <= 5:
-                                log_acc = self._convert_old_to_new_structure(acc) if "platform" in acc else acc
-                                platform_info = []
-                                if log_acc.get('instagram_id'):
-                                    platform_info.append(f"IG:{log_acc['instagram_id']}")
-                                if log_acc.get('facebook_id'):
-                                    platform_info.append(f"FB:{log_acc['facebook_id']}")
-                                if log_acc.get('whatsapp_id'):
-                                    platform_info.append(f"WA:{log_acc['whatsapp_id']}")
-                                if log_acc.get('X_id'):
-                                    platform_info.append(f"X:{log_acc['X_id']}")
-                                platform_str = ', '.join(platform_info) if platform_info else 'Unknown'
-                                print(f" Skipping invalid record: {error_msg} - Platform IDs: {platform_str}, Account: {log_acc.get('account_name', 'N/A')}")
-                            continue
-                        
-                        if "platform" in acc:
-                            acc = self._convert_old_to_new_structure(acc)
-                        
-                        if self._check_existing_social_media(acc):
-                            skipped_count += 1
-                            continue
-                        
-                            self.db.add(SocialMedia(**acc))
-                        batch_saved += 1
-                    
-                    self.db.commit()
-                    saved_count += batch_saved
-                    print(f"Saved batch {i//batch_size + 1}: {batch_saved}/{len(batch)} records inserted (Total saved: {saved_count}, Skipped: {skipped_count})")
-                    
-                except Exception as batch_error:
-                    print(f"Error saving batch {i//batch_size + 1}: {batch_error}")
-                    
-                    traceback.print_exc()
-                    self.db.rollback()
-                    raise batch_error
+                # Each sheet's rows are deduplicated and written before the next sheet is
+                # read; only the account keys are kept across sheets.
+                writer.extend(self._parse_oxygen_instagram_sheets(file_path, xls, file_id, engine))
+                writer.extend(self._parse_oxygen_contacts_sheet(file_path, xls, file_id, engine))
+                writer.flush()
             
-            print(f"Successfully saved {saved_count} unique Oxygen social media accounts to database")
-            if skipped_count > 0:
-                print(f"  ({skipped_count} records skipped - already exist)")
-            if invalid_count > 0:
-                print(f"  ({invalid_count} records skipped - invalid data)")
+            print(f"Removed {writer.parsed_count - writer.unique_count} duplicate records")
+            print(f"Unique social media accounts: {writer.unique_count}")
+            print(f"Successfully saved {writer.saved_count} unique Oxygen social media accounts to database")
+            if writer.skipped_count > 0:
+                print(f"  ({writer.skipped_count} records skipped - already exist)")
+            if writer.invalid_count > 0:
+                print(f"  ({writer.invalid_count} records skipped - invalid data)")
 
         except Exception as e:
             print(f"Error parsing social media Oxygen: {e}")
             self.db.rollback()
             raise e
 
-        return unique_results
+        return writer.unique_count
 
     def _parse_oxygen_instagram_sheets(self, file_path: str, xls: pd.ExcelFile, file_id: int, engine: str) -> List[Dict[str, Any]]:
         results = []
@@ -813,82 +743,16 @@ class SocialMediaParser(SocialMediaParsersExtended):
 
     def _extract_platform_id(self, text: str, platform: str) -> Optional[str]:
         """Extract platform ID dari text berdasarkan platform"""
-        if not text:
-            return None
-        
-        text_str = str(text)
-        platform_lower = platform.lower()
-        
-        patterns = {
-            "instagram": r"Instagram\s+ID[:\s]*(\d+)",
-            "facebook": r"Facebook\s+ID[:\s]*(\d+)",
-            "whatsapp": r"WhatsApp\s+ID[:\s]*([\+\d\s\-\(\)]+)|Phone\s+number[:\s]*([\+\d\s\-\(\)]+)",
-            "telegram": r"Telegram\s+ID[:\s]*(\d+)",
-            "x": r"(?:X|Twitter)\s+ID[:\s]*(\d+)",
-            "twitter": r"(?:X|Twitter)\s+ID[:\s]*(\d+)",
-            "tiktok": r"TikTok\s+ID[:\s]*(\d+)",
-        }
-        
-        pattern = patterns.get(platform_lower)
-        if pattern:
-            match = re.search(pattern, text_str, re.IGNORECASE)
-            if match:
-                for group in match.groups():
-                    if group:
-                        return group.strip()
-        return None
+        return extract_platform_id(text, platform)
     
     def _extract_nickname(self, text: str) -> Optional[str]:
-        if not text:
-            return None
-        
-        text_str = str(text)
-        match = re.search(r"Nickname[:\s]+([^\n]+)", text_str, re.IGNORECASE)
-        if match:
-            return match.group(1).strip()
-        return None
+        return identifiers_for(text).nickname
     
     def _extract_location(self, text: str) -> Optional[str]:
-        if not text:
-            return None
-        
-        text_str = str(text)
-        match = re.search(r"Location[:\s]+([^\n]+)", text_str, re.IGNORECASE)
-        if match:
-            return match.group(1).strip()
-        return None
+        return identifiers_for(text).location
     
     def _extract_phone_number_from_text(self, text: str) -> Optional[str]:
-        if not text:
-            return None
-        
-        text_str = str(text)
-        
-        match = re.search(r"Phone\s+number[:\s]+([\+\d\s\-\(\)@\.]+)", text_str, re.IGNORECASE)
-        if match:
-            phone = match.group(1).strip()
-            phone = phone.replace('@s.whatsapp.net', '')
-            phone = re.sub(r'\s+', '', phone)
-            if phone.startswith('+'):
-                phone = '+' + re.sub(r'[^\d]', '', phone[1:])
-            else:
-                phone = re.sub(r'[^\d]', '', phone)
-            if phone and len(phone) >= 8 and phone not in ['0', '+0']:
-                return phone
-        
-        phone_match = re.search(r"(?:Home|Mobile|Work|Cell|Phone|Office)[:\s]+([\+\d\s\-\(\)]+)", text_str, re.IGNORECASE)
-        if phone_match:
-            phone = phone_match.group(1).strip()
-            phone = phone.replace('@s.whatsapp.net', '')
-            phone = re.sub(r'\s+', '', phone)
-            if phone.startswith('+'):
-                phone = '+' + re.sub(r'[^\d]', '', phone[1:])
-            else:
-                phone = re.sub(r'[^\d]', '', phone)
-            if phone and len(phone) >= 8 and phone not in ['0', '+0']:
-                return phone
-        
-        return None
+        return identifiers_for(text).phone_number
     
     def _extract_full_name_from_contact(self, text: str) -> Optional[str]:
         if not text:
@@ -912,116 +776,19 @@ class SocialMediaParser(SocialMediaParsersExtended):
         return None
 
     def _extract_whatsapp_id_from_text(self, text: str) -> Optional[str]:
-        if not text:
-            return None
-        
-        text_str = str(text)
-        match = re.search(r'WhatsApp\s+ID[:\s]+([^\n\r]+)', text_str, re.IGNORECASE)
-        if match:
-            whatsapp_id_raw = match.group(1).strip()
-            
-            if '@s.whatsapp.net' in whatsapp_id_raw:
-                number_part = whatsapp_id_raw.split('@s.whatsapp.net')[0].strip()
-                number_part = re.sub(r'^[^\d]+', '', number_part)
-                number_part = re.sub(r'[^\d]+$', '', number_part)
-                
-                if number_part and number_part.isdigit() and len(number_part) >= 11 and number_part.startswith('8'):
-                    number_part = number_part[1:]
-                
-                if number_part and number_part.isdigit() and len(number_part) >= 8:
-                    return f"{number_part}@s.whatsapp.net"
-            else:
-                whatsapp_id = whatsapp_id_raw
-                whatsapp_id = re.sub(r'^[^\d]+', '', whatsapp_id)
-                whatsapp_id = re.sub(r'[^\d]+$', '', whatsapp_id)
-                
-                if whatsapp_id and whatsapp_id.isdigit() and len(whatsapp_id) >= 11 and whatsapp_id.startswith('8'):
-                    whatsapp_id = whatsapp_id[1:]
-                
-                if whatsapp_id and whatsapp_id.isdigit() and len(whatsapp_id) >= 8:
-                    return whatsapp_id
-        
-        return None
+        return identifiers_for(text).whatsapp_account
     
     def _extract_telegram_id_from_text(self, text: str) -> Optional[str]:
-        if not text:
-            return None
-        
-        text_str = str(text)
-        
-        match = re.search(r'Telegram\s+ID[:\s]+(\d+)', text_str, re.IGNORECASE)
-        if match:
-            telegram_id = match.group(1).strip()
-            if telegram_id and telegram_id.isdigit():
-                return telegram_id
-        
-        username_match = re.search(r'(?:Telegram|Username)[:\s]+@?([a-zA-Z0-9_]+)', text_str, re.IGNORECASE)
-        if username_match:
-            username = username_match.group(1).strip()
-            if username and len(username) > 0:
-                return username
-        
-        return None
+        return identifiers_for(text).telegram_account
     
     def _extract_tiktok_id_from_text(self, text: str) -> Optional[str]:
-        if not text:
-            return None
-        
-        text_str = str(text)
-        
-        match = re.search(r'TikTok\s+(?:ID|Username)[:\s]+@?([a-zA-Z0-9_\.]+)', text_str, re.IGNORECASE)
-        if match:
-            tiktok_id = match.group(1).strip()
-            if tiktok_id:
-                return tiktok_id
-        
-        username_match = re.search(r'TikTok[:\s]+@?([a-zA-Z0-9_\.]+)', text_str, re.IGNORECASE)
-        if username_match:
-            username = username_match.group(1).strip()
-            if username:
-                return username
-        
-        return None
+        return identifiers_for(text).tiktok_account
     
     def _extract_x_id_from_text(self, text: str) -> Optional[str]:
-        if not text:
-            return None
-        
-        text_str = str(text)
-        
-        match = re.search(r'(?:Twitter|X)\s+ID[:\s]+([a-zA-Z0-9_]+)', text_str, re.IGNORECASE)
-        if match:
-            x_id = match.group(1).strip()
-            if x_id and len(x_id) > 0:
-                return x_id
-        
-        username_match = re.search(r'(?:Twitter|X)[:\s]+@?([a-zA-Z0-9_]+)', text_str, re.IGNORECASE)
-        if username_match:
-            username = username_match.group(1).strip()
-            if username:
-                return username
-        
-        return None
+        return identifiers_for(text).x_account
     
     def _extract_facebook_id_from_text(self, text: str) -> Optional[str]:
-        if not text:
-            return None
-        
-        text_str = str(text)
-        
-        match = re.search(r'Facebook\s+ID[:\s]+(\d+)', text_str, re.IGNORECASE)
-        if match:
-            facebook_id = match.group(1).strip()
-            if facebook_id and facebook_id.isdigit():
-                return facebook_id
-        
-        username_match = re.search(r'Facebook[:\s]+(?:profile/)?([a-zA-Z0-9_\.]+)', text_str, re.IGNORECASE)
-        if username_match:
-            username = username_match.group(1).strip()
-            if username and len(username) > 0:
-                return username
-        
-        return None
+        return identifiers_for(text).facebook_account
     
     def _extract_whatsapp_account_name_from_contact(self, contact_field: str) -> Optional[str]:
         if not contact_field:
@@ -1218,6 +985,7 @@ class SocialMediaParser(SocialMediaParsersExtended):
                                 continue
                             
                             self.db.add(SocialMedia(**acc))
+                            mark_social_media_saved(self.db, acc)
                             batch_saved += 1
                         
                         self.db.commit()
@@ -1446,6 +1214,7 @@ class SocialMediaParser(SocialMediaParsersExtended):
                                     continue
                                 
                                 self.db.add(SocialMedia(**acc))
+                                mark_social_media_saved(self.db, acc)
                                 batch_saved += 1
                             
                             self.db.commit()
@@ -1883,83 +1652,24 @@ class SocialMediaParser(SocialMediaParsersExtended):
         if not file_id:
             return False
         
-        query = self.db.query(SocialMedia).filter(SocialMedia.file_id == file_id)
+        index = social_media_index(self.db, file_id)
         
-        
-        platform_ids = {
-            'instagram_id': acc.get("instagram_id"),
-            'facebook_id': acc.get("facebook_id"),
-            'whatsapp_id': acc.get("whatsapp_id"),
-            'telegram_id': acc.get("telegram_id"),
-            'X_id': acc.get("X_id"),
-            'tiktok_id': acc.get("tiktok_id"),
-        }
-        
-        has_platform_id = any(v for v in platform_ids.values() if v)
+        has_platform_id = any(acc.get(column) for column in SOCIAL_MEDIA_ID_COLUMNS)
         
         if has_platform_id:
-            from sqlalchemy import or_
-            platform_filters = []
-            platform_info = []
-            
-            if platform_ids['instagram_id']:
-                platform_filters.append(SocialMedia.instagram_id == platform_ids['instagram_id'])
-                platform_info.append(f"IG:{platform_ids['instagram_id']}")
-            if platform_ids['facebook_id']:
-                platform_filters.append(SocialMedia.facebook_id == platform_ids['facebook_id'])
-                platform_info.append(f"FB:{platform_ids['facebook_id']}")
-            if platform_ids['whatsapp_id']:
-                platform_filters.append(SocialMedia.whatsapp_id == platform_ids['whatsapp_id'])
-                platform_info.append(f"WA:{platform_ids['whatsapp_id']}")
-            if platform_ids['telegram_id']:
-                platform_filters.append(SocialMedia.telegram_id == platform_ids['telegram_id'])
-                platform_info.append(f"TG:{platform_ids['telegram_id']}")
-            if platform_ids['X_id']:
-                platform_filters.append(SocialMedia.X_id == platform_ids['X_id'])
-                platform_info.append(f"X:{platform_ids['X_id']}")
-            if platform_ids['tiktok_id']:
-                platform_filters.append(SocialMedia.tiktok_id == platform_ids['tiktok_id'])
-                platform_info.append(f"TT:{platform_ids['tiktok_id']}")
-            
-            if platform_filters:
-                existing = query.filter(or_(*platform_filters)).first()
-                if existing:
-                    import sys
-                    if not hasattr(self, '_dup_log_count'):
-                        self._dup_log_count = 0
-                    if self._dup_log_count < 5:
-                        existing_info = []
-                        telegram_id_val = existing.telegram_id
-                        if telegram_id_val is not None and str(telegram_id_val).strip():
-                            existing_info.append(f"TG:{telegram_id_val}")
-                        instagram_id_val = existing.instagram_id
-                        if instagram_id_val is not None and str(instagram_id_val).strip():
-                            existing_info.append(f"IG:{instagram_id_val}")
-                        whatsapp_id_val = existing.whatsapp_id
-                        if whatsapp_id_val is not None and str(whatsapp_id_val).strip():
-                            existing_info.append(f"WA:{whatsapp_id_val}")
-                        x_id_val = existing.X_id
-                        if x_id_val is not None and str(x_id_val).strip():
-                            existing_info.append(f"X:{x_id_val}")
-                        tiktok_id_val = existing.tiktok_id
-                        if tiktok_id_val is not None and str(tiktok_id_val).strip():
-                            existing_info.append(f"TT:{tiktok_id_val}")
-                        existing_str = ', '.join(existing_info) if existing_info else 'N/A'
-                        print(f" Duplicate detected: Platform IDs: {', '.join(platform_info)}, Account: {acc.get('account_name', 'N/A')}")
-                        print(f"    → Already exists in DB: {existing_str}, Account: {existing.account_name or 'N/A'}, Sheet: {existing.sheet_name or 'N/A'}")
-                        self._dup_log_count += 1
-                return existing is not None
+            matched_column = index.find(acc, SOCIAL_MEDIA_ID_COLUMNS)
         elif acc.get("account_name"):
-            existing = query.filter(SocialMedia.account_name == acc["account_name"]).first()
-            if existing:
-                import sys
-                if not hasattr(self, '_dup_log_count'):
-                    self._dup_log_count = 0
-                if self._dup_log_count < 5:
-                    print(f" Duplicate detected: Account name: {acc['account_name']} (no platform ID)")
-                    self._dup_log_count += 1
-            return existing is not None
+            matched_column = index.find(acc, ["account_name"])
+        else:
+            return False
         
+        if matched_column:
+            if not hasattr(self, '_dup_log_count'):
+                self._dup_log_count = 0
+            if self._dup_log_count < 5:
+                print(f" Duplicate detected: {matched_column}={acc.get(matched_column)}, Account: {acc.get('account_name', 'N/A')}")
+                self._dup_log_count += 1
+            return True
         return False
     
     def _validate_social_media_data_new(self, acc: Dict[str, Any]) -> tuple[bool, str]:
@@ -3,12 +3,127 @@ from pathlib import Path
 from typing import List, Dict, Any, Optional
 from sqlalchemy.orm import Session
 from app.analytics.device_management.models import SocialMedia, ChatMessage
-from sqlalchemy import or_
 from app.analytics.utils.chat_messages_parser_extended import ChatMessagesParserExtended
+from app.analytics.utils.dedup_writer import social_media_index, mark_social_media_saved, SOCIAL_MEDIA_KEY_COLUMNS
+from app.analytics.utils.sheet_mapping import AXIOM, count_rows, find_mapping
+from app.analytics.utils.sheet_scheduler import parser_task, mapping_task, run_sheet_tasks
 import logging, re, traceback
 
 logger = logging.getLogger(__name__)
 
+AXIOM_SOCIAL_MEDIA_SHEETS = [
+    ('WhatsApp User Profiles - Androi', '_parse_axiom_whatsapp_users'),
+    ('Android WhatsApp Accounts Infor', '_parse_axiom_whatsapp_accounts_info'),
+    ('Android WhatsApp Chats', '_parse_axiom_whatsapp_chats'),
+    ('Android WhatsApp Contacts', '_parse_axiom_whatsapp_contacts_android'),
+    ('Android WhatsApp Messages', '_parse_axiom_whatsapp_messages'),
+    ('Android WhatsApp User Profiles', '_parse_axiom_whatsapp_user_profiles'),
+    ('Telegram Chats - Android', '_parse_axiom_telegram_chats'),
+    ('Telegram Contacts - Android', '_parse_axiom_telegram_contacts_android'),
+    ('Telegram Messages - Android', '_parse_axiom_telegram_messages'),
+    ('Telegram Users - Android', '_parse_axiom_telegram_users_android'),
+]
+
+class SocialMediaBatchWriter:
+    def __init__(self, parser: "SocialMediaParsersExtended", batch_size: int = 50):
+        self.parser = parser
+        self.batch_size = batch_size
+        self.seen_accounts = set()
+        self.pending: List[Dict[str, Any]] = []
+        self.parsed_count = 0
+        self.unique_count = 0
+        self.saved_count = 0
+        self.skipped_count = 0
+        self.invalid_count = 0
+        self.batches = 0
+
+    @staticmethod
+    def account_key(acc: Dict[str, Any]) -> str:
+        if "platform" in acc:
+            return f"{acc.get('platform', '')}_{acc.get('account_id', '')}_{acc.get('account_name', '')}"
+        platform_ids = []
+        if acc.get('instagram_id'):
+            platform_ids.append(f"ig:{acc['instagram_id']}")
+        if acc.get('facebook_id'):
+            platform_ids.append(f"fb:{acc['facebook_id']}")
+        if acc.get('whatsapp_id'):
+            platform_ids.append(f"wa:{acc['whatsapp_id']}")
+        if acc.get('telegram_id'):
+            platform_ids.append(f"tg:{acc['telegram_id']}")
+        if acc.get('X_id'):
+            platform_ids.append(f"x:{acc['X_id']}")
+        if acc.get('tiktok_id'):
+            platform_ids.append(f"tt:{acc['tiktok_id']}")
+        return f"{acc.get('account_name', '')}_{'_'.join(platform_ids)}"
+
+    def extend(self, accounts: List[Dict[str, Any]]) -> None:
+        for acc in accounts:
+            self.append(acc)
+
+    def append(self, acc: Dict[str, Any]) -> None:
+        self.parsed_count += 1
+        account_key = self.account_key(acc)
+        if account_key in self.seen_accounts:
+            return
+        self.seen_accounts.add(account_key)
+        self.unique_count += 1
+        self.pending.append(acc)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> int:
+        if not self.pending:
+            return self.saved_count
+
+        parser = self.parser
+        batch, self.pending = self.pending, []
+        batch_saved = 0
+        self.batches += 1
+        try:
+            for acc in batch:
+                if "platform" in acc:
+                    acc = parser._convert_old_to_new_structure(acc)
+
+                is_valid, error_msg = parser._validate_social_media_data(acc)
+                if not is_valid:
+                    self.invalid_count += 1
+                    if self.invalid_count <= 10:
+                        platform_info = []
+                        if acc.get('instagram_id'):
+                            platform_info.append(f"IG:{acc['instagram_id']}")
+                        if acc.get('facebook_id'):
+                            platform_info.append(f"FB:{acc['facebook_id']}")
+                        if acc.get('whatsapp_id'):
+                            platform_info.append(f"WA:{acc['whatsapp_id']}")
+                        if acc.get('telegram_id'):
+                            platform_info.append(f"TG:{acc['telegram_id']}")
+                        if acc.get('X_id'):
+                            platform_info.append(f"X:{acc['X_id']}")
+                        if acc.get('tiktok_id'):
+                            platform_info.append(f"TT:{acc['tiktok_id']}")
+                        platform_str = ', '.join(platform_info) if platform_info else 'Unknown'
+                        print(f" Skipping invalid record: {error_msg} - Platform IDs: {platform_str}, Account: {acc.get('account_name', 'N/A')}")
+                    continue
+
+                if parser._check_existing_social_media(acc):
+                    self.skipped_count += 1
+                    continue
+
+                parser.db.add(SocialMedia(**acc))
+                mark_social_media_saved(parser.db, acc)
+                batch_saved += 1
+
+            parser.db.commit()
+            self.saved_count += batch_saved
+            print(f"Saved batch {self.batches}: {batch_saved}/{len(batch)} records inserted (Total saved: {self.saved_count}, Skipped: {self.skipped_count})")
+        except Exception as batch_error:
+            print(f"Error saving batch {self.batches}: {batch_error}")
+            traceback.print_exc()
+            parser.db.rollback()
+            raise batch_error
+        return self.saved_count
+
+
 class SocialMediaParsersExtended:
     
     def __init__(self, db: Session):
@@ -111,32 +226,11 @@ class SocialMediaParsersExtended:
         if not file_id:
             return False
         
-        query = self.db.query(SocialMedia).filter(SocialMedia.file_id == file_id)
-        
-        filters = []
+        index = social_media_index(self.db, file_id)
         
-        if acc.get("instagram_id"):
-            filters.append(SocialMedia.instagram_id == acc["instagram_id"])
-        if acc.get("facebook_id"):
-            filters.append(SocialMedia.facebook_id == acc["facebook_id"])
-        if acc.get("whatsapp_id"):
-            filters.append(SocialMedia.whatsapp_id == acc["whatsapp_id"])
-        if acc.get("telegram_id"):
-            filters.append(SocialMedia.telegram_id == acc["telegram_id"])
-        if acc.get("X_id"):
-            filters.append(SocialMedia.X_id == acc["X_id"])
-        if acc.get("tiktok_id"):
-            filters.append(SocialMedia.tiktok_id == acc["tiktok_id"])
-        
-        if acc.get("account_name"):
-            filters.append(SocialMedia.account_name == acc["account_name"])
-        
-        if not filters:
-            return False
-        
-        existing = query.filter(or_(*filters)).first()
-        
-        return existing is not None
+        if index.find(acc, SOCIAL_MEDIA_KEY_COLUMNS):
+            return True
+        return False
     
     def _validate_social_media_data(self, acc: Dict[str, Any]) -> tuple[bool, str]:
         return self._validate_social_media_data_new(acc)
@@ -350,159 +444,52 @@ class SocialMediaParsersExtended:
         
         return None
 
-    def parse_axiom_social_media(self, file_path: str, file_id: int) -> List[Dict[str, Any]]:
-        results = []
+    def parse_axiom_social_media(self, file_path: str, file_id: int) -> int:
+        writer = SocialMediaBatchWriter(self)
         
         try:
             xls = pd.ExcelFile(file_path, engine='openpyxl')
             
             print(f" Total sheets available: {len(xls.sheet_names)}")
             
+            tasks = []
             for sheet_name in xls.sheet_names:
                 print(f"Processing sheet: {sheet_name}")
                 sheet_name_str = str(sheet_name)
                 
-                if 'Instagram Profiles' in sheet_name_str:
-                    results.extend(self._parse_axiom_instagram_profiles(file_path, sheet_name, file_id))
-                elif 'Android Instagram Following' in sheet_name_str:
-                    results.extend(self._parse_axiom_instagram_following(file_path, sheet_name, file_id))
-                elif 'Android Instagram Users' in sheet_name_str:
-                    results.extend(self._parse_axiom_instagram_users(file_path, sheet_name, file_id))
-                
-                elif 'Twitter Users' in sheet_name_str:
-                    results.extend(self._parse_axiom_twitter_users(file_path, sheet_name, file_id))
-                
-                elif 'Telegram Accounts' in sheet_name_str:
-                    results.extend(self._parse_axiom_telegram_accounts(file_path, sheet_name, file_id))
-                elif 'User Accounts' in sheet_name_str:
-                    results.extend(self._parse_axiom_user_accounts(file_path, sheet_name, file_id))
-                
-                elif 'TikTok Contacts' in sheet_name_str:
-                    results.extend(self._parse_axiom_tiktok_contacts(file_path, sheet_name, file_id))
-                
-                elif 'Facebook Contacts' in sheet_name_str:
-                    results.extend(self._parse_axiom_facebook_contacts(file_path, sheet_name, file_id))
-                elif 'Facebook User-Friends' in sheet_name_str:
-                    results.extend(self._parse_axiom_facebook_users(file_path, sheet_name, file_id))
-                
-                elif 'WhatsApp Contacts - Android' in sheet_name_str:
-                    results.extend(self._parse_axiom_whatsapp_contacts(file_path, sheet_name, file_id))
-                elif 'WhatsApp User Profiles - Androi' in sheet_name_str:
-                    results.extend(self._parse_axiom_whatsapp_users(file_path, sheet_name, file_id))
-                elif 'WhatsApp Accounts Information' in sheet_name_str:
-                    results.extend(self._parse_axiom_whatsapp_accounts(file_path, sheet_name, file_id))
+                if find_mapping("Magnet Axiom", sheet_name_str, target="social_media"):
+                    tasks.append(mapping_task("Magnet Axiom", "social_media", file_path, sheet_name, file_id))
+                    continue
                 
-                elif 'Android WhatsApp Accounts Infor' in sheet_name_str:
-                    results.extend(self._parse_axiom_whatsapp_accounts_info(file_path, sheet_name, file_id))
-                elif 'Android WhatsApp Chats' in sheet_name_str:
-                    results.extend(self._parse_axiom_whatsapp_chats(file_path, sheet_name, file_id))
-                elif 'Android WhatsApp Contacts' in sheet_name_str:
-                    results.extend(self._parse_axiom_whatsapp_contacts_android(file_path, sheet_name, file_id))
-                elif 'Android WhatsApp Messages' in sheet_name_str:
-                    results.extend(self._parse_axiom_whatsapp_messages(file_path, sheet_name, file_id))
-                elif 'Android WhatsApp User Profiles' in sheet_name_str:
-                    results.extend(self._parse_axiom_whatsapp_user_profiles(file_path, sheet_name, file_id))
-                elif 'Telegram Chats - Android' in sheet_name_str:
-                    results.extend(self._parse_axiom_telegram_chats(file_path, sheet_name, file_id))
-                elif 'Telegram Contacts - Android' in sheet_name_str:
-                    results.extend(self._parse_axiom_telegram_contacts_android(file_path, sheet_name, file_id))
-                elif 'Telegram Messages - Android' in sheet_name_str:
-                    results.extend(self._parse_axiom_telegram_messages(file_path, sheet_name, file_id))
-                elif 'Telegram Users - Android' in sheet_name_str:
-                    results.extend(self._parse_axiom_telegram_users_android(file_path, sheet_name, file_id))
-
-            unique_results = []
-            seen_accounts = set()
+                for marker, method_name in AXIOM_SOCIAL_MEDIA_SHEETS:
+                    if marker in sheet_name_str:
+                        tasks.append(parser_task(type(self), method_name, file_path, sheet_name, file_id))
+                        break
             
-            for acc in results:
-                platform_ids = []
-                if acc.get('instagram_id'):
-                    platform_ids.append(f"ig:{acc['instagram_id']}")
-                if acc.get('facebook_id'):
-                    platform_ids.append(f"fb:{acc['facebook_id']}")
-                if acc.get('whatsapp_id'):
-                    platform_ids.append(f"wa:{acc['whatsapp_id']}")
-                if acc.get('telegram_id'):
-                    platform_ids.append(f"tg:{acc['telegram_id']}")
-                if acc.get('X_id'):
-                    platform_ids.append(f"x:{acc['X_id']}")
-                if acc.get('tiktok_id'):
-                    platform_ids.append(f"tt:{acc['tiktok_id']}")
-                account_key = f"{acc.get('account_name', '')}_{'_'.join(platform_ids)}"
-                
-                if account_key not in seen_accounts:
-                    seen_accounts.add(account_key)
-                    unique_results.append(acc)
-            
-            print(f"Removed {len(results) - len(unique_results)} duplicate records")
-            print(f"Unique social media accounts: {len(unique_results)}")
+            # Batches are deduplicated and written as they arrive; only the account keys
+            # are kept across batches.
+            for task, sheet_results in run_sheet_tasks(tasks):
+                unique_before = writer.unique_count
+                writer.extend(sheet_results)
+                print(f"{task.sheet_name}: {writer.unique_count - unique_before} unique of {len(sheet_results)} social media records in batch")
+            writer.flush()
             
-            batch_size = 50
-            saved_count = 0
-            skipped_count = 0
-            invalid_count = 0
-            
-            for i in range(0, len(unique_results), batch_size):
-                batch = unique_results[i:i + batch_size]
-                batch_saved = 0
-                
-                try:
-                    for acc in batch:
-                        if "platform" in acc:
-                            acc = self._convert_old_to_new_structure(acc)
-                        
-                        is_valid, error_msg = self._validate_social_media_data(acc)
-                        if not is_valid:
-                            invalid_count += 1
-                            if invalid_count <= 10:
-                                platform_info = []
-                                if acc.get('instagram_id'):
-                                    platform_info.append(f"IG:{acc['instagram_id']}")
-                                if acc.get('facebook_id'):
-                                    platform_info.append(f"FB:{acc['facebook_id']}")
-                                if acc.get('whatsapp_id'):
-                                    platform_info.append(f"WA:{acc['whatsapp_id']}")
-                                if acc.get('telegram_id'):
-                                    platform_info.append(f"TG:{acc['telegram_id']}")
-                                if acc.get('X_id'):
-                                    platform_info.append(f"X:{acc['X_id']}")
-                                if acc.get('tiktok_id'):
-                                    platform_info.append(f"TT:{acc['tiktok_id']}")
-                                platform_str = ', '.join(platform_info) if platform_info else 'Unknown'
-                                print(f" Skipping invalid record: {error_msg} - Platform IDs: {platform_str}, Account: {acc.get('account_name', 'N/A')}")
-                            continue
-                        
-                        if self._check_existing_social_media(acc):
-                            skipped_count += 1
-                            continue
-                        
-                        self.db.add(SocialMedia(**acc))
-                        batch_saved += 1
-                    
-                    self.db.commit()
-                    saved_count += batch_saved
-                    print(f"Saved batch {i//batch_size + 1}: {batch_saved}/{len(batch)} records inserted (Total saved: {saved_count}, Skipped: {skipped_count})")
-                    
-                except Exception as batch_error:
-                    print(f"Error saving batch {i//batch_size + 1}: {batch_error}")
-                    
-                    traceback.print_exc()
-                    self.db.rollback()
-                    raise batch_error
+            print(f"Removed {writer.parsed_count - writer.unique_count} duplicate records")
+            print(f"Unique social media accounts: {writer.unique_count}")
             
-            print(f"Successfully saved {saved_count} unique Axiom social media accounts to database")
-            if skipped_count > 0:
-                print(f"  ({skipped_count} records skipped - already exist)")
-            if invalid_count > 0:
-                print(f"  ({invalid_count} records skipped - invalid data)")
+            print(f"Successfully saved {writer.saved_count} unique Axiom social media accounts to database")
+            if writer.skipped_count > 0:
+                print(f"  ({writer.skipped_count} records skipped - already exist)")
+            if writer.invalid_count > 0:
+                print(f"  ({writer.invalid_count} records skipped - invalid data)")
             
         except Exception as e:
             print(f"Error parsing Axiom social media: {e}")
             self.db.rollback()
             raise e
         
-        return unique_results
-    
+        return writer.unique_count
+
     def count_axiom_social_media(self, file_path: str) -> int:
         try:
             file_ext = Path(file_path).suffix.lower()
@@ -514,53 +501,12 @@ class SocialMediaParsersExtended:
             else:
                 engine = 'openpyxl'
             
-            xls = pd.ExcelFile(file_path, engine=engine)
-            total_count = 0
-            
-            for sheet_name in xls.sheet_names:
-                try:
-                    sheet_name_str = str(sheet_name)
-                    if 'Instagram Profiles' in sheet_name_str:
-                        df = pd.read_excel(file_path, sheet_name=sheet_name, engine=engine, dtype=str)
-                        if 'User ID' in df.columns:
-                            total_count += len(df[df['User ID'].notna()])
-                    elif 'Twitter Users' in sheet_name_str:
-                        df = pd.read_excel(file_path, sheet_name=sheet_name, engine=engine, dtype=str)
-                        if 'User ID' in df.columns:
-                            total_count += len(df[df['User ID'].notna()])
-                    elif 'Telegram Accounts' in sheet_name_str:
-                        df = pd.read_excel(file_path, sheet_name=sheet_name, engine=engine, dtype=str)
-                        if 'Account ID' in df.columns:
-                            total_count += len(df[df['Account ID'].notna()])
-                    elif 'TikTok Contacts' in sheet_name_str:
-                        df = pd.read_excel(file_path, sheet_name=sheet_name, engine=engine, dtype=str)
-                        if 'ID' in df.columns:
-                            total_count += len(df[df['ID'].notna()])
-                    elif 'Facebook Contacts' in sheet_name_str:
-                        df = pd.read_excel(file_path, sheet_name=sheet_name, engine=engine, dtype=str)
-                        if 'Profile ID' in df.columns:
-                            total_count += len(df[df['Profile ID'].notna()])
-                    elif 'Facebook User-Friends' in sheet_name_str:
-                        df = pd.read_excel(file_path, sheet_name=sheet_name, engine=engine, dtype=str)
-                        if 'User ID' in df.columns:
-                            total_count += len(df[df['User ID'].notna()])
-                    elif 'WhatsApp Contacts' in sheet_name_str:
-                        df = pd.read_excel(file_path, sheet_name=sheet_name, engine=engine, dtype=str)
-                        if 'ID' in df.columns:
-                            total_count += len(df[df['ID'].notna()])
-                    elif 'WhatsApp User Profiles' in sheet_name_str:
-                        df = pd.read_excel(file_path, sheet_name=sheet_name, engine=engine, dtype=str)
-                        if 'Phone Number' in df.columns:
-                            total_count += len(df[df['Phone Number'].notna()])
-                except Exception:
-                    continue
-            
-            return total_count
-            
+            return count_rows(AXIOM, file_path, engine)
+
         except Exception as e:
             return 0
     
-    def parse_cellebrite_social_media(self, file_path: str, file_id: int) -> List[Dict[str, Any]]:
+    def parse_cellebrite_social_media(self, file_path: str, file_id: int) -> List[Dict[str, Any]] | int:
         results = []
         
         try:
@@ -596,7 +542,8 @@ class SocialMediaParsersExtended:
             
             elif any(keyword in ' '.join(xls.sheet_names).lower() for keyword in ['instagram', 'facebook', 'twitter', 'whatsapp', 'telegram', 'tiktok']):
                 print("Detected Oxygen format - parsing dedicated social media sheets")
-                results.extend(self.parse_oxygen_social_media(file_path, file_id))
+                # The Oxygen parser deduplicates and saves its own rows and returns the count.
+                return self.parse_oxygen_social_media(file_path, file_id)
             
             else:
                 print("Unknown format - attempting generic parsing")
@@ -670,6 +617,7 @@ class SocialMediaParsersExtended:
                             continue
                         
                         self.db.add(SocialMedia(**acc))
+                        mark_social_media_saved(self.db, acc)
                         batch_saved += 1
                     
                     self.db.commit()
@@ -1400,395 +1348,6 @@ class SocialMediaParsersExtended:
             print(f"Error counting Cellebrite social media: {e}")
             return 0
 
-    def _parse_axiom_instagram_profiles(self, file_path: str, sheet_name: str, file_id: int) -> List[Dict[str, Any]]:
-        results = []
-        try:
-            df = pd.read_excel(file_path, sheet_name=sheet_name, engine='openpyxl', dtype=str)
-            
-            for _, row in df.iterrows():
-                if self._is_na(row.get('User Name')):
-                    continue
-                    
-                following_value = self._clean(row.get('Following'))
-                followers_value = self._clean(row.get('Is Followed By'))
-                
-                following_count = 1 if following_value and following_value.lower() == 'yes' else None
-                followers_count = 1 if followers_value and followers_value.lower() == 'yes' else None
-                
-                user_id_value = self._clean(row.get('User ID'))
-                user_name_value = self._clean(row.get('User Name'))
-                
-                account_id_value = user_id_value if user_id_value else user_name_value
-                
-                acc = {
-                    "file_id": file_id,
-                    "source": "Instagram",
-                    "account_name": user_name_value,
-                    "full_name": self._clean(row.get('Name')),
-                    "phone_number": self._clean(row.get('Phone Number')),
-                    "sheet_name": "Instagram Profiles",
-                    "instagram_id": account_id_value, 
-                    "whatsapp_id": None,
-                    "telegram_id": None,
-                    "X_id": None,
-                    "facebook_id": None,
-                    "tiktok_id": None,
-                }
-                results.append(acc)
-                
-        except Exception as e:
-            print(f"Error parsing Instagram Profiles: {e}")
-        
-        return results
-
-    def _parse_axiom_instagram_following(self, file_path: str, sheet_name: str, file_id: int) -> List[Dict[str, Any]]:
-        results = []
-        try:
-            df = pd.read_excel(file_path, sheet_name=sheet_name, engine='openpyxl', dtype=str)
-            
-            for _, row in df.iterrows():
-                if self._is_na(row.get('User Name')):
-                    continue
-                
-                following_value = self._clean(row.get('Status'))
-                following_count = 1 if following_value and following_value.lower() == 'following' else None
-                
-                user_id_value = self._clean(row.get('ID'))
-                user_name_value = self._clean(row.get('User Name'))
-                
-                account_id_value = user_id_value if user_id_value else user_name_value
-                
-                acc = {
-                    "file_id": file_id,
-                    "source": "Instagram",
-                    "account_name": user_name_value,
-                    "full_name": self._clean(row.get('Full Name')),
-                    "sheet_name": "Android Instagram Following",
-                    "instagram_id": account_id_value,
-                    "whatsapp_id": None,
-                    "telegram_id": None,
-                    "X_id": None,
-                    "facebook_id": None,
-                    "tiktok_id": None,
-                }
-                results.append(acc)
-                
-        except Exception as e:
-            print(f"Error parsing Android Instagram Following: {e}")
-        return results
-
-    def _parse_axiom_instagram_users(self, file_path: str, sheet_name: str, file_id: int) -> List[Dict[str, Any]]:
-        results = []
-        try:
-            df = pd.read_excel(file_path, sheet_name=sheet_name, engine='openpyxl', dtype=str)
-            
-            for _, row in df.iterrows():
-                if self._is_na(row.get('User Name')):
-                    continue
-                
-                user_id_value = self._clean(row.get('ID'))
-                user_name_value = self._clean(row.get('User Name'))
-                
-                account_id_value = user_id_value if user_id_value else user_name_value
-                
-                acc = {
-                    "file_id": file_id,
-                    "source": "Instagram",
-                    "account_name": user_name_value,
-                    "full_name": self._clean(row.get('Full Name')),
-                    "sheet_name": "Android Instagram Users",
-                    "instagram_id": account_id_value,
-                    "whatsapp_id": None,
-                    "telegram_id": None,
-                    "X_id": None,
-                    "facebook_id": None,
-                    "tiktok_id": None,
-                }
-                results.append(acc)
-                
-        except Exception as e:
-            print(f"Error parsing Android Instagram Users: {e}")
-        
-        return results
-
-    def _parse_axiom_user_accounts(self, file_path: str, sheet_name: str, file_id: int) -> List[Dict[str, Any]]:
-        results = []
-        
-        try:
-            df = pd.read_excel(file_path, sheet_name=sheet_name, engine='openpyxl', dtype=str)
-            
-            for _, row in df.iterrows():
-                service_name = self._clean(row.get('Service Name', ''))
-                user_name = self._clean(row.get('User Name', ''))
-                user_id = self._clean(row.get('User ID', ''))
-                
-                if not service_name or 'telegram' not in service_name.lower():
-                    continue
-                
-                if not user_name and not user_id:
-                    continue
-                
-                acc = {
-                    "file_id": file_id,
-                    "source": "Telegram",
-                    "account_name": user_name or user_id,
-                    "full_name": user_name,
-                    "phone_number": self._clean(row.get('Phone Number(s)')),
-                    "sheet_name": "User Accounts",
-                    "telegram_id": user_id or user_name,
-                    "whatsapp_id": None,
-                    "instagram_id": None,
-                    "X_id": None,
-                    "facebook_id": None,
-                    "tiktok_id": None,
-                }
-                results.append(acc)
-                
-        except Exception as e:
-            print(f"Error parsing User Accounts: {e}")
-        
-        return results
-
-    def _parse_axiom_whatsapp_accounts(self, file_path: str, sheet_name: str, file_id: int) -> List[Dict[str, Any]]:
-        results = []
-        
-        try:
-            df = pd.read_excel(file_path, sheet_name=sheet_name, engine='openpyxl', dtype=str)
-            
-            for _, row in df.iterrows():
-                whatsapp_name = self._clean(row.get('WhatsApp Name'))
-                phone_number = self._clean(row.get('Phone Number'))
-                
-                if not whatsapp_name and not phone_number:
-                    continue
-                
-                acc = {
-                    "file_id": file_id,
-                    "source": "WhatsApp",
-                    "account_name": whatsapp_name or phone_number,
-                    "full_name": whatsapp_name,
-                    "phone_number": phone_number,
-                    "sheet_name": "WhatsApp Accounts Information",
-                    "whatsapp_id": phone_number or whatsapp_name,
-                    "telegram_id": None,
-                    "instagram_id": None,
-                    "X_id": None,
-                    "facebook_id": None,
-                    "tiktok_id": None,
-                }
-                results.append(acc)
-                
-        except Exception as e:
-            print(f"Error parsing WhatsApp Accounts Information: {e}")
-        
-        return results
-
-    def _parse_axiom_twitter_users(self, file_path: str, sheet_name: str, file_id: int) -> List[Dict[str, Any]]:
-        results = []
-        
-        try:
-            df = pd.read_excel(file_path, sheet_name=sheet_name, engine='openpyxl', dtype=str)
-            
-            for _, row in df.iterrows():
-                if self._is_na(row.get('User Name')):
-                    continue
-                    
-                user_id_value = self._clean(row.get('User ID'))
-                screen_name_value = self._clean(row.get('Screen Name'))
-                user_name_value = self._clean(row.get('User Name')) or screen_name_value
-                
-                account_id_value = user_id_value if user_id_value else user_name_value
-                    
-                acc = {
-                    "file_id": file_id,
-                    "source": "X (Twitter)",
-                    "account_name": user_name_value or screen_name_value,
-                    "full_name": self._clean(row.get('Full Name')),
-                    "sheet_name": "Twitter Users",
-                    "X_id": account_id_value,
-                    "whatsapp_id": None,
-                    "telegram_id": None,
-                    "instagram_id": None,
-                    "facebook_id": None,
-                    "tiktok_id": None,
-                }
-                results.append(acc)
-                
-        except Exception as e:
-            print(f"Error parsing Twitter Users: {e}")
-        
-        return results
-
-    def _parse_axiom_telegram_accounts(self, file_path: str, sheet_name: str, file_id: int) -> List[Dict[str, Any]]:
-        results = []
-        
-        try:
-            df = pd.read_excel(file_path, sheet_name=sheet_name, engine='openpyxl', dtype=str)
-            
-            for _, row in df.iterrows():
-                if self._is_na(row.get('User ID')):
-                    continue
-                    
-                first_name = self._clean(row.get('First Name', ''))
-                last_name = self._clean(row.get('Last Name', ''))
-                full_name = f"{first_name} {last_name}".strip()
-                user_name = self._clean(row.get('User Name'))
-                
-                account_id_value = self._clean(row.get('Account ID'))
-                user_id_value = self._clean(row.get('User ID'))
-                
-                account_name_value = user_name or full_name or str(user_id_value) if user_id_value else None
-                account_id_final = account_id_value if account_id_value else user_id_value
-                
-                acc = {
-                    "file_id": file_id,
-                    "source": "Telegram",
-                    "account_name": account_name_value,
-                    "full_name": full_name,
-                    "phone_number": self._clean(row.get('Phone Number')),
-                    "sheet_name": "Telegram Accounts",
-                    "telegram_id": account_id_final,
-                    "whatsapp_id": None,
-                    "instagram_id": None,
-                    "X_id": None,
-                    "facebook_id": None,
-                    "tiktok_id": None,
-                }
-                results.append(acc)
-                
-        except Exception as e:
-            print(f"Error parsing Telegram Accounts: {e}")
-        
-        return results
-
-    def _parse_axiom_tiktok_contacts(self, file_path: str, sheet_name: str, file_id: int) -> List[Dict[str, Any]]:
-        results = []
-        
-        try:
-            df = pd.read_excel(file_path, sheet_name=sheet_name, engine="openpyxl", dtype=str)
-            
-            for _, row in df.iterrows():
-                if self._is_na(row.get("ID")):
-                    continue
-                
-                nickname = self._clean(row.get("Nickname"))
-                user_name = self._clean(row.get("User Name"))
-                account_name = nickname or user_name
-                
-                acc = {
-                    "file_id": file_id,
-                    "source": "TikTok",
-                    "account_name": account_name,
-                    "full_name": nickname or user_name,
-                    "sheet_name": "TikTok Contacts",
-                    "tiktok_id": self._clean(row.get("ID")),
-                    "whatsapp_id": None,
-                    "telegram_id": None,
-                    "instagram_id": None,
-                    "X_id": None,
-                    "facebook_id": None,
-                }
-                
-                results.append(acc)
-                
-        except Exception as e:
-            print(f"Error parsing TikTok Contacts: {e}")
-        
-        return results
-
-    def _parse_axiom_facebook_contacts(self, file_path: str, sheet_name: str, file_id: int) -> List[Dict[str, Any]]:
-        results = []
-        
-        try:
-            df = pd.read_excel(file_path, sheet_name=sheet_name, engine='openpyxl', dtype=str)
-            
-            for _, row in df.iterrows():
-                if self._is_na(row.get('Profile ID')):
-                    continue
-                    
-                acc = {
-                    "file_id": file_id,
-                    "source": "Facebook",
-                    "account_name": self._clean(row.get('Display Name')),
-                    "full_name": f"{self._clean(row.get('First Name'))} {self._clean(row.get('Last Name'))}".strip(),
-                    "phone_number": self._clean(row.get('Phone Numbers')),
-                    "sheet_name": sheet_name,
-                    "facebook_id": self._clean(row.get('Profile ID')),
-                    "whatsapp_id": None,
-                    "telegram_id": None,
-                    "instagram_id": None,
-                    "X_id": None,
-                    "tiktok_id": None,
-                }
-                results.append(acc)
-                
-        except Exception as e:
-            print(f"Error parsing Facebook Contacts: {e}")
-        
-        return results
-
-    def _parse_axiom_facebook_users(self, file_path: str, sheet_name: str, file_id: int) -> List[Dict[str, Any]]:
-        results = []
-        
-        try:
-            df = pd.read_excel(file_path, sheet_name=sheet_name, engine='openpyxl', dtype=str)
-            
-            for _, row in df.iterrows():
-                if self._is_na(row.get('User ID')):
-                    continue
-                    
-                acc = {
-                    "file_id": file_id,
-                    "source": "Facebook",
-                    "account_name": self._clean(row.get('Display Name')),
-                    "full_name": f"{self._clean(row.get('First Name'))} {self._clean(row.get('Last Name'))}".strip(),
-                    "phone_number": self._clean(row.get('Phone Number')),
-                    "sheet_name": sheet_name,
-                    "facebook_id": self._clean(row.get('User ID')),
-                    "whatsapp_id": None,
-                    "telegram_id": None,
-                    "instagram_id": None,
-                    "X_id": None,
-                    "tiktok_id": None,
-                }
-                results.append(acc)
-                
-        except Exception as e:
-            print(f"Error parsing Facebook Users: {e}")
-        
-        return results
-
-    def _parse_axiom_whatsapp_contacts(self, file_path: str, sheet_name: str, file_id: int) -> List[Dict[str, Any]]:
-        results = []
-        
-        try:
-            df = pd.read_excel(file_path, sheet_name=sheet_name, engine='openpyxl', dtype=str)
-            
-            for _, row in df.iterrows():
-                if self._is_na(row.get('ID')):
-                    continue
-                    
-                acc = {
-                    "file_id": file_id,
-                    "source": "WhatsApp",
-                    "account_name": self._clean(row.get('WhatsApp Name')),
-                    "full_name": f"{self._clean(row.get('Given Name'))} {self._clean(row.get('Family Name'))}".strip(),
-                    "phone_number": self._clean(row.get('Phone Number')),
-                    "sheet_name": sheet_name,
-                    "whatsapp_id": self._clean(row.get('ID')),
-                    "telegram_id": None,
-                    "instagram_id": None,
-                    "X_id": None,
-                    "facebook_id": None,
-                    "tiktok_id": None,
-                }
-                results.append(acc)
-                
-        except Exception as e:
-            print(f"Error parsing WhatsApp Contacts: {e}")
-        
-        return results
-
     def _parse_axiom_whatsapp_users(self, file_path: str, sheet_name: str, file_id: int) -> List[Dict[str, Any]]:
         results = []
         
@@ -1837,13 +1396,13 @@ class SocialMediaParsersExtended:
             return value.lower() in ['true', 'yes', '1', 'y']
         return bool(value)
 
-    def parse_social_media_from_sample_folder(self, sample_folder_path: str, file_id: int) -> List[Dict[str, Any]]:
-        results = []
+    def parse_social_media_from_sample_folder(self, sample_folder_path: str, file_id: int) -> int:
+        total_count = 0
         sample_path = Path(sample_folder_path)
         
         if not sample_path.exists():
             print(f"Sample folder tidak ditemukan: {sample_folder_path}")
-            return results
+            return total_count
         
         for device_folder in sample_path.iterdir():
             if not device_folder.is_dir():
@@ -1866,63 +1425,60 @@ class SocialMediaParsersExtended:
                 else:
                     continue
                     
-                results.extend(tool_results)
+                total_count += tool_results
         
-        return results
+        return total_count
 
-    def _parse_axiom_social_media(self, tool_folder: Path, file_id: int) -> List[Dict[str, Any]]:
-        results = []
+    def _parse_axiom_social_media(self, tool_folder: Path, file_id: int) -> int:
+        total_count = 0
 
         excel_files = list(tool_folder.glob("*.xlsx")) + list(tool_folder.glob("*.xls"))
         
         for excel_file in excel_files:
             print(f"Parsing Axiom file: {excel_file.name}")
             try:
-                file_results = self.parse_oxygen_social_media(excel_file, file_id)
-                results.extend(file_results)
+                total_count += self.parse_oxygen_social_media(excel_file, file_id)
             except Exception as e:
                 print(f"Error parsing Axiom file {excel_file.name}: {e}")
         
-        return results
+        return total_count
 
-    def _parse_cellebrite_social_media(self, tool_folder: Path, file_id: int) -> List[Dict[str, Any]]:
+    def _parse_cellebrite_social_media(self, tool_folder: Path, file_id: int) -> int:
     
-        results = []
+        total_count = 0
         
         excel_files = list(tool_folder.glob("*.xlsx")) + list(tool_folder.glob("*.xls"))
         
         for excel_file in excel_files:
             print(f"Parsing Cellebrite file: {excel_file.name}")
             try:
-                file_results = self.parse_oxygen_social_media(excel_file, file_id)
-                results.extend(file_results)
+                total_count += self.parse_oxygen_social_media(excel_file, file_id)
             except Exception as e:
                 print(f"Error parsing Cellebrite file {excel_file.name}: {e}")
         
-        return results
+        return total_count
 
-    def _parse_oxygen_folder_social_media(self, tool_folder: Path, file_id: int) -> List[Dict[str, Any]]:
-        results = []
+    def _parse_oxygen_folder_social_media(self, tool_folder: Path, file_id: int) -> int:
+        total_count = 0
         
         excel_files = list(tool_folder.glob("*.xlsx")) + list(tool_folder.glob("*.xls"))
         
         for excel_file in excel_files:
             print(f"Parsing Oxygen file: {excel_file.name}")
             try:
-                file_results = self.parse_oxygen_social_media(excel_file, file_id)  
-                results.extend(file_results)
+                total_count += self.parse_oxygen_social_media(excel_file, file_id)
             except Exception as e:
                 print(f"Error parsing Oxygen file {excel_file.name}: {e}")
         
-        return results
+        return total_count
 
-    def parse_cellebrite_chat_messages(self, file_path: str, file_id: int) -> List[Dict[str, Any]]:
+    def parse_cellebrite_chat_messages(self, file_path: str, file_id: int) -> int:
         return self._chat_messages_parser.parse_cellebrite_chat_messages(file_path, file_id)
 
-    def parse_oxygen_chat_messages(self, file_path: str, file_id: int) -> List[Dict[str, Any]]:
+    def parse_oxygen_chat_messages(self, file_path: str, file_id: int) -> int:
         return self._chat_messages_parser.parse_oxygen_chat_messages(file_path, file_id)
 
-    def parse_axiom_chat_messages(self, file_path: str, file_id: int) -> List[Dict[str, Any]]:
+    def parse_axiom_chat_messages(self, file_path: str, file_id: int) -> int:
         return self._chat_messages_parser.parse_axiom_chat_messages(file_path, file_id)
 
     def _parse_axiom_whatsapp_accounts_info(self, file_path: str, sheet_name: str, file_id: int) -> List[Dict[str, Any]]:
@@ -0,0 +1,101 @@
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+import json, logging, os, re, threading
+
+logger = logging.getLogger(__name__)
+
+INDICATORS_FILE = "suspicious_indicators.json"
+MATCH_TYPES = ("permission", "api")
+
+
+class IndicatorIndex:
+    # Compiled view of suspicious_indicators.json. Permission and API indicators are exact
+    # matches held in frozensets per (platform, type); string indicators are folded into
+    # one case-insensitive regex per platform so a blob of text is scanned in a single pass.
+    def __init__(self, items: Iterable[dict], mtime_ns: Optional[int] = None):
+        exact: Dict[Tuple[str, str], set] = {}
+        strings: Dict[str, set] = {}
+        for item in items:
+            if not isinstance(item, dict) or not item.get("name"):
+                continue
+            platform = str(item.get("platform", "")).lower()
+            indicator_type = str(item.get("type", "")).lower()
+            if indicator_type in MATCH_TYPES:
+                exact.setdefault((platform, indicator_type), set()).add(item["name"])
+            elif indicator_type == "string":
+                strings.setdefault(platform, set()).add(item["name"])
+
+        self.mtime_ns = mtime_ns
+        self._size = sum(len(names) for names in exact.values()) + sum(len(names) for names in strings.values())
+        self._exact: Dict[Tuple[str, str], FrozenSet[str]] = {key: frozenset(names) for key, names in exact.items()}
+        self._strings: Dict[str, re.Pattern] = {
+            platform: re.compile("|".join(re.escape(s) for s in sorted(names, key=len, reverse=True)), re.IGNORECASE)
+            for platform, names in strings.items()
+        }
+
+    def __len__(self) -> int:
+        return self._size
+
+    def indicators(self, indicator_type: str, platform: str = "android") -> FrozenSet[str]:
+        return self._exact.get((platform, indicator_type), frozenset())
+
+    @property
+    def permissions(self) -> FrozenSet[str]:
+        return self.indicators("permission")
+
+    def match_permissions(self, permissions: Iterable[str], platform: str = "android") -> List[str]:
+        known = self.indicators("permission", platform)
+        return [name for name in permissions if name in known]
+
+    def match_apis(self, apis: Iterable[str], platform: str = "android") -> List[str]:
+        known = self.indicators("api", platform)
+        return [name for name in apis if name in known]
+
+    def match_strings(self, text: str, platform: str = "android") -> List[str]:
+        pattern = self._strings.get(platform)
+        if pattern is None or not text:
+            return []
+        return sorted({match.group(0).lower() for match in pattern.finditer(text)})
+
+
+EMPTY_INDEX = IndicatorIndex([])
+
+_indexes: Dict[str, IndicatorIndex] = {}
+_lock = threading.Lock()
+
+
+def _load_index(path: str, mtime_ns: int) -> IndicatorIndex:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"[INDICATORS] Failed to load {path}: {e}")
+        return IndicatorIndex([], mtime_ns)
+
+    index = IndicatorIndex(data if isinstance(data, list) else [], mtime_ns)
+    logger.info(f"[INDICATORS] Loaded {len(index)} suspicious indicators from {path}")
+    return index
+
+
+def get_indicator_index(path: str) -> IndicatorIndex:
+    # Compiled once per process; a stat() per call is all it costs until the file's
+    # mtime changes, at which point it is rebuilt.
+    path = os.path.abspath(path)
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return EMPTY_INDEX
+
+    index = _indexes.get(path)
+    if index is not None and index.mtime_ns == mtime_ns:
+        return index
+
+    with _lock:
+        index = _indexes.get(path)
+        if index is None or index.mtime_ns != mtime_ns:
+            index = _load_index(path, mtime_ns)
+            _indexes[path] = index
+        return index
+
+
+def indicator_index_for(script_dir: str) -> IndicatorIndex:
+    return get_indicator_index(os.path.join(script_dir, INDICATORS_FILE))
@@ -0,0 +1,89 @@
+from typing import Any, Iterable, Iterator, List, Sequence
+from openpyxl import Workbook
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+import csv, io, json, os
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+    "jsonl": ("application/x-ndjson", "jsonl"),
+}
+
+STREAM_CHUNK_SIZE = 64 * 1024
+XLSX_MAX_ROWS = 1048576
+XLSX_MAX_CELL_CHARS = 32767
+
+
+def iter_csv(columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # BOM so Excel opens UTF-8 names and messages correctly.
+    buffer.write("\ufeff")
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow(["" if value is None else value for value in row])
+        if buffer.tell() >= STREAM_CHUNK_SIZE:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def iter_jsonl(columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> Iterator[bytes]:
+    chunk: List[str] = []
+    size = 0
+    for row in rows:
+        line = json.dumps(dict(zip(columns, row)), ensure_ascii=False, default=str)
+        chunk.append(line)
+        size += len(line) + 1
+        if size >= STREAM_CHUNK_SIZE:
+            yield ("\n".join(chunk) + "\n").encode("utf-8")
+            chunk, size = [], 0
+    if chunk:
+        yield ("\n".join(chunk) + "\n").encode("utf-8")
+
+
+def _xlsx_value(value: Any) -> Any:
+    if value is None:
+        return None
+    if isinstance(value, (int, float, bool)):
+        return value
+    text = ILLEGAL_CHARACTERS_RE.sub("", str(value))
+    return text[:XLSX_MAX_CELL_CHARS]
+
+
+def write_xlsx(file_path: str, columns: Sequence[str], rows: Iterable[Sequence[Any]], sheet_title: str = "Export") -> int:
+    # Write-only workbooks stream rows to disk, so memory stays flat regardless of row count.
+    workbook = Workbook(write_only=True)
+    sheet_index = 1
+    sheet = workbook.create_sheet(title=sheet_title[:31])
+    sheet.append(list(columns))
+    sheet_rows = 1
+    total = 0
+
+    for row in rows:
+        if sheet_rows >= XLSX_MAX_ROWS:
+            sheet_index += 1
+            sheet = workbook.create_sheet(title=f"{sheet_title[:27]} ({sheet_index})")
+            sheet.append(list(columns))
+            sheet_rows = 1
+        sheet.append([_xlsx_value(value) for value in row])
+        sheet_rows += 1
+        total += 1
+
+    workbook.save(file_path)
+    return total
+
+
+def iter_file(file_path: str, remove: bool = True) -> Iterator[bytes]:
+    try:
+        with open(file_path, "rb") as f:
+            while True:
+                chunk = f.read(STREAM_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+    finally:
+        if remove and os.path.exists(file_path):
+            os.remove(file_path)
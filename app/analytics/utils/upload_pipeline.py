@@ -3,7 +3,7 @@ from typing import Any, Dict, Optional
 from fastapi import UploadFile
 from app.analytics.shared.models import File
 from app.analytics.device_management.service import create_device
-from app.analytics.utils.sdp_crypto import decrypt_from_sdp
+from app.analytics.utils.sdp_crypto import SDPStreamDecryptor
 from app.analytics.utils.tools_parser import tools_parser
 from app.analytics.utils.performance_optimizer import performance_optimizer
 from app.analytics.device_management.service import save_hashfiles_to_database
@@ -52,6 +52,13 @@ def format_bytes(n: int) -> str:
         i += 1
     return f"{int(x)} {units[i]}" if i == 0 else f"{x:.2f} {units[i]}"
 
+def parsed_count(result) -> int:
+    if not result:
+        return 0
+    if isinstance(result, int):
+        return result
+    return len(result)
+
 class UploadService:
     def __init__(self):
         self._progress: Dict[str, Dict[str, Any]] = {}
@@ -1055,63 +1062,37 @@ class UploadService:
             CHUNK = 1024 * 512
             written = 0
             if file_ext == ".sdp":
-                encrypted_path_abs = os.path.join(ENCRYPTED_DIR, original_filename)
-                with open(encrypted_path_abs, "wb") as f:
+                # Decrypt while reading the upload so only the plaintext ever touches disk.
+                expected_name = os.path.splitext(original_filename)[0]
+                decrypted_path_abs = os.path.join(DATA_DIR, expected_name)
+                loop = asyncio.get_event_loop()
+                decryptor = None
+                try:
+                    priv_key = _load_existing_private_key()
+                    decryptor = SDPStreamDecryptor(priv_key, decrypted_path_abs)
                     for i in range(0, total_size, CHUNK):
                         if self._is_canceled(upload_id):
+                            decryptor.abort()
                             self._mark_done(upload_id, "Upload canceled")
                             return {"status": 200, "message": "Upload canceled", "data": {"done": True}}
                         chunk = file_bytes[i:i + CHUNK]
-                        f.write(chunk)
+                        await loop.run_in_executor(None, decryptor.feed, chunk)
                         written += len(chunk)
 
-                        percent = (written / total_size) * 60
+                        percent = (written / total_size) * 80
                         progress_bytes = int((percent / 100) * total_size)
                         self._progress[upload_id].update({
                             "percent": round(percent, 2),
                             "progress_size": format_bytes(progress_bytes),
-                            "message": f"Uploading... ({percent:.2f}%)",
+                            "message": f"Uploading and decrypting... ({percent:.2f}%)",
                         })
-                        await asyncio.sleep(0.02)
 
-                try:
-                    self._progress[upload_id].update({"message": "Decrypting file...", "percent": 75})
-                    priv_key = _load_existing_private_key()
-                    
-                    loop = asyncio.get_event_loop()
-                    try:
-                        decrypted_path_abs = await asyncio.wait_for(
-                            loop.run_in_executor(None, decrypt_from_sdp, priv_key, encrypted_path_abs, DATA_DIR),
-                            timeout=300.0
-                        )
-                    except asyncio.TimeoutError:
-                        detected_tool_for_error = self._normalize_tool_name(tools) if tools else "Unknown"
-                        error_message = f"Upload hash data not found in file with {method or 'Unknown'} method and {detected_tool_for_error} tools."
-                        self._mark_done(upload_id, error_message, is_error=True, detected_tool=detected_tool_for_error, method=method, tools=tools)
-                        return {"status": 500, "message": error_message, "data": None, "detected_tool": detected_tool_for_error}
-                    except Exception as e:
-                        detected_tool_for_error = self._normalize_tool_name(tools) if tools else "Unknown"
-                        error_message = f"Upload hash data not found in file with {method or 'Unknown'} method and {detected_tool_for_error} tools."
-                        self._mark_done(upload_id, error_message, is_error=True, detected_tool=detected_tool_for_error, method=method, tools=tools)
-                        return {"status": 500, "message": error_message, "data": None, "detected_tool": detected_tool_for_error}
-                    
+                    await loop.run_in_executor(None, decryptor.finish)
                     self._progress[upload_id].update({"message": "Decryption completed", "percent": 80})
-                    
-                    expected_name = os.path.splitext(original_filename)[0]
-                    expected_abs = os.path.join(DATA_DIR, expected_name)
-                    if os.path.abspath(decrypted_path_abs) != os.path.abspath(expected_abs):
-                        
-                        if os.path.exists(expected_abs):
-                            try:
-                                os.remove(expected_abs)
-                            except Exception:
-                                pass
-                        try:
-                            os.replace(decrypted_path_abs, expected_abs)
-                            decrypted_path_abs = expected_abs
-                        except Exception:
-                            pass
                 except Exception as e:
+                    if decryptor is not None:
+                        decryptor.abort()
+                    print(f"[SDP] Streaming decryption failed for {original_filename}: {e}")
                     detected_tool_for_error = self._normalize_tool_name(tools) if tools else "Unknown"
                     error_message = f"Upload hash data not found in file with {method or 'Unknown'} method and {detected_tool_for_error} tools."
                     self._mark_done(upload_id, error_message, is_error=True, detected_tool=detected_tool_for_error, method=method, tools=tools)
@@ -1259,7 +1240,7 @@ class UploadService:
                             social_media_result = sm_parser.parse_oxygen_social_media(original_path_abs, file_id)
                     
                     if social_media_result:
-                        parsing_result["social_media_count"] = len(social_media_result)
+                        parsing_result["social_media_count"] = parsed_count(social_media_result)
                     else:
                         parsing_result["social_media_count"] = 0
                         if validation_passed:
@@ -1302,13 +1283,13 @@ class UploadService:
                     elif tools == "Oxygen":
                         print(f"Calling parse_oxygen_chat_messages for file_id={file_id}")
                         chat_messages_result = sm_parser.parse_oxygen_chat_messages(original_path_abs, file_id)
-                        print(f"parse_oxygen_chat_messages returned {len(chat_messages_result) if chat_messages_result else 0} messages")
+                        print(f"parse_oxygen_chat_messages returned {chat_messages_result or 0} messages")
                     else:
-                        chat_messages_result = []
+                        chat_messages_result = 0
                     
                     if chat_messages_result:
-                        parsing_result["chat_messages_count"] = len(chat_messages_result)
-                        print(f"Set chat_messages_count to {len(chat_messages_result)}")
+                        parsing_result["chat_messages_count"] = chat_messages_result
+                        print(f"Set chat_messages_count to {chat_messages_result}")
                     else:
                         parsing_result["chat_messages_count"] = 0
                         
@@ -1474,13 +1455,7 @@ class UploadService:
                             progress_callback=update_hashfile_progress
                         )
                         
-                        if hashfiles_result:
-                            if isinstance(hashfiles_result, int):
-                                parsing_result["hashfiles_count"] = hashfiles_result
-                            else:
-                                parsing_result["hashfiles_count"] = len(hashfiles_result)
-                        else:
-                            parsing_result["hashfiles_count"] = 0
+                        parsing_result["hashfiles_count"] = parsed_count(hashfiles_result)
                     except ValueError as ve:
                         error_str = str(ve)
                         if "Upload hash data not found" in error_str or "hash data not found" in error_str.lower():
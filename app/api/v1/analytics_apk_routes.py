@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, Query,HTTPException,UploadFile,Form, BackgroundTasks, File as FastAPIFile
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
-from app.db.session import get_db
+from app.db.session import get_db, SessionLocal
 from app.analytics.analytics_management.service import analyze_apk_from_file
 from app.analytics.analytics_management.models import ApkAnalytic, Analytic, AnalyticFile
 from app.analytics.device_management.models import File
@@ -9,7 +9,9 @@ from app.analytics.utils.upload_pipeline import upload_service
 from app.auth.models import User
 from app.api.deps import get_current_user
 from app.utils.security import validate_sql_injection_patterns, sanitize_input, validate_file_name
-import asyncio, time, uuid
+from app.core.config import settings
+from concurrent.futures import ThreadPoolExecutor
+import asyncio, threading, time, uuid
 import logging
 
 logger = logging.getLogger(__name__)
@@ -17,6 +19,13 @@ from app.api.v1.analytics_management_routes import check_analytic_access
 import os
 router = APIRouter()
 
+APK_ANALYSIS_JOBS = {}
+APK_JOB_RETENTION_SECONDS = 24 * 60 * 60
+
+# MobSF scans take minutes; they run here instead of holding a request worker.
+_apk_executor = ThreadPoolExecutor(max_workers=settings.APK_ANALYSIS_WORKERS, thread_name_prefix="apk-analysis")
+_apk_jobs_lock = threading.Lock()
+
 @router.post("/analytics/upload-apk")
 async def upload_apk(
     background_tasks: BackgroundTasks,
@@ -119,109 +128,161 @@ async def upload_apk(
             status_code=500,
         )
 
-@router.post("/analytics/analyze-apk")
-def analyze_apk(
-    file_id: int,
-    analytic_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    try:
-        analytic_obj = db.query(Analytic).filter(Analytic.id == analytic_id).first()
-        if not analytic_obj:
-            return JSONResponse({"status": 404, "message": "Analytics Not Found", "data": None}, 404)
-
-        if current_user and not check_analytic_access(analytic_obj, current_user):
-            return JSONResponse({"status": 403, "message": "Forbidden", "data": None}, 403)
-
-        if getattr(analytic_obj, 'method', None) != "APK Analytics":
-            return JSONResponse({"status": 400, "message": "Wrong Analytic Method", "data": None}, 400)
+def _validate_apk_analysis_request(db: Session, file_id: int, analytic_id: int, current_user: User):
+    analytic_obj = db.query(Analytic).filter(Analytic.id == analytic_id).first()
+    if not analytic_obj:
+        return None, None, JSONResponse({"status": 404, "message": "Analytics Not Found", "data": None}, 404)
 
-        file_obj = db.query(File).filter(File.id == file_id).first()
-        if not file_obj:
-            return JSONResponse({"status": 404, "message": "File Not Found", "data": None}, 404)
+    if current_user and not check_analytic_access(analytic_obj, current_user):
+        return None, None, JSONResponse({"status": 403, "message": "Forbidden", "data": None}, 403)
 
-        file_size_raw = getattr(file_obj, "total_size", None)
+    if getattr(analytic_obj, 'method', None) != "APK Analytics":
+        return None, None, JSONResponse({"status": 400, "message": "Wrong Analytic Method", "data": None}, 400)
 
-        if not file_size_raw and os.path.exists(file_obj.file_path):
-            file_size_raw = os.path.getsize(file_obj.file_path)
+    file_obj = db.query(File).filter(File.id == file_id).first()
+    if not file_obj:
+        return None, None, JSONResponse({"status": 404, "message": "File Not Found", "data": None}, 404)
 
-        formatted_file_size = format_file_size(file_size_raw)
+    return analytic_obj, file_obj, None
 
-        analytic_file = (
-            db.query(AnalyticFile)
-            .filter(AnalyticFile.analytic_id == analytic_id, AnalyticFile.file_id == file_id)
-            .first()
-        )
+def _run_apk_analysis(db: Session, analytic_obj: Analytic, file_obj: File, file_id: int, analytic_id: int, deep_scan: bool = False):
+    file_size_raw = getattr(file_obj, "total_size", None)
 
-        if not analytic_file:
-            analytic_file = AnalyticFile(
-                analytic_id=analytic_id,
-                file_id=file_id,
-                status="pending",
-            )
-            db.add(analytic_file)
-            db.commit()
-            db.refresh(analytic_file)
+    if not file_size_raw and os.path.exists(file_obj.file_path):
+        file_size_raw = os.path.getsize(file_obj.file_path)
 
-        result = analyze_apk_from_file(db, file_id=file_id, analytic_id=analytic_id)
-        if not isinstance(result, dict):
-            return JSONResponse({"status": 400, "message": "Invalid analysis result", "data": None}, 400)
+    formatted_file_size = format_file_size(file_size_raw)
 
-        permissions_dict = result.get("permissions", {})
-        analysis = result.get("permission_analysis", {})
-        scoring = str(analysis.get("security_score", analysis.get("safety_score", 0)))
+    analytic_file = (
+        db.query(AnalyticFile)
+        .filter(AnalyticFile.analytic_id == analytic_id, AnalyticFile.file_id == file_id)
+        .first()
+    )
 
-        setattr(analytic_file, 'status', "scanned")
-        setattr(analytic_file, 'scoring', scoring)
+    if not analytic_file:
+        analytic_file = AnalyticFile(
+            analytic_id=analytic_id,
+            file_id=file_id,
+            status="pending",
+        )
+        db.add(analytic_file)
         db.commit()
+        db.refresh(analytic_file)
+
+    result = analyze_apk_from_file(db, file_id=file_id, analytic_id=analytic_id, deep_scan=deep_scan)
+    if not isinstance(result, dict):
+        return None
+
+    return {
+        "analytic_name": analytic_obj.analytic_name,
+        "method": "APK Analytics",
+        "status": analytic_file.status,
+        "malware_scoring": result["scoring"],
+        "file_size": formatted_file_size,
+        "permissions": result["permission_rows"],
+        "scan_source": result.get("scan_source"),
+        "summary": analytic_obj.summary
+    }
 
-        db.query(ApkAnalytic).filter(ApkAnalytic.analytic_file_id == analytic_file.id).delete()
+@router.post("/analytics/analyze-apk")
+def analyze_apk(
+    file_id: int,
+    analytic_id: int,
+    deep_scan: bool = False,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    try:
+        analytic_obj, file_obj, error = _validate_apk_analysis_request(db, file_id, analytic_id, current_user)
+        if error:
+            return error
 
-        for perm, value in permissions_dict.items():
-            status = value.get("status", "unknown")
-            desc = value.get("description", "")
+        final_response = _run_apk_analysis(db, analytic_obj, file_obj, file_id, analytic_id, deep_scan)
+        if final_response is None:
+            return JSONResponse({"status": 400, "message": "Invalid analysis result", "data": None}, 400)
 
-            db.add(ApkAnalytic(
-                item=perm,
-                status=status,
-                description=desc,
-                malware_scoring=scoring,
-                analytic_file_id=analytic_file.id
-            ))
+        return JSONResponse({"status": 200, "message": "Success", "data": final_response}, 200)
 
-        db.commit()
+    except Exception as e:
+        logger.error(f"Error in get_apk_analysis: {str(e)}", exc_info=True)
+        return JSONResponse({"status": 500, "message": "An unexpected error occurred while retrieving APK analysis. Please try again later.", "data": None}, 500)
 
-        permission_rows = db.query(ApkAnalytic).filter(
-            ApkAnalytic.analytic_file_id == analytic_file.id
-        ).all()
+def _apk_job_status(job: dict) -> dict:
+    return {key: job[key] for key in ("job_id", "analytic_id", "file_id", "deep_scan", "status", "message", "data")}
 
-        permissions_list = [
-            {
-                "id": row.id,
-                "item": row.item,
-                "status": row.status,
-                "description": row.description,
+def _run_apk_analysis_job(job_id: str) -> None:
+    job = APK_ANALYSIS_JOBS[job_id]
+    job.update({"status": "running", "message": "Analyzing APK..."})
+    db = SessionLocal()
+    try:
+        analytic_obj = db.query(Analytic).filter(Analytic.id == job["analytic_id"]).first()
+        file_obj = db.query(File).filter(File.id == job["file_id"]).first()
+        if not analytic_obj or not file_obj:
+            raise ValueError("Analytic or file no longer exists")
+
+        job["data"] = _run_apk_analysis(db, analytic_obj, file_obj, job["file_id"], job["analytic_id"], job["deep_scan"])
+        if job["data"] is None:
+            raise ValueError("Invalid analysis result")
+        job.update({"status": "completed", "message": "Success"})
+    except Exception as e:
+        logger.error(f"APK analysis job {job_id} failed: {str(e)}", exc_info=True)
+        job.update({"status": "failed", "message": "APK analysis failed. Please try again later."})
+    finally:
+        job["finished_at"] = time.time()
+        db.close()
+
+@router.post("/analytics/analyze-apk/jobs")
+def submit_apk_analysis_job(
+    file_id: int,
+    analytic_id: int,
+    deep_scan: bool = False,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    try:
+        _, _, error = _validate_apk_analysis_request(db, file_id, analytic_id, current_user)
+        if error:
+            return error
+
+        with _apk_jobs_lock:
+            cutoff = time.time() - APK_JOB_RETENTION_SECONDS
+            for expired_id in [
+                job_id for job_id, job in APK_ANALYSIS_JOBS.items()
+                if job["finished_at"] and job["finished_at"] < cutoff
+            ]:
+                APK_ANALYSIS_JOBS.pop(expired_id, None)
+
+            # Re-submitting the same analytic/file while it is still running returns that job.
+            for job in APK_ANALYSIS_JOBS.values():
+                if (job["analytic_id"], job["file_id"], job["deep_scan"]) == (analytic_id, file_id, deep_scan) and job["status"] in ("queued", "running"):
+                    return JSONResponse({"status": 202, "message": "Analysis already in progress", "data": _apk_job_status(job)}, 202)
+
+            job_id = uuid.uuid4().hex
+            APK_ANALYSIS_JOBS[job_id] = {
+                "job_id": job_id,
+                "user_id": getattr(current_user, "id", None),
+                "analytic_id": analytic_id,
+                "file_id": file_id,
+                "deep_scan": deep_scan,
+                "status": "queued",
+                "message": "Waiting for an analysis worker...",
+                "data": None,
+                "finished_at": None,
             }
-            for row in permission_rows
-        ]
-
-        final_response = {
-            "analytic_name": analytic_obj.analytic_name,
-            "method": "APK Analytics",
-            "status": analytic_file.status,
-            "malware_scoring": scoring,
-            "file_size": formatted_file_size,
-            "permissions": permissions_list,
-            "summary": analytic_obj.summary
-        }
 
-        return JSONResponse({"status": 200, "message": "Success", "data": final_response}, 200)
+        _apk_executor.submit(_run_apk_analysis_job, job_id)
+        return JSONResponse({"status": 202, "message": "Analysis queued", "data": _apk_job_status(APK_ANALYSIS_JOBS[job_id])}, 202)
 
     except Exception as e:
-        logger.error(f"Error in get_apk_analysis: {str(e)}", exc_info=True)
-        return JSONResponse({"status": 500, "message": "An unexpected error occurred while retrieving APK analysis. Please try again later.", "data": None}, 500)
+        logger.error(f"Error submitting APK analysis job: {str(e)}", exc_info=True)
+        return JSONResponse({"status": 500, "message": "Failed to queue APK analysis. Please try again later.", "data": None}, 500)
 
+@router.get("/analytics/analyze-apk/jobs/{job_id}")
+def get_apk_analysis_job(job_id: str, current_user: User = Depends(get_current_user)):
+    job = APK_ANALYSIS_JOBS.get(job_id)
+    if not job or (job["user_id"] is not None and job["user_id"] != getattr(current_user, "id", None)):
+        return JSONResponse({"status": 404, "message": "Analysis job not found", "data": None}, 404)
+    return JSONResponse({"status": 200, "message": job["message"], "data": _apk_job_status(job)}, 200)
 
 UPLOAD_PROGRESS = {}
 def format_file_size(size_bytes: int) -> str:
@@ -445,3 +506,6 @@ def store_analytic_file(
             {"status": 500, "message": "An unexpected error occurred while retrieving APK analysis. Please try again later.", "data": None},
             status_code=500,
         )
+
+def shutdown_apk_analysis_pool() -> None:
+    _apk_executor.shutdown(wait=False, cancel_futures=True)
@@ -4,9 +4,10 @@ from sqlalchemy.orm import Session
 from sqlalchemy import or_, func, and_
 from app.db.session import get_db
 from app.analytics.shared.models import Device, Contact, Analytic, AnalyticDevice
+from app.analytics.shared.results import AnalyticsResult
 from app.analytics.device_management.models import ChatMessage
 from collections import defaultdict
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from datetime import datetime
 import re, logging
 
@@ -92,6 +93,28 @@ def extract_time_from_timestamp(timestamp: str) -> str:
     
     return ""
 
+def filter_chat_platform(query, platform: Optional[str]):
+    if not platform:
+        return query
+    normalized_platform = normalize_platform_name(platform)
+    if normalized_platform == 'x':
+        query = query.filter(
+            or_(
+                func.lower(ChatMessage.platform) == 'x',
+                func.lower(ChatMessage.platform) == 'twitter',
+                func.lower(ChatMessage.platform).like('%x%'),
+                func.lower(ChatMessage.platform).like('%twitter%')
+            )
+        )
+    else:
+        query = query.filter(
+            or_(
+                func.lower(ChatMessage.platform) == normalized_platform,
+                func.lower(ChatMessage.platform).like(f"%{normalized_platform}%")
+            )
+        )
+    return query
+
 def get_chat_messages_for_analytic(
     db: Session,
     analytic_id: int,
@@ -110,24 +133,7 @@ def get_chat_messages_for_analytic(
             logger.warning(f"All file_ids are None, returning empty result")
             return []
 
-    if platform:
-        normalized_platform = normalize_platform_name(platform)
-        if normalized_platform == 'x':
-            query = query.filter(
-                or_(
-                    func.lower(ChatMessage.platform) == 'x',
-                    func.lower(ChatMessage.platform) == 'twitter',
-                    func.lower(ChatMessage.platform).like('%x%'),
-                    func.lower(ChatMessage.platform).like('%twitter%')
-                )
-            )
-        else:
-            query = query.filter(
-                or_(
-                    func.lower(ChatMessage.platform) == normalized_platform,
-                    func.lower(ChatMessage.platform).like(f"%{normalized_platform}%")
-                )
-            )
+    query = filter_chat_platform(query, platform)
     
     messages = query.all()
     logger.debug(f"get_chat_messages_for_analytic: Found {len(messages)} messages (analytic_id={analytic_id}, device_id={device_id}, platform={platform}, file_ids={file_ids})")
@@ -1783,377 +1789,371 @@ def get_platform_cards_intensity(
             status_code=500
         )
 
-@router.get("/analytic/chat-detail")
-def get_chat_detail(
-    analytic_id: int = Query(..., description="Analytic ID"),
-    person_name: Optional[str] = Query(None, description="Person name to filter chat details (optional if using search only)"),
-    platform: Optional[str] = Query(None, description="Platform name (optional, can filter by search only)"),
-    device_id: Optional[int] = Query(None, description="Filter by device ID"),
-    search: Optional[str] = Query(None, description="Search text in messages (optional)"),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    try:
-        if person_name:
-            if not validate_sql_injection_patterns(person_name):
-                return JSONResponse(
-                    content={
-                        "status": 400,
-                        "message": "Invalid characters detected in person_name. Please remove any SQL injection attempts or malicious code."
-                    },
-                    status_code=400
+VALID_CHAT_PLATFORMS = ['instagram', 'telegram', 'whatsapp', 'facebook', 'x', 'tiktok']
+
+
+def _validate_chat_detail_filters(
+    person_name: Optional[str],
+    platform: Optional[str],
+    search: Optional[str]
+) -> Tuple[Optional[str], Optional[str], Optional[str], Optional[AnalyticsResult]]:
+    if person_name:
+        if not validate_sql_injection_patterns(person_name):
+            return person_name, platform, search, AnalyticsResult(
+                content={
+                    "status": 400,
+                    "message": "Invalid characters detected in person_name. Please remove any SQL injection attempts or malicious code."
+                },
+                status_code=400
             )
-            person_name = sanitize_input(person_name, max_length=255)
-        
-        if platform:
-            if not validate_sql_injection_patterns(platform):
-                return JSONResponse(
-                    content={
-                        "status": 400,
-                        "message": "Invalid characters detected in platform. Please remove any SQL injection attempts or malicious code."
-                    },
-                    status_code=400
-                )
-            platform = sanitize_input(platform, max_length=100)
-            
-            if not platform or not platform.strip():
-                return JSONResponse(
-                    content={
-                        "status": 400,
-                        "message": "Platform parameter cannot be empty"
-                    },
-                    status_code=400
-                )
-            
-            normalized = normalize_platform_name(platform)
-            valid_platforms = ['instagram', 'telegram', 'whatsapp', 'facebook', 'x', 'tiktok']
-            if normalized not in valid_platforms:
-                return JSONResponse(
-                    content={
-                        "status": 400,
-                    "message": f"Invalid platform. Supported platforms: Instagram, Telegram, WhatsApp, Facebook, X, TikTok"
-                    },
-                    status_code=400
-                )
-        
-        if search:
-            if not validate_sql_injection_patterns(search):
-                return JSONResponse(
-                    content={
-                        "status": 400,
-                        "message": "Invalid characters detected in search parameter. Please remove any SQL injection attempts or malicious code."
-                    },
-                    status_code=400
-                )
-            search = sanitize_input(search, max_length=255)
-        
-        if not person_name and not search:
-            return JSONResponse(
+        person_name = sanitize_input(person_name, max_length=255)
+
+    if platform:
+        if not validate_sql_injection_patterns(platform):
+            return person_name, platform, search, AnalyticsResult(
                 content={
                     "status": 400,
-                    "message": "Either person_name or search parameter must be provided"
+                    "message": "Invalid characters detected in platform. Please remove any SQL injection attempts or malicious code."
                 },
                 status_code=400
             )
-        
-        analytic = db.query(Analytic).filter(Analytic.id == analytic_id).first()
-        if not analytic:
-            return JSONResponse(
+        platform = sanitize_input(platform, max_length=100)
+
+        if not platform or not platform.strip():
+            return person_name, platform, search, AnalyticsResult(
                 content={
-                    "status": 404,
-                    "message": f"Analytic with ID {analytic_id} not found",
-                    "data": {
-                        "analytic_info": {
-                            "analytic_id": analytic_id,
-                            "analytic_name": "Unknown"
-                        },
-                        "next_action": "create_analytic",
-                        "redirect_to": "/analytics/start-analyzing",
-                        "instruction": "Please create a new analytic with method 'Deep Communication Analytics'"
-                    }
+                    "status": 400,
+                    "message": "Platform parameter cannot be empty"
                 },
-                status_code=404
+                status_code=400
             )
-        
-        if current_user is not None and not check_analytic_access(analytic, current_user):
-            return JSONResponse(
+
+        if normalize_platform_name(platform) not in VALID_CHAT_PLATFORMS:
+            return person_name, platform, search, AnalyticsResult(
                 content={
-                    "status": 403,
-                    "message": "You do not have permission to access this analytic"
+                    "status": 400,
+                    "message": f"Invalid platform. Supported platforms: Instagram, Telegram, WhatsApp, Facebook, X, TikTok"
                 },
-                status_code=403
+                status_code=400
             )
 
-        device_links = db.query(AnalyticDevice).filter(
-            AnalyticDevice.analytic_id == analytic_id
-        ).order_by(AnalyticDevice.id).all()
-            
-        device_ids = []
-        for link in device_links:
-            device_ids.extend(link.device_ids)
-        device_ids = list(set(device_ids))
-        
-        if not device_ids:
-            return JSONResponse(
+    if search:
+        if not validate_sql_injection_patterns(search):
+            return person_name, platform, search, AnalyticsResult(
                 content={
-                    "status": 200,
-                    "message": "No devices linked",
-                    "data": {
-                        "person_name": person_name,
-                        "platform": platform,
-                        "chat_messages": []
-                    }
+                    "status": 400,
+                    "message": "Invalid characters detected in search parameter. Please remove any SQL injection attempts or malicious code."
                 },
-                status_code=200
+                status_code=400
             )
+        search = sanitize_input(search, max_length=255)
 
-        if device_id:
-            if device_id not in device_ids:
-                return JSONResponse(
-                    content={
-                        "status": 404,
-                        "message": "Device not found in this analytic"
+    if not person_name and not search:
+        return person_name, platform, search, AnalyticsResult(
+            content={
+                "status": 400,
+                "message": "Either person_name or search parameter must be provided"
+            },
+            status_code=400
+        )
+
+    return person_name, platform, search, None
+
+
+def _get_chat_detail_devices(
+    db: Session,
+    analytic_id: int,
+    person_name: Optional[str] = None,
+    platform: Optional[str] = None,
+    device_id: Optional[int] = None,
+    current_user=None
+) -> Tuple[Optional[Analytic], List[Device], Optional[AnalyticsResult]]:
+    analytic = db.query(Analytic).filter(Analytic.id == analytic_id).first()
+    if not analytic:
+        return None, [], AnalyticsResult(
+            content={
+                "status": 404,
+                "message": f"Analytic with ID {analytic_id} not found",
+                "data": {
+                    "analytic_info": {
+                        "analytic_id": analytic_id,
+                        "analytic_name": "Unknown"
                     },
-                    status_code=404
-                )
-            device_ids = [device_id]
+                    "next_action": "create_analytic",
+                    "redirect_to": "/analytics/start-analyzing",
+                    "instruction": "Please create a new analytic with method 'Deep Communication Analytics'"
+                }
+            },
+            status_code=404
+        )
 
-        devices = db.query(Device).filter(Device.id.in_(device_ids)).order_by(Device.id).all()
-        file_ids = [d.file_id for d in devices]
-        
-        messages = get_chat_messages_for_analytic(db, analytic_id, device_id, platform, file_ids)
-        
-        chat_messages = []
-        filtered_messages = []
-        normalized_platform = normalize_platform_name(platform) if platform else None
-        person_name_normalized = person_name.strip().lower() if person_name else None
-        search_lower = search.lower() if search else None
-        
-        thread_person_map = {}
-        thread_group_map = {}
-        
-        if person_name_normalized:
-            for msg in messages:
-                if normalized_platform:
-                    msg_platform_normalized = normalize_platform_name(msg.platform or '')
-                    if msg_platform_normalized != normalized_platform:
-                        continue
-                
-                thread_id = (msg.thread_id or msg.chat_id or "").strip()
-                if thread_id:
-                    chat_type = (msg.chat_type or "").strip() if msg.chat_type else None
-                    if chat_type:
-                        chat_type_lower = chat_type.lower()
-                        if chat_type_lower in ["group", "broadcast"]:
-                            group_name = (msg.group_name or "").strip() if msg.group_name else None
-                            if group_name and group_name.strip():
-                                group_name_lower = group_name.strip().lower()
-                                person_name_len = len(person_name_normalized.strip())
-                                if person_name_len <= 2:
-                                    if group_name_lower == person_name_normalized:
-                                        if thread_id not in thread_group_map:
-                                            thread_group_map[thread_id] = group_name.strip()
-                                else:
-                                    if group_name_lower == person_name_normalized or person_name_normalized in group_name_lower:
-                                        if thread_id not in thread_group_map:
-                                            thread_group_map[thread_id] = group_name.strip()
-        
-        if person_name_normalized:
-            for msg in messages:
-                if normalized_platform:
-                    msg_platform_normalized = normalize_platform_name(msg.platform or '')
-                    if msg_platform_normalized != normalized_platform:
-                        continue
-                
-                thread_id = (msg.thread_id or msg.chat_id or "").strip()
+    if current_user is not None and not check_analytic_access(analytic, current_user):
+        return analytic, [], AnalyticsResult(
+            content={
+                "status": 403,
+                "message": "You do not have permission to access this analytic"
+            },
+            status_code=403
+        )
+
+    device_links = db.query(AnalyticDevice).filter(
+        AnalyticDevice.analytic_id == analytic_id
+    ).order_by(AnalyticDevice.id).all()
+
+    device_ids = []
+    for link in device_links:
+        device_ids.extend(link.device_ids)
+    device_ids = list(set(device_ids))
+
+    if not device_ids:
+        return analytic, [], AnalyticsResult(
+            content={
+                "status": 200,
+                "message": "No devices linked",
+                "data": {
+                    "person_name": person_name,
+                    "platform": platform,
+                    "chat_messages": []
+                }
+            },
+            status_code=200
+        )
+
+    if device_id:
+        if device_id not in device_ids:
+            return analytic, [], AnalyticsResult(
+                content={
+                    "status": 404,
+                    "message": "Device not found in this analytic"
+                },
+                status_code=404
+            )
+        device_ids = [device_id]
+
+    devices = db.query(Device).filter(Device.id.in_(device_ids)).order_by(Device.id).all()
+    return analytic, devices, None
+
+
+def _chat_detail_messages_query(db: Session, file_ids: List[int], platform: Optional[str] = None):
+    valid_file_ids = [fid for fid in file_ids if fid is not None]
+    query = db.query(ChatMessage).filter(ChatMessage.file_id.in_(valid_file_ids))
+    return filter_chat_platform(query, platform)
+
+
+class ChatDetailMatcher:
+    # Selects the messages of one chat and their direction for the chat detail view and its
+    # exports. Person matches depend on thread maps built from every message, so callers pass
+    # all messages to scan_groups() and then scan_senders() before calling match().
+
+    def __init__(self, devices: List[Device], person_name: Optional[str], platform: Optional[str], search: Optional[str]):
+        self.owner_names = {}
+        for d in devices:
+            self.owner_names.setdefault(d.file_id, (d.owner_name or "").strip().lower())
+        self.person_name = person_name
+        self.platform = normalize_platform_name(platform) if platform else None
+        self.person = person_name.strip().lower() if person_name else None
+        self.search = search.lower() if search else None
+        self.thread_group_map = {}
+        self.thread_person_map = {}
+
+        self.chat_type = None
+        self.group_name = None
+        self.group_id = None
+        self.person_id = None
+        self.chat_person_name = person_name
+
+    def _platform_matches(self, msg) -> bool:
+        return not self.platform or normalize_platform_name(msg.platform or '') == self.platform
+
+    def scan_groups(self, messages) -> None:
+        person_name_normalized = self.person
+        if not person_name_normalized:
+            return
+
+        for msg in messages:
+            if not self._platform_matches(msg):
+                continue
+
+            thread_id = (msg.thread_id or msg.chat_id or "").strip()
+            if thread_id:
                 chat_type = (msg.chat_type or "").strip() if msg.chat_type else None
-                
-                if thread_id and thread_id in thread_group_map:
-                        continue
-                
-                direction = (msg.direction or "").strip().lower()
-                if direction in ['incoming', 'received']:
-                    sender_name = (msg.from_name or "").strip().lower()
-                    sender_number = (msg.sender_number or "").strip()
-                    person_name_len = len(person_name_normalized.strip())
-                    
-                    is_likely_id = person_name_normalized.isdigit() or (len(person_name_normalized) >= 5 and person_name_normalized.replace(' ', '').isdigit())
-                    
-                    name_matched = False
-                    if person_name_len == 1:
-                        if sender_name == person_name_normalized:
-                            name_matched = True
-                    elif person_name_len == 2:
-                        if sender_name == person_name_normalized:
-                            name_matched = True
-                        else:
-                            sender_words = sender_name.split()
-                            for word in sender_words:
-                                if word.strip().lower() == person_name_normalized:
-                                    name_matched = True
-                                    break
-                    else:
-                        if sender_name == person_name_normalized or person_name_normalized in sender_name:
-                            name_matched = True
-                    
-                    number_matched = False
-                    if is_likely_id and sender_number and sender_number.strip():
-                        sender_number_normalized = sender_number.strip().lower()
-                        if sender_number_normalized == person_name_normalized:
-                            number_matched = True
-                    
-                    if (name_matched or number_matched) and thread_id:
-                        thread_person_map[thread_id] = person_name_normalized
-        
+                if chat_type:
+                    chat_type_lower = chat_type.lower()
+                    if chat_type_lower in ["group", "broadcast"]:
+                        group_name = (msg.group_name or "").strip() if msg.group_name else None
+                        if group_name and group_name.strip():
+                            group_name_lower = group_name.strip().lower()
+                            person_name_len = len(person_name_normalized.strip())
+                            if person_name_len <= 2:
+                                if group_name_lower == person_name_normalized:
+                                    if thread_id not in self.thread_group_map:
+                                        self.thread_group_map[thread_id] = group_name.strip()
+                            else:
+                                if group_name_lower == person_name_normalized or person_name_normalized in group_name_lower:
+                                    if thread_id not in self.thread_group_map:
+                                        self.thread_group_map[thread_id] = group_name.strip()
+
+    def scan_senders(self, messages) -> None:
+        person_name_normalized = self.person
+        if not person_name_normalized:
+            return
+
         for msg in messages:
-            if normalized_platform:
-                msg_platform_normalized = normalize_platform_name(msg.platform or '')
-                if msg_platform_normalized != normalized_platform:
-                    continue
-            
-            device_owner_name = None
-            for d in devices:
-                if d.file_id == msg.file_id:
-                    device_owner_name = (d.owner_name or "").strip().lower()
-                    break
-            
-            if person_name_normalized:
+            if not self._platform_matches(msg):
+                continue
+
+            thread_id = (msg.thread_id or msg.chat_id or "").strip()
+
+            if thread_id and thread_id in self.thread_group_map:
+                continue
+
+            direction = (msg.direction or "").strip().lower()
+            if direction in ['incoming', 'received']:
                 sender_name = (msg.from_name or "").strip().lower()
-                recipient_name = (msg.to_name or "").strip().lower()
-                thread_id = (msg.thread_id or msg.chat_id or "").strip()
-                chat_type = (msg.chat_type or "").strip() if msg.chat_type else None
-                group_name = (msg.group_name or "").strip() if msg.group_name else None
-                
-                group_match = False
-                person_name_len = len(person_name_normalized.strip()) if person_name_normalized else 0
-                if thread_id and thread_id in thread_group_map:
-                    group_name_from_map = thread_group_map[thread_id].lower()
+                sender_number = (msg.sender_number or "").strip()
+                person_name_len = len(person_name_normalized.strip())
+
+                is_likely_id = person_name_normalized.isdigit() or (len(person_name_normalized) >= 5 and person_name_normalized.replace(' ', '').isdigit())
+
+                name_matched = False
+                if person_name_len == 1:
+                    if sender_name == person_name_normalized:
+                        name_matched = True
+                elif person_name_len == 2:
+                    if sender_name == person_name_normalized:
+                        name_matched = True
+                    else:
+                        sender_words = sender_name.split()
+                        for word in sender_words:
+                            if word.strip().lower() == person_name_normalized:
+                                name_matched = True
+                                break
+                else:
+                    if sender_name == person_name_normalized or person_name_normalized in sender_name:
+                        name_matched = True
+
+                number_matched = False
+                if is_likely_id and sender_number and sender_number.strip():
+                    sender_number_normalized = sender_number.strip().lower()
+                    if sender_number_normalized == person_name_normalized:
+                        number_matched = True
+
+                if (name_matched or number_matched) and thread_id:
+                    self.thread_person_map[thread_id] = person_name_normalized
+
+    def match(self, msg) -> Optional[str]:
+        # Returns the message direction, or None when the message is not part of the chat.
+        if not self._platform_matches(msg):
+            return None
+
+        person_name_normalized = self.person
+        device_owner_name = self.owner_names.get(msg.file_id)
+
+        if person_name_normalized:
+            sender_name = (msg.from_name or "").strip().lower()
+            recipient_name = (msg.to_name or "").strip().lower()
+            thread_id = (msg.thread_id or msg.chat_id or "").strip()
+            chat_type = (msg.chat_type or "").strip() if msg.chat_type else None
+            group_name = (msg.group_name or "").strip() if msg.group_name else None
+
+            group_match = False
+            person_name_len = len(person_name_normalized.strip())
+            if thread_id and thread_id in self.thread_group_map:
+                group_name_from_map = self.thread_group_map[thread_id].lower()
+                if person_name_len == 1:
+                    if group_name_from_map == person_name_normalized:
+                        group_match = True
+                elif person_name_len == 2:
+                    if group_name_from_map == person_name_normalized:
+                        group_match = True
+                else:
+                    if group_name_from_map == person_name_normalized or person_name_normalized in group_name_from_map:
+                        group_match = True
+            elif chat_type and chat_type.lower() in ["group", "broadcast"]:
+                if group_name:
+                    group_name_lower = group_name.strip().lower()
                     if person_name_len == 1:
-                        if group_name_from_map == person_name_normalized:
+                        if group_name_lower == person_name_normalized:
                             group_match = True
                     elif person_name_len == 2:
-                        if group_name_from_map == person_name_normalized:
+                        if group_name_lower == person_name_normalized:
                             group_match = True
                     else:
-                        if group_name_from_map == person_name_normalized or person_name_normalized in group_name_from_map:
+                        if group_name_lower == person_name_normalized or person_name_normalized in group_name_lower:
                             group_match = True
-                elif chat_type and chat_type.lower() in ["group", "broadcast"]:
-                    if group_name:
-                        group_name_lower = group_name.strip().lower()
-                        if person_name_len == 1:
-                            if group_name_lower == person_name_normalized:
-                                group_match = True
-                        elif person_name_len == 2:
-                            if group_name_lower == person_name_normalized:
-                                group_match = True
-                        else:
-                            if group_name_lower == person_name_normalized or person_name_normalized in group_name_lower:
-                                group_match = True
-                
-                sender_match = sender_name == person_name_normalized
-                recipient_match = recipient_name == person_name_normalized
-                
-                sender_number = (msg.sender_number or "").strip()
-                recipient_number = (msg.recipient_number or "").strip()
-                
-                is_likely_id = person_name_normalized.isdigit() or (len(person_name_normalized) >= 5 and person_name_normalized.replace(' ', '').isdigit())
-                
-                if is_likely_id:
-                    if sender_number and sender_number.strip():
-                        sender_number_normalized = sender_number.strip().lower()
-                        if sender_number_normalized == person_name_normalized:
-                            sender_match = True
-                    if recipient_number and recipient_number.strip():
-                        recipient_number_normalized = recipient_number.strip().lower()
-                        if recipient_number_normalized == person_name_normalized:
-                            recipient_match = True
-                
-                if person_name_normalized:
-                    person_name_len = len(person_name_normalized.strip())
-                else:
-                    person_name_len = 0
-                
-                if not sender_match and person_name_len > 2:
-                    if person_name_normalized in sender_name:
-                        sender_match = True
-                    elif sender_name in person_name_normalized and len(sender_name) >= 3:
+
+            sender_match = sender_name == person_name_normalized
+            recipient_match = recipient_name == person_name_normalized
+
+            sender_number = (msg.sender_number or "").strip()
+            recipient_number = (msg.recipient_number or "").strip()
+
+            is_likely_id = person_name_normalized.isdigit() or (len(person_name_normalized) >= 5 and person_name_normalized.replace(' ', '').isdigit())
+
+            if is_likely_id:
+                if sender_number and sender_number.strip():
+                    sender_number_normalized = sender_number.strip().lower()
+                    if sender_number_normalized == person_name_normalized:
                         sender_match = True
-                    elif person_name_normalized and sender_name:
-                        query_words = [w for w in person_name_normalized.split() if len(w) >= 2]
-                        sender_words = [w for w in sender_name.split() if len(w) >= 2]
-                        if len(query_words) >= 2 and len(sender_words) >= 1:
-                            query_words_set = set(query_words)
-                            sender_words_set = set(sender_words)
-                            common_words = query_words_set & sender_words_set
-                            if len(common_words) >= 2 or (len(query_words) == 2 and len(common_words) == 2):
-                                sender_match = True
-                elif not sender_match and person_name_len == 1:
-                    pass
-                elif not sender_match and person_name_len == 2:
-                    sender_words = sender_name.split()
-                    for word in sender_words:
-                        if word.strip().lower() == person_name_normalized:
-                            sender_match = True
-                            break
-                
-                if not recipient_match and person_name_len > 2:
-                    if person_name_normalized in recipient_name:
+                if recipient_number and recipient_number.strip():
+                    recipient_number_normalized = recipient_number.strip().lower()
+                    if recipient_number_normalized == person_name_normalized:
                         recipient_match = True
-                    elif recipient_name in person_name_normalized and len(recipient_name) >= 3:
-                        recipient_match = True
-                    elif person_name_normalized and recipient_name:
-                        query_words = [w for w in person_name_normalized.split() if len(w) >= 2]
-                        recipient_words = [w for w in recipient_name.split() if len(w) >= 2]
-                        if len(query_words) >= 2 and len(recipient_words) >= 1:
-                            query_words_set = set(query_words)
-                            recipient_words_set = set(recipient_words)
-                            common_words = query_words_set & recipient_words_set
-                            if len(common_words) >= 2 or (len(query_words) == 2 and len(common_words) == 2):
-                                recipient_match = True
-                elif not recipient_match and person_name_len == 1:
-                    pass
-                elif not recipient_match and person_name_len == 2:
-                    recipient_words = recipient_name.split()
-                    for word in recipient_words:
-                        if word.strip().lower() == person_name_normalized:
+
+            if not sender_match and person_name_len > 2:
+                if person_name_normalized in sender_name:
+                    sender_match = True
+                elif sender_name in person_name_normalized and len(sender_name) >= 3:
+                    sender_match = True
+                elif person_name_normalized and sender_name:
+                    query_words = [w for w in person_name_normalized.split() if len(w) >= 2]
+                    sender_words = [w for w in sender_name.split() if len(w) >= 2]
+                    if len(query_words) >= 2 and len(sender_words) >= 1:
+                        query_words_set = set(query_words)
+                        sender_words_set = set(sender_words)
+                        common_words = query_words_set & sender_words_set
+                        if len(common_words) >= 2 or (len(query_words) == 2 and len(common_words) == 2):
+                            sender_match = True
+            elif not sender_match and person_name_len == 1:
+                pass
+            elif not sender_match and person_name_len == 2:
+                sender_words = sender_name.split()
+                for word in sender_words:
+                    if word.strip().lower() == person_name_normalized:
+                        sender_match = True
+                        break
+
+            if not recipient_match and person_name_len > 2:
+                if person_name_normalized in recipient_name:
+                    recipient_match = True
+                elif recipient_name in person_name_normalized and len(recipient_name) >= 3:
+                    recipient_match = True
+                elif person_name_normalized and recipient_name:
+                    query_words = [w for w in person_name_normalized.split() if len(w) >= 2]
+                    recipient_words = [w for w in recipient_name.split() if len(w) >= 2]
+                    if len(query_words) >= 2 and len(recipient_words) >= 1:
+                        query_words_set = set(query_words)
+                        recipient_words_set = set(recipient_words)
+                        common_words = query_words_set & recipient_words_set
+                        if len(common_words) >= 2 or (len(query_words) == 2 and len(common_words) == 2):
                             recipient_match = True
-                            break
-                
-                thread_match = False
-                if thread_id and thread_id in thread_person_map:
-                    thread_match = True
-                
-                if not group_match and not sender_match and not recipient_match and not thread_match:
-                    continue
-                
-                if device_owner_name:
-                    is_device_owner_sender = sender_name == device_owner_name
-                    if not is_device_owner_sender:
-                        is_device_owner_sender = (
-                            device_owner_name in sender_name or
-                            sender_name in device_owner_name or
-                            (len(set(device_owner_name.split()) & set(sender_name.split())) > 0)
-                        )
-                    
-                    is_device_owner_recipient = recipient_name == device_owner_name
-                    if not is_device_owner_recipient:
-                        is_device_owner_recipient = (
-                            device_owner_name in recipient_name or
-                            recipient_name in device_owner_name or
-                            (len(set(device_owner_name.split()) & set(recipient_name.split())) > 0)
-                        )
-                    
-                    if is_device_owner_sender and is_device_owner_recipient:
-                        continue
-            
-            if search_lower:
-                message_text = (msg.message_text or "").lower()
-                if search_lower not in message_text:
-                    continue
-            
-            direction = None
-            
-            if person_name_normalized and device_owner_name:
+            elif not recipient_match and person_name_len == 1:
+                pass
+            elif not recipient_match and person_name_len == 2:
+                recipient_words = recipient_name.split()
+                for word in recipient_words:
+                    if word.strip().lower() == person_name_normalized:
+                        recipient_match = True
+                        break
+
+            thread_match = False
+            if thread_id and thread_id in self.thread_person_map:
+                thread_match = True
+
+            if not group_match and not sender_match and not recipient_match and not thread_match:
+                return None
+
+            if device_owner_name:
                 is_device_owner_sender = sender_name == device_owner_name
                 if not is_device_owner_sender:
                     is_device_owner_sender = (
@@ -2161,7 +2161,7 @@ def get_chat_detail(
                         sender_name in device_owner_name or
                         (len(set(device_owner_name.split()) & set(sender_name.split())) > 0)
                     )
-                
+
                 is_device_owner_recipient = recipient_name == device_owner_name
                 if not is_device_owner_recipient:
                     is_device_owner_recipient = (
@@ -2169,35 +2169,198 @@ def get_chat_detail(
                         recipient_name in device_owner_name or
                         (len(set(device_owner_name.split()) & set(recipient_name.split())) > 0)
                     )
-                
-                is_person_sender = sender_match
-                is_person_recipient = recipient_match
-                
-                if is_person_sender and not is_device_owner_sender:
-                    direction = "Incoming"
-                elif is_device_owner_sender and not is_person_sender:
-                    direction = "Outgoing"
-                elif is_person_recipient and is_device_owner_sender:
-                    direction = "Outgoing"
-                elif is_person_recipient and not is_device_owner_sender:
-                    direction = "Incoming"
-                elif is_person_sender:
-                    direction = "Incoming"
-                elif is_person_recipient:
-                    direction = "Outgoing"
-                else:
-                    direction = "Unknown"
+
+                if is_device_owner_sender and is_device_owner_recipient:
+                    return None
+
+        if self.search:
+            message_text = (msg.message_text or "").lower()
+            if self.search not in message_text:
+                return None
+
+        direction = None
+
+        if person_name_normalized and device_owner_name:
+            is_person_sender = sender_match
+            is_person_recipient = recipient_match
+
+            if is_person_sender and not is_device_owner_sender:
+                direction = "Incoming"
+            elif is_device_owner_sender and not is_person_sender:
+                direction = "Outgoing"
+            elif is_person_recipient and is_device_owner_sender:
+                direction = "Outgoing"
+            elif is_person_recipient and not is_device_owner_sender:
+                direction = "Incoming"
+            elif is_person_sender:
+                direction = "Incoming"
+            elif is_person_recipient:
+                direction = "Outgoing"
+            else:
+                direction = "Unknown"
+        elif person_name_normalized:
+            if sender_match:
+                direction = "Incoming"
+            elif recipient_match:
+                direction = "Outgoing"
+            else:
+                direction = "Unknown"
+
+        if msg.direction:
+            direction = msg.direction
+
+        return direction or "Unknown"
+
+    def determine_chat(self, filtered_messages) -> None:
+        # Takes the chat type and counterpart from the first matched message that identifies
+        # them; filtered_messages may be a generator and is not consumed past that message.
+        person_name_normalized = self.person
+        person_name = self.person_name
+
+        for msg in filtered_messages:
+            msg_chat_type = (msg.chat_type or "").strip() if msg.chat_type else None
+            msg_group_name = (msg.group_name or "").strip() if msg.group_name else None
+            msg_group_id = (msg.group_id or "").strip() if msg.group_id else None
+
+            if msg_chat_type and msg_chat_type.lower() in ["group", "broadcast"]:
+                if msg_group_name:
+                    if person_name_normalized:
+                        group_name_lower = msg_group_name.strip().lower()
+                        person_name_len = len(person_name_normalized.strip())
+
+                        if person_name_len <= 2:
+                            group_matches = group_name_lower == person_name_normalized
+                        else:
+                            group_matches = group_name_lower == person_name_normalized or person_name_normalized in group_name_lower
+                        if not group_matches:
+                            continue
+
+                    self.chat_type = msg_chat_type
+                    self.group_name = msg_group_name.strip()
+                    if msg_group_id and msg_group_id.strip():
+                        self.group_id = msg_group_id.strip()
+                    break
             elif person_name_normalized:
-                if sender_match:
-                    direction = "Incoming"
-                elif recipient_match:
-                    direction = "Outgoing"
+                sender_name_val = (msg.from_name or "").strip().lower()
+                recipient_name_val = (msg.to_name or "").strip().lower()
+                sender_number_val = (msg.sender_number or "").strip()
+                recipient_number_val = (msg.recipient_number or "").strip()
+                person_name_len = len(person_name_normalized.strip())
+
+                is_likely_id = person_name_normalized.isdigit() or (len(person_name_normalized) >= 5 and person_name_normalized.replace(' ', '').isdigit())
+
+                sender_matches = sender_name_val == person_name_normalized
+                if not sender_matches and person_name_len > 2:
+                    sender_matches = (
+                        person_name_normalized in sender_name_val or
+                        sender_name_val in person_name_normalized or
+                        (len(set(person_name_normalized.split()) & set(sender_name_val.split())) > 0)
+                    )
+                elif not sender_matches and person_name_len == 1:
+                    pass
+                elif not sender_matches and person_name_len == 2:
+                    sender_words = sender_name_val.split()
+                    for word in sender_words:
+                        if word.strip().lower() == person_name_normalized:
+                            sender_matches = True
+                            break
+
+                if is_likely_id and not sender_matches and sender_number_val and sender_number_val.strip():
+                    sender_number_normalized = sender_number_val.strip().lower()
+                    if sender_number_normalized == person_name_normalized:
+                        sender_matches = True
+
+                recipient_matches = recipient_name_val == person_name_normalized
+                if not recipient_matches and person_name_len > 2:
+                    recipient_matches = (
+                        person_name_normalized in recipient_name_val or
+                        recipient_name_val in person_name_normalized or
+                        (len(set(person_name_normalized.split()) & set(recipient_name_val.split())) > 0)
+                    )
+                elif not recipient_matches and person_name_len == 1:
+                    pass
+                elif not recipient_matches and person_name_len == 2:
+                    recipient_words = recipient_name_val.split()
+                    for word in recipient_words:
+                        if word.strip().lower() == person_name_normalized:
+                            recipient_matches = True
+                            break
+
+                if is_likely_id and not recipient_matches and recipient_number_val and recipient_number_val.strip():
+                    recipient_number_normalized = recipient_number_val.strip().lower()
+                    if recipient_number_normalized == person_name_normalized:
+                        recipient_matches = True
+
+                self.chat_type = msg_chat_type or "One On One"
+                if sender_matches:
+                    self.chat_person_name = msg.from_name or person_name
+                    if msg.sender_number and msg.sender_number.strip():
+                        self.person_id = msg.sender_number.strip()
+                elif recipient_matches:
+                    self.chat_person_name = msg.to_name or person_name
+                    if msg.recipient_number and msg.recipient_number.strip():
+                        self.person_id = msg.recipient_number.strip()
                 else:
-                    direction = "Unknown"
-            
-            if msg.direction:
-                direction = msg.direction
-            
+                    if msg.from_name and msg.from_name.strip() and msg.from_name.strip() != "Unknown":
+                        self.chat_person_name = msg.from_name.strip()
+                    elif msg.to_name and msg.to_name.strip() and msg.to_name.strip() != "Unknown":
+                        self.chat_person_name = msg.to_name.strip()
+                    if msg.sender_number and msg.sender_number.strip():
+                        self.person_id = msg.sender_number.strip()
+                    elif msg.recipient_number and msg.recipient_number.strip():
+                        self.person_id = msg.recipient_number.strip()
+                break
+
+        if not self.person_id or not self.person_id.strip():
+            self.person_id = None
+        else:
+            self.person_id = self.person_id.strip()
+
+    def keeps_chat_type(self, msg_chat_type: Optional[str]) -> bool:
+        # Once the chat type is known, one-on-one chats drop group messages and group
+        # chats keep only messages of that group type.
+        if not self.chat_type:
+            return True
+        msg_chat_type = msg_chat_type.strip() if isinstance(msg_chat_type, str) else None
+        chat_type_determined_lower = self.chat_type.lower()
+        if chat_type_determined_lower == "one on one":
+            return not msg_chat_type or msg_chat_type.lower() == "one on one"
+        if chat_type_determined_lower in ["group", "broadcast"]:
+            return bool(msg_chat_type) and msg_chat_type.lower() == chat_type_determined_lower
+        return True
+
+
+def _get_chat_detail_data(
+    analytic_id: int,
+    db: Session,
+    person_name: Optional[str] = None,
+    platform: Optional[str] = None,
+    device_id: Optional[int] = None,
+    search: Optional[str] = None,
+    current_user=None
+) -> AnalyticsResult:
+    try:
+        person_name, platform, search, error = _validate_chat_detail_filters(person_name, platform, search)
+        if error:
+            return error
+
+        analytic, devices, error = _get_chat_detail_devices(db, analytic_id, person_name, platform, device_id, current_user)
+        if error:
+            return error
+
+        file_ids = [d.file_id for d in devices]
+        messages = _chat_detail_messages_query(db, file_ids, platform).order_by(ChatMessage.id).all()
+
+        matcher = ChatDetailMatcher(devices, person_name, platform, search)
+        matcher.scan_groups(messages)
+        matcher.scan_senders(messages)
+
+        chat_messages = []
+        filtered_messages = []
+        for msg in messages:
+            direction = matcher.match(msg)
+            if direction is None:
+                continue
             raw_message_text = msg.message_text or ""
             cleaned_message_text = clean_message_text(raw_message_text)
             
@@ -2259,159 +2422,19 @@ def get_chat_detail(
             })
             
             filtered_messages.append(msg)
-        
-        chat_type_determined = None
-        group_name_determined = None
-        group_id_determined = None
-        person_name_determined = person_name
-        person_id_determined = None
-        
-        if filtered_messages:
-            for msg in filtered_messages:
-                msg_chat_type = (msg.chat_type or "").strip() if msg.chat_type else None
-                msg_group_name = (msg.group_name or "").strip() if msg.group_name else None
-                msg_group_id = (msg.group_id or "").strip() if msg.group_id else None
-                
-                if msg_chat_type and msg_chat_type.lower() in ["group", "broadcast"]:
-                    if msg_group_name:
-                        if person_name_normalized:
-                            group_name_lower = msg_group_name.strip().lower()
-                            person_name_len = len(person_name_normalized.strip())
-                            
-                            if person_name_len == 1:
-                                if group_name_lower == person_name_normalized:
-                                    chat_type_determined = msg_chat_type
-                                    group_name_determined = msg_group_name.strip()
-                                    if msg_group_id and msg_group_id.strip():
-                                        group_id_determined = msg_group_id.strip()
-                                    break
-                            elif person_name_len == 2:
-                                if group_name_lower == person_name_normalized:
-                                    chat_type_determined = msg_chat_type
-                                    group_name_determined = msg_group_name.strip()
-                                    if msg_group_id and msg_group_id.strip():
-                                        group_id_determined = msg_group_id.strip()
-                                    break
-                            else:
-                                if group_name_lower == person_name_normalized or person_name_normalized in group_name_lower:
-                                    chat_type_determined = msg_chat_type
-                                    group_name_determined = msg_group_name.strip()
-                                    if msg_group_id and msg_group_id.strip():
-                                        group_id_determined = msg_group_id.strip()
-                                    break
-                        else:
-                            chat_type_determined = msg_chat_type
-                            group_name_determined = msg_group_name.strip()
-                            if msg_group_id and msg_group_id.strip():
-                                group_id_determined = msg_group_id.strip()
-                            break
-                elif person_name_normalized:
-                    sender_name_val = (msg.from_name or "").strip().lower()
-                    recipient_name_val = (msg.to_name or "").strip().lower()
-                    sender_number_val = (msg.sender_number or "").strip()
-                    recipient_number_val = (msg.recipient_number or "").strip()
-                    person_name_len = len(person_name_normalized.strip())
-                    
-                    is_likely_id = person_name_normalized.isdigit() or (len(person_name_normalized) >= 5 and person_name_normalized.replace(' ', '').isdigit())
-                    
-                    sender_matches = sender_name_val == person_name_normalized
-                    if not sender_matches and person_name_len > 2:
-                        sender_matches = (
-                            person_name_normalized in sender_name_val or
-                            sender_name_val in person_name_normalized or
-                            (len(set(person_name_normalized.split()) & set(sender_name_val.split())) > 0)
-                        )
-                    elif not sender_matches and person_name_len == 1:
-                        pass
-                    elif not sender_matches and person_name_len == 2:
-                        sender_words = sender_name_val.split()
-                        for word in sender_words:
-                            if word.strip().lower() == person_name_normalized:
-                                sender_matches = True
-                                break
-                    
-                    if is_likely_id and not sender_matches and sender_number_val and sender_number_val.strip():
-                        sender_number_normalized = sender_number_val.strip().lower()
-                        if sender_number_normalized == person_name_normalized:
-                            sender_matches = True
-                    
-                    recipient_matches = recipient_name_val == person_name_normalized
-                    if not recipient_matches and person_name_len > 2:
-                        recipient_matches = (
-                            person_name_normalized in recipient_name_val or
-                            recipient_name_val in person_name_normalized or
-                            (len(set(person_name_normalized.split()) & set(recipient_name_val.split())) > 0)
-                        )
-                    elif not recipient_matches and person_name_len == 1:
-                        pass
-                    elif not recipient_matches and person_name_len == 2:
-                        recipient_words = recipient_name_val.split()
-                        for word in recipient_words:
-                            if word.strip().lower() == person_name_normalized:
-                                recipient_matches = True
-                                break
-                    
-                    if is_likely_id and not recipient_matches and recipient_number_val and recipient_number_val.strip():
-                        recipient_number_normalized = recipient_number_val.strip().lower()
-                        if recipient_number_normalized == person_name_normalized:
-                            recipient_matches = True
-                    
-                    if sender_matches:
-                        chat_type_determined = msg_chat_type or "One On One"
-                        person_name_determined = msg.from_name or person_name
-                        if msg.sender_number and msg.sender_number.strip():
-                            person_id_determined = msg.sender_number.strip()
-                        break
-                    elif recipient_matches:
-                        chat_type_determined = msg_chat_type or "One On One"
-                        person_name_determined = msg.to_name or person_name
-                        if msg.recipient_number and msg.recipient_number.strip():
-                            person_id_determined = msg.recipient_number.strip()
-                        break
-                    else:
-                        chat_type_determined = msg_chat_type or "One On One"
-                        if msg.from_name and msg.from_name.strip() and msg.from_name.strip() != "Unknown":
-                            person_name_determined = msg.from_name.strip()
-                        elif msg.to_name and msg.to_name.strip() and msg.to_name.strip() != "Unknown":
-                            person_name_determined = msg.to_name.strip()
-                        if msg.sender_number and msg.sender_number.strip():
-                            person_id_determined = msg.sender_number.strip()
-                        elif msg.recipient_number and msg.recipient_number.strip():
-                            person_id_determined = msg.recipient_number.strip()
-                        break
-        
-        
-        if not person_id_determined or not person_id_determined.strip():
-            person_id_determined = None
-        else:
-            person_id_determined = person_id_determined.strip()
-        
-        filtered_chat_messages = []
-        if chat_type_determined:
-            chat_type_determined_lower = chat_type_determined.lower()
-            for msg_dict in chat_messages:
-                msg_chat_type = msg_dict.get("_chat_type")
-                if msg_chat_type:
-                    msg_chat_type = msg_chat_type.strip() if isinstance(msg_chat_type, str) else None
-                
-                if chat_type_determined_lower == "one on one":
-                    if msg_chat_type:
-                        msg_chat_type_lower = msg_chat_type.lower()
-                        if msg_chat_type_lower == "one on one":
-                            msg_dict_clean = {k: v for k, v in msg_dict.items() if k != "_chat_type"}
-                            filtered_chat_messages.append(msg_dict_clean)
-                    else:
-                        msg_dict_clean = {k: v for k, v in msg_dict.items() if k != "_chat_type"}
-                        filtered_chat_messages.append(msg_dict_clean)
-                elif chat_type_determined_lower in ["group", "broadcast"]:
-                    if msg_chat_type and msg_chat_type.lower() == chat_type_determined_lower:
-                        msg_dict_clean = {k: v for k, v in msg_dict.items() if k != "_chat_type"}
-                        filtered_chat_messages.append(msg_dict_clean)
-                else:
-                    msg_dict_clean = {k: v for k, v in msg_dict.items() if k != "_chat_type"}
-                    filtered_chat_messages.append(msg_dict_clean)
-        else:
-            filtered_chat_messages = [{k: v for k, v in msg_dict.items() if k != "_chat_type"} for msg_dict in chat_messages]
+
+        matcher.determine_chat(filtered_messages)
+        chat_type_determined = matcher.chat_type
+        group_name_determined = matcher.group_name
+        group_id_determined = matcher.group_id
+        person_name_determined = matcher.chat_person_name
+        person_id_determined = matcher.person_id
+
+        filtered_chat_messages = [
+            {k: v for k, v in msg_dict.items() if k != "_chat_type"}
+            for msg_dict in chat_messages
+            if matcher.keeps_chat_type(msg_dict["_chat_type"])
+        ]
 
         if person_name:
             filtered_chat_messages.sort(key=lambda x: x["timestamp"] or "", reverse=False)
@@ -2483,7 +2506,7 @@ def get_chat_detail(
             if person_id_determined:
                 response_data["person_id"] = person_id_determined
 
-        return JSONResponse(
+        return AnalyticsResult(
             content={
                 "status": 200,
                 "message": "Chat detail retrieved successfully",
@@ -2495,11 +2518,23 @@ def get_chat_detail(
         raise
     except Exception as e:
         logger.error(f"Error in get_chat_detail: {str(e)}", exc_info=True)
-        return JSONResponse(
+        return AnalyticsResult(
             content={
                 "status": 500,
                 "message": "An unexpected error occurred while retrieving chat detail. Please try again later.",
                 "data": None
             },
             status_code=500
-        )
\ No newline at end of file
+        )
+
+@router.get("/analytic/chat-detail")
+def get_chat_detail(
+    analytic_id: int = Query(..., description="Analytic ID"),
+    person_name: Optional[str] = Query(None, description="Person name to filter chat details (optional if using search only)"),
+    platform: Optional[str] = Query(None, description="Platform name (optional, can filter by search only)"),
+    device_id: Optional[int] = Query(None, description="Filter by device ID"),
+    search: Optional[str] = Query(None, description="Search text in messages (optional)"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    return _get_chat_detail_data(analytic_id, db, person_name, platform, device_id, search, current_user).to_response()
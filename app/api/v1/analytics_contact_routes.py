@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from app.db.session import get_db
 from app.analytics.shared.models import Analytic, Device, AnalyticDevice, Contact
+from app.analytics.shared.results import CORRELATION_FETCH_SIZE, AnalyticsResult
 from app.auth.models import User
 from app.api.deps import get_current_user
 from app.api.v1.analytics_management_routes import check_analytic_access
@@ -28,12 +28,12 @@ def normalize_phone_number(phone: str) -> str:
     
     return phone
 
-def _get_contact_correlation_data(analytic_id: int, db: Session, current_user=None):
+def _get_contact_correlation_data(analytic_id: int, db: Session, current_user=None) -> AnalyticsResult:
     min_devices = 2
     
     analytic = db.query(Analytic).filter(Analytic.id == analytic_id).first()
     if not analytic:
-        return JSONResponse(
+        return AnalyticsResult(
             content={
                 "status": 404,
                 "message": f"Analytic with ID {analytic_id} not found",
@@ -51,14 +51,14 @@ def _get_contact_correlation_data(analytic_id: int, db: Session, current_user=No
         )
     
     if current_user is not None and not check_analytic_access(analytic, current_user):
-        return JSONResponse(
+        return AnalyticsResult(
             content={"status": 403, "message": "You do not have permission to access this analytic", "data": None},
             status_code=403,
         )
     
     method_value = getattr(analytic, 'method', None)
     if method_value is None or str(method_value) != "Contact Correlation":
-        return JSONResponse(
+        return AnalyticsResult(
             content={
                 "status": 400, 
                 "message": f"This endpoint is only for Contact Correlation. Current analytic method is '{method_value}'", 
@@ -87,7 +87,7 @@ def _get_contact_correlation_data(analytic_id: int, db: Session, current_user=No
     
     if not device_ids:
         analytic_name_value = getattr(analytic, 'analytic_name', None) or "Unknown"
-        return JSONResponse(
+        return AnalyticsResult(
             content={
                 "status": 404,
                 "message": "No devices linked to this analytic",
@@ -109,7 +109,7 @@ def _get_contact_correlation_data(analytic_id: int, db: Session, current_user=No
     total_device_count = len(device_ids)
     if total_device_count < min_devices:
         analytic_name_value = getattr(analytic, 'analytic_name', None) or "Unknown"
-        return JSONResponse(
+        return AnalyticsResult(
             content={
                 "status": 404,
                 "message": f"Contact Correlation requires minimum {min_devices} devices. Current analytic has {total_device_count} device(s).",
@@ -132,7 +132,7 @@ def _get_contact_correlation_data(analytic_id: int, db: Session, current_user=No
     
     if not devices:
         analytic_name_value = getattr(analytic, 'analytic_name', None) or "Unknown"
-        return JSONResponse(
+        return AnalyticsResult(
             content={
                 "status": 404,
                 "message": "Devices not found for this analytic",
@@ -153,11 +153,12 @@ def _get_contact_correlation_data(analytic_id: int, db: Session, current_user=No
     
     file_ids = [d.file_id for d in devices]
     
+    # Streamed from the cursor; only the per-number correlation map is held in memory.
     contacts = (
         db.query(Contact)
         .filter(Contact.file_id.in_(file_ids))
         .order_by(Contact.id)
-        .all()
+        .yield_per(CORRELATION_FETCH_SIZE)
     )
 
     device_info = {}
@@ -279,7 +280,7 @@ def _get_contact_correlation_data(analytic_id: int, db: Session, current_user=No
     summary_value = analytic.summary
     summary = summary_value if summary_value is not None else None
 
-    return JSONResponse(
+    return AnalyticsResult(
         content={
             "status": 200,
             "message": "Contact correlation analysis completed",
@@ -299,4 +300,4 @@ def get_contact_correlation(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    return _get_contact_correlation_data(analytic_id, db, current_user)
+    return _get_contact_correlation_data(analytic_id, db, current_user).to_response()
@@ -5,6 +5,7 @@ from sqlalchemy import or_, and_
 from app.db.session import get_db
 from app.analytics.analytics_management.service import store_analytic, get_all_analytics
 from app.analytics.shared.models import Device, Analytic, AnalyticDevice, File, Contact
+from app.analytics.shared.results import CORRELATION_FETCH_SIZE, AnalyticsResult
 from app.analytics.device_management.models import HashFile
 from app.analytics.analytics_management.models import ApkAnalytic
 from typing import List, Optional
@@ -13,7 +14,7 @@ from app.utils.timezone import get_indonesia_time
 from app.core.config import settings
 from datetime import datetime, date, time
 import logging, os
-from collections import defaultdict
+from itertools import islice
 from app.auth.models import User
 from app.api.deps import get_current_user
 from app.utils.security import sanitize_input, validate_sql_injection_patterns
@@ -183,12 +184,12 @@ def _get_hashfile_analytics_data(
     analytic_id: int,
     db: Session,
     current_user=None
-):
+) -> AnalyticsResult:
     try:
         min_devices = 2
         analytic = db.query(Analytic).filter(Analytic.id == analytic_id).first()
         if not analytic:
-            return JSONResponse(
+            return AnalyticsResult(
                 {
                     "status": 404,
                     "message": f"Analytic with ID {analytic_id} not found",
@@ -206,13 +207,13 @@ def _get_hashfile_analytics_data(
             )
         
         if current_user is not None and not check_analytic_access(analytic, current_user):
-            return JSONResponse(
+            return AnalyticsResult(
                 {"status": 403, "message": "You do not have permission to access this analytic", "data": None},
                 status_code=403,
             )
         method_value = getattr(analytic, 'method', None)
         if method_value is None or str(method_value) != "Hashfile Analytics":
-            return JSONResponse(
+            return AnalyticsResult(
                 {
                     "status": 400,
                     "message": f"This endpoint is only for Hashfile Analytics. Current method: '{method_value}'",
@@ -238,7 +239,7 @@ def _get_hashfile_analytics_data(
         
         if not device_ids:
             analytic_name_value = getattr(analytic, 'analytic_name', None) or "Unknown"
-            return JSONResponse(
+            return AnalyticsResult(
                 {
                     "status": 404,
                     "message": "No devices linked to this analytic",
@@ -260,7 +261,7 @@ def _get_hashfile_analytics_data(
         total_device_count = len(device_ids)
         if total_device_count < min_devices:
             analytic_name_value = getattr(analytic, 'analytic_name', None) or "Unknown"
-            return JSONResponse(
+            return AnalyticsResult(
                 {
                     "status": 404,
                     "message": f"Hashfile Analytics requires minimum {min_devices} devices. Current analytic has {total_device_count} device(s).",
@@ -282,7 +283,7 @@ def _get_hashfile_analytics_data(
         devices = db.query(Device).filter(Device.id.in_(device_ids)).all()
         if not devices:
             analytic_name_value = getattr(analytic, 'analytic_name', None) or "Unknown"
-            return JSONResponse(
+            return AnalyticsResult(
                 {
                     "status": 404,
                     "message": "Devices not found for this analytic",
@@ -320,15 +321,11 @@ def _get_hashfile_analytics_data(
                 HashFile.md5_hash,
                 HashFile.sha1_hash,
                 HashFile.path_original,
-                HashFile.size_bytes,
                 HashFile.file_type,
-                HashFile.source_tool,
-                HashFile.created_at_original,
-                HashFile.modified_at_original,
             )
             .filter(HashFile.file_id.in_(file_ids))
             .filter(or_(HashFile.md5_hash != None, HashFile.sha1_hash != None))
-            .all()
+            .yield_per(CORRELATION_FETCH_SIZE)
         )
 
         devices_list_empty = [
@@ -339,11 +336,36 @@ def _get_hashfile_analytics_data(
             }
             for i, d in enumerate(devices)
         ]
-        
-        if not hashfiles:
+
+        # Rows are streamed from the cursor; only the first record and the device set of
+        # each hash+filename key are kept, not every matching row.
+        correlation_map: dict[str, dict] = {}
+        total_hashfiles_before_filter = 0
+
+        for hf in hashfiles:
+            total_hashfiles_before_filter += 1
+            hash_value = hf.md5_hash or hf.sha1_hash
+            if not hash_value:
+                continue
+
+            if not hf.file_name:
+                continue
+            
+            key = f"{hash_value}::{hf.file_name.strip().lower()}"
+            device_id = file_to_device.get(hf.file_id)
+            if device_id is None:
+                continue
+
+            entry = correlation_map.get(key)
+            if entry is None:
+                entry = correlation_map[key] = {"first": hf, "records": 0, "devices": set()}
+            entry["records"] += 1
+            entry["devices"].add(device_id)
+
+        if not total_hashfiles_before_filter:
             summary_value = analytic.summary
             summary = summary_value if summary_value is not None else None
-            return JSONResponse(
+            return AnalyticsResult(
                 content={
                     "status": 200,
                     "message": "No hashfile data found",
@@ -357,38 +379,16 @@ def _get_hashfile_analytics_data(
                 status_code=200,
             )
 
-        print(f"[DEBUG] Found {len(hashfiles)} hashfiles for file_ids: {file_ids}")
+        print(f"[DEBUG] Found {total_hashfiles_before_filter} hashfiles for file_ids: {file_ids}")
         print(f"[DEBUG] Devices: {[{'id': d.id, 'file_id': d.file_id, 'owner': d.owner_name} for d in devices]}")
-        
-        correlation_map: dict[str, dict[str, list | set]] = defaultdict(lambda: {"records": [], "devices": set()})
-
-        for hf in hashfiles:
-            hash_value = hf.md5_hash or hf.sha1_hash
-            if not hash_value:
-                continue
-
-            if not hf.file_name:
-                continue
-            
-            key = f"{hash_value}::{hf.file_name.strip().lower()}"
-            device_id = file_to_device.get(hf.file_id)
-            if device_id is None:
-                continue
-
-            records_list = correlation_map[key]["records"]
-            if isinstance(records_list, list):
-                records_list.append(hf)
-            devices_set = correlation_map[key]["devices"]
-            if isinstance(devices_set, set):
-                devices_set.add(device_id)
 
         logger.info(f"Total correlation keys (unique hash+filename combinations): {len(correlation_map)}")
         
-        sample_keys = list(correlation_map.items())[:5]
+        sample_keys = list(islice(correlation_map.items(), 5))
         for key, data in sample_keys:
             hash_part, filename_part = key.split("::", 1) if "::" in key else (key[:20], "unknown")
             logger.debug(f"Sample correlation key - Hash: {hash_part[:20]}..., Filename: {filename_part[:30]}..., "
-                        f"Devices: {len(data['devices'])}, Records: {len(data['records'])}")
+                        f"Devices: {len(data['devices'])}, Records: {data['records']}")
 
         correlated = {
             key: data for key, data in correlation_map.items()
@@ -397,7 +397,6 @@ def _get_hashfile_analytics_data(
         
         logger.info(f"Correlated items (appearing in >= {min_devices} devices): {len(correlated)}")
         
-        total_hashfiles_before_filter = len(hashfiles)
         total_unique_keys = len(correlation_map)
         total_correlated_keys = len(correlated)
         logger.info(f"Hashfile Analytics Statistics:")
@@ -408,22 +407,9 @@ def _get_hashfile_analytics_data(
 
         hashfile_list = []
         for key, info in correlated.items():
-            records_list = info["records"]
-            if not isinstance(records_list, list) or len(records_list) == 0:
-                continue
-            first = records_list[0]
+            first = info["first"]
             device_ids_found = info["devices"]
 
-            file_size_bytes = first.size_bytes or 0
-            if file_size_bytes >= 1024**3:
-                size_display = f"{file_size_bytes / (1024**3):.1f} GB"
-            elif file_size_bytes >= 1024**2:
-                size_display = f"{file_size_bytes / (1024**2):.1f} MB"
-            elif file_size_bytes >= 1024:
-                size_display = f"{file_size_bytes / 1024:.1f} KB"
-            else:
-                size_display = f"{file_size_bytes} bytes"
-
             file_path = first.path_original or "Unknown"
             file_name = os.path.basename(file_path) if file_path != "Unknown" else (first.file_name or "Unknown")
             file_type = first.file_type or "Unknown"
@@ -463,7 +449,7 @@ def _get_hashfile_analytics_data(
 
         summary_value = analytic.summary
         summary = summary_value if summary_value is not None else None
-        return JSONResponse(
+        return AnalyticsResult(
             content={
                 "status": 200,
                 "message": "Hashfile correlation completed successfully",
@@ -479,7 +465,7 @@ def _get_hashfile_analytics_data(
 
     except Exception as e:
         logger.error(f"Error getting hashfile analytics: {str(e)}")
-        return JSONResponse(
+        return AnalyticsResult(
             content={
                 "status": 500,
                 "message": "Failed to retrieve hashfile analytics. Please try again later.",
@@ -494,7 +480,7 @@ def get_hashfile_analytics(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    return _get_hashfile_analytics_data(analytic_id, db, current_user)
+    return _get_hashfile_analytics_data(analytic_id, db, current_user).to_response()
 
 @router.post("/analytics/start-extraction")
 def start_data_extraction(
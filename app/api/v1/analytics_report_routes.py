@@ -1,18 +1,24 @@
 from fastapi import APIRouter, Depends, Query 
-from fastapi.responses import JSONResponse, FileResponse  
+from fastapi.responses import JSONResponse, FileResponse, StreamingResponse
 from sqlalchemy.orm import Session  
 from sqlalchemy import func
-from app.db.session import get_db
-from app.analytics.shared.models import Device, Analytic, AnalyticDevice, File, Contact
+from app.db.session import get_db, SessionLocal
+from app.analytics.shared.models import Device, Analytic, AnalyticDevice, File, Contact, ChatMessage
 from app.analytics.analytics_management.models import ApkAnalytic, AnalyticFile
+from app.analytics.shared.results import ContactCorrelation, HashfileCorrelation
 from typing import List, Optional, Iterator, Generator
 from pydantic import BaseModel
 from collections import defaultdict
 from app.utils.timezone import get_indonesia_time
 from app.core.config import settings
 from app.utils.security import validate_sql_injection_patterns, sanitize_input
+from app.analytics.utils.report_cache import report_cache_key, get_cached_report, store_report
+from app.utils.pdf_resources import logo_image, paragraph_style, sample_styles, title_bold_font
+from app.analytics.utils.tabular_export import EXPORT_FORMATS, iter_csv, iter_jsonl, iter_file, write_xlsx
+from app.analytics.utils.pdf_segments import PdfSegment, map_in_pdf_pool, render_pdf_segments, draw_page_footer
+from app.analytics.utils.report_jobs import submit_report_job, get_report_job, job_status, report_progress, ReportJobError, ReportJobLimitExceeded
 from reportlab.lib.pagesizes import A4  
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle  
+from reportlab.lib.styles import ParagraphStyle  
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image, PageBreak, KeepTogether 
 from reportlab.lib import colors  
 from reportlab.lib.enums import TA_CENTER, TA_LEFT,TA_RIGHT,TA_JUSTIFY 
@@ -20,18 +26,17 @@ from reportlab.pdfgen import canvas
 from reportlab.lib.units import inch
 from app.api.v1.analytics_contact_routes import _get_contact_correlation_data
 from app.api.v1.analytics_management_routes import _get_hashfile_analytics_data, check_analytic_access
-from app.api.v1.analytics_social_media_routes import social_media_correlation
-from app.api.v1.analytics_communication_enhanced_routes import get_chat_detail
+from app.api.v1.analytics_social_media_routes import _get_social_media_correlation_data
+from app.api.v1.analytics_communication_enhanced_routes import (
+    ChatDetailMatcher, _chat_detail_messages_query, _get_chat_detail_data, _get_chat_detail_devices, _validate_chat_detail_filters,
+)
 from app.auth.models import User
 from app.api.deps import get_current_user
 from datetime import datetime
 import dateutil.parser
-import os, json, gc, logging, time
-from reportlab.pdfgen import canvas
-from reportlab.lib import colors
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.lib.utils import ImageReader
+import os, json, logging, time, uuid
+from itertools import islice
+from functools import partial
 
 
 logger = logging.getLogger(__name__)
@@ -43,43 +48,153 @@ router = APIRouter()
 
 PDF_EXPORT_BATCH_SIZE = 10000
 
-def stream_query_in_batches(query, batch_size: int = PDF_EXPORT_BATCH_SIZE) -> Generator:
-    offset = 0
+def _keyset_batches(query, key_column, batch_size: int) -> Iterator[list]:
+    key_name = key_column.key
+    # Drop any ordering the caller applied; paging is only correct when sorted by the key alone.
+    query = query.order_by(None).order_by(key_column)
+    last_key = None
+    while True:
+        page = query
+        if last_key is not None:
+            page = page.filter(key_column > last_key)
+        batch = page.limit(batch_size).all()
+        if not batch:
+            return
+        last_key = getattr(batch[-1], key_name)
+        yield batch
+
+def _cursor_batches(query, batch_size: int) -> Iterator[list]:
+    # yield_per streams from a server-side cursor instead of buffering the full result.
+    rows = iter(query.yield_per(batch_size))
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        yield batch
+
+def stream_query_in_batches(query, batch_size: int = PDF_EXPORT_BATCH_SIZE, key_column=None) -> Generator:
+    # Pass key_column (an indexed, unique column such as Model.id) to page by keyset;
+    # otherwise rows are streamed in the query's own order.
     batch_number = 0
     total_processed = 0
     start_time = time.time()
     
-    logger.info(f"Starting streaming query with batch_size={batch_size}")
+    logger.info(f"Starting streaming query with batch_size={batch_size}, mode={'keyset' if key_column is not None else 'cursor'}")
     
-    while True:
-        batch_start_time = time.time()
-        batch = query.offset(offset).limit(batch_size).all()
-        if not batch:
-            elapsed = time.time() - start_time
-            logger.info(f"Streaming query completed. Total batches: {batch_number}, Total records: {total_processed}, Time: {elapsed:.2f}s")
-            break
-        
+    batches = _keyset_batches(query, key_column, batch_size) if key_column is not None else _cursor_batches(query, batch_size)
+    batch_start_time = time.time()
+    for batch in batches:
         batch_number += 1
         batch_size_actual = len(batch)
         total_processed += batch_size_actual
         batch_time = time.time() - batch_start_time
         
-        logger.debug(f"Batch {batch_number}: {batch_size_actual} records (offset {offset}), processed in {batch_time:.2f}s, total: {total_processed}")
+        logger.debug(f"Batch {batch_number}: {batch_size_actual} records, fetched in {batch_time:.2f}s, total: {total_processed}")
+        report_progress(records_processed=total_processed, batch_seconds=batch_time)
         
         if batch_number % 10 == 0:
             elapsed = time.time() - start_time
             logger.info(f"Progress: {batch_number} batches, {total_processed} records processed in {elapsed:.2f}s")
         
         yield batch
-        offset += batch_size
-        
-        if offset % (batch_size * 10) == 0:
-            gc.collect()
-            logger.debug(f"Garbage collection triggered at offset {offset}")
+        batch_start_time = time.time()
+    
+    elapsed = time.time() - start_time
+    logger.info(f"Streaming query completed. Total batches: {batch_number}, Total records: {total_processed}, Time: {elapsed:.2f}s")
 
 def get_total_count(query) -> int:
     return query.count()
 
+def _validate_export_filters(person_name: Optional[str], source: Optional[str]):
+    # Validate SQL injection patterns for person_name
+    if person_name:
+        if not validate_sql_injection_patterns(person_name):
+            logger.warning(f"SQL injection attempt detected in person_name: {person_name[:50]}")
+            return person_name, source, JSONResponse(
+                content={
+                    "status": 400,
+                    "message": "Invalid characters detected in person_name. Please remove any SQL injection attempts or malicious code.",
+                    "data": None
+                },
+                status_code=400,
+            )
+        person_name = sanitize_input(person_name, max_length=255)
+    
+    # Validate SQL injection patterns for source
+    if source:
+        if not validate_sql_injection_patterns(source):
+            logger.warning(f"SQL injection attempt detected in source: {source[:50]}")
+            return person_name, source, JSONResponse(
+                content={
+                    "status": 400,
+                    "message": "Invalid characters detected in source. Please remove any SQL injection attempts or malicious code.",
+                    "data": None
+                },
+                status_code=400,
+            )
+        source = sanitize_input(source, max_length=100)
+    
+    return person_name, source, None
+
+def _get_exportable_analytic(analytic_id: int, db: Session, current_user):
+    analytic = db.query(Analytic).filter(Analytic.id == analytic_id).first()
+    if not analytic:
+        logger.warning(f"Analytic not found - analytic_id={analytic_id}")
+        return None, JSONResponse(
+            content={"status": 404, "message": "Analytic not found", "data": None},
+            status_code=404,
+        )
+    
+    if current_user is not None and not check_analytic_access(analytic, current_user):
+        return None, JSONResponse(
+            content={"status": 403, "message": "You do not have permission to access this analytic", "data": None},
+            status_code=403,
+        )
+    
+    return analytic, None
+
+def _build_analytics_pdf(analytic_id: int, db: Session, current_user, person_name: Optional[str], device_id: Optional[int], source: Optional[str]):
+    analytic, error_response = _get_exportable_analytic(analytic_id, db, current_user)
+    if error_response:
+        return error_response
+    
+    logger.info(f"Analytic found - id={analytic.id}, name={analytic.analytic_name}, method={analytic.method}")
+
+    device_links = db.query(AnalyticDevice).filter(
+        AnalyticDevice.analytic_id == analytic_id
+    ).order_by(AnalyticDevice.id).all()
+
+    device_ids = []
+    for link in device_links:
+        device_ids.extend(link.device_ids)
+    device_ids = list(set(device_ids))
+    method = analytic.method
+    
+    logger.info(f"Found {len(device_ids)} device(s) linked to analytic {analytic_id}")
+    
+    if "APK" not in method or "apk" not in method.lower():
+        if not device_ids:
+            logger.warning(f"No devices linked to analytic {analytic_id}")
+            return JSONResponse(
+                content={"status": 400, "message": "No devices linked to this analytic", "data": None},
+                status_code=400,
+            )
+
+    logger.info(f"Routing to PDF export function based on method: {method}")
+    
+    if "Contact" in method or "contact" in method.lower():
+        return _export_contact_correlation_pdf(analytic, db, current_user)
+    elif "APK" in method or "apk" in method.lower():
+        return _export_apk_analytics_pdf(analytic, db)
+    elif "Communication" in method or "communication" in method.lower():
+        return _export_communication_analytics_pdf(analytic, db, source=source,person_name=person_name,device_id=device_id)
+    elif "Social" in method or "social" in method.lower():
+        return _export_social_media_analytics_pdf(analytic, db, source=source)
+    elif "Hashfile" in method or "hashfile" in method.lower():
+        return _export_hashfile_analytic_pdf(analytic, db)
+    else:
+        return _export_generic_analytics_pdf(analytic, db)
+
 @router.get("/analytic/export-pdf", 
             summary="Export analytics report to PDF",
             description="Export analytics report to PDF. This endpoint is optimized for large datasets (millions of records) and uses streaming/chunking to avoid timeout and memory issues.")
@@ -95,86 +210,14 @@ def export_analytics_pdf(
     logger.info(f"PDF Export started - analytic_id={analytic_id}, person_name={person_name}, device_id={device_id}, source={source}")
     
     try:
-        # Validate SQL injection patterns for person_name
-        if person_name:
-            if not validate_sql_injection_patterns(person_name):
-                logger.warning(f"SQL injection attempt detected in person_name: {person_name[:50]}")
-                return JSONResponse(
-                    content={
-                        "status": 400,
-                        "message": "Invalid characters detected in person_name. Please remove any SQL injection attempts or malicious code.",
-                        "data": None
-                    },
-                    status_code=400,
-                )
-            person_name = sanitize_input(person_name, max_length=255)
-        
-        # Validate SQL injection patterns for source
-        if source:
-            if not validate_sql_injection_patterns(source):
-                logger.warning(f"SQL injection attempt detected in source: {source[:50]}")
-                return JSONResponse(
-                    content={
-                        "status": 400,
-                        "message": "Invalid characters detected in source. Please remove any SQL injection attempts or malicious code.",
-                        "data": None
-                    },
-                    status_code=400,
-                )
-            source = sanitize_input(source, max_length=100)
-        analytic = db.query(Analytic).filter(Analytic.id == analytic_id).first()
-        if not analytic:
-            logger.warning(f"Analytic not found - analytic_id={analytic_id}")
-            return JSONResponse(
-                content={"status": 404, "message": "Analytic not found", "data": None},
-                status_code=404,
-            )
-        
-        if current_user is not None and not check_analytic_access(analytic, current_user):
-            return JSONResponse(
-                content={"status": 403, "message": "You do not have permission to access this analytic", "data": None},
-                status_code=403,
-            )
-        
-        logger.info(f"Analytic found - id={analytic.id}, name={analytic.analytic_name}, method={analytic.method}")
-
-        device_links = db.query(AnalyticDevice).filter(
-            AnalyticDevice.analytic_id == analytic_id
-        ).order_by(AnalyticDevice.id).all()
-
-        device_ids = []
-        for link in device_links:
-            device_ids.extend(link.device_ids)
-        device_ids = list(set(device_ids))
-        method = analytic.method
-        
-        logger.info(f"Found {len(device_ids)} device(s) linked to analytic {analytic_id}")
-        
-        if "APK" not in method or "apk" not in method.lower():
-            if not device_ids:
-                logger.warning(f"No devices linked to analytic {analytic_id}")
-                return JSONResponse(
-                    content={"status": 400, "message": "No devices linked to this analytic", "data": None},
-                    status_code=400,
-                )
-
-        logger.info(f"Routing to PDF export function based on method: {method}")
+        person_name, source, error_response = _validate_export_filters(person_name, source)
+        if error_response:
+            return error_response
         
-        if "Contact" in method or "contact" in method.lower():
-            result = _export_contact_correlation_pdf(analytic, db, current_user)
-        elif "APK" in method or "apk" in method.lower():
-            result = _export_apk_analytics_pdf(analytic, db)
-        elif "Communication" in method or "communication" in method.lower():
-            result = _export_communication_analytics_pdf(analytic, db, source=source,person_name=person_name,device_id=device_id)
-        elif "Social" in method or "social" in method.lower():
-            result = _export_social_media_analytics_pdf(analytic, db, source=source)
-        elif "Hashfile" in method or "hashfile" in method.lower():
-            result = _export_hashfile_analytic_pdf(analytic, db)
-        else:
-            result = _export_generic_analytics_pdf(analytic, db)
+        result = _build_analytics_pdf(analytic_id, db, current_user, person_name, device_id, source)
         
         elapsed_time = time.time() - export_start_time
-        logger.info(f"PDF Export completed successfully - analytic_id={analytic_id}, method={method}, elapsed_time={elapsed_time:.2f}s")
+        logger.info(f"PDF Export completed successfully - analytic_id={analytic_id}, elapsed_time={elapsed_time:.2f}s")
         
         return result
 
@@ -186,6 +229,322 @@ def export_analytics_pdf(
             status_code=500,
         )
 
+def _run_export_pdf_job(analytic_id: int, user_id: int, person_name: Optional[str], device_id: Optional[int], source: Optional[str]):
+    db = SessionLocal()
+    try:
+        current_user = db.query(User).filter(User.id == user_id).first()
+        result = _build_analytics_pdf(analytic_id, db, current_user, person_name, device_id, source)
+        if isinstance(result, FileResponse):
+            return result.path, result.filename
+        
+        try:
+            message = json.loads(result.body).get("message")
+        except Exception:
+            message = None
+        raise ReportJobError(message or "Failed to generate PDF. Please try again later.")
+    finally:
+        db.close()
+
+@router.post("/analytic/export-pdf/jobs",
+             summary="Queue an analytics PDF export",
+             description="Queue an analytics report PDF export in the background. Poll the job status and download the PDF once it is completed.")
+def submit_export_pdf_job(
+    analytic_id: int = Query(..., description="Analytic ID"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    person_name: Optional[str] = Query(None, description="if method = Deep Communication Analytics"),
+    device_id: Optional[int] = Query(None, description="if method = Deep Communication Analytics"),
+    source: Optional[str] = Query(None, description="if method = Social Media Correlation or Deep Communication Analytics")
+):
+    try:
+        person_name, source, error_response = _validate_export_filters(person_name, source)
+        if error_response:
+            return error_response
+        
+        analytic, error_response = _get_exportable_analytic(analytic_id, db, current_user)
+        if error_response:
+            return error_response
+        
+        user_id = current_user.id
+        job = submit_report_job(
+            user_id,
+            analytic_id,
+            analytic.method,
+            lambda: _run_export_pdf_job(analytic_id, user_id, person_name, device_id, source),
+        )
+        return JSONResponse(
+            content={"status": 202, "message": "PDF export queued", "data": job},
+            status_code=202,
+        )
+    except ReportJobLimitExceeded as e:
+        return JSONResponse(
+            content={"status": 429, "message": str(e), "data": None},
+            status_code=429,
+        )
+    except Exception as e:
+        logger.error(f"Failed to queue PDF export - analytic_id={analytic_id}, error={str(e)}", exc_info=True)
+        return JSONResponse(
+            content={"status": 500, "message": "Failed to queue PDF export. Please try again later.", "data": None},
+            status_code=500,
+        )
+
+def _get_owned_report_job(job_id: str, current_user):
+    job = get_report_job(job_id)
+    if not job or (current_user is not None and job["user_id"] != current_user.id and getattr(current_user, "role", None) != "admin"):
+        return None, JSONResponse(
+            content={"status": 404, "message": "Export job not found", "data": None},
+            status_code=404,
+        )
+    return job, None
+
+@router.get("/analytic/export-pdf/jobs/{job_id}", summary="Get analytics PDF export job status")
+def get_export_pdf_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+):
+    job, error_response = _get_owned_report_job(job_id, current_user)
+    if error_response:
+        return error_response
+    
+    return JSONResponse(
+        content={"status": 200, "message": "Export job retrieved successfully", "data": job_status(job)},
+        status_code=200,
+    )
+
+@router.get("/analytic/export-pdf/jobs/{job_id}/download", summary="Download a completed analytics PDF export")
+def download_export_pdf_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+):
+    job, error_response = _get_owned_report_job(job_id, current_user)
+    if error_response:
+        return error_response
+    
+    if job["status"] != "completed":
+        return JSONResponse(
+            content={"status": 409, "message": f"Export job is {job['status']}", "data": job_status(job)},
+            status_code=409,
+        )
+    
+    if not job["file_path"] or not os.path.exists(job["file_path"]):
+        return JSONResponse(
+            content={"status": 410, "message": "Report file is no longer available. Please export again.", "data": None},
+            status_code=410,
+        )
+    
+    return FileResponse(
+        job["file_path"],
+        filename=job["filename"],
+        media_type="application/pdf",
+        headers={"Content-Disposition": f"attachment; filename={job['filename']}"},
+    )
+
+def _export_device_column(device: dict) -> str:
+    label = device.get("device_label") or device.get("device_name") or "Device"
+    owner = device.get("owner_name") or "Unknown"
+    phone = device.get("phone_number") or "-"
+    return f"{label} - {owner} ({phone})"
+
+def _contact_export_rows(result):
+    devices = result.data.get("devices") or []
+    labels = [d.get("device_label") for d in devices]
+    columns = ["Contact Number"] + [_export_device_column(d) for d in devices]
+
+    def rows():
+        for row in result.iter_rows("correlations", ContactCorrelation):
+            names = {d.get("device_label"): d.get("contact_name") for d in row.devices_found_in or []}
+            yield [row.contact_number] + [names.get(label) for label in labels]
+
+    return columns, rows()
+
+def _hashfile_export_rows(result):
+    devices = result.data.get("devices") or []
+    labels = [d.get("device_label") for d in devices]
+    columns = ["Hash Value", "File Name", "File Type"] + [_export_device_column(d) for d in devices]
+
+    def rows():
+        for row in result.iter_rows("correlations", HashfileCorrelation):
+            found = set(row.devices or [])
+            yield [row.hash_value, row.file_name, row.file_type] + ["Yes" if label in found else "No" for label in labels]
+
+    return columns, rows()
+
+def _social_media_export_rows(result):
+    devices = result.data.get("devices") or []
+    columns = ["Platform", "Connections"] + [
+        _export_device_column({"device_label": f"Device {index}", **d}) for index, d in enumerate(devices, start=1)
+    ]
+
+    def rows():
+        for platform_name, correlation in (result.data.get("correlations") or {}).items():
+            for bucket in correlation.get("buckets") or []:
+                for values in bucket.get("devices") or []:
+                    yield [platform_name, bucket.get("label")] + list(values)
+
+    return columns, rows()
+
+CHAT_EXPORT_COLUMNS = [
+    ("Device", None), ("Platform", "platform"), ("Timestamp", "timestamp"), ("Direction", "direction"),
+    ("From", "from_name"), ("Sender Number", "sender_number"), ("To", "to_name"), ("Recipient Number", "recipient_number"),
+    ("Message", "message_text"), ("Message Type", "message_type"), ("Chat Type", "chat_type"),
+    ("Group Name", "group_name"), ("Group ID", "group_id"), ("Thread ID", "thread_id"), ("Chat ID", "chat_id"),
+    ("Message ID", "message_id"), ("Status", "status"), ("Source Tool", "source_tool"),
+]
+
+def _chat_export_rows(analytic, db, current_user, person_name: Optional[str], device_id: Optional[int], source: Optional[str]):
+    # Same filters and matching as the chat detail view and its PDF export.
+    person_name, source, _, error = _validate_chat_detail_filters(person_name, source, None)
+    if error:
+        return None, error.to_response()
+    _, devices, error = _get_chat_detail_devices(db, analytic.id, person_name, source, device_id, current_user)
+    if error:
+        return None, error.to_response()
+
+    columns = [name for name, _ in CHAT_EXPORT_COLUMNS]
+    attributes = [attribute for _, attribute in CHAT_EXPORT_COLUMNS[1:]]
+    file_ids = [device.file_id for device in devices]
+    device_labels = {device.file_id: f"{device.owner_name or 'Unknown'} ({device.phone_number or '-'})" for device in devices}
+    matcher = ChatDetailMatcher(devices, person_name, source, None)
+
+    def rows():
+        # Rows are pulled after the endpoint returns, so the stream owns its session.
+        db = SessionLocal()
+
+        def messages():
+            query = _chat_detail_messages_query(db, file_ids, source)
+            for batch in stream_query_in_batches(query, key_column=ChatMessage.id):
+                yield from batch
+                db.expunge_all()
+
+        try:
+            # The matcher needs the thread maps and chat type before it can pick rows,
+            # so the messages are streamed once per pass instead of held in memory.
+            matcher.scan_groups(messages())
+            matcher.scan_senders(messages())
+            matcher.determine_chat(message for message in messages() if matcher.match(message) is not None)
+
+            for message in messages():
+                direction = matcher.match(message)
+                if direction is None or not matcher.keeps_chat_type(message.chat_type):
+                    continue
+                yield [device_labels.get(message.file_id)] + [
+                    direction if attribute == "direction" else getattr(message, attribute) for attribute in attributes
+                ]
+        finally:
+            db.close()
+
+    logger.info(f"Streaming chat export - analytic_id={analytic.id}, devices={len(devices)}, source={source}, person_name={person_name}")
+    return (columns, rows()), None
+
+def _apk_export_rows(analytic, db):
+    analytic_file = (
+        db.query(AnalyticFile)
+        .filter(AnalyticFile.analytic_id == analytic.id)
+        .order_by(AnalyticFile.created_at.desc())
+        .first()
+    )
+    columns = ["Item", "Description", "Status", "Malware Scoring"]
+    apks = analytic_file.apk_analytics if analytic_file else []
+    return columns, ([apk.item, apk.description, apk.status, apk.malware_scoring] for apk in apks)
+
+def _analytic_export_rows(analytic, db, current_user, person_name, device_id, source):
+    method = analytic.method or ""
+    if "APK" in method or "apk" in method.lower():
+        return "apk_analytics", _apk_export_rows(analytic, db)
+
+    device_ids = []
+    for link in db.query(AnalyticDevice).filter(AnalyticDevice.analytic_id == analytic.id).all():
+        device_ids.extend(link.device_ids)
+    device_ids = sorted(set(device_ids))
+    if not device_ids:
+        return None, JSONResponse(
+            content={"status": 400, "message": "No devices linked to this analytic", "data": None},
+            status_code=400,
+        )
+
+    if "Contact" in method or "contact" in method.lower():
+        prefix, result, build_rows = "contact_correlation", _get_contact_correlation_data(analytic.id, db, current_user), _contact_export_rows
+    elif "Communication" in method or "communication" in method.lower():
+        export, error_response = _chat_export_rows(analytic, db, current_user, person_name, device_id, source)
+        if error_response:
+            return None, error_response
+        return "deep_communication", export
+    elif "Social" in method or "social" in method.lower():
+        prefix, result, build_rows = "social_media_correlation", _get_social_media_correlation_data(analytic.id, db, source or "Instagram", current_user), _social_media_export_rows
+    elif "Hashfile" in method or "hashfile" in method.lower():
+        prefix, result, build_rows = "hashfile_analytics", _get_hashfile_analytics_data(analytic.id, db, current_user), _hashfile_export_rows
+    else:
+        return None, JSONResponse(
+            content={"status": 400, "message": f"Data export is not available for method '{method}'", "data": None},
+            status_code=400,
+        )
+
+    if not result.ok:
+        return None, result.to_response()
+    return prefix, build_rows(result)
+
+@router.get("/analytic/export",
+            summary="Export analytic results as CSV, XLSX or JSONL",
+            description="Export the full analytic dataset. CSV and JSONL are streamed row by row; XLSX is written to a temporary file first. Uses the same filters as /analytic/export-pdf.")
+def export_analytic_data(
+    analytic_id: int = Query(..., description="Analytic ID"),
+    export_format: str = Query("csv", alias="format", description="csv, xlsx or jsonl"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    person_name: Optional[str] = Query(None, description="if method = Deep Communication Analytics"),
+    device_id: Optional[int] = Query(None, description="if method = Deep Communication Analytics"),
+    source: Optional[str] = Query(None, description="if method = Social Media Correlation or Deep Communication Analytics")
+):
+    export_format = (export_format or "").lower()
+    if export_format not in EXPORT_FORMATS:
+        return JSONResponse(
+            content={"status": 400, "message": f"Unsupported format '{export_format}'. Use one of: {', '.join(EXPORT_FORMATS)}", "data": None},
+            status_code=400,
+        )
+
+    try:
+        person_name, source, error_response = _validate_export_filters(person_name, source)
+        if error_response:
+            return error_response
+
+        analytic, error_response = _get_exportable_analytic(analytic_id, db, current_user)
+        if error_response:
+            return error_response
+
+        prefix, export = _analytic_export_rows(analytic, db, current_user, person_name, device_id, source)
+        if prefix is None:
+            return export
+        columns, rows = export
+
+        media_type, extension = EXPORT_FORMATS[export_format]
+        filename = f"{prefix}_{analytic.id}_{get_indonesia_time().strftime('%Y%m%d_%H%M%S')}.{extension}"
+        headers = {"Content-Disposition": f"attachment; filename={filename}"}
+
+        if export_format == "csv":
+            return StreamingResponse(iter_csv(columns, rows), media_type=media_type, headers=headers)
+        if export_format == "jsonl":
+            return StreamingResponse(iter_jsonl(columns, rows), media_type=media_type, headers=headers)
+
+        # An XLSX is a zip whose directory is written last, so the workbook is finished
+        # on disk before the response starts.
+        os.makedirs(settings.REPORTS_DIR, exist_ok=True)
+        file_path = os.path.join(settings.REPORTS_DIR, f".{uuid.uuid4().hex}_{filename}")
+        try:
+            total = write_xlsx(file_path, columns, rows, sheet_title=prefix.replace("_", " ").title())
+        except Exception:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+            raise
+        logger.info(f"XLSX export written - analytic_id={analytic_id}, rows={total}")
+        return StreamingResponse(iter_file(file_path), media_type=media_type, headers=headers)
+
+    except Exception as e:
+        logger.error(f"Data export failed - analytic_id={analytic_id}, format={export_format}, error={str(e)}", exc_info=True)
+        return JSONResponse(
+            content={"status": 500, "message": "Failed to export analytic data. Please try again later.", "data": None},
+            status_code=500,
+        )
+
 @router.post("/analytic/save-summary")
 def save_analytic_summary(
     request: SummaryRequest,
@@ -347,58 +706,18 @@ class GlobalPageCanvas(canvas.Canvas):
         super().save()
 
     def _draw_footer(self, current_page, total_pages):
-        self.setFont("Helvetica", 10)
-        self.setFillColor(colors.HexColor("#333333"))
-
-        self.setStrokeColor(colors.HexColor("#466086"))
-        self.setLineWidth(1.5)
-        self.line(30, 40, 569, 40)
-
-        padding_y = 25
-
-        from reportlab.platypus import Paragraph
-        from reportlab.lib.styles import ParagraphStyle
-
-        footer_style = ParagraphStyle(
-            "FooterStyle",
-            fontName="Helvetica",
-            fontSize=10,
-            leading=12,
-            textColor=colors.HexColor("#333333"),
-            wordWrap="CJK",
-        )
-
-        para = Paragraph(self.footer_text, footer_style)
-
-        max_width = 480
-        w, h = para.wrap(max_width, 100)
-
-        para.drawOn(self, 30, padding_y - (h - 10))
-
-        page_label = f"Page {current_page} of {total_pages}"
-        self.drawRightString(575, padding_y, page_label)
+        draw_page_footer(self, self.footer_text, current_page, total_pages)
 
 
 def build_report_header(analytic, timestamp_now, usable_width, file_upload_date=None):
-    styles = getSampleStyleSheet()
+    styles = sample_styles()
     story = []
     
     story.append(Spacer(1, -130))
 
     subtitle_style = ParagraphStyle("Subtitle", fontSize=12, textColor=colors.black, leftIndent=-7, fontName="Helvetica")
     subtitle_style_right = ParagraphStyle("SubtitleRight", fontSize=12, textColor=colors.black, alignment=TA_RIGHT, rightIndent=7, fontName="Helvetica")
-    try:
-        try:
-            pdfmetrics.registerFont(TTFont('Arial-Bold', '/System/Library/Fonts/Supplemental/Arial Bold.ttf'))
-            title_font = "Arial-Bold"
-        except:
-            try:
-                pdfmetrics.registerFont(TTFont('Arial-Bold', 'C:/Windows/Fonts/arialbd.ttf'))
-                title_font = "Arial-Bold"
-            except:
-                title_font = "Helvetica-Bold"
-    except:
-        title_font = "Helvetica-Bold"
+    title_font = title_bold_font()
     
     title_style = ParagraphStyle(
         "Title", fontSize=20, textColor=colors.HexColor("#0d0d0d"), spaceAfter=8, alignment=TA_LEFT, fontName=title_font, leftIndent=-8
@@ -463,6 +782,9 @@ def build_report_header(analytic, timestamp_now, usable_width, file_upload_date=
 
 def _export_contact_correlation_pdf(analytic, db, current_user=None):
     logger.info(f"Starting Contact Correlation PDF export for analytic_id={analytic.id}")
+    cache_key, cached = _lookup_cached_report(analytic, db, "contact_correlation")
+    if cached:
+        return cached
     start_time = time.time()
     total_contacts = db.query(Contact).count()
     logger.info(f"Total contacts to process: {total_contacts}")
@@ -472,7 +794,8 @@ def _export_contact_correlation_pdf(analytic, db, current_user=None):
         filename_prefix="contact_correlation_report",
         data={"total_contacts": total_contacts},
         method="contact_correlation",
-        current_user=current_user
+        current_user=current_user,
+        cache_key=cache_key,
     )
     
     elapsed = time.time() - start_time
@@ -481,6 +804,9 @@ def _export_contact_correlation_pdf(analytic, db, current_user=None):
     return result
 def _export_hashfile_analytic_pdf(analytic, db):
     logger.info(f"Starting Hashfile Analytics PDF export for analytic_id={analytic.id}")
+    cache_key, cached = _lookup_cached_report(analytic, db, "hashfile_analytics")
+    if cached:
+        return cached
     start_time = time.time()
     total_contacts = db.query(Contact).count()
     logger.info(f"Total contacts to process: {total_contacts}")
@@ -489,7 +815,8 @@ def _export_hashfile_analytic_pdf(analytic, db):
         report_type="Hashfile Analytics",
         filename_prefix="hashfile_analytics_report",
         data={"total_contacts": total_contacts},
-        method="hashfile_analytics"
+        method="hashfile_analytics",
+        cache_key=cache_key,
     )
     elapsed = time.time() - start_time
     logger.info(f"Hashfile Analytics PDF export completed - analytic_id={analytic.id}, total_contacts={total_contacts}, elapsed_time={elapsed:.2f}s")
@@ -498,6 +825,9 @@ def _export_hashfile_analytic_pdf(analytic, db):
 
 def _export_apk_analytics_pdf(analytic, db):
     logger.info(f"Starting APK Analytics PDF export for analytic_id={analytic.id}")
+    cache_key, cached = _lookup_cached_report(analytic, db, "apk_analytics")
+    if cached:
+        return cached
     start_time = time.time()
 
     analytic_file = (
@@ -515,7 +845,8 @@ def _export_apk_analytics_pdf(analytic, db):
         report_type="APK Analytics Report",
         filename_prefix="apk_analytics_report",
         data={"total_apks": total_apks},
-        method="apk_analytics"
+        method="apk_analytics",
+        cache_key=cache_key,
     )
 
     elapsed = time.time() - start_time
@@ -559,9 +890,79 @@ def _export_generic_analytics_pdf(analytic, db):
         method="generic"
     )
 
+def _report_data_version(analytic, db) -> str:
+    device_ids = set()
+    device_links = db.query(AnalyticDevice.device_ids, AnalyticDevice.updated_at).filter(
+        AnalyticDevice.analytic_id == analytic.id
+    ).all()
+    for link in device_links:
+        device_ids.update(link.device_ids or [])
+
+    devices = db.query(Device.id, Device.file_id, Device.updated_at).filter(
+        Device.id.in_(device_ids)
+    ).order_by(Device.id).all() if device_ids else []
+    file_ids = {device.file_id for device in devices}
+
+    analytic_files = db.query(AnalyticFile.id, AnalyticFile.file_id, AnalyticFile.updated_at).filter(
+        AnalyticFile.analytic_id == analytic.id
+    ).order_by(AnalyticFile.id).all()
+    file_ids.update(analytic_file.file_id for analytic_file in analytic_files)
+
+    files = db.query(File.id, File.updated_at).filter(
+        File.id.in_(file_ids)
+    ).order_by(File.id).all() if file_ids else []
+
+    apk_count = db.query(func.count(ApkAnalytic.id)).join(AnalyticFile).filter(
+        AnalyticFile.analytic_id == analytic.id
+    ).scalar() if analytic_files else 0
+
+    return json.dumps({
+        "analytic": analytic.updated_at,
+        "links": sorted((sorted(link.device_ids or []), link.updated_at) for link in device_links),
+        "devices": [tuple(device) for device in devices],
+        "analytic_files": [tuple(analytic_file) for analytic_file in analytic_files],
+        "files": [tuple(file) for file in files],
+        "apk_count": apk_count,
+    }, default=str)
+
+def _lookup_cached_report(analytic, db, method, source: Optional[str] = None, person_name: Optional[str] = None, device_id: Optional[int] = None):
+    cache_key = report_cache_key(
+        analytic.id,
+        method,
+        {"source": source, "person_name": person_name, "device_id": device_id},
+        _report_data_version(analytic, db),
+        analytic.summary,
+    )
+    cached = get_cached_report(cache_key)
+    if not cached:
+        return cache_key, None
+
+    file_path, filename = cached
+    logger.info(f"Serving cached {method} report for analytic_id={analytic.id}: {filename}")
+    return cache_key, FileResponse(path=file_path, filename=filename, media_type="application/pdf")
+
 def _generate_pdf_report(
         analytic, db, report_type, filename_prefix, data, method,source:Optional[str] = None,
         person_name:Optional[str] = None, device_id:Optional[int] = None, current_user=None,
+        cache_key: Optional[str] = None,
+    ):
+    # Callers that query counts before rendering look the cache up first and pass its key.
+    if cache_key is None:
+        cache_key, cached = _lookup_cached_report(analytic, db, method, source, person_name, device_id)
+        if cached:
+            return cached
+
+    result = _render_pdf_report(
+        analytic, db, report_type, filename_prefix, data, method,
+        source=source, person_name=person_name, device_id=device_id, current_user=current_user,
+    )
+    if isinstance(result, FileResponse):
+        store_report(cache_key, analytic.id, method, result.path, result.filename)
+    return result
+
+def _render_pdf_report(
+        analytic, db, report_type, filename_prefix, data, method,source:Optional[str] = None,
+        person_name:Optional[str] = None, device_id:Optional[int] = None, current_user=None,
     ):
     if method == "deep_communication":
         return _generate_deep_communication_report(analytic, db, report_type, filename_prefix, data, source, person_name,device_id)
@@ -713,36 +1114,19 @@ def _generate_deep_communication_report(
         bottomMargin=60,
     )
 
-    try:
-        response = get_chat_detail(
-            analytic_id=analytic.id,
-            person_name=person_name,
-            platform=source,
-            device_id=device_id,
-            search=None,
-            current_user=None,
-            db=db
-        )
-    except Exception:
-        response = None
-
-    chat_data = {}
-    conversation_history = []
+    result = _get_chat_detail_data(
+        analytic.id,
+        db,
+        person_name=person_name,
+        platform=source,
+        device_id=device_id,
+    )
+    if not result.ok:
+        return result.to_response()
+    chat_data = result.data
 
-    try:
-        if hasattr(response, "body") and response.body:
-            raw = json.loads(response.body.decode("utf-8"))
-        elif isinstance(response, dict):
-            raw = response
-        elif hasattr(response, "content"):
-            raw = response.content
-        else:
-            raw = {}
-        chat_data = raw.get("data", {}) or {}
-        conversation_history = chat_data.get("conversation_history", []) or []
-    except Exception:
-        chat_data = {}
-        conversation_history = []
+    conversation_history = list(chat_data.get("conversation_history") or [])
+    report_progress(message="Building report sections...", progress=30)
 
     style_time_center = ParagraphStyle(
         "TimeCenter",
@@ -900,6 +1284,7 @@ def _generate_deep_communication_report(
     chunk_size = 2000
 
     for i in range(0, len(rows), chunk_size):
+        report_progress(message=f"Building chat table ({i:,} of {len(rows):,} messages)...", progress=30 + 30 * i // len(rows))
         chunk = [header_row] + rows[i:i + chunk_size]
 
         tbl = Table(chunk, colWidths=[col_time, col_chat], repeatRows=1)
@@ -949,10 +1334,10 @@ def _generate_deep_communication_report(
         canvas_obj.saveState()
         page_w, page_h = A4
 
-        logo_path = settings.LOGO_PATH
-        if os.path.exists(logo_path):
+        logo = logo_image()
+        if logo is not None:
             canvas_obj.drawImage(
-                ImageReader(logo_path),
+                logo,
                 20, page_h - 60,
                 width=191, height=30,
                 preserveAspectRatio=True,
@@ -989,6 +1374,7 @@ def _generate_deep_communication_report(
 
         canvas_obj.restoreState()
 
+    report_progress(message="Rendering PDF...", progress=60)
     doc.build(
         story,
         onFirstPage=draw_header,
@@ -1029,7 +1415,7 @@ def _generate_apk_analytics_report(analytic, db, report_type, filename_prefix, d
     )
 
     # ========= STYLES =========
-    styles = getSampleStyleSheet()
+    styles = sample_styles()
     heading_style = ParagraphStyle("Heading", fontSize=12, leading=15, fontName="Helvetica-Bold")
     normal_style = ParagraphStyle("Normal", fontSize=10.5, leading=14, alignment=TA_LEFT)
     wrap_desc = ParagraphStyle("WrapDesc", fontSize=10.5, leading=14, alignment=TA_JUSTIFY)
@@ -1046,6 +1432,7 @@ def _generate_apk_analytics_report(analytic, db, report_type, filename_prefix, d
     )
 
     apk_analytics = analytic_file.apk_analytics if analytic_file else []
+    report_progress(message="Building report sections...", progress=30)
 
     malicious_items = []
     common_items = []
@@ -1242,10 +1629,10 @@ def _generate_apk_analytics_report(analytic, db, report_type, filename_prefix, d
         page_w, page_h = A4
 
         # LOGO
-        logo_path = settings.LOGO_PATH
-        if os.path.exists(logo_path):
+        logo = logo_image()
+        if logo is not None:
             canvas_obj.drawImage(
-                ImageReader(logo_path),
+                logo,
                 20, page_h - 60,
                 width=191, height=30,
                 preserveAspectRatio=True,
@@ -1284,6 +1671,7 @@ def _generate_apk_analytics_report(analytic, db, report_type, filename_prefix, d
         canvas_obj.restoreState()
 
     # BUILD PDF
+    report_progress(message="Rendering PDF...", progress=60)
     doc.build(
         story,
         onFirstPage=draw_header,
@@ -1347,19 +1735,8 @@ def _generate_social_media_correlation_report(
     doc.topMargin = title_height + 90
 
     try:
-        from app.api.v1.analytics_social_media_routes import _get_social_media_correlation_data
-        response = _get_social_media_correlation_data(analytic.id, db, source or "Instagram")
+        data_block = _get_social_media_correlation_data(analytic.id, db, source or "Instagram").data
     except Exception:
-        response = None
-
-    data_block = {}
-    try:
-        if hasattr(response, "body"):
-            raw = json.loads(response.body.decode("utf-8"))
-            data_block = raw.get("data", {}) if isinstance(raw, dict) else {}
-        elif isinstance(response, dict):
-            data_block = response.get("data", {})
-    except:
         data_block = {}
 
     correlations_root = data_block.get("correlations", {})
@@ -1370,11 +1747,12 @@ def _generate_social_media_correlation_report(
     devices = data_block.get("devices", [])
     total_devices = len(devices)
     total_accounts = sum(len(bucket.get("devices", [])) for bucket in buckets)
+    report_progress(message="Building report sections...", progress=30)
 
     # force big dataset (like your test)
     # buckets = buckets 
 
-    styles = getSampleStyleSheet()
+    styles = sample_styles()
     normal_style = ParagraphStyle("Normal", fontSize=12, leading=14)
     wrap_style = ParagraphStyle("Wrap", fontSize=12, leading=14, wordWrap="CJK")
 
@@ -1521,10 +1899,10 @@ def _generate_social_media_correlation_report(
         canvas_obj.saveState()
         page_w, page_h = A4
 
-        logo_path = settings.LOGO_PATH
-        if os.path.exists(logo_path):
+        logo = logo_image()
+        if logo is not None:
             canvas_obj.drawImage(
-                ImageReader(logo_path),
+                logo,
                 20, page_h - 60,
                 width=191, height=30,
                 preserveAspectRatio=True,
@@ -1557,6 +1935,7 @@ def _generate_social_media_correlation_report(
 
         canvas_obj.restoreState()
 
+    report_progress(message="Rendering PDF...", progress=60)
     doc.build(
         story,
         onFirstPage=draw_header,
@@ -1600,23 +1979,12 @@ def _generate_contact_correlation_report(analytic, db, report_type, filename_pre
         bottomMargin=50,
     )
 
-    result = _get_contact_correlation_data(analytic.id, db, current_user)
-
-    if isinstance(result, JSONResponse):
-        result = result.body
-    if isinstance(result, (bytes, bytearray)):
-        result = json.loads(result.decode("utf-8"))
-    if isinstance(result, str):
-        try: result = json.loads(result)
-        except: result = {}
-    if not isinstance(result, dict):
-        result = {}
-
-    api_data = result.get("data", {})
+    api_data = _get_contact_correlation_data(analytic.id, db, current_user).data
     devices = api_data.get("devices", [])
     correlations = api_data.get("correlations", [])
     summary = api_data.get("summary")
-    styles = getSampleStyleSheet()
+    report_progress(message="Building report sections...", progress=30)
+    styles = sample_styles()
     center_style = ParagraphStyle("Center", alignment=TA_CENTER, fontSize=10, leading=13)
     header_device_style = ParagraphStyle(
         "HeaderDevice", alignment=TA_CENTER, fontSize=10, leading=12,
@@ -1630,6 +1998,7 @@ def _generate_contact_correlation_report(analytic, db, report_type, filename_pre
     story.append(Spacer(1, 5))
 
     for group_index, group in enumerate(groups, start=1):
+        report_progress(message=f"Building device group {group_index} of {len(groups)}...", progress=30 + 30 * (group_index - 1) // len(groups))
 
         start_dev = (group_index - 1) * group_size + 1
         end_dev = start_dev + len(group) - 1
@@ -1760,10 +2129,10 @@ def _generate_contact_correlation_report(analytic, db, report_type, filename_pre
         canvas_obj.saveState()
         page_w, page_h = A4
 
-        logo_path = settings.LOGO_PATH
-        if os.path.exists(logo_path):
+        logo = logo_image()
+        if logo is not None:
             canvas_obj.drawImage(
-                ImageReader(logo_path),
+                logo,
                 20, page_h - 60,
                 width=191, height=30,
                 preserveAspectRatio=True,
@@ -1798,6 +2167,7 @@ def _generate_contact_correlation_report(analytic, db, report_type, filename_pre
 
         canvas_obj.restoreState()
 
+    report_progress(message="Rendering PDF...", progress=60)
     doc.build(
         story,
         onFirstPage=draw_header,
@@ -1815,25 +2185,20 @@ def _generate_contact_correlation_report(analytic, db, report_type, filename_pre
         media_type="application/pdf"
     )
 
-def _generate_hashfile_analytics_report(analytic, db, report_type, filename_prefix, data):
-    from reportlab.platypus import Paragraph
-    from reportlab.lib.styles import ParagraphStyle
-
-    logger.info(f"Starting Hashfile Analytics PDF generation - analytic_id={analytic.id}")
-    report_start_time = time.time()
+def _format_hash_filename(text: str, wrap_len: int = 40, max_chars: int = 320) -> str:
+    if not text:
+        text = "-"
 
-    reports_dir = settings.REPORTS_DIR
-    os.makedirs(reports_dir, exist_ok=True)
+    if len(text) > max_chars:
+        head = text[:100]   
+        tail = text[-5:]
+        text = f"{head}...{tail}"
 
-    timestamp_now = get_indonesia_time()
-    filename = f"{filename_prefix}_{analytic.id}_{timestamp_now.strftime('%Y%m%d_%H%M%S')}.pdf"
-    file_path = os.path.join(reports_dir, filename)
+    chunks = [text[i:i + wrap_len] for i in range(0, len(text), wrap_len)]
+    return "<br/>".join(chunks)
 
-    page_width, _ = A4
-    left_margin, right_margin = 30, 30
-    usable_width = page_width - left_margin - right_margin
-
-    dyn_title_style = ParagraphStyle(
+def _hashfile_title_style():
+    return paragraph_style(
         "DynHead",
         fontName="Helvetica-Bold",
         fontSize=20,
@@ -1841,42 +2206,40 @@ def _generate_hashfile_analytics_report(analytic, db, report_type, filename_pref
         wordWrap="CJK",
     )
 
-    temp_para = Paragraph(analytic.analytic_name or "", dyn_title_style)
-    _, title_h = temp_para.wrap(page_width - 60, 500)
+def _draw_hashfile_report_header(header, canvas_obj, doc_obj):
+    dyn_title_style = _hashfile_title_style()
+    header_ts = header["exported_at"]
 
-    doc = SimpleDocTemplate(
-        file_path,
-        pagesize=A4,
-        leftMargin=left_margin,
-        rightMargin=right_margin,
-        topMargin=title_h + 90,
-        bottomMargin=60,
-    )
+    canvas_obj.saveState()
+    page_w, page_h = A4
 
-    response = _get_hashfile_analytics_data(analytic.id, db)
-    data = {}
-    try:
-        if response is not None:
-            if hasattr(response, "body") and response.body is not None:
-                raw = response.body.decode("utf-8") if isinstance(response.body, bytes) else response.body
-                parsed = json.loads(raw)
-                data = parsed.get("data", {}) if isinstance(parsed, dict) else {}
-            elif isinstance(response, dict):
-                data = response.get("data", {})
-    except:
-        data = {}
+    logo = logo_image()
+    if logo is not None:
+        canvas_obj.drawImage(logo, 20, page_h - 60, width=191, height=30, preserveAspectRatio=True, mask="auto")
 
-    devices = data.get("devices", [])
-    hashfiles = data.get("correlations") or []
+    canvas_obj.setFont("Helvetica", 10)
+    canvas_obj.drawRightString(page_w - 30, page_h - 45, f"Exported: {header_ts.strftime('%d/%m/%Y %H:%M')} WIB")
 
-    group_size = 4
-    groups = [devices[i:i + group_size] for i in range(0, len(devices), group_size)]
+    title_para = Paragraph(header["analytic_name"] or "", dyn_title_style)
+    _, h = title_para.wrap(page_w - 60, 400)
+    title_y = page_h - 65 - h
+    title_para.drawOn(canvas_obj, 30, title_y)
 
-    story = []
-    story.append(Spacer(1, 5))
+    method_y = title_y - dyn_title_style.leading + 3
+    canvas_obj.setFont("Helvetica", 12)
+    canvas_obj.drawString(30, method_y, f"Method: {header['method'].replace('_',' ').title()}")
 
-    # Styles
-    normal_center = ParagraphStyle("NormalCenter", fontSize=10, leading=13, alignment=TA_CENTER)
+    uploaded = header["created_at"].strftime("%d/%m/%Y") if header["created_at"] else header_ts.strftime("%d/%m/%Y")
+    canvas_obj.drawRightString(page_w - 30, method_y, f"File Uploaded: {uploaded}")
+
+    canvas_obj.restoreState()
+
+HASHFILE_TABLE_CHUNK_ROWS = 2000
+
+def _hashfile_cell_style():
+    return ParagraphStyle("NormalCenter", fontSize=10, leading=13, alignment=TA_CENTER)
+
+def _hashfile_header_row(header_cells):
     header_style = ParagraphStyle(
         "HeaderStyle",
         alignment=TA_CENTER,
@@ -1884,138 +2247,232 @@ def _generate_hashfile_analytics_report(analytic, db, report_type, filename_pref
         fontName="Helvetica-Bold",
         fontSize=9
     )
+    header_row = ["Filename"]
+    for owner, phone in header_cells:
+        header_row.append(Paragraph(f"<b>{owner}</b><br/><font size=8>{phone}</font>", header_style))
+    return header_row
 
-    def format_filename(text: str, wrap_len: int = 40, max_chars: int = 320) -> str:
-        if not text:
-            text = "-"
-
-        if len(text) > max_chars:
-            head = text[:100]   
-            tail = text[-5:]
-            text = f"{head}...{tail}"
+def _hashfile_col_widths(usable_width, device_count):
+    return [usable_width * 0.35] + [(usable_width * 0.65) / device_count] * device_count
 
-        chunks = [text[i:i + wrap_len] for i in range(0, len(text), wrap_len)]
-        return "<br/>".join(chunks)
+def _hashfile_info_table(usable_width, info_rows):
+    info_table = Table(info_rows, colWidths=[usable_width * 0.25, usable_width * 0.75])
+    info_table.setStyle(TableStyle([
+        ("FONTNAME", (0, 0), (-1, -1), "Helvetica"),
+        ("FONTSIZE", (0, 0), (-1, -1), 12),
+        ("LEFTPADDING", (0, 0), (-1, -1), 0),
+        ("TOPPADDING", (0, 0), (-1, -1), 2),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
+    ]))
+    return info_table
+
+def _hashfile_table(header_row, body_rows, col_widths):
+    tbl = Table(
+        [header_row] + body_rows,
+        colWidths=col_widths,
+        repeatRows=1,
+        splitByRow=True,
+    )
 
+    styles = [
+
+        ("BACKGROUND", (0,0), (-1,0), colors.HexColor("#466086")),
+        ("TEXTCOLOR", (0,0), (-1,0), colors.white),
+        ("FONTNAME", (0,0), (-1,0), "Helvetica-Bold"),
+        ("ALIGN", (0,0), (-1,0), "CENTER"),
+        ("VALIGN", (0,0), (-1,0), "MIDDLE"),
+
+        ("ROWBACKGROUNDS", (0,1), (-1,-1), [colors.whitesmoke, colors.lightgrey]),
+        ("ALIGN", (0,1), (-1,-1), "CENTER"),
+        ("VALIGN", (0,1), (-1,-1), "MIDDLE"),
+        ("LINEBELOW", (0,1), (-1,-1), 0.5, colors.grey),
+        ("LEFTPADDING", (0,1), (-1,-1), 4),
+        ("RIGHTPADDING", (0,1), (-1,-1), 4),
+        ("TOPPADDING", (0,1), (-1,-1), 6),
+        ("BOTTOMPADDING", (0,1), (-1,-1), 6),
+    ]
 
-    for g_index, group in enumerate(groups, start=1):
-        start_dev = (g_index - 1) * group_size + 1
-        end_dev = start_dev + len(group) - 1
+    tbl.setStyle(TableStyle(styles))
+    return tbl
+
+def _hashfile_row_heights(filename_width, filenames):
+    # Same arithmetic as Table row heights for _hashfile_table body rows: the tallest cell
+    # (the filename, or a one-line mark) plus 6pt top and bottom padding, 4pt side padding.
+    style = _hashfile_cell_style()
+    return [max(Paragraph(name, style).wrap(filename_width - 8, 1e9)[1], style.leading) + 12 for name in filenames]
+
+def _hashfile_page_starts(row_heights, start, header_height, first_avail, page_avail):
+    # Yields the row that opens each new page when rows[start:] are laid out from the top
+    # of a page, mirroring how ReportLab splits the chunked tables of _hashfile_segment_story.
+    avail = first_avail
+    for chunk_start in range(start, len(row_heights), HASHFILE_TABLE_CHUNK_ROWS):
+        chunk_end = min(chunk_start + HASHFILE_TABLE_CHUNK_ROWS, len(row_heights))
+        index = chunk_start
+        while index < chunk_end:
+            if header_height + row_heights[index] > avail:
+                yield index
+                avail = page_avail
+            height = header_height
+            while index < chunk_end and height + row_heights[index] <= avail:
+                height += row_heights[index]
+                index += 1
+            avail -= height
+            if index < chunk_end:
+                yield index
+                avail = page_avail
+
+def _hashfile_segment_ranges(row_heights, header_height, first_avail, page_avail, segment_rows):
+    # Splits rows into segments of about segment_rows that end exactly where a page ends,
+    # so the merged PDF continues the table without half-empty pages between segments.
+    ranges = []
+    start, avail = 0, first_avail
+    while start < len(row_heights):
+        end = len(row_heights)
+        if end - start > segment_rows:
+            cut = None
+            for page_start in _hashfile_page_starts(row_heights, start, header_height, avail, page_avail):
+                if page_start == start:
+                    continue
+                if cut is not None and page_start - start > segment_rows:
+                    break
+                cut = page_start
+            end = cut if cut is not None else end
+        ranges.append((start, end))
+        start, avail = end, page_avail
+    return ranges or [(0, 0)]
+
+def _hashfile_segment_story(usable_width, info_rows, header_cells, rows, first_segment, summary_text, last_segment):
+    normal_center = _hashfile_cell_style()
 
-        info_data = [
-            ["Source", ": Handphone"],
-            ["Total Device", f": {len(devices)} Devices (Device {start_dev}-{end_dev})"],
-            ["Total Files", f": {len(hashfiles)} Files"],
-        ]
+    story = []
+    if first_segment:
+        story.append(Spacer(1, 5))
 
-        info_table = Table(info_data, colWidths=[usable_width * 0.25, usable_width * 0.75])
-        info_table.setStyle(TableStyle([
-            ("FONTNAME", (0, 0), (-1, -1), "Helvetica"),
-            ("FONTSIZE", (0, 0), (-1, -1), 12),
-            ("LEFTPADDING", (0, 0), (-1, -1), 0),
-            ("TOPPADDING", (0, 0), (-1, -1), 2),
-            ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
-        ]))
-        story.append(info_table)
+    if info_rows:
+        story.append(_hashfile_info_table(usable_width, info_rows))
         story.append(Spacer(1, 12))
 
-        header_row = ["Filename"]
-        for d in group:
-            owner = d.get("owner_name", "Unknown")
-            phone = d.get("phone_number") or "-"
-            header_row.append(Paragraph(f"<b>{owner}</b><br/><font size=8>{phone}</font>", header_style))
-
-        table_data = [header_row]
-
-        for h in hashfiles:
-            fname = h.get("file_name", "-")
-            formatted = format_filename(fname)
-            row = [Paragraph(formatted, normal_center)]
-
-            found = h.get("devices", [])
-            for d in group:
-                mark = "✔" if d.get("device_label") in found else "✘"
-                row.append(Paragraph(mark, normal_center))
-
-            table_data.append(row)
+    if header_cells:
+        header_row = _hashfile_header_row(header_cells)
 
-        col_widths = [usable_width * 0.35] + [(usable_width * 0.65) / len(group)] * len(group)
+        body_rows = [
+            [Paragraph(formatted, normal_center)] + [Paragraph(mark, normal_center) for mark in marks]
+            for formatted, marks in rows
+        ]
 
-        chunk_size = 2000
-        body_rows = table_data[1:]
+        col_widths = _hashfile_col_widths(usable_width, len(header_cells))
 
-        for start in range(0, len(body_rows), chunk_size):
-            part = [header_row] + body_rows[start:start + chunk_size]
+        for start in range(0, len(body_rows), HASHFILE_TABLE_CHUNK_ROWS):
+            story.append(_hashfile_table(header_row, body_rows[start:start + HASHFILE_TABLE_CHUNK_ROWS], col_widths))
 
-            tbl = Table(
-                part,
-                colWidths=col_widths,
-                repeatRows=1,
-                splitByRow=True,
-            )
+    if last_segment:
+        story.append(Spacer(1, 20))
+        story.extend(_build_summary_section(usable_width, summary_text))
 
-            styles = [
+    return story
 
-                ("BACKGROUND", (0,0), (-1,0), colors.HexColor("#466086")),
-                ("TEXTCOLOR", (0,0), (-1,0), colors.white),
-                ("FONTNAME", (0,0), (-1,0), "Helvetica-Bold"),
-                ("ALIGN", (0,0), (-1,0), "CENTER"),
-                ("VALIGN", (0,0), (-1,0), "MIDDLE"),
+def _generate_hashfile_analytics_report(analytic, db, report_type, filename_prefix, data):
+    logger.info(f"Starting Hashfile Analytics PDF generation - analytic_id={analytic.id}")
+    report_start_time = time.time()
 
-                ("ROWBACKGROUNDS", (0,1), (-1,-1), [colors.whitesmoke, colors.lightgrey]),
-                ("ALIGN", (0,1), (-1,-1), "CENTER"),
-                ("VALIGN", (0,1), (-1,-1), "MIDDLE"),
-                ("LINEBELOW", (0,1), (-1,-1), 0.5, colors.grey),
-                ("LEFTPADDING", (0,1), (-1,-1), 4),
-                ("RIGHTPADDING", (0,1), (-1,-1), 4),
-                ("TOPPADDING", (0,1), (-1,-1), 6),
-                ("BOTTOMPADDING", (0,1), (-1,-1), 6),
-            ]
+    reports_dir = settings.REPORTS_DIR
+    os.makedirs(reports_dir, exist_ok=True)
 
-            tbl.setStyle(TableStyle(styles))
-            story.append(tbl)
+    timestamp_now = get_indonesia_time()
+    filename = f"{filename_prefix}_{analytic.id}_{timestamp_now.strftime('%Y%m%d_%H%M%S')}.pdf"
+    file_path = os.path.join(reports_dir, filename)
 
-        if g_index < len(groups):
-            story.append(PageBreak())
+    page_width, _ = A4
+    left_margin, right_margin = 30, 30
+    usable_width = page_width - left_margin - right_margin
 
-    story.append(Spacer(1, 20))
-    story.extend(_build_summary_section(usable_width, analytic.summary))
+    temp_para = Paragraph(analytic.analytic_name or "", _hashfile_title_style())
+    _, title_h = temp_para.wrap(page_width - 60, 500)
 
-    header_ts = timestamp_now
-    def draw_header(canvas_obj, doc_obj):
-        canvas_obj.saveState()
-        page_w, page_h = A4
+    data = _get_hashfile_analytics_data(analytic.id, db).data
 
-        logo_path = settings.LOGO_PATH
-        if os.path.exists(logo_path):
-            canvas_obj.drawImage(ImageReader(logo_path), 20, page_h - 60, width=191, height=30, preserveAspectRatio=True, mask="auto")
+    devices = data.get("devices", [])
+    hashfiles = data.get("correlations") or []
+    report_progress(message="Building report sections...", progress=30)
 
-        canvas_obj.setFont("Helvetica", 10)
-        canvas_obj.drawRightString(page_w - 30, page_h - 45, f"Exported: {header_ts.strftime('%d/%m/%Y %H:%M')} WIB")
+    group_size = 4
+    groups = [devices[i:i + group_size] for i in range(0, len(devices), group_size)]
 
-        title_para = Paragraph(analytic.analytic_name or "", dyn_title_style)
-        _, h = title_para.wrap(page_w - 60, 400)
-        title_y = page_h - 65 - h
-        title_para.drawOn(canvas_obj, 30, title_y)
+    doc_kwargs = {
+        "leftMargin": left_margin,
+        "rightMargin": right_margin,
+        "topMargin": title_h + 90,
+        "bottomMargin": 60,
+    }
+    # Frame height inside SimpleDocTemplate's 6pt frame padding.
+    page_avail = A4[1] - doc_kwargs["topMargin"] - doc_kwargs["bottomMargin"] - 12
+    filenames = [_format_hash_filename(h.get("file_name", "-")) for h in hashfiles]
+    row_heights = []
+    if groups:
+        chunks = [filenames[i:i + HASHFILE_TABLE_CHUNK_ROWS] for i in range(0, len(filenames), HASHFILE_TABLE_CHUNK_ROWS)]
+        for heights in map_in_pdf_pool(_hashfile_row_heights, [(usable_width * 0.35, chunk) for chunk in chunks]):
+            row_heights.extend(heights)
+
+    # Device groups already start on a new page, so each group renders as one or more
+    # independent segments of about PDF_SEGMENT_ROWS rows, cut where a page ends.
+    segment_args = []
+    segment_rows = max(1, settings.PDF_SEGMENT_ROWS)
+    for g_index, group in enumerate(groups, start=1):
+        start_dev = (g_index - 1) * group_size + 1
+        end_dev = start_dev + len(group) - 1
 
-        method_y = title_y - dyn_title_style.leading + 3
-        canvas_obj.setFont("Helvetica", 12)
-        canvas_obj.drawString(30, method_y, f"Method: {analytic.method.replace('_',' ').title()}")
+        info_rows = [
+            ["Source", ": Handphone"],
+            ["Total Device", f": {len(devices)} Devices (Device {start_dev}-{end_dev})"],
+            ["Total Files", f": {len(hashfiles)} Files"],
+        ]
+        header_cells = [(d.get("owner_name", "Unknown"), d.get("phone_number") or "-") for d in group]
+        labels = [d.get("device_label") for d in group]
 
-        uploaded = analytic.created_at.strftime("%d/%m/%Y") if analytic.created_at else header_ts.strftime("%d/%m/%Y")
-        canvas_obj.drawRightString(page_w - 30, method_y, f"File Uploaded: {uploaded}")
+        rows = []
+        for formatted, h in zip(filenames, hashfiles):
+            found = h.get("devices", [])
+            rows.append((formatted, ["✔" if label in found else "✘" for label in labels]))
+
+        header_height = _hashfile_table(
+            _hashfile_header_row(header_cells), [], _hashfile_col_widths(usable_width, len(group)),
+        ).wrap(usable_width, page_avail)[1]
+        first_avail = page_avail - _hashfile_info_table(usable_width, info_rows).wrap(usable_width, page_avail)[1] - 12
+        if g_index == 1:
+            first_avail -= 5
+
+        for start, end in _hashfile_segment_ranges(row_heights, header_height, first_avail, page_avail, segment_rows):
+            segment_args.append((info_rows if start == 0 else None, header_cells, rows[start:end]))
+
+    if not segment_args:
+        segment_args.append((None, [], []))
+
+    last_index = len(segment_args) - 1
+    segments = [
+        PdfSegment(
+            _hashfile_segment_story,
+            (usable_width, info_rows, header_cells, rows, index == 0, analytic.summary, index == last_index),
+        )
+        for index, (info_rows, header_cells, rows) in enumerate(segment_args)
+    ]
 
-        canvas_obj.restoreState()
+    header = {
+        "analytic_name": analytic.analytic_name,
+        "method": analytic.method,
+        "created_at": analytic.created_at,
+        "exported_at": timestamp_now,
+    }
 
-    doc.build(
-        story,
-        onFirstPage=draw_header,
-        onLaterPages=draw_header,
-        canvasmaker=lambda *a, **kw: GlobalPageCanvas(
-            *a,
-            footer_text=f"{analytic.analytic_name} - {analytic.method.replace('_',' ').title()}",
-            **kw,
-        ),
+    report_progress(message="Rendering PDF...", progress=60)
+    total_pages = render_pdf_segments(
+        file_path,
+        segments,
+        doc_kwargs=doc_kwargs,
+        on_page=partial(_draw_hashfile_report_header, header),
+        footer_text=f"{analytic.analytic_name} - {analytic.method.replace('_',' ').title()}",
     )
 
+    elapsed = time.time() - report_start_time
+    logger.info(f"Hashfile Analytics PDF generated - analytic_id={analytic.id}, files={len(hashfiles)}, pages={total_pages}, elapsed_time={elapsed:.2f}s")
+
     return FileResponse(path=file_path, filename=filename, media_type="application/pdf")
@@ -1,8 +1,16 @@
-from fastapi import APIRouter, UploadFile, File as FastAPIFile, Query  
+from fastapi import APIRouter, UploadFile, File as FastAPIFile, Query, Depends
 from fastapi.responses import JSONResponse, FileResponse  
-import os,re,json,asyncio, uuid
+from fastapi.concurrency import run_in_threadpool
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+from sqlalchemy.orm import Session
+import os,re, time, uuid, shutil
 from datetime import datetime
 from app.analytics.utils.sdp_crypto import encrypt_to_sdp, generate_keypair
+from app.analytics.utils.sdp_catalog import catalog_entry, import_legacy_metadata, list_conversions, record_conversion
+from app.api.deps import get_database
+from app.core.config import settings
+from app.db.session import SessionLocal
 from app.utils.security import validate_sql_injection_patterns, sanitize_input, validate_file_name
 import logging
 
@@ -11,6 +19,12 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 CONVERT_PROGRESS = {}
+CONVERT_BATCHES = {}
+ALLOWED_CONVERT_EXTENSIONS = {"xlsx", "xls", "csv", "txt"}
+
+# Encryption is CPU/disk bound and runs here instead of on the event loop; the pool size
+# is the number of conversions that may run at once, the rest wait as "queued".
+_convert_executor = ThreadPoolExecutor(max_workers=settings.SDP_CONVERT_WORKERS, thread_name_prefix="sdp-convert")
 
 def _sanitize_name(name: str) -> str:
     base = os.path.basename(name)
@@ -19,52 +33,92 @@ def _sanitize_name(name: str) -> str:
     base = re.sub(r"_+", "_", base).strip("._")
     return base
 
+def _file_extension(filename: str) -> str:
+    return filename.lower().rsplit(".", 1)[-1] if "." in filename else ""
+
+def _prepare_convert_dirs():
+    base_dir = os.getcwd()
+    tmp_dir = os.path.join(base_dir, "data", "uploads", "tmp")
+    converted_dir = os.path.join(base_dir, "data", "uploads", "converted")
+    os.makedirs(tmp_dir, exist_ok=True)
+    os.makedirs(converted_dir, exist_ok=True)
+
+    keys_dir = os.path.join(base_dir, "keys")
+    os.makedirs(keys_dir, exist_ok=True)
+    pub_path = os.path.join(keys_dir, "public.key")
+    priv_path = os.path.join(keys_dir, "private.key")
+    if not (os.path.exists(pub_path) and os.path.exists(priv_path)):
+        private_key, public_key = generate_keypair()
+        with open(priv_path, "wb") as f:
+            f.write(private_key)
+        with open(pub_path, "wb") as f:
+            f.write(public_key)
+    return tmp_dir, converted_dir
+
+def _store_upload(file: UploadFile, tmp_dir: str, upload_id: str, safe_name: str) -> str:
+    src_tmp_path = os.path.join(tmp_dir, upload_id)
+    with open(src_tmp_path, "wb") as f:
+        shutil.copyfileobj(file.file, f, 1024 * 1024)
+
+    CONVERT_PROGRESS[upload_id] = {
+        "status": "waiting",
+        "progress": 0,
+        "message": "File ready for conversion.",
+        "src_path": src_tmp_path,
+        "original_name": safe_name,
+        "finished_at": None,
+    }
+    return src_tmp_path
+
+def _prune_finished_conversions() -> None:
+    # Progress is kept for SDP_PROGRESS_RETENTION_HOURS after a conversion finishes so
+    # clients can still poll it; a batch is dropped only once all of its files have expired.
+    cutoff = time.time() - settings.SDP_PROGRESS_RETENTION_HOURS * 3600
+    expired = {
+        upload_id for upload_id, progress in list(CONVERT_PROGRESS.items())
+        if progress.get("finished_at") and progress["finished_at"] < cutoff
+    }
+    for batch_id, upload_ids in list(CONVERT_BATCHES.items()):
+        if all(upload_id in expired for upload_id in upload_ids):
+            del CONVERT_BATCHES[batch_id]
+        else:
+            expired.difference_update(upload_ids)
+    for upload_id in expired:
+        CONVERT_PROGRESS.pop(upload_id, None)
+
+def _queue_conversion(upload_id: str) -> None:
+    CONVERT_PROGRESS[upload_id]["status"] = "queued"
+    CONVERT_PROGRESS[upload_id]["message"] = "Waiting for a conversion worker..."
+    _convert_executor.submit(run_conversion, upload_id)
+
+def _progress_data(upload_id: str) -> dict:
+    progress = CONVERT_PROGRESS[upload_id]
+    return {
+        "status": progress["status"],
+        "progress": progress["progress"],
+        "message": progress["message"]
+    }
+
 @router.post("/file-encryptor/convert-to-sdp")
 async def prepare_convert_to_sdp(file: UploadFile = FastAPIFile(...)):
     try:
-        allowed = {"xlsx", "xls", "csv", "txt"}
-        base_dir = os.getcwd()
-        tmp_dir = os.path.join(base_dir, "data", "uploads", "tmp")
-        converted_dir = os.path.join(base_dir, "data", "uploads", "converted")
-        os.makedirs(tmp_dir, exist_ok=True)
-        os.makedirs(converted_dir, exist_ok=True)
-
-        keys_dir = os.path.join(base_dir, "keys")
-        os.makedirs(keys_dir, exist_ok=True)
-        pub_path = os.path.join(keys_dir, "public.key")
-        priv_path = os.path.join(keys_dir, "private.key")
-        if not (os.path.exists(pub_path) and os.path.exists(priv_path)):
-            private_key, public_key = generate_keypair()
-            with open(priv_path, "wb") as f:
-                f.write(private_key)
-            with open(pub_path, "wb") as f:
-                f.write(public_key)
+        tmp_dir, _ = _prepare_convert_dirs()
 
         filename = file.filename or "uploaded"
-        ext = filename.lower().rsplit(".", 1)[-1] if "." in filename else ""
-        if ext not in allowed:
+        ext = _file_extension(filename)
+        if ext not in ALLOWED_CONVERT_EXTENSIONS:
             return JSONResponse(
                 {
                     "status": 400,
-                    "message": f"Invalid file type. Allowed extensions: {sorted(list(allowed))}"
+                    "message": f"Invalid file type. Allowed extensions: {sorted(list(ALLOWED_CONVERT_EXTENSIONS))}"
                 },
                 status_code=400
             )
 
         safe_name = _sanitize_name(filename)
-        src_tmp_path = os.path.join(tmp_dir, safe_name)
-        content = await file.read()
-        with open(src_tmp_path, "wb") as f:
-            f.write(content)
-
         upload_id = safe_name
-
-        CONVERT_PROGRESS[upload_id] = {
-            "status": "waiting",
-            "progress": 0,
-            "message": "File ready for conversion.",
-            "src_path": src_tmp_path
-        }
+        _prune_finished_conversions()
+        await run_in_threadpool(_store_upload, file, tmp_dir, upload_id, safe_name)
 
         return JSONResponse(
             {
@@ -116,28 +170,123 @@ async def get_convert_progress(upload_id: str = Query(..., description="Upload I
             )
 
         if progress["status"] == "waiting":
-            CONVERT_PROGRESS[upload_id]["status"] = "converting"
-            CONVERT_PROGRESS[upload_id]["message"] = "Starting conversion..."
-            asyncio.create_task(run_conversion(upload_id))
+            _queue_conversion(upload_id)
 
         return JSONResponse(
             {
                 "status": 200,
                 "message": "Progress retrieved successfully.",
+                "data": _progress_data(upload_id)
+            },
+            status_code=200
+        )
+    except Exception as e:
+        logger.error(f"Error checking progress: {str(e)}", exc_info=True)
+        return JSONResponse({"status": 500, "message": "Progress check error occurred. Please try again later."}, status_code=500)
+
+@router.post("/file-encryptor/convert-to-sdp/batch")
+async def convert_to_sdp_batch(files: List[UploadFile] = FastAPIFile(...)):
+    try:
+        if len(files) > settings.SDP_BATCH_MAX_FILES:
+            return JSONResponse(
+                {
+                    "status": 400,
+                    "message": f"Too many files. A batch may contain at most {settings.SDP_BATCH_MAX_FILES} files."
+                },
+                status_code=400
+            )
+
+        tmp_dir, _ = _prepare_convert_dirs()
+        _prune_finished_conversions()
+        batch_id = uuid.uuid4().hex
+        queued, rejected = [], []
+
+        for file in files:
+            filename = file.filename or "uploaded"
+            if _file_extension(filename) not in ALLOWED_CONVERT_EXTENSIONS:
+                rejected.append({
+                    "filename": filename,
+                    "message": f"Invalid file type. Allowed extensions: {sorted(list(ALLOWED_CONVERT_EXTENSIONS))}"
+                })
+                continue
+
+            safe_name = _sanitize_name(filename)
+            # Batch files may share a name, so each gets its own id and temp path.
+            upload_id = f"{uuid.uuid4().hex[:8]}_{safe_name}"
+            await run_in_threadpool(_store_upload, file, tmp_dir, upload_id, safe_name)
+            _queue_conversion(upload_id)
+            queued.append({"upload_id": upload_id, "filename": safe_name})
+
+        if not queued:
+            return JSONResponse(
+                {"status": 400, "message": "No valid files to convert.", "data": {"rejected": rejected}},
+                status_code=400
+            )
+
+        CONVERT_BATCHES[batch_id] = [item["upload_id"] for item in queued]
+        logger.info(f"Queued SDP conversion batch {batch_id}: {len(queued)} files, {len(rejected)} rejected")
+
+        return JSONResponse(
+            {
+                "status": 200,
+                "message": f"{len(queued)} file(s) queued for conversion.",
                 "data": {
-                    "status": CONVERT_PROGRESS[upload_id]["status"],
-                    "progress": CONVERT_PROGRESS[upload_id]["progress"],
-                    "message": CONVERT_PROGRESS[upload_id]["message"]
+                    "batch_id": batch_id,
+                    "files": queued,
+                    "rejected": rejected,
+                    "max_concurrent": settings.SDP_CONVERT_WORKERS
                 }
             },
             status_code=200
         )
+
     except Exception as e:
-        logger.error(f"Error checking progress: {str(e)}", exc_info=True)
+        logger.error(f"Error preparing SDP batch conversion: {str(e)}", exc_info=True)
+        return JSONResponse(
+            {"status": 500, "message": "File preparation error occurred. Please try again later."},
+            status_code=500
+        )
+
+@router.get("/file-encryptor/batch-progress")
+async def get_batch_progress(batch_id: str = Query(..., description="Batch ID")):
+    try:
+        upload_ids = CONVERT_BATCHES.get(batch_id)
+        if upload_ids is None:
+            return JSONResponse(
+                {"status": 404, "message": "No batch found for the given batch_id."},
+                status_code=404
+            )
+
+        items = [
+            {"upload_id": upload_id, "filename": CONVERT_PROGRESS[upload_id]["original_name"], **_progress_data(upload_id)}
+            for upload_id in upload_ids
+        ]
+        finished = sum(1 for item in items if item["status"] in ("converted", "error"))
+
+        return JSONResponse(
+            {
+                "status": 200,
+                "message": "Progress retrieved successfully.",
+                "data": {
+                    "batch_id": batch_id,
+                    "progress": round(sum(item["progress"] for item in items) / len(items)),
+                    "finished": finished,
+                    "total": len(items),
+                    "done": finished == len(items),
+                    "files": items
+                }
+            },
+            status_code=200
+        )
+    except Exception as e:
+        logger.error(f"Error checking batch progress: {str(e)}", exc_info=True)
         return JSONResponse({"status": 500, "message": "Progress check error occurred. Please try again later."}, status_code=500)
 
-async def run_conversion(upload_id: str):
+def run_conversion(upload_id: str):
+    progress = CONVERT_PROGRESS[upload_id]
     try:
+        progress.update({"status": "converting", "message": "Starting conversion..."})
+
         base_dir = os.getcwd()
         converted_dir = os.path.join(base_dir, "data", "uploads", "converted")
         os.makedirs(converted_dir, exist_ok=True)
@@ -146,83 +295,104 @@ async def run_conversion(upload_id: str):
         with open(pub_path, "rb") as f:
             pub_key = f.read()
 
-        src_path = CONVERT_PROGRESS[upload_id]["src_path"]
-        safe_name = os.path.basename(src_path)
+        src_path = progress["src_path"]
+        safe_name = progress.get("original_name") or os.path.basename(src_path)
         unique_id = uuid.uuid4().hex[:10]
         base, ext = os.path.splitext(safe_name)
         ext = ext.lstrip('.')
         out_name = f"{base}_{unique_id}.{ext}.sdp"      
         out_path = os.path.join(converted_dir, out_name)
 
-        for step in range(1, 6):
-            CONVERT_PROGRESS[upload_id]["progress"] = step * 20
-            CONVERT_PROGRESS[upload_id]["message"] = f"Converting... {step * 20}%"
-            await asyncio.sleep(0.5)
-
-        encrypt_to_sdp(pub_key, src_path, out_path)
+        def on_progress(bytes_done: int, total_bytes: int):
+            # Hold 100% back until the catalog entry below is written.
+            percent = min(99, int(bytes_done * 100 / total_bytes)) if total_bytes else 99
+            progress["progress"] = percent
+            progress["message"] = f"Converting... {percent}%"
 
-        metadata_path = os.path.join(converted_dir, "converted_files.json")
-        new_entry = {
-            "original_filename": safe_name,
-            "converted_filename": out_name,
-            "timestamp": datetime.now().isoformat()
-        }
-
-        data = []
-        if os.path.exists(metadata_path):
-            with open(metadata_path, "r", encoding="utf-8") as f:
-                try:
-                    data = json.load(f)
-                except json.JSONDecodeError:
-                    data = []
+        # Split the CPU between conversions that run side by side.
+        chunk_workers = max(1, (os.cpu_count() or 1) // settings.SDP_CONVERT_WORKERS)
+        encrypt_to_sdp(
+            pub_key, src_path, out_path, workers=chunk_workers, version=settings.SDP_OUTPUT_VERSION, progress_callback=on_progress,
+        )
 
-        data.append(new_entry)
-        with open(metadata_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        db = SessionLocal()
+        try:
+            record_conversion(db, converted_dir, safe_name, out_name)
+        finally:
+            db.close()
 
-        CONVERT_PROGRESS[upload_id].update({
+        result = {
             "status": "converted",
             "progress": 100,
             "message": "File successfully converted to .sdp."
-        })
+        }
 
     except Exception as e:
-        CONVERT_PROGRESS[upload_id].update({
+        logger.error(f"SDP conversion failed for {upload_id}: {str(e)}", exc_info=True)
+        result = {
             "status": "error",
             "message": "File conversion failed. Please try again later."
-        })
+        }
+
+    # The upload is not reused after a conversion, whatever its outcome.
+    src_path = progress.get("src_path")
+    if src_path and os.path.exists(src_path):
+        try:
+            os.remove(src_path)
+        except OSError as e:
+            logger.warning(f"Failed to remove SDP upload {src_path}: {e}")
+
+    progress.update(result, finished_at=time.time())
+
+def shutdown_convert_pool() -> None:
+    _convert_executor.shutdown(wait=False, cancel_futures=True)
 
 @router.get("/file-encryptor/list-sdp")
-def list_sdp_files():
+def list_sdp_files(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    search: Optional[str] = Query(None, description="Filter by original file name"),
+    date_from: Optional[datetime] = Query(None, description="Only conversions at or after this time"),
+    date_to: Optional[datetime] = Query(None, description="Only conversions at or before this time"),
+    db: Session = Depends(get_database),
+):
     try:
-        base_dir = os.getcwd()
-        converted_dir = os.path.join(base_dir, "data", "uploads", "converted")
-        metadata_path = os.path.join(converted_dir, "converted_files.json")
+        if search:
+            if not validate_sql_injection_patterns(search):
+                return JSONResponse(
+                    {
+                        "status": 400,
+                        "message": "Invalid characters detected in search. Please remove any SQL injection attempts or malicious code.",
+                        "data": None
+                    },
+                    status_code=400,
+                )
+            search = sanitize_input(search, max_length=255)
+
+        converted_dir = os.path.join(os.getcwd(), "data", "uploads", "converted")
+        import_legacy_metadata(db, converted_dir)
 
-        if not os.path.exists(metadata_path):
+        entries, total = list_conversions(db, skip=skip, limit=limit, search=search, date_from=date_from, date_to=date_to)
+        if total == 0 and not (search or date_from or date_to):
             return JSONResponse(
                 {"status": 404, "message": "No converted file records found."},
                 status_code=404
             )
 
-        with open(metadata_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        if isinstance(data, list):
-            try:
-                data.sort(
-                    key=lambda x: x.get("timestamp", ""),
-                    reverse=True
-                )
-            except Exception as e:
-                print(f"Warning: failed to sort data by timestamp: {e}")
-
         return JSONResponse(
-            {"status": 200, "message": "Successfully retrieved SDP file list.", "data": data},
+            {
+                "status": 200,
+                "message": "Successfully retrieved SDP file list.",
+                "data": [catalog_entry(entry) for entry in entries],
+                "total": total,
+                "page": skip // limit + 1,
+                "size": limit
+            },
             status_code=200
         )
 
     except Exception as e:
+        logger.error(f"Error listing SDP files: {str(e)}", exc_info=True)
         return JSONResponse(
             {"status": 500, "message": "Error reading file list. Please try again later."},
             status_code=500
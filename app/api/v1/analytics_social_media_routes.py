@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import text
 from app.db.session import get_db
 from app.analytics.shared.models import Analytic, AnalyticDevice, Device, SocialMedia
+from app.analytics.shared.results import CORRELATION_FETCH_SIZE, AnalyticsResult
 from typing import Optional
 from app.auth.models import User
 from app.api.deps import get_current_user
@@ -20,10 +21,10 @@ def _get_social_media_correlation_data(
     db: Session,
     platform: Optional[str] = "Instagram",
     current_user=None
-):
+) -> AnalyticsResult:
     analytic = db.query(Analytic).filter(Analytic.id == analytic_id).first()
     if not analytic:
-        return JSONResponse(
+        return AnalyticsResult(
             {
                 "status": 404,
                 "message": f"Analytic with ID {analytic_id} not found",
@@ -42,14 +43,14 @@ def _get_social_media_correlation_data(
     
     if current_user is not None:
         if not check_analytic_access(analytic, current_user):
-            return JSONResponse(
+            return AnalyticsResult(
                 {"status": 403, "message": "You do not have permission to access this analytic", "data": {}},
                 status_code=403,
             )
 
     method_value = getattr(analytic, 'method', None)
     if method_value is None or str(method_value) != "Social Media Correlation":
-        return JSONResponse(
+        return AnalyticsResult(
             {
                 "status": 400,
                 "message": f"This endpoint is only for Social Media Correlation. Current analytic method is '{method_value}'",
@@ -74,7 +75,7 @@ def _get_social_media_correlation_data(
     )
     if not device_links:
         analytic_name_value = getattr(analytic, 'analytic_name', None) or "Unknown"
-        return JSONResponse(
+        return AnalyticsResult(
             {
                 "status": 404,
                 "message": "No devices linked to this analytic",
@@ -102,7 +103,7 @@ def _get_social_media_correlation_data(
     total_device_count = len(device_ids)
     if total_device_count < min_devices:
         analytic_name_value = getattr(analytic, 'analytic_name', None) or "Unknown"
-        return JSONResponse(
+        return AnalyticsResult(
             {
                 "status": 404,
                 "message": f"Social Media Correlation requires minimum {min_devices} devices. Current analytic has {total_device_count} device(s).",
@@ -129,7 +130,7 @@ def _get_social_media_correlation_data(
     )
     if not devices:
         analytic_name_value = getattr(analytic, 'analytic_name', None) or "Unknown"
-        return JSONResponse(
+        return AnalyticsResult(
             {
                 "status": 404,
                 "message": "Devices not found for this analytic",
@@ -173,7 +174,7 @@ def _get_social_media_correlation_data(
             getattr(SocialMedia, id_column).isnot(None)
             | (SocialMedia.account_name.isnot(None))
         )
-        .all()
+        .yield_per(CORRELATION_FETCH_SIZE)
     )
 
     device_map = {d.file_id: d for d in devices}
@@ -190,27 +191,11 @@ def _get_social_media_correlation_data(
         for d in devices
     ]
 
-    if not socials:
-        return JSONResponse(
-            {
-                "status": 200,
-                "message": f"No social media data found for platform '{selected_platform}'",
-                "data": {
-                    "analytic_id": analytic.id,
-                    "analytic_name": analytic.analytic_name,
-                    "total_devices": len(devices),
-                    "devices": devices_data,
-                    "correlations": {
-                        platform_display: {"buckets": []}
-                    },
-                    "summary": getattr(analytic, "summary", None),
-                },
-            },
-            status_code=200,
-        )
-
+    # Rows are streamed from the cursor; each account key keeps one record per device.
     correlation_map = {}
+    total_socials = 0
     for sm in socials:
+        total_socials += 1
         platform_id_value = getattr(sm, id_column, None)
         account_name_value = sm.account_name
         
@@ -223,20 +208,41 @@ def _get_social_media_correlation_data(
         if key is None or (isinstance(key, str) and str(key).strip() == ""):
             continue
 
+        device = device_map.get(sm.file_id)
+        if not device:
+            continue
+
         key = str(key).strip().lower()
-        record = {
+        correlation_map.setdefault(key, {})[device.id] = {
             "account_key": key,
             "account_name": sm.account_name,
             "full_name": sm.full_name,
             "platform_id": platform_id_value,
             "phone_number": sm.phone_number,
-            "device": device_map.get(sm.file_id),
+            "device": device,
         }
-        correlation_map.setdefault(key, []).append(record)
+
+    if not total_socials:
+        return AnalyticsResult(
+            {
+                "status": 200,
+                "message": f"No social media data found for platform '{selected_platform}'",
+                "data": {
+                    "analytic_id": analytic.id,
+                    "analytic_name": analytic.analytic_name,
+                    "total_devices": len(devices),
+                    "devices": devices_data,
+                    "correlations": {
+                        platform_display: {"buckets": []}
+                    },
+                    "summary": getattr(analytic, "summary", None),
+                },
+            },
+            status_code=200,
+        )
 
     bucket_map = {}
-    for key, records in correlation_map.items():
-        devices_present = {r["device"].id: r for r in records if r["device"]}
+    for key, devices_present in correlation_map.items():
         if len(devices_present) < 2:
             continue
 
@@ -267,7 +273,7 @@ def _get_social_media_correlation_data(
     ):
         sorted_buckets.append({"label": label, "devices": bucket_map[label]})
 
-    return JSONResponse(
+    return AnalyticsResult(
         {
             "status": 200,
             "message": f"Success analyzing social media correlation for '{analytic.analytic_name}'",
@@ -308,4 +314,4 @@ def social_media_correlation(
             )
         platform = sanitize_input(platform, max_length=50)
     
-    return _get_social_media_correlation_data(analytic_id, db, platform, current_user)
+    return _get_social_media_correlation_data(analytic_id, db, platform, current_user).to_response()
@@ -4,16 +4,27 @@ from typing import Optional
 from datetime import datetime
 from app.api.deps import get_database, get_current_user
 from app.auth.models import User
-from app.case_management.service import case_service
+from app.case_management.service import case_service, check_case_access
 from app.case_management.schemas import (
     Case, CaseCreate, CaseUpdate, CaseResponse, CaseListResponse,
     Agency, AgencyCreate, WorkUnit, WorkUnitCreate, CaseDetailResponse,
     CaseNotesRequest, CaseSelectResponse, CaseSelectItem
 )
-from fastapi.responses import JSONResponse, FileResponse
-import os
+from fastapi.responses import JSONResponse, FileResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from sqlalchemy.orm import joinedload
+import os, re, shutil, tempfile, uuid, zipfile
 import logging
 from app.case_management.models import Case
+from app.case_management.pdf_export import (
+    generate_case_detail_pdf, generate_suspect_detail_pdf, generate_evidence_detail_pdf
+)
+from app.suspect_management.models import Suspect
+from app.suspect_management.service import suspect_service
+from app.evidence_management.service import evidence_service
+from app.evidence_management.models import Evidence
+from app.analytics.utils.pdf_segments import render_documents
+from app.analytics.utils.tabular_export import iter_file
 
 logger = logging.getLogger(__name__)
 from app.core.config import settings
@@ -522,3 +533,107 @@ async def export_case_details_pdf(
             status_code=500,
             detail="Failed to export case detail PDF. Please try again later."
         )
+
+def _safe_filename(value) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", str(value or "")).strip("_") or "unknown"
+
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+@router.get("/export-case-dossier/{case_id}")
+def export_case_dossier(
+    case_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_database)
+):
+    work_dir = None
+    try:
+        case = db.query(Case).filter(Case.id == case_id).first()
+        if not case:
+            raise HTTPException(status_code=404, detail=f"Case with ID {case_id} not found")
+        if not check_case_access(case, current_user):
+            raise HTTPException(status_code=403, detail="You do not have permission to access this case")
+
+        case_data = case_service.get_case_detail_comprehensive(db, case_id, current_user)
+        case_info = case_data.get("case", {})
+        case_number = _safe_filename(case_info.get("case_number", case_info.get("id", case_id)))
+
+        suspects = db.query(Suspect).filter(Suspect.case_id == case_id).order_by(Suspect.id).all()
+        evidences = db.query(Evidence).options(joinedload(Evidence.case)).filter(
+            Evidence.case_id == case_id
+        ).order_by(Evidence.id).all()
+
+        os.makedirs(settings.REPORTS_DIR, exist_ok=True)
+        work_dir = tempfile.mkdtemp(prefix="case_dossier_", dir=settings.REPORTS_DIR)
+
+        # Data is collected here on the request session; only rendering is fanned out to the PDF pool.
+        jobs = [(generate_case_detail_pdf, case_data, os.path.join(work_dir, "case.pdf"))]
+        entries = [f"case_detail_{case_number}.pdf"]
+        for suspect in suspects:
+            jobs.append((
+                generate_suspect_detail_pdf,
+                suspect_service.get_suspect_pdf_data(db, suspect),
+                os.path.join(work_dir, f"suspect_{suspect.id}.pdf"),
+            ))
+            entries.append(f"suspects/suspect_{suspect.id}_{_safe_filename(suspect.name)}.pdf")
+        for evidence in evidences:
+            jobs.append((
+                generate_evidence_detail_pdf,
+                evidence_service.get_evidence_pdf_data(db, evidence),
+                os.path.join(work_dir, f"evidence_{evidence.id}.pdf"),
+            ))
+            entries.append(f"evidence/evidence_{evidence.id}_{_safe_filename(evidence.evidence_number)}.pdf")
+
+        errors = render_documents(jobs)
+        if errors[0] is not None:
+            raise HTTPException(
+                status_code=500,
+                detail="Failed to generate case detail PDF"
+            )
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"case_dossier_{case_number}_{timestamp}.zip"
+        zip_path = os.path.join(settings.REPORTS_DIR, f".{uuid.uuid4().hex}_{filename}")
+
+        failed = []
+        try:
+            # PDFs are already compressed, so they are stored as-is.
+            with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_STORED) as archive:
+                for (_, _, pdf_path), entry, error in zip(jobs, entries, errors):
+                    if error is not None or not os.path.exists(pdf_path):
+                        failed.append(f"{entry}: {error or 'file was not generated'}")
+                        continue
+                    archive.write(pdf_path, arcname=entry)
+                if failed:
+                    archive.writestr("export_errors.txt", "\n".join(failed) + "\n", compress_type=zipfile.ZIP_DEFLATED)
+        except Exception:
+            _remove_file(zip_path)
+            raise
+
+        logger.info(
+            f"Exported case dossier {case_id}: {len(jobs) - len(failed)} documents, {len(failed)} failed"
+        )
+
+        # iter_file removes the archive once it is sent; the background task also covers
+        # a response that is dropped before streaming starts.
+        return StreamingResponse(
+            iter_file(zip_path),
+            media_type="application/zip",
+            headers={"Content-Disposition": f"attachment; filename={filename}"},
+            background=BackgroundTask(_remove_file, zip_path),
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error exporting case dossier: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to export case dossier. Please try again later."
+        )
+    finally:
+        if work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
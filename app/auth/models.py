@@ -42,3 +42,11 @@ class BlacklistedToken(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
     __table_args__ = (UniqueConstraint("token_hash", name="uq_blacklisted_token_hash"),)
+
+
+class AuthCacheVersion(Base):
+    __tablename__ = "auth_cache_versions"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 from passlib.context import CryptContext
 from app.auth import models
 from app.core.config import settings
+from app.auth.token_cache import bump_auth_version
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -96,6 +97,7 @@ def blacklist_access_token(db: Session, token: str, user_id: int, expires_at: da
             expires_at=expires_at
         )
         db.add(blacklisted)
+        bump_auth_version(db)
         db.commit()
 
 def is_token_blacklisted(db: Session, token: str) -> bool:
@@ -0,0 +1,135 @@
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session, make_transient_to_detached
+from app.auth.models import AuthCacheVersion, User
+from app.core.config import settings
+from app.db.session import SessionLocal
+import hashlib, logging, threading, time
+
+logger = logging.getLogger(__name__)
+
+VERSION_ROW_ID = 1
+USER_COLUMNS = tuple(column.key for column in User.__table__.columns)
+
+
+class TokenCache:
+    # Verified access tokens -> user column snapshot, LRU-bounded, and never kept past
+    # min(token exp, ttl). Logout and user changes bump a counter in auth_cache_versions;
+    # each worker compares it at most once per check interval and drops everything it
+    # cached when it moves, so revocation also reaches the other workers.
+    def __init__(self, maxsize: int, ttl: float, check_interval: float, session_factory=SessionLocal):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.check_interval = check_interval
+        self._session_factory = session_factory
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._version: Optional[int] = None
+        self._checked_at = 0.0
+        self.generation = 0
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def _clear(self) -> None:
+        self._entries.clear()
+        self.generation += 1
+
+    def invalidate(self) -> None:
+        # Local invalidation; the next lookup also re-reads the shared version.
+        with self._lock:
+            self._clear()
+            self._checked_at = 0.0
+
+    def _refresh_version(self) -> None:
+        now = time.monotonic()
+        if self._version is not None and now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+
+        db = self._session_factory()
+        try:
+            version = db.query(AuthCacheVersion.version).filter(AuthCacheVersion.id == VERSION_ROW_ID).scalar() or 0
+        except Exception as e:
+            # Without a readable version nothing is served from the cache.
+            logger.warning(f"[AUTH CACHE] Could not read auth cache version: {e}")
+            version = None
+        finally:
+            db.close()
+
+        with self._lock:
+            if version is None or version != self._version:
+                self._clear()
+            self._version = version
+
+    def get(self, token: str) -> Optional[User]:
+        if self.maxsize <= 0:
+            return None
+        self._refresh_version()
+
+        key = self._key(token)
+        with self._lock:
+            if self._version is None:
+                return None
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            values, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+
+        # A fresh detached instance per request, so routes never share ORM state.
+        user = User(**values)
+        make_transient_to_detached(user)
+        return user
+
+    def put(self, token: str, user: User, token_exp: Optional[float], generation: int) -> None:
+        # generation is read before verification starts; if an invalidation happened in
+        # between, the result may already be stale and is not cached.
+        if self.maxsize <= 0:
+            return
+        expires_at = time.time() + self.ttl
+        if token_exp is not None:
+            expires_at = min(expires_at, float(token_exp))
+
+        values = {column: getattr(user, column) for column in USER_COLUMNS}
+        key = self._key(token)
+        with self._lock:
+            if generation != self.generation or self._version is None:
+                return
+            self._entries[key] = (values, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+token_cache = TokenCache(
+    maxsize=settings.AUTH_CACHE_SIZE,
+    ttl=settings.AUTH_CACHE_TTL_SECONDS,
+    check_interval=settings.AUTH_CACHE_VERSION_CHECK_SECONDS,
+)
+
+
+def _invalidate_after_commit(session: Session) -> None:
+    token_cache.invalidate()
+
+
+def bump_auth_version(db: Session) -> None:
+    # Runs inside the caller's transaction, so the bump commits together with the
+    # logout or user change that caused it. The local cache is only dropped once that
+    # commit lands; dropping it earlier lets a concurrent request re-cache the old state.
+    updated = db.execute(
+        update(AuthCacheVersion)
+        .where(AuthCacheVersion.id == VERSION_ROW_ID)
+        .values(version=AuthCacheVersion.version + 1)
+    ).rowcount
+    if not updated:
+        db.add(AuthCacheVersion(id=VERSION_ROW_ID, version=1))
+    event.listen(db, "after_commit", _invalidate_after_commit, once=True)
@@ -5,7 +5,7 @@ from datetime import datetime, timezone, timedelta
 from io import BytesIO
 from typing import Optional
 from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.styles import ParagraphStyle
 from reportlab.platypus import (
     SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle,
     Image, PageBreak, KeepTogether, CondPageBreak, Flowable
@@ -13,10 +13,9 @@ from reportlab.platypus import (
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_LEFT, TA_RIGHT, TA_CENTER, TA_JUSTIFY
 from reportlab.pdfgen import canvas
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 from PIL import Image as PILImage, ImageDraw
 from app.core.config import settings
+from app.utils.pdf_resources import noto_sans_font, logo_image, fit_image, resolve_logo_path, sample_styles
 
 WIB = timezone(timedelta(hours=7), 'WIB')
 
@@ -53,25 +52,6 @@ class TimelineFlowable(Flowable):
         self.custody_data = custody_data
         self.width = width
         self.height = height
-        self._register_noto_sans()
-    
-    def _register_noto_sans(self):
-        try:
-            pdfmetrics.getFont("NotoSans")
-        except:
-            noto_sans_paths = [
-                "/System/Library/Fonts/Supplemental/NotoSans-Regular.ttf",
-                "/usr/share/fonts/truetype/noto/NotoSans-Regular.ttf",
-                "C:/Windows/Fonts/NotoSans-Regular.ttf",
-                os.path.join(os.path.dirname(__file__), "fonts", "NotoSans-Regular.ttf"),
-            ]
-            for path in noto_sans_paths:
-                if os.path.exists(path):
-                    try:
-                        pdfmetrics.registerFont(TTFont("NotoSans", path))
-                        break
-                    except:
-                        continue
 
     def wrap(self, availWidth, availHeight):
         return self.width, self.height
@@ -131,10 +111,7 @@ class TimelineFlowable(Flowable):
 
             name_str = data.get("name", "N/A")
 
-            try:
-                font_name = "NotoSans" if pdfmetrics.getFont("NotoSans") else "Helvetica"
-            except:
-                font_name = "Helvetica"
+            font_name = noto_sans_font()
             canvas.setFont(font_name, 6.31)
             canvas.setFillColor(colors.HexColor("#000000"))
             name_width = canvas.stringWidth(name_str, font_name, 6.31)
@@ -186,22 +163,16 @@ class CaseDetailPageCanvas(canvas.Canvas):
         logo_x = left_margin - 7
         logo_y = page_height - 30
 
-        if self.logo_path and os.path.exists(self.logo_path):
+        logo = logo_image(self.logo_path) if self.logo_path else None
+        if logo is not None:
             try:
-                img = PILImage.open(self.logo_path)
-                ratio = min(logo_w / img.width, logo_h / img.height)
-                final_w = img.width * ratio
-                final_h = img.height * ratio
-                buf = BytesIO()
-                img.save(buf, format="PNG")
-                buf.seek(0)
-                reportlab_img = Image(buf, width=final_w, height=final_h)
+                final_w, final_h = fit_image(logo, logo_w, logo_h)
                 
                 logo_y_aligned = logo_y - final_h + 12
                 self.saveState()
                 self.setStrokeColor(colors.white)
                 self.setLineWidth(0)
-                reportlab_img.drawOn(self, logo_x, logo_y_aligned)
+                self.drawImage(logo, logo_x, logo_y_aligned, width=final_w, height=final_h, mask="auto")
                 self.restoreState()
             except Exception:
                 self.setFont("Helvetica-Bold", 14)
@@ -352,7 +323,7 @@ def generate_case_detail_pdf(case_data: dict, output_path: str) -> str:
             bottomMargin=MARGIN_BOTTOM,
         )
 
-        styles = getSampleStyleSheet()
+        styles = sample_styles()
 
         title_style = ParagraphStyle(
             "CaseTitle", parent=styles["Heading1"], fontSize=20, textColor=COLOR_TITLE,
@@ -729,9 +700,7 @@ def generate_case_detail_pdf(case_data: dict, output_path: str) -> str:
         canvas_instance = [None]
 
         def canvas_maker(*args, **kwargs):
-            logo_path = settings.LOGO_PATH
-            if not os.path.isabs(logo_path):
-                logo_path = os.path.join(os.getcwd(), logo_path.lstrip("./"))
+            logo_path = resolve_logo_path()
             
             canvas_obj = CaseDetailPageCanvas(
                 *args, case_title=case_title,
@@ -806,22 +775,16 @@ class SuspectDetailPageCanvas(canvas.Canvas):
         logo_x = left_margin - 7
         logo_y = page_height - 30
 
-        if self.logo_path and os.path.exists(self.logo_path):
+        logo = logo_image(self.logo_path) if self.logo_path else None
+        if logo is not None:
             try:
-                img = PILImage.open(self.logo_path)
-                ratio = min(logo_w / img.width, logo_h / img.height)
-                final_w = img.width * ratio
-                final_h = img.height * ratio
-                buf = BytesIO()
-                img.save(buf, format="PNG")
-                buf.seek(0)
-                reportlab_img = Image(buf, width=final_w, height=final_h)
+                final_w, final_h = fit_image(logo, logo_w, logo_h)
                 
                 logo_y_aligned = logo_y - final_h + 12
                 self.saveState()
                 self.setStrokeColor(colors.white)
                 self.setLineWidth(0)
-                reportlab_img.drawOn(self, logo_x, logo_y_aligned)
+                self.drawImage(logo, logo_x, logo_y_aligned, width=final_w, height=final_h, mask="auto")
                 self.restoreState()
             except Exception:
                 self.setFont("Helvetica-Bold", 14)
@@ -977,7 +940,7 @@ def generate_suspect_detail_pdf(suspect_data: dict, output_path: str) -> str:
             bottomMargin=MARGIN_BOTTOM,
         )
 
-        styles = getSampleStyleSheet()
+        styles = sample_styles()
 
         title_style = ParagraphStyle(
             "SuspectTitle", parent=styles["Heading1"], fontSize=20, textColor=COLOR_TITLE,
@@ -1193,9 +1156,7 @@ def generate_suspect_detail_pdf(suspect_data: dict, output_path: str) -> str:
         canvas_instance = [None]
 
         def canvas_maker(*args, **kwargs):
-            logo_path = settings.LOGO_PATH
-            if not os.path.isabs(logo_path):
-                logo_path = os.path.join(os.getcwd(), logo_path.lstrip("./"))
+            logo_path = resolve_logo_path()
             
             canvas_obj = SuspectDetailPageCanvas(
                 *args, suspect_name=suspect_name,
@@ -1269,21 +1230,17 @@ class EvidenceDetailPageCanvas(canvas.Canvas):
         header_y = page_height - 30
         logo_y = header_y
 
-        if self.logo_path and os.path.exists(self.logo_path):
+        logo = logo_image(self.logo_path) if self.logo_path else None
+        if logo is not None:
             try:
-                img = PILImage.open(self.logo_path)
                 final_w = logo_w
                 final_h = logo_h
-                buf = BytesIO()
-                img.save(buf, format="PNG")
-                buf.seek(0)
-                reportlab_img = Image(buf, width=final_w, height=final_h)
                 
                 logo_y_aligned = logo_y - final_h + 12
                 self.saveState()
                 self.setStrokeColor(colors.white)
                 self.setLineWidth(0)
-                reportlab_img.drawOn(self, logo_x, logo_y_aligned)
+                self.drawImage(logo, logo_x, logo_y_aligned, width=final_w, height=final_h, mask="auto")
                 self.restoreState()
             except Exception:
                 self.setFont("Helvetica-Bold", 14)
@@ -1368,7 +1325,7 @@ def generate_evidence_detail_pdf(evidence_data: dict, output_path: str) -> str:
             bottomMargin=MARGIN_BOTTOM,
         )
 
-        styles = getSampleStyleSheet()
+        styles = sample_styles()
 
         title_style = ParagraphStyle(
             "CaseTitle", parent=styles["Heading1"], fontSize=20, textColor=COLOR_TITLE,
@@ -4,8 +4,14 @@ import os
 import json
 import struct
 import glob
+import time
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from sdp_crypto import generate_keypair, encrypt_to_sdp, decrypt_from_sdp
 
+# Anything claiming a larger JSON header is not an SDP file; never read more than this.
+MAX_HEADER_BYTES = 1024 * 1024
+
 def is_sdp_encrypted(file_path):
     try:
         if not os.path.exists(file_path):
@@ -21,6 +27,8 @@ def is_sdp_encrypted(file_path):
                 return False
                 
             header_len = struct.unpack('>I', header_len_bytes)[0]
+            if header_len > min(MAX_HEADER_BYTES, file_size - 4):
+                return False
             
             header_json = f.read(header_len)
             if len(header_json) != header_len:
@@ -54,6 +62,11 @@ def get_sdp_file_info(file_path):
             file_size = os.path.getsize(file_path)
             header_size = 4 + header_len
             footer_size = 32
+            if str(header.get('version', '')).startswith('3'):
+                # v3: encrypted chunk index + (u64 index_offset, u32 index_size, sha256, magic)
+                f.seek(file_size - 48)
+                index_offset = struct.unpack('>Q', f.read(8))[0]
+                footer_size = file_size - index_offset
             
             data_size = file_size - header_size - footer_size
             
@@ -72,25 +85,98 @@ def get_sdp_file_info(file_path):
     except Exception as e:
         return None
 
-def check_files_in_directory(directory='.'):
+def _chunk_workers(jobs):
+    # Each process already encrypts its own file; split the cores between them.
+    return max(1, (os.cpu_count() or 1) // max(1, jobs))
+
+def _encrypt_task(pub_key, file_path, output_file, chunk_workers, quiet):
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull if quiet else sys.stdout):
+        encrypt_to_sdp(pub_key, file_path, output_file, workers=chunk_workers)
+    return output_file, os.path.getsize(file_path)
+
+def _decrypt_task(priv_key, sdp_file, output_dir, chunk_workers, quiet):
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull if quiet else sys.stdout):
+        decrypted_path = decrypt_from_sdp(priv_key, sdp_file, output_dir, workers=chunk_workers)
+    return decrypted_path, os.path.getsize(decrypted_path)
+
+def run_file_jobs(task, key, items, jobs=1, action='Encrypted', failure='encrypt'):
+    # items: (source_path, destination, label). Returns [(source_path, result_path)] in
+    # completion order and prints aggregated progress and throughput.
+    total = len(items)
+    done = []
+    total_bytes = 0
+    start_time = time.time()
+    chunk_workers = _chunk_workers(jobs)
+
+    def report(index, item, outcome):
+        nonlocal total_bytes
+        source_path, _, label = item
+        try:
+            result_path, size = outcome()
+        except Exception as e:
+            print(f"[{index}/{total}] Failed to {failure} {source_path}: {e}")
+            return
+        done.append((source_path, result_path))
+        total_bytes += size
+        elapsed = max(time.time() - start_time, 1e-6)
+        print(f"[{index}/{total}] {action}: {label} ({total_bytes / elapsed / (1024 * 1024):.1f} MB/s overall)")
+
+    if jobs <= 1 or total <= 1:
+        for index, item in enumerate(items, 1):
+            report(index, item, lambda item=item: task(key, item[0], item[1], chunk_workers, False))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {pool.submit(task, key, item[0], item[1], chunk_workers, True): item for item in items}
+            for index, future in enumerate(as_completed(futures), 1):
+                report(index, futures[future], future.result)
+
+    elapsed = time.time() - start_time
+    if total:
+        print(
+            f"Processed {total_bytes / (1024 * 1024):.1f} MB in {elapsed:.1f}s "
+            f"({total_bytes / max(elapsed, 1e-6) / (1024 * 1024):.1f} MB/s, {len(done)}/{total} files, jobs={max(1, jobs)})"
+        )
+    return done
+
+def _scan_paths(directory, recursive):
+    if not recursive:
+        return [os.path.join(directory, name) for name in os.listdir(directory)]
+    paths = []
+    for root, _, names in os.walk(directory):
+        paths.extend(os.path.join(root, name) for name in names)
+    return paths
+
+def check_files_in_directory(directory='.', recursive=False, jobs=1):
     print(f"Checking encryption status in: {os.path.abspath(directory)}")
     print("=" * 60)
     
-    files = os.listdir(directory)
+    files = [path for path in _scan_paths(directory, recursive) if os.path.isfile(path)]
+    
+    # Only the first bytes of each file are read, so the scan is I/O bound and threads suffice.
+    if jobs > 1:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            statuses = list(pool.map(is_sdp_encrypted, files))
+    else:
+        statuses = [is_sdp_encrypted(file_path) for file_path in files]
+    
     results = []
+    for file_path, is_encrypted in zip(files, statuses):
+        status = "ENCRYPTED" if is_encrypted else "NOT ENCRYPTED"
+        results.append((os.path.relpath(file_path, directory), status, file_path))
     
-    for file in files:
-        file_path = os.path.join(directory, file)
-        if os.path.isfile(file_path):
-            is_encrypted = is_sdp_encrypted(file_path)
-            status = "ENCRYPTED" if is_encrypted else "NOT ENCRYPTED"
-            results.append((file, status, file_path))
+    for file, status, _ in sorted(results):
+        print(f"{file} - {status}")
     
-def encrypt_multiple_files(public_key_path, file_patterns, output_dir=None):
+    encrypted_count = sum(1 for _, status, _ in results if status == "ENCRYPTED")
+    print("=" * 60)
+    print(f"Total: {len(results)} files, {encrypted_count} encrypted, {len(results) - encrypted_count} not encrypted")
+    return results
+    
+def encrypt_multiple_files(public_key_path, file_patterns, output_dir=None, jobs=1):
     with open(public_key_path, 'rb') as f:
         pub_key = f.read()
     
-    encrypted_files = []
+    items = []
     
     for pattern in file_patterns:
         matched_files = glob.glob(pattern)
@@ -100,27 +186,20 @@ def encrypt_multiple_files(public_key_path, file_patterns, output_dir=None):
             
         for file_path in matched_files:
             if os.path.isfile(file_path):
-                try:
-                    if output_dir:
-                        os.makedirs(output_dir, exist_ok=True)
-                        output_file = os.path.join(output_dir, os.path.basename(file_path) + '.sdp')
-                    else:
-                        output_file = file_path + '.sdp'
-                    
-                    encrypt_to_sdp(pub_key, file_path, output_file)
-                    encrypted_files.append((file_path, output_file))
-                    print(f"Encrypted: {file_path} -> {output_file}")
-                    
-                except Exception as e:
-                    print(f"Failed to encrypt {file_path}: {e}")
+                if output_dir:
+                    os.makedirs(output_dir, exist_ok=True)
+                    output_file = os.path.join(output_dir, os.path.basename(file_path) + '.sdp')
+                else:
+                    output_file = file_path + '.sdp'
+                items.append((file_path, output_file, f"{file_path} -> {output_file}"))
     
-    return encrypted_files
+    return run_file_jobs(_encrypt_task, pub_key, items, jobs, 'Encrypted', 'encrypt')
 
-def decrypt_multiple_files(private_key_path, sdp_patterns, output_dir='.'):
+def decrypt_multiple_files(private_key_path, sdp_patterns, output_dir='.', jobs=1):
     with open(private_key_path, 'rb') as f:
         priv_key = f.read()
     
-    decrypted_files = []
+    items = []
     
     for pattern in sdp_patterns:
         matched_files = glob.glob(pattern)
@@ -130,17 +209,11 @@ def decrypt_multiple_files(private_key_path, sdp_patterns, output_dir='.'):
             
         for file_path in matched_files:
             if os.path.isfile(file_path) and file_path.endswith('.sdp'):
-                try:
-                    decrypted_path = decrypt_from_sdp(priv_key, file_path, output_dir)
-                    decrypted_files.append((file_path, decrypted_path))
-                    print(f"Decrypted: {file_path} -> {decrypted_path}")
-                    
-                except Exception as e:
-                    print(f"Failed to decrypt {file_path}: {e}")
+                items.append((file_path, output_dir, file_path))
     
-    return decrypted_files
+    return run_file_jobs(_decrypt_task, priv_key, items, jobs, 'Decrypted', 'decrypt')
 
-def encrypt_folder(public_key_path, folder_path, output_dir=None, recursive=False):
+def encrypt_folder(public_key_path, folder_path, output_dir=None, recursive=False, jobs=1):
     with open(public_key_path, 'rb') as f:
         pub_key = f.read()
     
@@ -164,8 +237,6 @@ def encrypt_folder(public_key_path, folder_path, output_dir=None, recursive=Fals
     print(f"Recursive: {'Yes' if recursive else 'No'}")
     print("=" * 50)
     
-    encrypted_files = []
-    
     if recursive:
         pattern = os.path.join(folder_path, "**", "*")
     else:
@@ -176,35 +247,29 @@ def encrypt_folder(public_key_path, folder_path, output_dir=None, recursive=Fals
     
     print(f"Found {file_count} files to encrypt")
     
-    for i, file_path in enumerate(all_files, 1):
-        if os.path.isfile(file_path):
-            try:
-                if file_path.endswith('.sdp'):
-                    continue
-                
-                if recursive:
-                    relative_path = os.path.relpath(file_path, folder_path)
-                    file_output_dir = os.path.join(output_dir, os.path.dirname(relative_path))
-                else:
-                    relative_path = os.path.basename(file_path)
-                    file_output_dir = output_dir
-                
-                os.makedirs(file_output_dir, exist_ok=True)
-                
-                output_file = os.path.join(file_output_dir, relative_path + '.sdp')
-                
-                encrypt_to_sdp(pub_key, file_path, output_file)
-                encrypted_files.append((file_path, output_file))
-                
-                print(f"[{i}/{file_count}] Encrypted: {relative_path}")
-                
-            except Exception as e:
-                print(f"[{i}/{file_count}] Failed to encrypt {file_path}: {e}")
+    items = []
+    for file_path in all_files:
+        if not os.path.isfile(file_path) or file_path.endswith('.sdp'):
+            continue
+        
+        if recursive:
+            relative_path = os.path.relpath(file_path, folder_path)
+            file_output_dir = os.path.join(output_dir, os.path.dirname(relative_path))
+        else:
+            relative_path = os.path.basename(file_path)
+            file_output_dir = output_dir
+        
+        os.makedirs(file_output_dir, exist_ok=True)
+        
+        output_file = os.path.join(file_output_dir, os.path.basename(relative_path) + '.sdp')
+        items.append((file_path, output_file, relative_path))
+    
+    encrypted_files = run_file_jobs(_encrypt_task, pub_key, items, jobs, 'Encrypted', 'encrypt')
     
     print(f"\nSummary: {len(encrypted_files)} files encrypted successfully")
     return encrypted_files
 
-def decrypt_folder(private_key_path, folder_path, output_dir=None, recursive=False):
+def decrypt_folder(private_key_path, folder_path, output_dir=None, recursive=False, jobs=1):
     with open(private_key_path, 'rb') as f:
         priv_key = f.read()
     
@@ -224,8 +289,6 @@ def decrypt_folder(private_key_path, folder_path, output_dir=None, recursive=Fal
     print(f"Recursive: {'Yes' if recursive else 'No'}")
     print("=" * 50)
     
-    decrypted_files = []
-    
     if recursive:
         pattern = os.path.join(folder_path, "**", "*.sdp")
     else:
@@ -235,26 +298,20 @@ def decrypt_folder(private_key_path, folder_path, output_dir=None, recursive=Fal
     
     print(f"Found {len(sdp_files)} .sdp files to decrypt")
     
-    for i, sdp_file in enumerate(sdp_files, 1):
-        try:
-            if recursive:
-                relative_path = os.path.relpath(sdp_file, folder_path)
-                relative_path_no_ext = relative_path[:-4]
-                file_output_dir = os.path.join(output_dir, os.path.dirname(relative_path_no_ext))
-            else:
-                relative_path = os.path.basename(sdp_file)
-                relative_path_no_ext = relative_path[:-4]
-                file_output_dir = output_dir
-            
-            os.makedirs(file_output_dir, exist_ok=True)
-            
-            decrypted_path = decrypt_from_sdp(priv_key, sdp_file, file_output_dir)
-            decrypted_files.append((sdp_file, decrypted_path))
-            
-            print(f"[{i}/{len(sdp_files)}] Decrypted: {relative_path}")
-            
-        except Exception as e:
-            print(f"[{i}/{len(sdp_files)}] Failed to decrypt {sdp_file}: {e}")
+    items = []
+    for sdp_file in sdp_files:
+        if recursive:
+            relative_path = os.path.relpath(sdp_file, folder_path)
+            relative_path_no_ext = relative_path[:-4]
+            file_output_dir = os.path.join(output_dir, os.path.dirname(relative_path_no_ext))
+        else:
+            relative_path = os.path.basename(sdp_file)
+            file_output_dir = output_dir
+        
+        os.makedirs(file_output_dir, exist_ok=True)
+        items.append((sdp_file, file_output_dir, relative_path))
+    
+    decrypted_files = run_file_jobs(_decrypt_task, priv_key, items, jobs, 'Decrypted', 'decrypt')
     
     print(f"\nSummary: {len(decrypted_files)} files decrypted successfully")
     return decrypted_files
@@ -275,6 +332,7 @@ def main():
     encrypt_multi_parser.add_argument('files', nargs='+', help='Files to encrypt (supports wildcards)')
     encrypt_multi_parser.add_argument('--public-key', required=True, help='Public key file')
     encrypt_multi_parser.add_argument('--output-dir', help='Output directory for encrypted files')
+    encrypt_multi_parser.add_argument('--jobs', type=int, default=1, help='Number of files to process in parallel (default: 1)')
     
     decrypt_parser = subparsers.add_parser('decrypt', help='Decrypt a file')
     decrypt_parser.add_argument('file', help='.sdp file to decrypt')
@@ -285,23 +343,28 @@ def main():
     decrypt_multi_parser.add_argument('files', nargs='+', help='.sdp files to decrypt (supports wildcards)')
     decrypt_multi_parser.add_argument('--private-key', required=True, help='Private key file')
     decrypt_multi_parser.add_argument('--output-dir', default='.', help='Output directory')
+    decrypt_multi_parser.add_argument('--jobs', type=int, default=1, help='Number of files to process in parallel (default: 1)')
     
     check_parser = subparsers.add_parser('check', help='Check encryption status')
     check_parser.add_argument('file', nargs='?', help='File to check (optional)')
     check_parser.add_argument('--dir', default='.', help='Directory to check')
     check_parser.add_argument('--info', action='store_true', help='Show detailed info')
+    check_parser.add_argument('--recursive', action='store_true', help='Check subfolders recursively')
+    check_parser.add_argument('--jobs', type=int, default=8, help='Number of files to scan in parallel (default: 8)')
 
     encrypt_folder_parser = subparsers.add_parser('encrypt-folder', help='Encrypt all files in a folder')
     encrypt_folder_parser.add_argument('folder', help='Folder path to encrypt')
     encrypt_folder_parser.add_argument('--public-key', required=True, help='Public key file')
     encrypt_folder_parser.add_argument('--output-dir', help='Output directory for encrypted files')
     encrypt_folder_parser.add_argument('--recursive', action='store_true', help='Process subfolders recursively')
+    encrypt_folder_parser.add_argument('--jobs', type=int, default=1, help='Number of files to process in parallel (default: 1)')
     
     decrypt_folder_parser = subparsers.add_parser('decrypt-folder', help='Decrypt all .sdp files in a folder')
     decrypt_folder_parser.add_argument('folder', help='Folder path to decrypt')
     decrypt_folder_parser.add_argument('--private-key', required=True, help='Private key file')
     decrypt_folder_parser.add_argument('--output-dir', help='Output directory for decrypted files')
     decrypt_folder_parser.add_argument('--recursive', action='store_true', help='Process subfolders recursively')
+    decrypt_folder_parser.add_argument('--jobs', type=int, default=1, help='Number of files to process in parallel (default: 1)')
 
     args = parser.parse_args()
     
@@ -325,7 +388,7 @@ def main():
         print(f"Encrypted: {args.file} -> {output_file}")
         
     elif args.command == 'encrypt-multiple':
-        encrypted_files = encrypt_multiple_files(args.public_key, args.files, args.output_dir)
+        encrypted_files = encrypt_multiple_files(args.public_key, args.files, args.output_dir, args.jobs)
         print(f"\nSummary: {len(encrypted_files)} files encrypted successfully")
         
     elif args.command == 'decrypt':
@@ -336,7 +399,7 @@ def main():
         print(f"Decrypted: {args.file} -> {decrypted_path}")
         
     elif args.command == 'decrypt-multiple':
-        decrypted_files = decrypt_multiple_files(args.private_key, args.files, args.output_dir)
+        decrypted_files = decrypt_multiple_files(args.private_key, args.files, args.output_dir, args.jobs)
         print(f"\nSummary: {len(decrypted_files)} files decrypted successfully")
         
     elif args.command == 'check':
@@ -360,13 +423,13 @@ def main():
             else:
                 print(f"File not found: {file_path}")
         else:
-            check_files_in_directory(args.dir)
+            check_files_in_directory(args.dir, args.recursive, args.jobs)
 
     elif args.command == 'encrypt-folder':
-        encrypted_files = encrypt_folder(args.public_key, args.folder, args.output_dir, args.recursive)
+        encrypted_files = encrypt_folder(args.public_key, args.folder, args.output_dir, args.recursive, args.jobs)
         
     elif args.command == 'decrypt-folder':
-        decrypted_files = decrypt_folder(args.private_key, args.folder, args.output_dir, args.recursive)
+        decrypted_files = decrypt_folder(args.private_key, args.folder, args.output_dir, args.recursive, args.jobs)
         
     else:
         parser.print_help()
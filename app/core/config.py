@@ -17,6 +17,9 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    AUTH_CACHE_SIZE: int = 10000
+    AUTH_CACHE_TTL_SECONDS: int = 300
+    AUTH_CACHE_VERSION_CHECK_SECONDS: float = 5
 
 
     ENCRYPTION_KEY: str
@@ -47,8 +50,26 @@ class Settings(BaseSettings):
     ANALYTICS_BATCH_SIZE: int = 1000
     HASH_ALGORITHMS: List[str] = ["md5", "sha1", "sha256"]
     MAX_ANALYSIS_THREADS: int = 4
+    SHEET_PARSER_WORKERS: int = 4
+    REPORT_JOB_WORKERS: int = 2
+    REPORT_JOBS_PER_USER: int = 2
+    REPORT_JOB_RETENTION_HOURS: int = 24
+    REPORT_CACHE_ENABLED: bool = True
+    REPORT_CACHE_MAX_MB: int = 2048
+    REPORT_CACHE_MAX_AGE_HOURS: int = 72
+    PDF_RENDER_WORKERS: int = 4
+    PDF_SEGMENT_ROWS: int = 20000
+    SDP_CONVERT_WORKERS: int = 2
+    SDP_BATCH_MAX_FILES: int = 20
+    SDP_OUTPUT_VERSION: str = "2.0"
+    SDP_PROGRESS_RETENTION_HOURS: int = 24
 
     MOBSF_URL: str = "http://172.15.2.105:5001"
+    MOBSF_CONNECT_TIMEOUT: float = 10
+    MOBSF_READ_TIMEOUT: float = 600
+    MOBSF_POOL_SIZE: int = 4
+    MOBSF_CACHE_DIR: str = "./data/mobsf_cache"
+    APK_ANALYSIS_WORKERS: int = 2
     START_DATE_LICENSE:str = "2026-01-01T00:01:00"
     END_DATE_LICENSE:str   = "2028-01-01T00:01:00"
 
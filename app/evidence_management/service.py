@@ -0,0 +1,104 @@
+from datetime import datetime
+from sqlalchemy.orm import Session
+from app.auth.models import User
+from app.evidence_management.models import CustodyReport, Evidence
+from app.suspect_management.models import Suspect
+
+
+class EvidenceService:
+    def get_evidence_pdf_data(self, db: Session, evidence: Evidence) -> dict:
+        case = evidence.case
+
+        suspect = None
+        if getattr(evidence, 'suspect_id', None) is not None:
+            suspect = db.query(Suspect).filter(Suspect.id == evidence.suspect_id).first()
+
+        custody_reports = db.query(CustodyReport).filter(
+            CustodyReport.evidence_id == evidence.id
+        ).order_by(CustodyReport.created_at.asc()).all()
+
+        evidence_type_from_custody = None
+        evidence_detail_from_custody = None
+        if custody_reports:
+            for report in custody_reports:
+                evidence_type_value = getattr(report, 'evidence_type', None)
+                evidence_detail_value = getattr(report, 'evidence_detail', None)
+                if evidence_type_value:
+                    evidence_type_from_custody = evidence_type_value
+                if evidence_detail_value:
+                    evidence_detail_from_custody = evidence_detail_value
+            
+                if evidence_type_from_custody and evidence_detail_from_custody:
+                    break
+
+        case_created_date = "N/A"
+        if case.created_at:
+            try:
+                if isinstance(case.created_at, datetime):
+                    case_created_date = case.created_at.strftime("%d/%m/%Y")
+                else:
+                    case_created_date = str(case.created_at)
+            except (AttributeError, TypeError):
+                case_created_date = "N/A"
+
+        custody_reports_data = []
+        for report in custody_reports:
+            created_by_value = report.created_by
+            user_fullname = created_by_value
+        
+            if created_by_value:
+                user = db.query(User).filter(User.email == created_by_value).first()
+                if not user:
+                    try:
+                        user_id = int(created_by_value)
+                        user = db.query(User).filter(User.id == user_id).first()
+                    except (ValueError, TypeError):
+                        pass
+            
+                if user and hasattr(user, 'fullname') and user.fullname:
+                    user_fullname = user.fullname
+        
+            details_value = report.details if report.details is not None else ({} if report.custody_type != "acquisition" else [])
+        
+            custody_reports_data.append({
+                "id": report.id,
+                "custody_type": report.custody_type,
+                "created_by": user_fullname,
+                "location": report.location,
+                "notes": report.notes,
+                "details": details_value,
+                "evidence_source": report.evidence_source,
+                "evidence_type": report.evidence_type,
+                "evidence_detail": report.evidence_detail,
+                "created_at": report.created_at.isoformat() if getattr(report, 'created_at', None) is not None else None,
+                "updated_at": report.updated_at.isoformat() if getattr(report, 'updated_at', None) is not None else None,
+            })
+
+        return {
+            "evidence": {
+                "id": evidence.id,
+                "evidence_number": evidence.evidence_number,
+                "title": evidence.title,
+                "description": evidence.description or "No description available",
+                "investigator": evidence.investigator or "N/A",
+                "source": getattr(evidence, 'source', None),
+                "evidence_type": evidence_type_from_custody or getattr(evidence, 'evidence_type', None),
+                "evidence_detail": evidence_detail_from_custody or getattr(evidence, 'evidence_detail', None),
+                "file_path": evidence.file_path,
+                "file_size": evidence.file_size,
+            },
+            "case": {
+                "id": case.id,
+                "title": case.title,
+                "case_number": getattr(case, 'case_number', None) or str(case.id),
+                "case_officer": getattr(case, 'case_officer', None) or evidence.investigator or "N/A",
+                "created_date": case_created_date,
+            },
+            "suspect": {
+                "name": suspect.name if suspect else "N/A",
+            },
+            "custody_reports": custody_reports_data
+        }
+
+
+evidence_service = EvidenceService()
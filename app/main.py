@@ -41,6 +41,10 @@ from app.api.v1 import (
 )
 from fastapi.openapi.utils import get_openapi
 from app.db.init_db import init_db
+from app.analytics.utils.sheet_scheduler import shutdown_sheet_pool
+from app.analytics.utils.pdf_segments import shutdown_pdf_pool
+from app.api.v1.analytics_sdp_routes import shutdown_convert_pool
+from app.api.v1.analytics_apk_routes import shutdown_apk_analysis_pool
 from fastapi.staticfiles import StaticFiles
 from datetime import datetime, timezone, timedelta
 
@@ -63,6 +67,10 @@ async def lifespan(app: FastAPI):
     yield
     
     logger.info("Server shutting down...")
+    shutdown_sheet_pool()
+    shutdown_pdf_pool()
+    shutdown_convert_pool()
+    shutdown_apk_analysis_pool()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
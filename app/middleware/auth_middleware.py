@@ -1,99 +1,105 @@
 import re
-from fastapi import Request
 from fastapi.responses import JSONResponse
 from jose import JWTError, ExpiredSignatureError
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Receive, Scope, Send
 from app.core import security
 from app.db.session import SessionLocal
 from app.auth.models import User
+from app.auth.token_cache import token_cache
 
+PUBLIC_PATHS = frozenset([
+    "/",
+    "/api/v1/auth/login",
+    "/api/v1/auth/register",
+    "/api/v1/auth/refresh",
+    "/docs",
+    "/openapi.json",
+    "/redoc",
+    "/favicon.ico",
+    "/api/v1/file-encryptor/convert-to-sdp",
+    "/api/v1/file-encryptor/list-sdp",
+    "/api/v1/file-encryptor/download-sdp",
+    "/api/v1/file-encryptor/progress",
+    '/health/health',
+    '/health/health/ready',
+    '/health/health/live',
+    "/license"
+])
 
-class AuthMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        public_paths = [
-            "/",
-            "/api/v1/auth/login",
-            "/api/v1/auth/register",
-            "/api/v1/auth/refresh",
-            "/docs",
-            "/openapi.json",
-            "/redoc",
-            "/favicon.ico",
-            "/api/v1/file-encryptor/convert-to-sdp",
-            "/api/v1/file-encryptor/list-sdp",
-            "/api/v1/file-encryptor/download-sdp",
-            "/api/v1/file-encryptor/progress",
-            '/health/health',
-            '/health/health/ready',
-            '/health/health/live',
-            "/license"
-        ]
-
-        public_patterns = [
-            r"^/data/.*$",
-        ]
-
-        path = request.url.path
-
-        if path in public_paths or any(re.match(p, path) for p in public_patterns):
-            return await call_next(request)
-
-        auth_header = request.headers.get("Authorization")
+PUBLIC_PATTERNS = [
+    re.compile(r"^/data/.*$"),
+]
+
+
+def _unauthorized(message: str) -> JSONResponse:
+    return JSONResponse(
+        status_code=401,
+        content={"status": 401, "message": message, "data": None},
+    )
+
+
+class AuthMiddleware:
+    # Plain ASGI middleware: the request passes through untouched (no extra task or body
+    # stream wrapping), so streaming and file responses go straight to the server.
+    def __init__(self, app: ASGIApp, session_factory=SessionLocal, cache=token_cache):
+        self.app = app
+        self.session_factory = session_factory
+        self.cache = cache
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+
+        if path in PUBLIC_PATHS or any(p.match(path) for p in PUBLIC_PATTERNS):
+            await self.app(scope, receive, send)
+            return
+
+        conn = HTTPConnection(scope)
+        auth_header = conn.headers.get("Authorization")
         if not auth_header or not auth_header.startswith("Bearer "):
-            return JSONResponse(
-                status_code=401,
-                content={
-                    "status": 401,
-                    "message": "Unauthorized",
-                    "data": None,
-                },
-            )
+            await _unauthorized("Unauthorized")(scope, receive, send)
+            return
 
         token = auth_header.split(" ", 1)[1]
 
-        db = SessionLocal()
+        user = self.cache.get(token)
+        if user is None:
+            user, error = self._authenticate(token)
+            if error is not None:
+                await error(scope, receive, send)
+                return
+
+        conn.state.user = user
+        await self.app(scope, receive, send)
+
+    def _authenticate(self, token: str):
+        generation = self.cache.generation
+        db = self.session_factory()
         try:
             from app.auth import service
-            
+
             if service.is_token_blacklisted(db, token):
-                return JSONResponse(
-                    status_code=401,
-                    content={"status": 401, "message": "Token has been revoked", "data": None},
-                )
-            
+                return None, _unauthorized("Token has been revoked")
+
             try:
                 payload = security.decode_token(token)
                 if payload.get("type") != "access":
-                    return JSONResponse(
-                        status_code=401,
-                        content={"status": 401, "message": "Invalid token type", "data": None},
-                    )
+                    return None, _unauthorized("Invalid token type")
             except ExpiredSignatureError:
-                return JSONResponse(
-                    status_code=401,
-                    content={"status": 401, "message": "Expired token", "data": None},
-                )
+                return None, _unauthorized("Expired token")
             except JWTError:
-                return JSONResponse(
-                    status_code=401,
-                    content={"status": 401, "message": "Invalid token", "data": None},
-                )
+                return None, _unauthorized("Invalid token")
 
             user_id = int(payload.get("sub"))
             user = db.get(User, user_id)
-            if user is None:
-                return JSONResponse(
-                    status_code=401,
-                    content={"status": 401, "message": "Inactive or missing user", "data": None},
-                )
-            if user.is_active is False:
-                return JSONResponse(
-                    status_code=401,
-                    content={"status": 401, "message": "Inactive or missing user", "data": None},
-                )
-
-            request.state.user = user
+            if user is None or user.is_active is False:
+                return None, _unauthorized("Inactive or missing user")
+
+            self.cache.put(token, user, payload.get("exp"), generation)
+            return user, None
         finally:
             db.close()
-
-        return await call_next(request)
\ No newline at end of file
@@ -1,24 +1,39 @@
 import logging, time
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 logger = logging.getLogger(__name__)
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
+class LoggingMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         start_time = time.time()
-        response = await call_next(request)
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
         process_time = time.time() - start_time
 
-        if request.url.path == "/api/v1/auth/login" and response.status_code == 401:
-            return response
-        
-        client_ip = request.client.host if request.client else "unknown"
-        log_message = f"{request.method} {request.url.path} - {response.status_code} ({process_time:.3f}s) [Client: {client_ip}]"
-        if response.status_code >= 500:
+        path = scope["path"]
+        if path == "/api/v1/auth/login" and status_code == 401:
+            return
+
+        client = scope.get("client")
+        client_ip = client[0] if client else "unknown"
+        log_message = f"{scope['method']} {path} - {status_code} ({process_time:.3f}s) [Client: {client_ip}]"
+        if status_code >= 500:
             logger.error(log_message)
-        elif response.status_code >= 400:
+        elif status_code >= 400:
             logger.warning(log_message)
         else:
             logger.info(log_message)
-        return response
\ No newline at end of file
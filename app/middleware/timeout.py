@@ -1,30 +1,23 @@
 import time
-from fastapi import Request, HTTPException, status
-from starlette.middleware.base import BaseHTTPMiddleware
-from typing import Optional
-from app.core.config import settings
+from starlette.types import ASGIApp, Receive, Scope, Send
 
-class TimeoutMiddleware(BaseHTTPMiddleware):
-    
-    def __init__(self, app, timeout_seconds: int = 3600):
-        super().__init__(app)
+UNTRACKED_PATHS = frozenset([
+    "/api/v1/analytics/upload-data",
+    "/api/v1/analytics/add-device",
+    "/api/v1/analytic/export-pdf"
+])
+
+class TimeoutMiddleware:
+
+    def __init__(self, app: ASGIApp, timeout_seconds: int = 3600):
+        self.app = app
         self.timeout_seconds = timeout_seconds
         self.last_activity = {}
-    
-    async def dispatch(self, request: Request, call_next):
-        if request.url.path in [
-            "/api/v1/analytics/upload-data", 
-            "/api/v1/analytics/add-device",
-            "/api/v1/analytic/export-pdf"
-        ]:
-            response = await call_next(request)
-            return response
-        
-        client_ip = request.client.host
-        
-        current_time = time.time()
-        self.last_activity[client_ip] = current_time
-        
-        response = await call_next(request)
-        
-        return response
\ No newline at end of file
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"] not in UNTRACKED_PATHS:
+            client = scope.get("client")
+            client_ip = client[0] if client else "unknown"
+            self.last_activity[client_ip] = time.time()
+
+        await self.app(scope, receive, send)
@@ -0,0 +1,127 @@
+import json, struct
+
+# SDP v3 keeps the v2 body (JSON header + length-prefixed AES-GCM chunks) and replaces the
+# bare trailing SHA-256 with an encrypted chunk index and a fixed-size footer:
+#
+#   [u32 header_len][header json, version "3.0"]
+#   [u32 len][chunk 0] ... [u32 len][chunk n-1]
+#   [index: AES-GCM(base_nonce + ffffffff) of n * (u64 offset, u32 enc_size, u32 plain_size, sha256)]
+#   [u64 index_offset][u32 index_size][sha256 of full plaintext][b"SDP3"]
+#
+# offset points at the ciphertext (after its length prefix), so any chunk can be decrypted
+# on its own.
+SDP_V2_VERSION = "2.0"
+SDP_V3_VERSION = "3.0"
+FOOTER_MAGIC = b"SDP3"
+INDEX_NONCE_SUFFIX = b"\xff\xff\xff\xff"
+INDEX_ENTRY = struct.Struct(">QII32s")
+FOOTER = struct.Struct(">QI32s4s")
+HEADER_SIZE_BYTES = 4
+CHUNK_SIZE_BYTES = 4
+HASH_SIZE = 32
+GCM_TAG_SIZE = 16
+REQUIRED_FIELDS = ('filename', 'ephemeral_public_key', 'salt', 'base_nonce', 'chunk_size')
+
+def is_v3(header):
+    return str(header.get('version', '')).startswith('3')
+
+def read_header(f):
+    header_len_bytes = f.read(HEADER_SIZE_BYTES)
+    if len(header_len_bytes) != HEADER_SIZE_BYTES:
+        raise ValueError("Invalid SDP file: missing header length")
+
+    header_len = int.from_bytes(header_len_bytes, 'big')
+    header_json = f.read(header_len)
+    if len(header_json) != header_len:
+        raise ValueError("Invalid SDP file: incomplete header")
+
+    try:
+        header = json.loads(header_json.decode('utf-8'))
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid SDP header: {str(e)}")
+
+    for field in REQUIRED_FIELDS:
+        if field not in header:
+            raise ValueError(f"Missing required field in header: {field}")
+    return header, HEADER_SIZE_BYTES + header_len
+
+def write_trailer(outfile, entries, aesgcm, base_nonce, file_hash):
+    index_offset = outfile.tell()
+    index = b"".join(INDEX_ENTRY.pack(*entry) for entry in entries)
+    encrypted_index = aesgcm.encrypt(base_nonce + INDEX_NONCE_SUFFIX, index, None)
+    outfile.write(encrypted_index)
+    outfile.write(FOOTER.pack(index_offset, len(encrypted_index), file_hash, FOOTER_MAGIC))
+
+def parse_trailer(trailer, aesgcm, base_nonce, trailer_offset=0):
+    # trailer holds the bytes from trailer_offset to the end of the file.
+    if len(trailer) < FOOTER.size:
+        raise ValueError("Invalid SDP v3 file: missing footer")
+
+    index_offset, index_size, file_hash, magic = FOOTER.unpack(trailer[-FOOTER.size:])
+    if magic != FOOTER_MAGIC:
+        raise ValueError("Invalid SDP v3 file: bad footer magic")
+
+    start = index_offset - trailer_offset
+    if start < 0 or start + index_size + FOOTER.size != len(trailer):
+        raise ValueError("Invalid SDP v3 file: index does not match footer")
+
+    try:
+        index = aesgcm.decrypt(base_nonce + INDEX_NONCE_SUFFIX, bytes(trailer[start:start + index_size]), None)
+    except Exception as e:
+        raise ValueError(f"Decryption failed for chunk index: {str(e)}")
+
+    if len(index) % INDEX_ENTRY.size:
+        raise ValueError("Invalid SDP v3 file: corrupt chunk index")
+    entries = [INDEX_ENTRY.unpack_from(index, pos) for pos in range(0, len(index), INDEX_ENTRY.size)]
+    return entries, file_hash, index_offset
+
+def read_trailer(f, file_size, aesgcm, base_nonce):
+    f.seek(file_size - FOOTER.size)
+    index_offset, index_size, _, _ = FOOTER.unpack(f.read(FOOTER.size))
+    if index_offset > file_size - FOOTER.size:
+        raise ValueError("Invalid SDP v3 file: index does not match footer")
+    f.seek(index_offset)
+    return parse_trailer(f.read(file_size - index_offset), aesgcm, base_nonce, index_offset)
+
+def scan_v2_entries(f, data_start, file_size):
+    # v2 has no index, but chunk boundaries can still be found by hopping over the
+    # length prefixes without decrypting anything.
+    entries = []
+    position = data_start
+    while position < file_size - HASH_SIZE:
+        f.seek(position)
+        size_bytes = f.read(CHUNK_SIZE_BYTES)
+        if len(size_bytes) != CHUNK_SIZE_BYTES:
+            break
+        encrypted_size = int.from_bytes(size_bytes, 'big')
+        offset = position + CHUNK_SIZE_BYTES
+        if offset + encrypted_size > file_size - HASH_SIZE:
+            raise ValueError(f"Incomplete chunk data at position {offset}")
+        entries.append((offset, encrypted_size, encrypted_size - GCM_TAG_SIZE, None))
+        position = offset + encrypted_size
+    return entries
+
+def describe_sdp(path):
+    # Summary from the header and trailer only; nothing is decrypted.
+    with open(path, 'rb') as f:
+        f.seek(0, 2)
+        file_size = f.tell()
+        f.seek(0)
+        header, _ = read_header(f)
+        if is_v3(header):
+            f.seek(file_size - FOOTER.size)
+            _, _, file_hash, magic = FOOTER.unpack(f.read(FOOTER.size))
+            if magic != FOOTER_MAGIC:
+                raise ValueError("Invalid SDP v3 file: bad footer magic")
+        else:
+            f.seek(file_size - HASH_SIZE)
+            file_hash = f.read(HASH_SIZE)
+
+    return {
+        "filename": header.get('filename'),
+        "version": header.get('version'),
+        "original_size": header.get('file_size'),
+        "encrypted_size": file_size,
+        "total_chunks": header.get('total_chunks'),
+        "sha256": file_hash.hex(),
+    }
@@ -10,6 +10,8 @@ from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from .parallel import PipelinedHash, ordered_map, resolve_workers
+from .container import SDP_V2_VERSION, is_v3, read_trailer, write_trailer
 
 class SDPCrypto:
     CHUNK_SIZE = 10 * 1024 * 1024
@@ -54,7 +56,7 @@ class SDPCrypto:
         return hkdf.derive(shared_secret)
 
     @staticmethod
-    def encrypt_to_sdp(recipient_public_key, input_path, output_path, chunk_size=None):
+    def encrypt_to_sdp(recipient_public_key, input_path, output_path, chunk_size=None, workers=None, version=SDP_V2_VERSION, progress_callback=None):
         if chunk_size is None:
             chunk_size = SDPCrypto.CHUNK_SIZE
             
@@ -76,7 +78,7 @@ class SDPCrypto:
         filename = os.path.basename(input_path)
         
         header = {
-            "version": "2.0",
+            "version": version,
             "filename": filename,
             "file_size": file_size,
             "timestamp": datetime.utcnow().isoformat() + "Z",
@@ -90,31 +92,40 @@ class SDPCrypto:
         
         header_json = json.dumps(header, separators=(',', ':')).encode('utf-8')
         
-        sha256_hash = hashlib.sha256()
+        workers = resolve_workers(workers)
+        write_index = is_v3(header)
+        index_entries = []
         
-        with open(input_path, 'rb') as infile, open(output_path, 'wb') as outfile:
+        with open(input_path, 'rb') as infile, open(output_path, 'wb') as outfile, PipelinedHash() as sha256_hash:
             outfile.write(len(header_json).to_bytes(SDPCrypto.HEADER_SIZE_BYTES, 'big'))
             outfile.write(header_json)
             
+            def read_chunks():
+                while True:
+                    chunk_data = infile.read(chunk_size)
+                    if not chunk_data:
+                        break
+                    sha256_hash.update(chunk_data)
+                    yield chunk_data
+            
+            def encrypt_chunk(index, chunk_data):
+                nonce = base_nonce + index.to_bytes(4, 'big')
+                digest = hashlib.sha256(chunk_data).digest() if write_index else None
+                return len(chunk_data), digest, aesgcm.encrypt(nonce, chunk_data, None)
+            
             chunk_index = 0
             bytes_processed = 0
             
-            while True:
-                chunk_data = infile.read(chunk_size)
-                if not chunk_data:
-                    break
-                
-                sha256_hash.update(chunk_data)
-                
-                nonce = base_nonce + chunk_index.to_bytes(4, 'big')
-                
-                encrypted_chunk = aesgcm.encrypt(nonce, chunk_data, None)
-                
+            for plain_size, digest, encrypted_chunk in ordered_map(encrypt_chunk, read_chunks(), workers):
                 outfile.write(len(encrypted_chunk).to_bytes(SDPCrypto.CHUNK_SIZE_BYTES, 'big'))
+                if write_index:
+                    index_entries.append((outfile.tell(), len(encrypted_chunk), plain_size, digest))
                 outfile.write(encrypted_chunk)
                 
                 chunk_index += 1
-                bytes_processed += len(chunk_data)
+                bytes_processed += plain_size
+                if progress_callback is not None:
+                    progress_callback(bytes_processed, file_size)
                 
                 if file_size > 100 * 1024 * 1024:
                     progress = (bytes_processed / file_size) * 100
@@ -122,14 +133,33 @@ class SDPCrypto:
                         print(f"Encrypted: {bytes_processed}/{file_size} bytes ({progress:.1f}%)")
             
             original_hash = sha256_hash.digest()
-            outfile.write(original_hash)
+            if write_index:
+                write_trailer(outfile, index_entries, aesgcm, base_nonce, original_hash)
+            else:
+                outfile.write(original_hash)
             
             print(f"Encryption complete: {chunk_index} chunks processed")
             print(f"Original size: {file_size:,} bytes")
             print(f"🔐 Encrypted size: {os.path.getsize(output_path):,} bytes")
 
     @staticmethod
-    def decrypt_from_sdp(recipient_private_key, input_path, output_dir=None):
+    def create_unique_output(output_path):
+        # The name is claimed with O_EXCL, so parallel decrypts of files that carry the
+        # same original filename never pick the same path and overwrite each other.
+        name, ext = os.path.splitext(output_path)
+        candidate = output_path
+        counter = 1
+        while True:
+            try:
+                fd = os.open(candidate, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666)
+            except FileExistsError:
+                candidate = f"{name}_{counter}{ext}"
+                counter += 1
+                continue
+            return candidate, os.fdopen(fd, 'wb')
+    
+    @staticmethod
+    def decrypt_from_sdp(recipient_private_key, input_path, output_dir=None, workers=None):
         if not os.path.exists(input_path):
             raise FileNotFoundError(f"SDP file not found: {input_path}")
         
@@ -173,41 +203,56 @@ class SDPCrypto:
             output_filename = header['filename']
             output_path = os.path.join(output_dir, output_filename)
             
-            counter = 1
-            original_output_path = output_path
-            while os.path.exists(output_path):
-                name, ext = os.path.splitext(original_output_path)
-                output_path = f"{name}_{counter}{ext}"
-                counter += 1
-            
             file_size = os.path.getsize(input_path)
             header_total_size = SDPCrypto.HEADER_SIZE_BYTES + header_len
             
-            sha256_hash = hashlib.sha256()
+            workers = resolve_workers(workers)
             
-            with open(output_path, 'wb') as outfile:
-                chunk_index = 0
-                bytes_processed = 0
-                total_chunks = header.get('total_chunks', 0)
-                
-                while infile.tell() < file_size - SDPCrypto.HASH_SIZE:
+            index_entries = None
+            if is_v3(header):
+                index_entries, original_hash, data_end = read_trailer(infile, file_size, aesgcm, base_nonce)
+                infile.seek(header_total_size)
+            else:
+                data_end = file_size - SDPCrypto.HASH_SIZE
+            
+            def read_chunks():
+                read_index = 0
+                while infile.tell() < data_end:
                     chunk_size_bytes = infile.read(SDPCrypto.CHUNK_SIZE_BYTES)
                     if not chunk_size_bytes or len(chunk_size_bytes) != SDPCrypto.CHUNK_SIZE_BYTES:
                         break
                     
                     chunk_data_size = int.from_bytes(chunk_size_bytes, 'big')
+                    chunk_offset = infile.tell()
+                    if index_entries is not None:
+                        if read_index >= len(index_entries) or index_entries[read_index][:2] != (chunk_offset, chunk_data_size):
+                            raise ValueError(f"Invalid SDP v3 file: chunk {read_index} does not match the chunk index")
                     
                     encrypted_chunk = infile.read(chunk_data_size)
                     if len(encrypted_chunk) != chunk_data_size:
                         raise ValueError(f"Incomplete chunk data at position {infile.tell()}")
-                    
-                    nonce = base_nonce + chunk_index.to_bytes(4, 'big')
-                    
-                    try:
-                        decrypted_chunk = aesgcm.decrypt(nonce, encrypted_chunk, None)
-                    except Exception as e:
-                        raise ValueError(f"Decryption failed for chunk {chunk_index}: {str(e)}")
-                    
+                    read_index += 1
+                    yield encrypted_chunk
+            
+            def decrypt_chunk(index, encrypted_chunk):
+                nonce = base_nonce + index.to_bytes(4, 'big')
+                try:
+                    decrypted_chunk = aesgcm.decrypt(nonce, encrypted_chunk, None)
+                except Exception as e:
+                    raise ValueError(f"Decryption failed for chunk {index}: {str(e)}")
+                
+                if index_entries is not None:
+                    if index >= len(index_entries) or hashlib.sha256(decrypted_chunk).digest() != index_entries[index][3]:
+                        raise ValueError(f"Integrity check failed for chunk {index}")
+                return decrypted_chunk
+            
+            output_path, outfile = SDPCrypto.create_unique_output(output_path)
+            with outfile, PipelinedHash() as sha256_hash:
+                chunk_index = 0
+                bytes_processed = 0
+                total_chunks = header.get('total_chunks', 0)
+                
+                for decrypted_chunk in ordered_map(decrypt_chunk, read_chunks(), workers):
                     outfile.write(decrypted_chunk)
                     sha256_hash.update(decrypted_chunk)
                     
@@ -220,12 +265,13 @@ class SDPCrypto:
                             print(f"Decrypted: {bytes_processed}/{header['file_size']} bytes ({progress:.1f}%)")
                 
                 print(f"Decryption complete: {chunk_index} chunks processed")
+                decrypted_hash = sha256_hash.digest()
             
-            current_pos = infile.tell()
-            infile.seek(-SDPCrypto.HASH_SIZE, 2)
-            original_hash = infile.read(SDPCrypto.HASH_SIZE)
-            
-            decrypted_hash = sha256_hash.digest()
+            if index_entries is None:
+                infile.seek(-SDPCrypto.HASH_SIZE, 2)
+                original_hash = infile.read(SDPCrypto.HASH_SIZE)
+            elif chunk_index != len(index_entries):
+                decrypted_hash = None
             
             if decrypted_hash != original_hash:
                 if os.path.exists(output_path):
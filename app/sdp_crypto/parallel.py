@@ -0,0 +1,57 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import hashlib, os
+
+# AES-GCM in cryptography and hashlib both release the GIL on large buffers, and every
+# SDP chunk has its own nonce (base_nonce + index), so chunks can be processed on threads.
+DEFAULT_WORKERS = min(8, os.cpu_count() or 1)
+
+def resolve_workers(workers=None):
+    if workers is None:
+        workers = os.environ.get("SDP_CRYPTO_WORKERS") or DEFAULT_WORKERS
+    return max(1, int(workers))
+
+def ordered_map(func, items, workers):
+    # Like Executor.map, but items are pulled lazily and at most 2 * workers chunks are in
+    # flight, so memory stays bounded for multi-GB files. Results come back in input order.
+    if workers <= 1:
+        for index, item in enumerate(items):
+            yield func(index, item)
+        return
+
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sdp-chunk") as pool:
+        for index, item in enumerate(items):
+            pending.append(pool.submit(func, index, item))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+class PipelinedHash:
+    # SHA-256 on its own thread: updates are queued in order and hashed while the
+    # next chunks are being encrypted or decrypted.
+    def __init__(self, max_pending=4):
+        self._hash = hashlib.sha256()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sdp-hash")
+        self._pending = deque()
+        self._max_pending = max_pending
+
+    def update(self, data):
+        self._pending.append(self._executor.submit(self._hash.update, data))
+        while len(self._pending) > self._max_pending:
+            self._pending.popleft().result()
+
+    def digest(self):
+        while self._pending:
+            self._pending.popleft().result()
+        return self._hash.digest()
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -4,6 +4,8 @@ from sqlalchemy import or_
 from app.suspect_management.models import Suspect
 from app.suspect_management.schemas import SuspectCreate, SuspectUpdate
 from app.case_management.models import Case, Agency
+from app.evidence_management.models import Evidence
+from datetime import datetime
 import logging
 from app.utils.security import sanitize_input
 
@@ -210,5 +212,90 @@ class SuspectService:
         db.commit()
         return True
     
+    def get_suspect_pdf_data(self, db: Session, suspect: Suspect) -> dict:
+        case = None
+        created_at_case_str = None
+        if suspect.case_id is not None:
+            case = db.query(Case).filter(Case.id == suspect.case_id).first()
+            if case is not None and hasattr(case, 'created_at') and case.created_at is not None:
+                try:
+                    if isinstance(case.created_at, datetime):
+                        created_at_case_str = case.created_at.strftime("%d/%m/%Y")
+                    else:
+                        created_at_case_str = str(case.created_at)
+                except (AttributeError, TypeError):
+                    pass
+    
+        evidence_list = []
+        evidence_records = []
+        if suspect.id is not None:
+            evidence_records = db.query(Evidence).filter(Evidence.suspect_id == suspect.id).order_by(Evidence.id.asc()).all()
+            if suspect.evidence_number is not None and str(suspect.evidence_number).strip():
+                evidence_by_number = db.query(Evidence).filter(
+                    Evidence.evidence_number == suspect.evidence_number,
+                    Evidence.case_id == suspect.case_id
+                ).order_by(Evidence.id.asc()).all()
+            
+                evidence_ids = {e.id for e in evidence_records}
+                for evidence in evidence_by_number:
+                    if evidence.id not in evidence_ids:
+                        evidence_records.append(evidence)
+                    
+            evidence_records = sorted(evidence_records, key=lambda x: x.id)
+        
+            for evidence in evidence_records:
+                evidence_list.append({
+                    "id": evidence.id,
+                    "evidence_number": evidence.evidence_number,  # Use original format for PDF
+                    "evidence_summary": evidence.description if hasattr(evidence, 'description') else None,
+                    "file_path": evidence.file_path if hasattr(evidence, 'file_path') else None,
+                })
+    
+        suspect_notes = None
+        if hasattr(suspect, 'notes') and suspect.notes is not None:
+            if isinstance(suspect.notes, str) and suspect.notes.strip():
+                suspect_notes = suspect.notes.strip()
+            elif isinstance(suspect.notes, dict):
+                suspect_notes = suspect.notes.get('suspect_notes') or suspect.notes.get('text')
+                if suspect_notes and isinstance(suspect_notes, str) and not suspect_notes.strip():
+                    suspect_notes = None
+            else:
+                suspect_notes = str(suspect.notes) if suspect.notes else None
+        else:
+            if evidence_records and len(evidence_records) > 0:
+                first_evidence = evidence_records[0]
+            elif evidence_list and len(evidence_list) > 0:
+                first_evidence = db.query(Evidence).filter(Evidence.id == evidence_list[0]["id"]).first()
+            else:
+                first_evidence = None
+            
+            if first_evidence is not None and hasattr(first_evidence, 'notes') and first_evidence.notes is not None:
+                if isinstance(first_evidence.notes, dict):
+                    suspect_notes = first_evidence.notes.get('suspect_notes')
+                    if suspect_notes is None:
+                        suspect_notes = first_evidence.notes.get('text')
+                    if suspect_notes and isinstance(suspect_notes, str) and not suspect_notes.strip():
+                        suspect_notes = None
+                elif isinstance(first_evidence.notes, str):
+                    suspect_notes = first_evidence.notes.strip() if first_evidence.notes.strip() else None
+                else:
+                    notes_value = first_evidence.notes
+                    suspect_notes = str(notes_value) if notes_value is not None else None
+    
+        return {
+            "person_name": suspect.name,
+            "suspect_status": suspect.status or "Unknown",
+            "investigator": suspect.investigator or "N/A",
+            "case_name": suspect.case_name or "Unknown Case",
+            "created_at_case": created_at_case_str or "N/A",
+            "evidence": [
+                {
+                    "evidence_count": str(len(evidence_list)),
+                    "list_evidence": evidence_list
+                }
+            ],
+            "suspect_notes": suspect_notes
+        }
+
 
 suspect_service = SuspectService()
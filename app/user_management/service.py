@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import or_, func
 from app.auth.models import User
 from app.auth import service as auth_service
+from app.auth.token_cache import bump_auth_version
 from app.user_management.schemas import UserCreate, UserUpdate
 from fastapi import HTTPException
 from app.utils.security import sanitize_input, validate_sql_injection_patterns
@@ -103,6 +104,7 @@ def update_user(db: Session, user_id: int, user_data: UserUpdate) -> User:
     setattr(user, 'role', _tag_to_role(user_data.tag))
     setattr(user, 'password', user_data.password)
     setattr(user, 'hashed_password', auth_service.get_password_hash(user_data.password))
+    bump_auth_version(db)
     
     db.commit()
     db.refresh(user)
@@ -116,6 +118,7 @@ def delete_user(db: Session, user_id: int) -> bool:
             detail=f"User with ID {user_id} not found"
         )
     db.delete(user)
+    bump_auth_version(db)
     db.commit()
     return True
 
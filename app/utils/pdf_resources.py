@@ -0,0 +1,104 @@
+from functools import lru_cache
+from typing import Any, Dict, Optional, Sequence, Tuple
+from reportlab.lib.styles import ParagraphStyle, StyleSheet1, getSampleStyleSheet
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from app.core.config import settings
+import logging, os, threading
+
+logger = logging.getLogger(__name__)
+
+NOTO_SANS_PATHS = (
+    "/System/Library/Fonts/Supplemental/NotoSans-Regular.ttf",
+    "/usr/share/fonts/truetype/noto/NotoSans-Regular.ttf",
+    "C:/Windows/Fonts/NotoSans-Regular.ttf",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "case_management", "fonts", "NotoSans-Regular.ttf"),
+)
+
+ARIAL_BOLD_PATHS = (
+    "/System/Library/Fonts/Supplemental/Arial Bold.ttf",
+    "C:/Windows/Fonts/arialbd.ttf",
+)
+
+_lock = threading.Lock()
+_paragraph_styles: Dict[Tuple[str, Tuple[Tuple[str, Any], ...]], ParagraphStyle] = {}
+
+
+@lru_cache(maxsize=None)
+def register_font(name: str, paths: Sequence[str]) -> Optional[str]:
+    try:
+        pdfmetrics.getFont(name)
+        return name
+    except KeyError:
+        pass
+
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        try:
+            pdfmetrics.registerFont(TTFont(name, path))
+            return name
+        except Exception as e:
+            logger.warning(f"Failed to register font {name} from {path}: {e}")
+    return None
+
+
+def noto_sans_font() -> str:
+    return register_font("NotoSans", NOTO_SANS_PATHS) or "Helvetica"
+
+
+def title_bold_font() -> str:
+    return register_font("Arial-Bold", ARIAL_BOLD_PATHS) or "Helvetica-Bold"
+
+
+def resolve_logo_path(path: Optional[str] = None) -> str:
+    logo_path = path or settings.LOGO_PATH
+    if not os.path.isabs(logo_path):
+        logo_path = os.path.normpath(os.path.join(os.getcwd(), logo_path))
+    return logo_path
+
+
+@lru_cache(maxsize=8)
+def _load_image(path: str, mtime: float) -> ImageReader:
+    reader = ImageReader(path)
+    # Decode once up front so concurrent exports only ever read the cached pixels.
+    reader.getRGBData()
+    return reader
+
+
+def logo_image(path: Optional[str] = None) -> Optional[ImageReader]:
+    logo_path = resolve_logo_path(path)
+    try:
+        mtime = os.path.getmtime(logo_path)
+    except OSError:
+        return None
+
+    with _lock:
+        try:
+            return _load_image(logo_path, mtime)
+        except Exception as e:
+            logger.warning(f"Failed to load logo {logo_path}: {e}")
+            return None
+
+
+def fit_image(image: ImageReader, max_width: float, max_height: float) -> Tuple[float, float]:
+    width, height = image.getSize()
+    ratio = min(max_width / width, max_height / height)
+    return width * ratio, height * ratio
+
+
+def paragraph_style(name: str, **attrs: Any) -> ParagraphStyle:
+    key = (name, tuple(sorted(attrs.items())))
+    style = _paragraph_styles.get(key)
+    if style is None:
+        style = ParagraphStyle(name, **attrs)
+        _paragraph_styles[key] = style
+    return style
+
+
+# One stylesheet is shared by every export. Callers may read styles or use them as a parent,
+# but must never add to it or change a style in place; derive a new ParagraphStyle instead.
+@lru_cache(maxsize=1)
+def sample_styles() -> StyleSheet1:
+    return getSampleStyleSheet()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+import os, sys, re, time, random, argparse
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from app.analytics.utils import identifier_extractor
+
+
+CELL_TEMPLATES = [
+    "{name}\nNickname: {nick}\nInstagram ID: {num}",
+    "{name}\nWhatsApp ID: 62{num}@s.whatsapp.net\nPhone number: +62 {num}",
+    "{name}\nTelegram ID: {num}\nUsername: @{nick}",
+    "{name}\nFacebook ID: {num}\nLocation: Jakarta, Indonesia",
+    "{name}\nTikTok Username: @{nick}.official",
+    "{name}\nTwitter ID: {num}",
+    "Mobile: +62 812 {num}\nHome: 021 {num}",
+    "{name}",
+    "{name}\nEmail: {nick}@mail.com",
+]
+
+
+def legacy_extract(text):
+    # Mirrors the former SocialMediaParser._extract_* methods: one
+    # uncompiled re.search per field, every field scanned on every call.
+    patterns = [
+        r"Instagram\s+ID[:\s]*(\d+)", r"Facebook\s+ID[:\s]*(\d+)",
+        r"WhatsApp\s+ID[:\s]*([\+\d\s\-\(\)]+)|Phone\s+number[:\s]*([\+\d\s\-\(\)]+)",
+        r"Telegram\s+ID[:\s]*(\d+)", r"(?:X|Twitter)\s+ID[:\s]*(\d+)", r"TikTok\s+ID[:\s]*(\d+)",
+        r"WhatsApp\s+ID[:\s]+([^\n\r]+)", r"Telegram\s+ID[:\s]+(\d+)",
+        r"(?:Telegram|Username)[:\s]+@?([a-zA-Z0-9_]+)", r"TikTok\s+(?:ID|Username)[:\s]+@?([a-zA-Z0-9_\.]+)",
+        r"TikTok[:\s]+@?([a-zA-Z0-9_\.]+)", r"(?:Twitter|X)\s+ID[:\s]+([a-zA-Z0-9_]+)",
+        r"(?:Twitter|X)[:\s]+@?([a-zA-Z0-9_]+)", r"Facebook\s+ID[:\s]+(\d+)",
+        r"Facebook[:\s]+(?:profile/)?([a-zA-Z0-9_\.]+)", r"Nickname[:\s]+([^\n]+)",
+        r"Location[:\s]+([^\n]+)", r"Phone\s+number[:\s]+([\+\d\s\-\(\)@\.]+)",
+        r"(?:Home|Mobile|Work|Cell|Phone|Office)[:\s]+([\+\d\s\-\(\)]+)",
+    ]
+    return [re.search(pattern, text, re.IGNORECASE) for pattern in patterns]
+
+
+def build_cells(count, unique_ratio, seed):
+    rng = random.Random(seed)
+    distinct = max(1, int(count * unique_ratio))
+    pool = [
+        rng.choice(CELL_TEMPLATES).format(
+            name=f"Contact {i}", nick=f"user_{i}", num=str(rng.randint(10**9, 10**10))
+        )
+        for i in range(distinct)
+    ]
+    return [rng.choice(pool) for _ in range(count)]
+
+
+def run(label, func, cells, repeat):
+    best = None
+    for _ in range(repeat):
+        identifier_extractor.extract_identifiers.cache_clear()
+        start = time.perf_counter()
+        for cell in cells:
+            func(cell)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{label:<12} {best * 1000:9.1f} ms  ({len(cells) / best:,.0f} cells/s)")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark social media identifier extraction")
+    parser.add_argument("--cells", type=int, default=50000)
+    parser.add_argument("--unique-ratio", type=float, default=0.6)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    cells = build_cells(args.cells, args.unique_ratio, args.seed)
+    print(f"{len(cells)} cells, {len(set(cells))} distinct")
+
+    legacy = run("legacy", legacy_extract, cells, args.repeat)
+    # The uncached run isolates the keyword-gated scan from the per-cell memoisation.
+    uncached = run("uncached", identifier_extractor.extract_identifiers.__wrapped__, cells, args.repeat)
+    compiled = run("compiled", identifier_extractor.extract_identifiers, cells, args.repeat)
+    print(f"speedup      {legacy / uncached:9.1f}x uncached, {legacy / compiled:.1f}x with cache")
+
+
+if __name__ == "__main__":
+    main()
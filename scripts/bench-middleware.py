@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+import os, sys, time, asyncio, argparse, logging, statistics
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+import httpx
+from fastapi import Depends, FastAPI, Request
+from fastapi.responses import JSONResponse
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.api.deps import get_current_user
+from app.auth.models import AuthCacheVersion, BlacklistedToken, User
+from app.auth.token_cache import TokenCache
+from app.core import security
+from app.middleware.auth_middleware import AuthMiddleware
+from app.middleware.logging import LoggingMiddleware
+from app.middleware.timeout import TimeoutMiddleware
+
+# Compares the pure-ASGI middleware stack against the same three layers wrapped in
+# BaseHTTPMiddleware (how they were implemented before), on a trivial authenticated
+# endpoint. Requests go through httpx's ASGI transport, so the numbers isolate
+# middleware overhead from network and server costs.
+
+
+class LegacyAuthMiddleware(BaseHTTPMiddleware):
+    def __init__(self, app, session_factory, cache):
+        super().__init__(app)
+        self.auth = AuthMiddleware(None, session_factory=session_factory, cache=cache)
+
+    async def dispatch(self, request: Request, call_next):
+        token = request.headers.get("Authorization", "").split(" ", 1)[-1]
+        user = self.auth.cache.get(token)
+        if user is None:
+            user, error = self.auth._authenticate(token)
+            if error is not None:
+                return error
+        request.state.user = user
+        return await call_next(request)
+
+
+class LegacyTimeoutMiddleware(BaseHTTPMiddleware):
+    def __init__(self, app):
+        super().__init__(app)
+        self.last_activity = {}
+
+    async def dispatch(self, request: Request, call_next):
+        self.last_activity[request.client.host] = time.time()
+        return await call_next(request)
+
+
+class LegacyLoggingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        start_time = time.time()
+        response = await call_next(request)
+        logging.getLogger("bench").info(
+            f"{request.method} {request.url.path} - {response.status_code} ({time.time() - start_time:.3f}s)"
+        )
+        return response
+
+
+def build_app(stack, session_factory, cache):
+    app = FastAPI()
+
+    @app.get("/api/v1/bench")
+    def bench(current_user: User = Depends(get_current_user)):
+        return JSONResponse({"status": 200, "message": "Success", "data": {"user_id": current_user.id}})
+
+    if stack == "legacy":
+        app.add_middleware(LegacyLoggingMiddleware)
+        app.add_middleware(LegacyTimeoutMiddleware)
+        app.add_middleware(LegacyAuthMiddleware, session_factory=session_factory, cache=cache)
+    else:
+        app.add_middleware(LoggingMiddleware)
+        app.add_middleware(TimeoutMiddleware, timeout_seconds=3600)
+        app.add_middleware(AuthMiddleware, session_factory=session_factory, cache=cache)
+    return app
+
+
+def make_database():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    for model in (User, BlacklistedToken, AuthCacheVersion):
+        model.__table__.create(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+    db = session_factory()
+    db.add(User(id=1, email="bench@example.com", fullname="Bench", tag="Admin", hashed_password="x", role="admin", is_active=True))
+    db.commit()
+    db.close()
+    return session_factory
+
+
+async def run(stack, requests_total, concurrency, use_cache):
+    session_factory = make_database()
+    cache = TokenCache(maxsize=1000 if use_cache else 0, ttl=300, check_interval=5, session_factory=session_factory)
+    app = build_app(stack, session_factory, cache)
+    headers = {"Authorization": f"Bearer {security.create_access_token('1')}"}
+    latencies = []
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for _ in range(20):
+            response = await client.get("/api/v1/bench", headers=headers)
+            assert response.status_code == 200, response.text
+
+        queue = asyncio.Queue()
+        for _ in range(requests_total):
+            queue.put_nowait(None)
+
+        async def worker():
+            while not queue.empty():
+                queue.get_nowait()
+                start = time.perf_counter()
+                await client.get("/api/v1/bench", headers=headers)
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(
+        f"{stack:<7} {requests_total / elapsed:9.1f} req/s   "
+        f"p50 {statistics.median(latencies) * 1000:7.2f} ms   p99 {p99 * 1000:7.2f} ms"
+    )
+    return requests_total / elapsed, p99
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark BaseHTTPMiddleware vs pure-ASGI middleware stack")
+    parser.add_argument("--requests", type=int, default=3000, help="Requests per stack")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent in-flight requests")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the token cache so every request verifies against the DB")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    print(f"requests={args.requests} concurrency={args.concurrency} token_cache={'off' if args.no_cache else 'on'}")
+    before_rps, before_p99 = asyncio.run(run("legacy", args.requests, args.concurrency, not args.no_cache))
+    after_rps, after_p99 = asyncio.run(run("asgi", args.requests, args.concurrency, not args.no_cache))
+    print(f"throughput x{after_rps / before_rps:.2f}, p99 x{after_p99 / before_p99:.2f}")
+
+
+if __name__ == "__main__":
+    main()
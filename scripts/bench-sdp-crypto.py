@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+import os, sys, time, shutil, tempfile, argparse, contextlib, io
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from app.analytics.utils.sdp_crypto import generate_keypair, encrypt_to_sdp, decrypt_from_sdp
+
+
+def timed(func, *args, **kwargs):
+    # encrypt_to_sdp / decrypt_from_sdp print progress; keep the benchmark output readable.
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def run(workers, work_dir, input_path, keys, chunk_size, repeat):
+    private_key, public_key = keys
+    size_mb = os.path.getsize(input_path) / (1024 * 1024)
+    sdp_path = os.path.join(work_dir, f"bench_{workers}.sdp")
+    best_encrypt = best_decrypt = None
+
+    for attempt in range(repeat):
+        elapsed, _ = timed(encrypt_to_sdp, public_key, input_path, sdp_path, chunk_size=chunk_size, workers=workers)
+        best_encrypt = elapsed if best_encrypt is None else min(best_encrypt, elapsed)
+
+        output_dir = os.path.join(work_dir, f"out_{workers}_{attempt}")
+        elapsed, output_path = timed(decrypt_from_sdp, private_key, sdp_path, output_dir, workers=workers)
+        best_decrypt = elapsed if best_decrypt is None else min(best_decrypt, elapsed)
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+    print(
+        f"workers={workers:<3} encrypt {size_mb / best_encrypt:8.1f} MB/s   "
+        f"decrypt {size_mb / best_decrypt:8.1f} MB/s"
+    )
+    return best_encrypt, best_decrypt
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SDP chunk encryption/decryption throughput")
+    parser.add_argument("--size-mb", type=int, default=512)
+    parser.add_argument("--chunk-mb", type=int, default=10)
+    parser.add_argument("--workers", default="1,2,4,8", help="Comma separated worker counts")
+    parser.add_argument("--repeat", type=int, default=2)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="bench_sdp_")
+    try:
+        input_path = os.path.join(work_dir, "input.bin")
+        block = os.urandom(1024 * 1024)
+        with open(input_path, "wb") as f:
+            for _ in range(args.size_mb):
+                f.write(block)
+
+        keys = generate_keypair()
+        print(f"{args.size_mb} MB input, {args.chunk_mb} MB chunks, {os.cpu_count()} CPUs")
+
+        results = {}
+        for workers in [int(value) for value in args.workers.split(",") if value.strip()]:
+            results[workers] = run(workers, work_dir, input_path, keys, args.chunk_mb * 1024 * 1024, args.repeat)
+
+        if 1 in results:
+            base_encrypt, base_decrypt = results[1]
+            for workers, (encrypt_time, decrypt_time) in results.items():
+                if workers != 1:
+                    print(f"speedup x{workers:<3} encrypt {base_encrypt / encrypt_time:5.2f}x   decrypt {base_decrypt / decrypt_time:5.2f}x")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
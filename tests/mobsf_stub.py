@@ -0,0 +1,94 @@
+"""
+Local MobSF stub
+Serves the upload/scan/report_json endpoints used by MobSFClient so APK analysis
+can be exercised without a real MobSF instance.
+
+Run standalone with: python tests/mobsf_stub.py --port 8001
+"""
+
+import argparse
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+STUB_API_KEY = "stub-api-key"
+
+STUB_REPORT = {
+    "app_name": "Stub App",
+    "package_name": "com.example.stub",
+    "permissions": {
+        "android.permission.INTERNET": {
+            "status": "normal",
+            "info": "full Internet access",
+            "description": "Allows the app to create network sockets.",
+        },
+        "android.permission.READ_SMS": {
+            "status": "dangerous",
+            "info": "read SMS or MMS",
+            "description": "Allows the app to read SMS messages.",
+        },
+    },
+}
+
+
+class MobSFStubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address=("127.0.0.1", 0)):
+        super().__init__(address, _MobSFStubHandler)
+        self.calls = {"upload": 0, "scan": 0, "report_json": 0}
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class _MobSFStubHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.headers.get("Authorization") != STUB_API_KEY:
+            return self._reply(401, {"error": "unauthorized"})
+
+        endpoint = self.path.rstrip("/").rsplit("/", 1)[-1]
+        if endpoint not in self.server.calls:
+            return self._reply(404, {"error": "not found"})
+        self.server.calls[endpoint] += 1
+
+        if endpoint == "upload":
+            return self._reply(200, {"hash": hashlib.md5(body).hexdigest(), "scan_type": "apk"})
+        if endpoint == "scan":
+            return self._reply(200, {"status": "completed"})
+        return self._reply(200, STUB_REPORT)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local MobSF stub")
+    parser.add_argument("--port", type=int, default=8001)
+    args = parser.parse_args()
+
+    server = MobSFStubServer(("127.0.0.1", args.port))
+    print(f"MobSF stub listening on {server.url} (Authorization: {STUB_API_KEY})")
+    server.serve_forever()
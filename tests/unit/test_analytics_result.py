@@ -0,0 +1,62 @@
+"""
+Analytics Result Unit Tests
+Test analytics payloads shared by JSON endpoints and PDF exports
+"""
+
+import json
+
+from app.analytics.shared.results import AnalyticsResult, HashfileCorrelation
+from app.api.v1.analytics_report_routes import _contact_export_rows, _hashfile_export_rows
+
+
+class TestAnalyticsResult:
+    """Test analytics result object"""
+
+    def test_data_and_response(self):
+        """Test data is read directly and the response keeps the endpoint payload"""
+        content = {"status": 200, "message": "ok", "data": {"correlations": [{"value": "a"}, {"value": "b"}]}}
+        result = AnalyticsResult(content, status_code=200)
+
+        assert result.ok
+        assert result.data["correlations"] is content["data"]["correlations"]
+
+        response = result.to_response()
+        assert response.status_code == 200
+        assert json.loads(response.body) == content
+
+    def test_error_result(self):
+        """Test error results expose an empty data block"""
+        result = AnalyticsResult(content={"status": 404, "message": "Analytic not found", "data": None}, status_code=404)
+
+        assert not result.ok
+        assert result.message == "Analytic not found"
+        assert result.data == {}
+
+    def test_iter_rows_is_typed_and_lazy(self):
+        """Test iter_rows yields typed rows one at a time and fills missing fields with None"""
+        result = AnalyticsResult({"data": {"correlations": [
+            {"hash_value": "abc", "file_name": "a.jpg", "file_type": "Image", "devices": ["Device A"], "extra": 1},
+            {"hash_value": "def"},
+        ]}})
+
+        rows = result.iter_rows("correlations", HashfileCorrelation)
+        assert next(rows) == HashfileCorrelation("abc", "a.jpg", "Image", ["Device A"])
+        assert next(rows).devices is None
+        assert list(AnalyticsResult({"data": None}).iter_rows("correlations", HashfileCorrelation)) == []
+
+    def test_export_rows_read_correlations(self):
+        """Test the data exports build their rows from the result's correlations"""
+        devices = [{"device_label": "Device A", "owner_name": "Budi", "phone_number": "0812"}, {"device_label": "Device B"}]
+        contacts = AnalyticsResult({"data": {"devices": devices, "correlations": [
+            {"contact_number": "628123", "devices_found_in": [{"device_label": "Device B", "contact_name": "Ani"}]},
+        ]}})
+        hashfiles = AnalyticsResult({"data": {"devices": devices, "correlations": [
+            {"hash_value": "abc", "file_name": "a.jpg", "file_type": "Image", "devices": ["Device A"]},
+        ]}})
+
+        columns, rows = _contact_export_rows(contacts)
+        assert columns == ["Contact Number", "Device A - Budi (0812)", "Device B - Unknown (-)"]
+        assert list(rows) == [["628123", None, "Ani"]]
+
+        columns, rows = _hashfile_export_rows(hashfiles)
+        assert list(rows) == [["abc", "a.jpg", "Image", "Yes", "No"]]
@@ -0,0 +1,199 @@
+"""
+APK Manifest Unit Tests
+Test the offline binary AndroidManifest.xml extractor
+"""
+
+import os
+import struct
+import zipfile
+from types import SimpleNamespace
+
+import pytest
+
+from app.analytics.analytics_management import service
+from app.analytics.analytics_management.service import classify_permissions
+from app.analytics.utils.apk_manifest import (
+    MAX_MANIFEST_BYTES,
+    ManifestError,
+    manifest_permissions,
+    parse_axml,
+    read_apk_manifest,
+)
+
+ANDROID_NS = "http://schemas.android.com/apk/res/android"
+# AndroidManifest.xml compiled by aapt2, taken from the MIT-licensed app-uiautomator.apk
+# that ships with the uiautomator2 Python package.
+REAL_MANIFEST = os.path.join(os.path.dirname(__file__), "fixtures", "uiautomator_AndroidManifest.xml")
+TYPE_STRING = 0x03
+TYPE_INT_DEC = 0x10
+TYPE_INT_BOOLEAN = 0x12
+
+
+def build_axml(elements, utf8=False, blank_attr_names=False):
+    """Encode (tag, [(attr, type, value)], children) trees as binary XML."""
+    strings = []
+    resource_ids = {"name": 0x01010003, "exported": 0x01010010, "minSdkVersion": 0x0101020C,
+                    "targetSdkVersion": 0x01010270, "versionCode": 0x0101021B}
+
+    def index(value):
+        if value not in strings:
+            strings.append(value)
+        return strings.index(value)
+
+    for attr in resource_ids:
+        index(attr)
+
+    body = []
+
+    def encode(tag, attrs, children):
+        ns = index(ANDROID_NS)
+        attr_bytes = b""
+        for name, data_type, value in attrs:
+            raw = index(value) if data_type == TYPE_STRING else 0xFFFFFFFF
+            data = index(value) if data_type == TYPE_STRING else int(value)
+            attr_bytes += struct.pack("<IIIHBBI", ns, index(name), raw, 8, 0, data_type, data)
+        ext = struct.pack("<IIHHHHHH", 0xFFFFFFFF, index(tag), 20, 20, len(attrs), 0, 0, 0)
+        chunk = struct.pack("<II", 1, 0xFFFFFFFF) + ext + attr_bytes
+        body.append(struct.pack("<HHI", 0x0102, 16, 8 + len(chunk)) + chunk)
+        for child in children:
+            encode(*child)
+        end = struct.pack("<IIII", 1, 0xFFFFFFFF, 0xFFFFFFFF, index(tag))
+        body.append(struct.pack("<HHI", 0x0103, 16, 8 + len(end)) + end)
+
+    for element in elements:
+        encode(*element)
+
+    pool_strings = ["" if blank_attr_names and s in resource_ids else s for s in strings]
+    encoded = b""
+    offsets = []
+    for value in pool_strings:
+        offsets.append(len(encoded))
+        if utf8:
+            raw = value.encode("utf-8")
+            encoded += bytes([len(value), len(raw)]) + raw + b"\x00"
+        else:
+            encoded += struct.pack("<H", len(value)) + value.encode("utf-16-le") + b"\x00\x00"
+    encoded += b"\x00" * (-len(encoded) % 4)
+    header_size = 28
+    strings_start = header_size + 4 * len(offsets)
+    pool = struct.pack("<IIIII", len(offsets), 0, 0x100 if utf8 else 0, strings_start, 0)
+    pool += struct.pack(f"<{len(offsets)}I", *offsets) + encoded
+    pool_chunk = struct.pack("<HHI", 0x0001, header_size, 8 + len(pool)) + pool
+
+    ids = [resource_ids[s] for s in strings if s in resource_ids]
+    res_map = struct.pack("<HHI", 0x0180, 8, 8 + 4 * len(ids)) + struct.pack(f"<{len(ids)}I", *ids)
+
+    payload = pool_chunk + res_map + b"".join(body)
+    return struct.pack("<HHI", 0x0003, 8, 8 + len(payload)) + payload
+
+
+SAMPLE_MANIFEST = [(
+    "manifest",
+    [("package", TYPE_STRING, "com.example.spy"), ("versionCode", TYPE_INT_DEC, 42)],
+    [
+        ("uses-sdk", [("minSdkVersion", TYPE_INT_DEC, 21), ("targetSdkVersion", TYPE_INT_DEC, 33)], []),
+        ("uses-permission", [("name", TYPE_STRING, "android.permission.INTERNET")], []),
+        ("uses-permission", [("name", TYPE_STRING, "android.permission.READ_SMS")], []),
+        ("uses-permission", [("name", TYPE_STRING, "android.permission.REQUEST_INSTALL_PACKAGES")], []),
+        ("application", [], [
+            ("activity", [("name", TYPE_STRING, ".MainActivity"), ("exported", TYPE_INT_BOOLEAN, 1)], []),
+            ("receiver", [("name", TYPE_STRING, "com.example.spy.SmsReceiver")], []),
+        ]),
+    ],
+)]
+
+
+def write_apk(path, manifest_bytes):
+    with zipfile.ZipFile(path, "w") as apk:
+        apk.writestr("AndroidManifest.xml", manifest_bytes)
+        apk.writestr("classes.dex", b"dex\n035\x00")
+    return str(path)
+
+
+class TestApkManifest:
+    """Test APK manifest extraction"""
+
+    @pytest.mark.parametrize("utf8", [False, True])
+    def test_read_binary_manifest(self, tmp_path, utf8):
+        """Test package, SDK levels, permissions and components are decoded"""
+        apk = write_apk(tmp_path / "sample.apk", build_axml(SAMPLE_MANIFEST, utf8=utf8))
+
+        manifest = read_apk_manifest(apk)
+
+        assert manifest["package_name"] == "com.example.spy"
+        assert manifest["version_code"] == 42
+        assert (manifest["min_sdk"], manifest["target_sdk"]) == (21, 33)
+        assert manifest["permissions"] == [
+            "android.permission.INTERNET",
+            "android.permission.READ_SMS",
+            "android.permission.REQUEST_INSTALL_PACKAGES",
+        ]
+        assert manifest["activities"] == [{"name": "com.example.spy.MainActivity", "exported": True}]
+        assert manifest["receivers"][0]["name"] == "com.example.spy.SmsReceiver"
+
+    def test_obfuscated_attribute_names(self):
+        """Test attributes with blanked names are resolved through the resource map"""
+        elements = parse_axml(build_axml(SAMPLE_MANIFEST, blank_attr_names=True))
+        permissions = [attrs["name"] for tag, attrs, _ in elements if tag == "uses-permission"]
+        assert "android.permission.READ_SMS" in permissions
+
+    def test_permissions_feed_classifier(self, tmp_path):
+        """Test extracted permissions use the MobSF report shape for scoring"""
+        apk = write_apk(tmp_path / "sample.apk", build_axml(SAMPLE_MANIFEST))
+        permissions = manifest_permissions(read_apk_manifest(apk))
+
+        assert permissions["android.permission.READ_SMS"]["status"] == "dangerous"
+        assert permissions["android.permission.INTERNET"]["status"] == "normal"
+
+        score, classification, _, dangerous, _ = classify_permissions(permissions)
+        assert classification == "Dangerous"
+        assert score <= 40
+        assert "android.permission.READ_SMS" in dangerous
+
+    def test_invalid_archive(self, tmp_path):
+        """Test non-APK input raises ManifestError"""
+        bad = tmp_path / "bad.apk"
+        bad.write_bytes(b"not a zip")
+        with pytest.raises(ManifestError):
+            read_apk_manifest(str(bad))
+
+        no_manifest = tmp_path / "empty.apk"
+        with zipfile.ZipFile(no_manifest, "w") as apk:
+            apk.writestr("classes.dex", b"")
+        with pytest.raises(ManifestError):
+            read_apk_manifest(str(no_manifest))
+
+    def test_real_compiled_manifest(self, tmp_path):
+        """Test a manifest compiled by aapt2 decodes to the values the Android tooling reports"""
+        with open(REAL_MANIFEST, "rb") as f:
+            apk = write_apk(tmp_path / "uiautomator.apk", f.read())
+
+        manifest = read_apk_manifest(apk)
+
+        assert manifest["package_name"] == "com.github.uiautomator"
+        assert (manifest["version_code"], manifest["version_name"]) == (2004001, "2.4.0")
+        assert (manifest["min_sdk"], manifest["target_sdk"], manifest["max_sdk"]) == (19, 32, None)
+        assert len(manifest["permissions"]) == 12
+        assert manifest["permissions"][:2] == ["android.permission.ACCESS_MOCK_LOCATION", "android.permission.INTERNET"]
+        assert [activity["name"] for activity in manifest["activities"]] == [
+            "com.github.uiautomator.IdentifyActivity", "com.github.uiautomator.MainActivity", "com.github.uiautomator.ToastActivity",
+        ]
+        assert manifest["services"] == [
+            {"name": "com.github.uiautomator.Service", "exported": True},
+            {"name": "com.github.uiautomator.AdbKeyboard", "exported": True},
+        ]
+        assert manifest["receivers"] == [{"name": "com.github.uiautomator.AdbBroadcastReceiver", "exported": True}]
+        assert manifest_permissions(manifest)["android.permission.GET_ACCOUNTS"]["status"] == "dangerous"
+
+    def test_oversized_manifest_falls_back_to_mobsf(self, tmp_path, monkeypatch):
+        """Test a manifest over the size limit is refused before inflating and MobSF is used instead"""
+        apk = tmp_path / "bomb.apk"
+        with zipfile.ZipFile(apk, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("AndroidManifest.xml", b"\x00" * (MAX_MANIFEST_BYTES + 1))
+        assert apk.stat().st_size < 64 * 1024
+
+        with pytest.raises(ManifestError, match="over the"):
+            read_apk_manifest(str(apk))
+
+        monkeypatch.setattr(service, "get_mobsf_client", lambda: SimpleNamespace(get_report=lambda path: {"permissions": {}}))
+        assert service.build_apk_report(str(apk))["scan_source"] == "mobsf"
@@ -0,0 +1,67 @@
+"""
+APK Permission Rows Unit Tests
+Test bulk persistence of APK permission analysis results
+"""
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.analytics.analytics_management.models import ApkAnalytic
+from app.analytics.analytics_management.service import save_apk_permissions
+
+PERMISSIONS = {
+    "android.permission.INTERNET": {"status": "normal", "description": "network access"},
+    "android.permission.READ_SMS": {"status": "dangerous", "description": "read SMS"},
+    "com.example.CUSTOM": {},
+}
+
+
+@pytest.fixture
+def apk_db():
+    engine = create_engine("sqlite://")
+    ApkAnalytic.__table__.create(bind=engine)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    session = sessionmaker(bind=engine)()
+    yield session, statements
+    session.close()
+
+
+class TestApkPermissionRows:
+    """Test APK permission persistence"""
+
+    def test_bulk_insert_returns_rows(self, apk_db):
+        """Test all rows are written in one INSERT and returned in input order"""
+        db, statements = apk_db
+
+        rows = save_apk_permissions(db, 7, PERMISSIONS, "55")
+
+        assert [row["item"] for row in rows] == list(PERMISSIONS)
+        assert rows[2]["status"] == "unknown"
+        assert all(row["id"] for row in rows)
+        assert sum(1 for sql in statements if sql.startswith("INSERT")) == 1
+        assert db.query(ApkAnalytic).filter(ApkAnalytic.analytic_file_id == 7).count() == 3
+
+    def test_unchanged_reanalysis_skips_write(self, apk_db):
+        """Test re-saving the same permission set performs no write"""
+        db, statements = apk_db
+        first = save_apk_permissions(db, 7, PERMISSIONS, "55")
+        statements.clear()
+
+        again = save_apk_permissions(db, 7, PERMISSIONS, "55")
+
+        assert [row["id"] for row in again] == [row["id"] for row in first]
+        assert not any(sql.startswith(("INSERT", "DELETE", "UPDATE")) for sql in statements)
+
+    def test_changed_permissions_replace_rows(self, apk_db):
+        """Test a changed permission set replaces only that file's rows"""
+        db, _ = apk_db
+        save_apk_permissions(db, 7, PERMISSIONS, "55")
+        save_apk_permissions(db, 8, PERMISSIONS, "55")
+
+        rows = save_apk_permissions(db, 7, {"android.permission.CAMERA": {"status": "dangerous"}}, "40")
+
+        assert [row["item"] for row in rows] == ["android.permission.CAMERA"]
+        assert db.query(ApkAnalytic).filter(ApkAnalytic.analytic_file_id == 7).count() == 1
+        assert db.query(ApkAnalytic).filter(ApkAnalytic.analytic_file_id == 8).count() == 3
@@ -0,0 +1,84 @@
+"""
+ASGI Middleware Unit Tests
+Test the auth, timeout and logging middleware stack
+"""
+
+import logging
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.api.deps import get_current_user
+from app.auth.models import AuthCacheVersion, BlacklistedToken, User
+from app.auth.token_cache import TokenCache
+from app.core import security
+from app.middleware.auth_middleware import AuthMiddleware
+from app.middleware.logging import LoggingMiddleware
+from app.middleware.timeout import TimeoutMiddleware
+
+
+@pytest.fixture
+def client():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    for model in (User, BlacklistedToken, AuthCacheVersion):
+        model.__table__.create(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+    db = session_factory()
+    db.add(User(id=1, email="active@example.com", fullname="Active", tag="Admin", hashed_password="x", role="admin", is_active=True))
+    db.add(User(id=2, email="inactive@example.com", fullname="Inactive", tag="Admin", hashed_password="x", role="admin", is_active=False))
+    db.commit()
+    db.close()
+
+    app = FastAPI()
+
+    @app.get("/api/v1/me")
+    def me(current_user: User = Depends(get_current_user)):
+        return {"id": current_user.id}
+
+    @app.get("/api/v1/stream")
+    def stream(current_user: User = Depends(get_current_user)):
+        return StreamingResponse(iter([b"a", b"b", b"c"]), media_type="text/plain")
+
+    cache = TokenCache(maxsize=100, ttl=300, check_interval=60, session_factory=session_factory)
+    app.add_middleware(LoggingMiddleware)
+    app.add_middleware(TimeoutMiddleware, timeout_seconds=3600)
+    app.add_middleware(AuthMiddleware, session_factory=session_factory, cache=cache)
+    return TestClient(app)
+
+
+def bearer(user_id):
+    return {"Authorization": f"Bearer {security.create_access_token(str(user_id))}"}
+
+
+class TestASGIMiddleware:
+    """Test ASGI middleware stack"""
+
+    def test_authenticated_request_sets_user(self, client):
+        """Test a valid token reaches the route with request.state.user set, cached or not"""
+        headers = bearer(1)
+        assert client.get("/api/v1/me", headers=headers).json() == {"id": 1}
+        assert client.get("/api/v1/me", headers=headers).json() == {"id": 1}
+
+    def test_rejections_match_previous_responses(self, client):
+        """Test missing, invalid and inactive-user tokens get the same 401 bodies"""
+        assert client.get("/api/v1/me").json() == {"status": 401, "message": "Unauthorized", "data": None}
+        assert client.get("/api/v1/me", headers={"Authorization": "Bearer nope"}).json()["message"] == "Invalid token"
+        response = client.get("/api/v1/me", headers=bearer(2))
+        assert response.status_code == 401
+        assert response.json()["message"] == "Inactive or missing user"
+
+    def test_streaming_response_and_logging(self, client, caplog):
+        """Test streamed bodies pass through and the final status is logged"""
+        with caplog.at_level(logging.INFO, logger="app.middleware.logging"):
+            response = client.get("/api/v1/stream", headers=bearer(1))
+            client.get("/api/v1/missing", headers=bearer(1))
+
+        assert response.text == "abc"
+        messages = [record.getMessage() for record in caplog.records]
+        assert any(m.startswith("GET /api/v1/stream - 200") for m in messages)
+        assert any(m.startswith("GET /api/v1/missing - 404") for m in messages)
@@ -0,0 +1,114 @@
+"""
+Case Dossier Unit Tests
+Test the case dossier archive holds every case, suspect and evidence PDF
+"""
+
+import asyncio
+import io
+import zipfile
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.analytics.shared.models  # noqa: F401
+from app.api.deps import get_current_user, get_database
+from app.api.v1 import case_routes
+from app.auth.models import User
+from app.case_management.models import Agency, Case, CaseLog, WorkUnit
+from app.core.config import settings
+from app.evidence_management.models import CustodyReport, Evidence
+from app.suspect_management.models import Suspect
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "REPORTS_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "PDF_RENDER_WORKERS", 1)
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    for model in (Agency, WorkUnit, Case, CaseLog, Suspect, Evidence, CustodyReport, User):
+        model.__table__.create(bind=engine)
+
+    session_factory = sessionmaker(bind=engine)
+    db = session_factory()
+    db.add(Case(id=1, case_number="CASE/01", title="Fraud", main_investigator="Owner"))
+    db.add(Suspect(id=1, name="Budi Santoso", case_id=1, status="Suspect"))
+    db.add(Suspect(id=2, name="Siti", case_id=1, status="Witness"))
+    db.add(Evidence(id=1, evidence_number="EV-1", title="Phone", case_id=1, suspect_id=1))
+    db.commit()
+    db.close()
+    return session_factory
+
+
+@pytest.fixture
+def client(session_factory):
+    def get_test_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    api = FastAPI()
+    api.include_router(case_routes.router)
+    api.dependency_overrides[get_database] = get_test_db
+    api.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=1, role="admin", fullname="Owner", email="owner@example.com")
+    return TestClient(api)
+
+
+class TestCaseDossier:
+    """Test case dossier export"""
+
+    def test_archive_members(self, client, tmp_path):
+        """Test the archive stores one PDF per case, suspect and evidence without recompressing them"""
+        response = client.get("/cases/export-case-dossier/1")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/zip"
+
+        archive = zipfile.ZipFile(io.BytesIO(response.content))
+        assert archive.namelist() == [
+            "case_detail_CASE_01.pdf",
+            "suspects/suspect_1_Budi_Santoso.pdf",
+            "suspects/suspect_2_Siti.pdf",
+            "evidence/evidence_1_EV-1.pdf",
+        ]
+        for member in archive.infolist():
+            assert member.compress_type == zipfile.ZIP_STORED
+            assert archive.read(member).startswith(b"%PDF")
+        assert [path.name for path in tmp_path.iterdir() if path.name.startswith("case_dossier_")] == []
+
+    def test_access_check(self, client, monkeypatch):
+        """Test the dossier is refused when the user may not access the case"""
+        assert client.get("/cases/export-case-dossier/2").status_code == 404
+
+        monkeypatch.setattr(case_routes, "check_case_access", lambda case, current_user: False)
+        response = client.get("/cases/export-case-dossier/1")
+        assert response.status_code == 403
+        assert response.json()["detail"] == "You do not have permission to access this case"
+
+    def test_archive_removed_when_writing_fails(self, client, tmp_path, monkeypatch):
+        """Test a failure while writing the archive leaves no zip in the reports directory"""
+        def fail_write(self, filename, arcname=None, *args, **kwargs):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(zipfile.ZipFile, "write", fail_write)
+        response = client.get("/cases/export-case-dossier/1")
+
+        assert response.status_code == 500
+        assert list(tmp_path.iterdir()) == []
+
+    def test_archive_removed_when_response_is_dropped(self, session_factory, tmp_path):
+        """Test the background cleanup removes the archive when streaming never starts"""
+        db = session_factory()
+        try:
+            response = case_routes.export_case_dossier(1, SimpleNamespace(id=1, role="admin", fullname="Owner", email="owner@example.com"), db)
+        finally:
+            db.close()
+
+        assert [path.suffix for path in tmp_path.iterdir()] == [".zip"]
+        asyncio.run(response.background())
+        assert list(tmp_path.iterdir()) == []
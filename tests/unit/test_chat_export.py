@@ -0,0 +1,134 @@
+"""
+Chat Export Unit Tests
+Test the deep communication data export selects the same chat as the chat detail view
+"""
+
+import csv
+import io
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import JSON, create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.analytics.shared.models  # noqa: F401
+from app.analytics.analytics_management.models import AnalyticFile
+from app.analytics.shared.models import Analytic, AnalyticDevice, ChatMessage, Device, File
+from app.api.deps import get_current_user
+from app.api.v1 import analytics_report_routes
+from app.api.v1.analytics_communication_enhanced_routes import _get_chat_detail_data
+from app.core.config import settings
+from app.db.session import get_db
+
+
+MESSAGES = [
+    # (file_id, platform, from_name, to_name, chat_type, thread_id, direction)
+    (10, "WhatsApp", "Andi", "Budi Santoso", "One On One", "t1", None),
+    (10, "WhatsApp", "Budi Santoso", "Andi", "One On One", "t1", None),
+    (10, "WhatsApp", "Rina", "Budi Santoso", "One On One", "t2", None),
+    (10, "WhatsApp", "Andi Pratama", "Grup Kantor", "Group", "t3", "Incoming"),
+    (20, "WhatsApp", "Andi", "Siti", "One On One", "t4", None),
+    (10, "Telegram", "Andi", "Budi Santoso", "One On One", "t5", None),
+    (20, "WhatsApp", "Siti", "Andi", None, "t4", "Outgoing"),
+]
+
+
+@pytest.fixture
+def session_factory(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    # SQLite has no ARRAY type; store the linked device ids as JSON instead.
+    monkeypatch.setattr(AnalyticDevice.__table__.c.device_ids, "type", JSON())
+    for model in (Analytic, AnalyticDevice, AnalyticFile, File, Device, ChatMessage):
+        model.__table__.create(bind=engine)
+
+    factory = sessionmaker(bind=engine)
+    db = factory()
+    db.add(Analytic(id=1, analytic_name="Case A", method="Deep Communication Analytics", created_by="Owner"))
+    db.add(AnalyticDevice(analytic_id=1, device_ids=[1, 2]))
+    db.add(Device(id=1, file_id=10, owner_name="Budi Santoso", phone_number="0811"))
+    db.add(Device(id=2, file_id=20, owner_name="Siti", phone_number="0822"))
+    for index, (file_id, platform, from_name, to_name, chat_type, thread_id, direction) in enumerate(MESSAGES, start=1):
+        db.add(ChatMessage(
+            id=index, file_id=file_id, platform=platform, message_text=f"message {index}", from_name=from_name,
+            to_name=to_name, chat_type=chat_type, thread_id=thread_id, chat_id=thread_id, message_id=str(index),
+            direction=direction, timestamp=f"2024-01-01 10:{index:02d}:00",
+        ))
+    db.commit()
+    db.close()
+
+    monkeypatch.setattr(analytics_report_routes, "SessionLocal", factory)
+    return factory
+
+
+@pytest.fixture
+def client(session_factory, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "REPORTS_DIR", str(tmp_path))
+
+    def get_test_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    api = FastAPI()
+    api.include_router(analytics_report_routes.router)
+    api.dependency_overrides[get_db] = get_test_db
+    api.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=1, role="admin", fullname="Owner", email="owner@example.com")
+    return TestClient(api)
+
+
+def detail_messages(session_factory, **filters):
+    db = session_factory()
+    try:
+        result = _get_chat_detail_data(1, db, **filters)
+    finally:
+        db.close()
+    assert result.ok
+    return {
+        (str(message["message_id"]), message["direction"])
+        for chat in result.data["conversation_history"]
+        for message in chat["messages"]
+    }
+
+
+def export_messages(client, **params):
+    response = client.get("/analytic/export", params={"analytic_id": 1, "format": "csv", **params})
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.content.decode("utf-8-sig"))))
+    return {(row["Message ID"], row["Direction"]) for row in rows}
+
+
+class TestChatExport:
+    """Test deep communication CSV export"""
+
+    @pytest.mark.parametrize("filters", [
+        {"person_name": "Andi", "source": "WhatsApp"},
+        {"person_name": "Andi", "source": "WhatsApp", "device_id": 2},
+        {"person_name": "Rina"},
+    ])
+    def test_rows_match_chat_detail(self, client, session_factory, filters):
+        """Test the export has the chat detail messages and directions for the same filters"""
+        expected = detail_messages(
+            session_factory, person_name=filters["person_name"], platform=filters.get("source"), device_id=filters.get("device_id"),
+        )
+
+        assert expected
+        assert export_messages(client, **filters) == expected
+
+    def test_invalid_filters_are_rejected(self, client):
+        """Test the export rejects the same filters as the chat detail and PDF export"""
+        unknown_device = client.get("/analytic/export", params={"analytic_id": 1, "person_name": "Andi", "device_id": 99})
+        assert unknown_device.status_code == 404
+        assert unknown_device.json()["message"] == "Device not found in this analytic"
+
+        unknown_platform = client.get("/analytic/export", params={"analytic_id": 1, "person_name": "Andi", "source": "Myspace"})
+        assert unknown_platform.status_code == 400
+
+        assert client.get("/analytic/export", params={"analytic_id": 1}).status_code == 400
+
+        pdf = client.get("/analytic/export-pdf", params={"analytic_id": 1, "person_name": "Andi", "device_id": 99})
+        assert pdf.status_code == 404
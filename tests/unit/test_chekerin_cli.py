@@ -0,0 +1,90 @@
+"""
+Chekerin CLI Unit Tests
+Test parallel encrypt, decrypt and scan in the chekerin CLI
+"""
+
+import importlib
+import os
+
+import pytest
+
+APP_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "app")
+
+
+@pytest.fixture
+def cli(monkeypatch):
+    # chekerin is shipped as a standalone tool that imports sdp_crypto as a top-level package.
+    monkeypatch.syspath_prepend(os.path.abspath(APP_DIR))
+    return importlib.import_module("chekerin.cli")
+
+
+@pytest.fixture
+def keys(cli, tmp_path):
+    private_key, public_key = cli.generate_keypair()
+    (tmp_path / "private.key").write_bytes(private_key)
+    (tmp_path / "public.key").write_bytes(public_key)
+    return str(tmp_path / "private.key"), str(tmp_path / "public.key")
+
+
+def tree_contents(root):
+    return {
+        os.path.relpath(os.path.join(directory, name), root): open(os.path.join(directory, name), "rb").read()
+        for directory, _, names in os.walk(root)
+        for name in names
+    }
+
+
+class TestChekerinCli:
+    """Test chekerin parallel jobs"""
+
+    def test_folder_round_trip_in_parallel(self, cli, keys, tmp_path):
+        """Test --jobs encrypts and decrypts a nested folder and the scan finds every encrypted file"""
+        private_key, public_key = keys
+        source = tmp_path / "exports"
+        (source / "device_b").mkdir(parents=True)
+        for index in range(6):
+            (source / f"report_{index}.csv").write_bytes(os.urandom(100 + index * 500))
+        (source / "device_b" / "contacts.xlsx").write_bytes(b"contacts")
+
+        encrypted = cli.encrypt_folder(public_key, str(source), str(tmp_path / "encrypted"), recursive=True, jobs=4)
+        assert len(encrypted) == 7
+
+        results = cli.check_files_in_directory(str(tmp_path / "encrypted"), recursive=True, jobs=4)
+        assert sorted(status for _, status, _ in results) == ["ENCRYPTED"] * 7
+
+        decrypted = cli.decrypt_folder(private_key, str(tmp_path / "encrypted"), str(tmp_path / "decrypted"), recursive=True, jobs=4)
+        assert len(decrypted) == 7
+        assert tree_contents(tmp_path / "decrypted") == tree_contents(source)
+
+    def test_parallel_decrypt_keeps_same_named_files(self, cli, keys, tmp_path):
+        """Test files whose SDP headers carry the same filename are all written under distinct names"""
+        private_key, public_key = keys
+        with open(public_key, "rb") as f:
+            public_key_bytes = f.read()
+        contents = set()
+        for index in range(16):
+            source = tmp_path / "sources" / str(index) / "data.xlsx"
+            source.parent.mkdir(parents=True)
+            source.write_bytes(f"device {index}".encode())
+            contents.add(f"device {index}".encode())
+            cli.encrypt_to_sdp(public_key_bytes, str(source), str(tmp_path / f"{index}.sdp"))
+
+        decrypted = cli.decrypt_multiple_files(private_key, [str(tmp_path / "*.sdp")], str(tmp_path / "out"), jobs=8)
+
+        assert len(decrypted) == 16
+        assert len({path for _, path in decrypted}) == 16
+        assert set(tree_contents(tmp_path / "out").values()) == contents
+
+    def test_failed_jobs_are_reported(self, cli, keys, tmp_path, capsys):
+        """Test a file that fails is reported and left out of the results while the others finish"""
+        private_key, public_key = keys
+        (tmp_path / "good.txt").write_bytes(b"payload")
+        cli.encrypt_multiple_files(public_key, [str(tmp_path / "good.txt")], str(tmp_path / "sdp"))
+        (tmp_path / "sdp" / "broken.sdp").write_bytes(b"\x00\x00\x00\x05junk" + b"\x00" * 40)
+
+        decrypted = cli.decrypt_multiple_files(private_key, [str(tmp_path / "sdp" / "*.sdp")], str(tmp_path / "out"), jobs=2)
+
+        assert [os.path.basename(source) for source, _ in decrypted] == ["good.txt.sdp"]
+        output = capsys.readouterr().out
+        assert "Failed to decrypt" in output and "broken.sdp" in output
+        assert "1/2 files, jobs=2" in output
@@ -0,0 +1,112 @@
+"""
+Correlation Export Unit Tests
+Test the contact, hashfile and social media data exports built from streamed source rows
+"""
+
+import csv
+import io
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import JSON, BigInteger, create_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.analytics.shared.models  # noqa: F401
+from app.analytics.device_management.models import HashFile
+from app.analytics.shared.models import Analytic, AnalyticDevice, Contact, Device, SocialMedia
+from app.api.deps import get_current_user
+from app.api.v1 import analytics_report_routes
+from app.core.config import settings
+from app.db.session import get_db
+
+
+@compiles(BigInteger, "sqlite")
+def _sqlite_big_integer(type_, compiler, **kw):
+    return "INTEGER"
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "REPORTS_DIR", str(tmp_path))
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    # SQLite has no ARRAY type; store the linked device ids as JSON instead.
+    monkeypatch.setattr(AnalyticDevice.__table__.c.device_ids, "type", JSON())
+    for model in (Analytic, AnalyticDevice, Device, Contact, HashFile, SocialMedia):
+        model.__table__.create(bind=engine)
+
+    factory = sessionmaker(bind=engine)
+    db = factory()
+    for analytic_id, method in ((1, "Contact Correlation"), (2, "Hashfile Analytics"), (3, "Social Media Correlation")):
+        db.add(Analytic(id=analytic_id, analytic_name="Case A", method=method, created_by="Owner"))
+        db.add(AnalyticDevice(analytic_id=analytic_id, device_ids=[1, 2]))
+    db.add(Device(id=1, file_id=10, owner_name="Budi", phone_number="0811"))
+    db.add(Device(id=2, file_id=20, owner_name="Siti", phone_number="0822"))
+    db.add_all([
+        Contact(file_id=10, display_name="First name: Ani", phone_number="081234567890"),
+        Contact(file_id=20, display_name="Ani Kantor", phone_number="+6281234567890"),
+        Contact(file_id=20, display_name="Rina", phone_number="081299999999"),
+        Contact(file_id=10, display_name="Bank", phone_number="081211111111", type="Account"),
+        Contact(file_id=20, display_name="Bank", phone_number="081211111111"),
+    ])
+    db.add_all([
+        HashFile(id=1, file_id=10, file_name="a.jpg", md5_hash="h1", file_type="Image"),
+        HashFile(id=2, file_id=20, file_name="A.JPG ", md5_hash="h1", file_type="Image"),
+        HashFile(id=3, file_id=20, file_name="a.jpg", md5_hash="h1"),
+        HashFile(id=4, file_id=10, file_name="b.png", sha1_hash="s2"),
+        HashFile(id=5, file_id=10, file_name="b.png", sha1_hash="s2"),
+    ])
+    db.add_all([
+        SocialMedia(file_id=10, source="Instagram", instagram_id="budi.s", full_name="Budi S"),
+        SocialMedia(file_id=20, source="Instagram", instagram_id="BUDI.S ", account_name="budi"),
+        SocialMedia(file_id=20, source="Instagram", account_name="siti"),
+    ])
+    db.commit()
+    db.close()
+
+    def get_test_db():
+        session = factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    api = FastAPI()
+    api.include_router(analytics_report_routes.router)
+    api.dependency_overrides[get_db] = get_test_db
+    api.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=1, role="admin", fullname="Owner", email="owner@example.com")
+    return TestClient(api)
+
+
+def export_rows(client, analytic_id, **params):
+    response = client.get("/analytic/export", params={"analytic_id": analytic_id, "format": "csv", **params})
+    assert response.status_code == 200
+    return list(csv.reader(io.StringIO(response.content.decode("utf-8-sig"))))
+
+
+class TestCorrelationExports:
+    """Test correlation data exports"""
+
+    def test_contact_export(self, client):
+        """Test numbers found on both devices are exported with each device's contact name"""
+        assert export_rows(client, 1) == [
+            ["Contact Number", "Device A - Budi (0811)", "Device B - Siti (0822)"],
+            ["6281234567890", "Ani", "Ani Kantor"],
+        ]
+
+    def test_hashfile_export(self, client):
+        """Test files are keyed by hash and normalised name and kept only when two devices share them"""
+        assert export_rows(client, 2) == [
+            ["Hash Value", "File Name", "File Type", "Device A - Budi (0811)", "Device B - Siti (0822)"],
+            ["h1", "a.jpg", "Image", "Yes", "Yes"],
+        ]
+
+    def test_social_media_export(self, client):
+        """Test accounts are keyed by platform ID and exported once per device"""
+        assert export_rows(client, 3, source="Instagram") == [
+            ["Platform", "Connections", "Device 1 - Budi (0811)", "Device 2 - Siti (0822)"],
+            ["Instagram", "2 koneksi", "Budi S", "budi"],
+        ]
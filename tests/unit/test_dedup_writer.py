@@ -0,0 +1,154 @@
+"""
+Dedup Writer Unit Tests
+Test chat message batch inserts and the per-file social media index
+"""
+
+import openpyxl
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.analytics.shared.models  # noqa: F401
+from app.analytics.device_management.models import ChatMessage, SocialMedia
+from app.analytics.utils import dedup_writer, social_media_parsers_extended
+from app.analytics.utils.dedup_writer import mark_social_media_saved, save_chat_messages, social_media_index
+from app.analytics.utils.social_media_parser import SocialMediaBatchWriter, SocialMediaParser
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    for model in (ChatMessage, SocialMedia):
+        model.__table__.create(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def message(message_id, file_id=1, platform="WhatsApp"):
+    return {"file_id": file_id, "platform": platform, "message_id": message_id, "message_text": "hi"}
+
+
+class TestSaveChatMessages:
+    """Test save_chat_messages"""
+
+    def test_skips_keys_already_in_file(self, db):
+        """Test existing and repeated keys are skipped, other files and NULL ids are kept"""
+        save_chat_messages(db, [message("m1")])
+        db.commit()
+
+        saved, skipped = save_chat_messages(
+            db, [message("m1"), message("m2"), message("m2"), message("m1", file_id=2), message(None), message(None)],
+            batch_size=2,
+        )
+        db.commit()
+
+        assert (saved, skipped) == (4, 2)
+        assert db.query(ChatMessage).count() == 5
+
+    def test_conflicting_rows_are_not_counted_as_saved(self, db, monkeypatch):
+        """Test rows dropped by ON CONFLICT DO NOTHING count as skipped"""
+        db.add(ChatMessage(**message("m2")))
+        db.commit()
+        # A concurrent upload committed m2 after this writer loaded the file's keys.
+        monkeypatch.setattr(dedup_writer, "load_existing_chat_message_keys", lambda db, file_id: set())
+
+        saved, skipped = save_chat_messages(db, [message("m1"), message("m2"), message("m3")])
+        db.commit()
+
+        assert (saved, skipped) == (2, 1)
+        assert db.query(ChatMessage).count() == 3
+
+
+class TestSocialMediaIndex:
+    """Test the per-file social media index"""
+
+    def test_check_does_not_mark_record(self, db):
+        """Test checking a record leaves it unknown until it is marked saved"""
+        acc = {"file_id": 1, "instagram_id": "ig-1", "account_name": "alice"}
+        index = social_media_index(db, 1)
+
+        assert index.find(acc, ["instagram_id"]) is None
+        assert index.find(acc, ["instagram_id"]) is None
+
+        db.add(SocialMedia(**acc))
+        mark_social_media_saved(db, acc)
+        assert index.find(acc, ["instagram_id"]) == "instagram_id"
+
+    def test_rollback_forgets_unsaved_records(self, db):
+        """Test records marked in a rolled back transaction are dropped, committed ones kept"""
+        saved = {"file_id": 1, "telegram_id": "tg-1"}
+        failed = {"file_id": 1, "telegram_id": "tg-2"}
+        index = social_media_index(db, 1)
+
+        db.add(SocialMedia(**saved))
+        mark_social_media_saved(db, saved)
+        db.commit()
+
+        db.add(SocialMedia(**failed))
+        mark_social_media_saved(db, failed)
+        db.rollback()
+
+        assert social_media_index(db, 1) is index
+        assert index.find(saved, ["telegram_id"]) == "telegram_id"
+        assert index.find(failed, ["telegram_id"]) is None
+
+    def test_loads_existing_rows_per_file(self, db):
+        """Test the index is loaded from the file's rows and reloaded for another file"""
+        db.add(SocialMedia(file_id=1, whatsapp_id="wa-1"))
+        db.add(SocialMedia(file_id=2, whatsapp_id="wa-2"))
+        db.commit()
+
+        assert social_media_index(db, 1).find({"whatsapp_id": "wa-1"}, ["whatsapp_id"]) == "whatsapp_id"
+        assert social_media_index(db, 1).find({"whatsapp_id": "wa-2"}, ["whatsapp_id"]) is None
+        assert social_media_index(db, 2).find({"whatsapp_id": "wa-2"}, ["whatsapp_id"]) == "whatsapp_id"
+
+    def test_other_sessions_are_unaffected(self, db):
+        """Test sessions without an index commit and roll back normally"""
+        social_media_index(db, 1)
+        other = sessionmaker(bind=db.get_bind())()
+        other.add(SocialMedia(file_id=1, X_id="x-1"))
+        other.commit()
+        other.rollback()
+        other.close()
+
+        assert "social_media_index" not in other.info
+
+
+class TestSocialMediaBatchWriter:
+    """Test the streamed social media writer shared by Oxygen and Axiom"""
+
+    def test_writes_each_batch_and_keeps_only_keys(self, db):
+        """Test duplicates across sheets are dropped and batches are committed as they fill"""
+        writer = SocialMediaBatchWriter(SocialMediaParser(db), batch_size=2)
+        first_sheet = [
+            {"file_id": 1, "account_name": "alice", "instagram_id": "1"},
+            {"file_id": 1, "account_name": "bob", "instagram_id": "2"},
+        ]
+        second_sheet = [
+            {"file_id": 1, "account_name": "alice", "instagram_id": "1"},
+            {"file_id": 1, "account_name": "carol", "instagram_id": "3"},
+        ]
+        writer.extend(first_sheet)
+        assert writer.pending == [] and writer.saved_count == 2
+
+        writer.extend(second_sheet)
+        writer.flush()
+
+        assert (writer.parsed_count, writer.unique_count, writer.saved_count) == (4, 3, 3)
+        assert db.query(SocialMedia).count() == 3
+
+    def test_axiom_writes_through_batch_writer(self, db, tmp_path, monkeypatch):
+        """Test Axiom sheets are deduplicated and validated by the shared writer"""
+        workbook = openpyxl.Workbook()
+        workbook.active.title = "Android WhatsApp Contacts"
+        workbook.save(tmp_path / "axiom.xlsx")
+        batches = [
+            [{"file_id": 1, "account_name": "alice", "whatsapp_id": "1"}, {"file_id": 1, "platform": "telegram", "account_id": "t1"}],
+            [{"file_id": 1, "account_name": "alice", "whatsapp_id": "1"}, {"file_id": 1, "account_name": None}],
+        ]
+        monkeypatch.setattr(social_media_parsers_extended, "run_sheet_tasks", lambda tasks: ((tasks[0], batch) for batch in batches))
+
+        assert SocialMediaParser(db).parse_axiom_social_media(str(tmp_path / "axiom.xlsx"), 1) == 3
+        assert {(row.whatsapp_id, row.telegram_id) for row in db.query(SocialMedia)} == {("1", None), (None, "t1")}
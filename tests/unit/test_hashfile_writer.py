@@ -0,0 +1,80 @@
+"""
+HashFile Batch Writer Unit Tests
+Test streamed hashfile inserts, single-commit import and progress totals
+"""
+
+import pytest
+from sqlalchemy import BigInteger, create_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.analytics.shared.models  # noqa: F401
+from app.analytics.device_management.models import HashFile
+from app.analytics.utils.hashfile_parser import HashFileBatchWriter, HashFileParser
+
+
+@compiles(BigInteger, "sqlite")
+def _sqlite_bigint(type_, compiler, **kw):
+    # SQLite only autoincrements INTEGER PRIMARY KEY columns.
+    return "INTEGER"
+
+
+@pytest.fixture
+def parser():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    HashFile.__table__.create(bind=engine)
+    db = sessionmaker(bind=engine)()
+    yield HashFileParser(db)
+    db.close()
+
+
+def record(i):
+    return {
+        "file_id": 1, "file_name": f"file{i}.bin", "path_original": None, "size_bytes": i,
+        "created_at_original": None, "modified_at_original": None, "file_type": "BIN file",
+        "md5_hash": f"md5-{i}", "sha1_hash": None, "algorithm": "MD5", "source_tool": "oxygen",
+    }
+
+
+def count_rows(parser):
+    return parser.db.query(HashFile).filter(HashFile.file_id == 1).count()
+
+
+class TestHashFileBatchWriter:
+    """Test hashfile batch writer"""
+
+    def test_finish_commits_all_flushes(self, parser):
+        """Test every flushed batch is inserted and committed once at the end"""
+        writer = HashFileBatchWriter(parser, 1, flush_size=2)
+        for i in range(5):
+            writer.append(record(i))
+
+        assert writer.finish() == 5
+        parser.db.close()
+        assert count_rows(parser) == 5
+
+    def test_failure_leaves_no_partial_import(self, parser):
+        """Test rows flushed before a failure are rolled back with the rest"""
+        writer = HashFileBatchWriter(parser, 1, flush_size=2)
+        for i in range(3):
+            writer.append(record(i))
+        assert writer.inserted_count == 2
+
+        # Parsers roll the session back when a later row or sheet fails.
+        parser.db.rollback()
+        assert count_rows(parser) == 0
+
+    def test_progress_reports_running_totals(self, parser):
+        """Test progress counts accumulate across flushes instead of restarting"""
+        updates = []
+        writer = HashFileBatchWriter(parser, 1, upload_id="u1", progress_callback=lambda upload_id, info: updates.append(info), flush_size=2)
+        for i in range(5):
+            writer.append(record(i))
+        writer.finish()
+
+        amounts = [update["amount_of_data"] for update in updates]
+        percents = [update["percent"] for update in updates]
+        assert amounts == [2, 4, 5]
+        assert percents == sorted(percents)
+        assert updates[-1]["message"] == "Inserting hashfiles (5 of 5 records)..."
@@ -0,0 +1,33 @@
+"""
+Identifier Extractor Unit Tests
+Test precompiled social media identifier extraction
+"""
+
+from app.analytics.utils.identifier_extractor import extract_identifiers, extract_platform_id, identifiers_for
+
+
+class TestIdentifierExtractor:
+    """Test identifier extraction from contact cells"""
+
+    def test_extract_identifiers(self):
+        """Test all identifiers are extracted from a single cell"""
+        text = "Budi\nNickname: budi_s\nWhatsApp ID: 6281234567890@s.whatsapp.net\nPhone number: +62 812-3456-7890"
+        identifiers = extract_identifiers(text)
+
+        assert identifiers.nickname == "budi_s"
+        assert identifiers.whatsapp_account == "6281234567890@s.whatsapp.net"
+        assert identifiers.phone_number == "+6281234567890"
+        assert identifiers.instagram_id is None
+        assert extract_platform_id("Twitter ID: 12345", "x") == "12345"
+        assert extract_platform_id(None, "instagram") is None
+
+    def test_repeated_cells_are_memoised(self):
+        """Test the same cell text is scanned once and non-string cells share the cache"""
+        extract_identifiers.cache_clear()
+        first = identifiers_for("Telegram ID: 777")
+        second = identifiers_for("Telegram ID: 777")
+
+        assert first is second
+        assert first.telegram_account == "777"
+        assert extract_identifiers.cache_info().hits == 1
+        assert identifiers_for(None).telegram_id is None
@@ -0,0 +1,59 @@
+"""
+MobSF Client Unit Tests
+Test the pooled MobSF client and its report cache
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.analytics.utils.mobsf_client import MobSFClient, MobSFError
+from tests.mobsf_stub import STUB_API_KEY, STUB_REPORT, MobSFStubServer
+
+
+@pytest.fixture
+def mobsf_stub():
+    server = MobSFStubServer().start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def apk_file(tmp_path):
+    path = tmp_path / "sample.apk"
+    path.write_bytes(b"PK\x03\x04" + b"\x00" * 4096)
+    return str(path)
+
+
+class TestMobSFClient:
+    """Test MobSF client"""
+
+    def test_report_cached_by_sha256(self, mobsf_stub, apk_file, tmp_path):
+        """Test a second request for the same APK is served from the cache"""
+        client = MobSFClient(base_url=mobsf_stub.url, api_key=STUB_API_KEY, cache_dir=str(tmp_path / "cache"))
+
+        assert client.get_report(apk_file) == STUB_REPORT
+        assert client.get_report(apk_file) == STUB_REPORT
+        assert mobsf_stub.calls == {"upload": 1, "scan": 1, "report_json": 1}
+
+        fresh_client = MobSFClient(base_url=mobsf_stub.url, api_key=STUB_API_KEY, cache_dir=str(tmp_path / "cache"))
+        assert fresh_client.get_report(apk_file) == STUB_REPORT
+        assert mobsf_stub.calls["upload"] == 1
+
+    def test_concurrent_requests_upload_once(self, mobsf_stub, apk_file, tmp_path):
+        """Test simultaneous requests for one APK trigger a single scan"""
+        client = MobSFClient(base_url=mobsf_stub.url, api_key=STUB_API_KEY, cache_dir=str(tmp_path / "cache"))
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            reports = list(pool.map(lambda _: client.get_report(apk_file), range(4)))
+
+        assert all(report == STUB_REPORT for report in reports)
+        assert mobsf_stub.calls["upload"] == 1
+
+    def test_rejected_request_raises(self, mobsf_stub, apk_file, tmp_path):
+        """Test a non-200 MobSF response raises MobSFError and is not cached"""
+        client = MobSFClient(base_url=mobsf_stub.url, api_key="wrong-key", cache_dir=str(tmp_path / "cache"))
+
+        with pytest.raises(MobSFError):
+            client.get_report(apk_file)
+        assert not (tmp_path / "cache").exists()
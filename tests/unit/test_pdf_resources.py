@@ -0,0 +1,39 @@
+"""
+PDF Resources Unit Tests
+Test shared logo, font and style helpers used by the PDF exports
+"""
+
+import os
+
+from reportlab.lib.styles import ParagraphStyle
+
+from app.core.config import settings
+from app.utils.pdf_resources import logo_image, paragraph_style, resolve_logo_path, sample_styles
+
+
+class TestPdfResources:
+    """Test shared PDF resources"""
+
+    def test_resolve_logo_path(self, tmp_path, monkeypatch):
+        """Test relative logo paths keep their parent directory segments"""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(settings, "LOGO_PATH", "./assets/logo.png")
+
+        assert resolve_logo_path() == os.path.join(str(tmp_path), "assets", "logo.png")
+        assert resolve_logo_path("../assets/logo.png") == os.path.join(os.path.dirname(str(tmp_path)), "assets", "logo.png")
+        assert resolve_logo_path(".hidden/logo.png") == os.path.join(str(tmp_path), ".hidden", "logo.png")
+        assert resolve_logo_path("/srv/logo.png") == "/srv/logo.png"
+
+    def test_missing_logo_returns_none(self, tmp_path):
+        """Test a logo that does not exist is skipped instead of failing the export"""
+        assert logo_image(str(tmp_path / "missing.png")) is None
+
+    def test_styles_are_shared(self):
+        """Test the stylesheet and equal paragraph styles are built once"""
+        assert sample_styles() is sample_styles()
+        assert sample_styles()["Normal"].fontSize == 10
+
+        style = paragraph_style("Footer", fontName="Helvetica", fontSize=10)
+        assert style is paragraph_style("Footer", fontSize=10, fontName="Helvetica")
+        assert style is not paragraph_style("Footer", fontName="Helvetica", fontSize=12)
+        assert isinstance(style, ParagraphStyle)
@@ -0,0 +1,67 @@
+"""
+PDF Segments Unit Tests
+Test segmented hashfile reports continue the table across segment boundaries
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from pypdf import PdfReader
+
+from app.analytics.shared.results import AnalyticsResult
+from app.api.v1 import analytics_report_routes
+from app.api.v1.analytics_report_routes import (
+    _format_hash_filename, _hashfile_col_widths, _hashfile_header_row, _hashfile_row_heights, _hashfile_table,
+)
+from app.core.config import settings
+
+
+def filename(i):
+    # Lengths vary so rows wrap to one, two or three lines.
+    return f"evidence_{i:04d}_" + "x" * (i * 7 % 90) + ".jpg"
+
+
+@pytest.fixture
+def report(tmp_path, monkeypatch):
+    devices = [{"device_label": f"D{i}", "owner_name": f"Owner {i}", "phone_number": "+620000"} for i in range(5)]
+    correlations = [{"file_name": filename(i), "devices": ["D0", "D3"]} for i in range(150)]
+    monkeypatch.setattr(
+        analytics_report_routes, "_get_hashfile_analytics_data",
+        lambda analytic_id, db: AnalyticsResult({"data": {"devices": devices, "correlations": correlations}}),
+    )
+    monkeypatch.setattr(settings, "REPORTS_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "PDF_RENDER_WORKERS", 1)
+    analytic = SimpleNamespace(id=1, analytic_name="Case A", method="Hashfile Analytics", created_at=datetime(2024, 1, 1), summary="Summary")
+
+    def render(segment_rows, prefix):
+        monkeypatch.setattr(settings, "PDF_SEGMENT_ROWS", segment_rows)
+        response = analytics_report_routes._generate_hashfile_analytics_report(analytic, None, "Hashfile Analytics", prefix, {})
+        return PdfReader(response.path)
+
+    return render
+
+
+class TestPdfSegments:
+    """Test segmented hashfile PDF rendering"""
+
+    def test_row_heights_match_table_layout(self):
+        """Test measured row heights equal the heights ReportLab computes for the table"""
+        names = [_format_hash_filename(filename(i)) for i in range(40)]
+        style = analytics_report_routes._hashfile_cell_style()
+        body = [[analytics_report_routes.Paragraph(name, style)] + [analytics_report_routes.Paragraph("✔", style)] * 4 for name in names]
+        table = _hashfile_table(_hashfile_header_row([("A", "1")] * 4), body, _hashfile_col_widths(535, 4))
+        table.wrap(535, 1e9)
+
+        assert _hashfile_row_heights(535 * 0.35, names) == table._rowHeights[1:]
+
+    def test_segments_continue_without_extra_pages(self, report):
+        """Test a report split into several segments has every row and the same pages as one document"""
+        single = report(10 ** 6, "single")
+        segmented = report(40, "segmented")
+
+        text = "".join(page.extract_text() for page in segmented.pages)
+        assert all(f"evidence_{i:04d}_" in text for i in range(150))
+        assert text.count("evidence_") == 150 * 2
+        assert len(segmented.pages) == len(single.pages)
+        assert f"Page {len(single.pages)} of {len(single.pages)}" in segmented.pages[-1].extract_text()
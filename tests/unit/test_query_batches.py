@@ -0,0 +1,49 @@
+"""
+Query Batches Unit Tests
+Test keyset and cursor batching used by the streamed exports
+"""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.analytics.shared.models  # noqa: F401
+from app.analytics.device_management.models import ChatMessage
+from app.api.v1.analytics_report_routes import stream_query_in_batches
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    ChatMessage.__table__.create(bind=engine)
+    session = sessionmaker(bind=engine)()
+    # Text order runs against id order, so a leftover ORDER BY would scramble keyset pages.
+    session.add_all(ChatMessage(id=i, file_id=1, platform="WhatsApp", message_id=f"m{i}", message_text=f"{100 - i:03d}") for i in range(1, 26))
+    session.commit()
+    yield session
+    session.close()
+
+
+def batch_ids(batches):
+    return [[row.id for row in batch] for batch in batches]
+
+
+class TestQueryBatches:
+    """Test stream_query_in_batches"""
+
+    def test_keyset_covers_every_row_once(self, db):
+        """Test keyset paging ignores the caller's ORDER BY and covers all rows across batch boundaries"""
+        query = db.query(ChatMessage).order_by(ChatMessage.message_text)
+        batches = batch_ids(stream_query_in_batches(query, batch_size=10, key_column=ChatMessage.id))
+
+        assert [len(batch) for batch in batches] == [10, 10, 5]
+        assert sum(batches, []) == list(range(1, 26))
+
+    def test_cursor_keeps_query_order(self, db):
+        """Test cursor batching streams rows in the query's own order"""
+        query = db.query(ChatMessage).order_by(ChatMessage.message_text)
+        batches = batch_ids(stream_query_in_batches(query, batch_size=10))
+
+        assert [len(batch) for batch in batches] == [10, 10, 5]
+        assert sum(batches, []) == list(range(25, 0, -1))
@@ -0,0 +1,67 @@
+"""
+Report Cache Unit Tests
+Test cached PDF report lookup and eviction
+"""
+
+import multiprocessing
+import os
+
+from app.core.config import settings
+from app.analytics.utils.report_cache import report_cache_key, get_cached_report, store_report
+
+
+def _write_report(directory, name, size):
+    path = os.path.join(directory, name)
+    with open(path, "wb") as f:
+        f.write(b"0" * size)
+    return path
+
+
+def _store_reports(directory, worker, count):
+    for i in range(count):
+        name = f"report_{worker}_{i}.pdf"
+        store_report(name, worker, "apk_analytics", _write_report(directory, name, 10), name)
+
+
+class TestReportCache:
+    """Test report artifact cache"""
+
+    def test_cache_key(self):
+        """Test key ignores filter order and changes with data version or summary"""
+        key = report_cache_key(1, "deep_communication", {"source": "WhatsApp", "device_id": 2}, "v1", "summary")
+
+        assert key == report_cache_key(1, "deep_communication", {"device_id": 2, "source": "WhatsApp", "person_name": None}, "v1", "summary")
+        assert key != report_cache_key(1, "deep_communication", {"source": "WhatsApp", "device_id": 2}, "v2", "summary")
+        assert key != report_cache_key(1, "deep_communication", {"source": "WhatsApp", "device_id": 2}, "v1", "edited")
+
+    def test_store_and_evict(self, tmp_path, monkeypatch):
+        """Test stored reports are served and least recently used ones are evicted over the size limit"""
+        monkeypatch.setattr(settings, "REPORTS_DIR", str(tmp_path))
+        monkeypatch.setattr(settings, "REPORT_CACHE_MAX_MB", 1)
+
+        first = _write_report(tmp_path, "first.pdf", 600 * 1024)
+        store_report("first", 1, "apk_analytics", first, "first.pdf")
+        assert get_cached_report("first") == (first, "first.pdf")
+
+        second = _write_report(tmp_path, "second.pdf", 600 * 1024)
+        store_report("second", 2, "apk_analytics", second, "second.pdf")
+
+        assert get_cached_report("first") is None
+        assert not os.path.exists(first)
+        assert get_cached_report("second") == (second, "second.pdf")
+
+    def test_concurrent_workers_keep_every_entry(self, tmp_path, monkeypatch):
+        """Test stores from several processes sharing the index do not lose each other's entries"""
+        monkeypatch.setattr(settings, "REPORTS_DIR", str(tmp_path))
+        context = multiprocessing.get_context("fork")
+        workers = [context.Process(target=_store_reports, args=(str(tmp_path), worker, 20)) for worker in range(4)]
+        for process in workers:
+            process.start()
+        for process in workers:
+            process.join()
+
+        for worker in range(4):
+            for i in range(20):
+                name = f"report_{worker}_{i}.pdf"
+                assert get_cached_report(name) == (os.path.join(tmp_path, name), name)
+        assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
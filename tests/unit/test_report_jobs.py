@@ -0,0 +1,143 @@
+"""
+Report Jobs Unit Tests
+Test queued PDF exports from submit through progress, completion, failure and download
+"""
+
+import os
+import subprocess
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.analytics.shared.models  # noqa: F401
+from app.analytics.analytics_management.models import Analytic
+from app.analytics.utils import report_jobs
+from app.analytics.utils.report_jobs import ReportJobError, report_progress
+from app.api.deps import get_current_user
+from app.api.v1 import analytics_report_routes
+from app.core.config import settings
+from app.db.session import get_db
+
+
+@pytest.fixture
+def reports_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "REPORTS_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def client(reports_dir):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Analytic.__table__.create(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+    db = session_factory()
+    db.add(Analytic(id=1, analytic_name="Case A", method="Hashfile Analytics", created_by="Owner"))
+    db.commit()
+    db.close()
+
+    def get_test_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    api = FastAPI()
+    api.include_router(analytics_report_routes.router)
+    api.dependency_overrides[get_db] = get_test_db
+    api.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=1, role="admin", fullname="Owner", email="owner@example.com")
+    return TestClient(api)
+
+
+def wait_for(client, job_id, status):
+    for _ in range(200):
+        job = client.get(f"/analytic/export-pdf/jobs/{job_id}").json()["data"]
+        if job["status"] == status:
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} never reached {status}: {job}")
+
+
+class TestReportJobs:
+    """Test report job lifecycle"""
+
+    def test_submit_progress_complete_download(self, client, reports_dir, monkeypatch):
+        """Test a job reports build progress while running and serves the PDF once completed"""
+        rendering, release = threading.Event(), threading.Event()
+
+        def build(analytic_id, user_id, person_name, device_id, source):
+            report_progress(message="Rendering PDF...", progress=60)
+            rendering.set()
+            release.wait(5)
+            path = reports_dir / "report.pdf"
+            path.write_bytes(b"%PDF-1.4 test")
+            return str(path), "report.pdf"
+
+        monkeypatch.setattr(analytics_report_routes, "_run_export_pdf_job", build)
+        response = client.post("/analytic/export-pdf/jobs", params={"analytic_id": 1})
+        assert response.status_code == 202
+        job_id = response.json()["data"]["job_id"]
+
+        assert rendering.wait(5)
+        running = client.get(f"/analytic/export-pdf/jobs/{job_id}").json()["data"]
+        assert (running["status"], running["progress"], running["message"]) == ("running", 60, "Rendering PDF...")
+        assert client.get(f"/analytic/export-pdf/jobs/{job_id}/download").status_code == 409
+
+        release.set()
+        completed = wait_for(client, job_id, "completed")
+        assert completed["progress"] == 100 and completed["download_ready"]
+        download = client.get(f"/analytic/export-pdf/jobs/{job_id}/download")
+        assert download.status_code == 200
+        assert download.content == b"%PDF-1.4 test"
+
+    def test_failed_job_reports_message(self, client, monkeypatch):
+        """Test a failing build marks the job failed with its message and blocks download"""
+        def build(analytic_id, user_id, person_name, device_id, source):
+            raise ReportJobError("No devices linked to this analytic")
+
+        monkeypatch.setattr(analytics_report_routes, "_run_export_pdf_job", build)
+        job_id = client.post("/analytic/export-pdf/jobs", params={"analytic_id": 1}).json()["data"]["job_id"]
+
+        failed = wait_for(client, job_id, "failed")
+        assert failed["message"] == "No devices linked to this analytic"
+        assert client.get(f"/analytic/export-pdf/jobs/{job_id}/download").status_code == 409
+        assert client.get("/analytic/export-pdf/jobs/unknown").status_code == 404
+
+    def test_job_of_stopped_worker_is_failed(self, reports_dir):
+        """Test a job left running by a process that exited is reported as failed"""
+        process = subprocess.Popen(["true"])
+        process.wait()
+        os.makedirs(report_jobs._jobs_dir())
+        report_jobs._save_job({
+            "job_id": "abc123", "user_id": 1, "analytic_id": 1, "method": "Hashfile Analytics", "pid": process.pid,
+            "status": "running", "progress": 30, "message": "Building report sections...", "records_processed": 0,
+            "batches": 0, "last_batch_seconds": None, "file_path": None, "filename": None,
+            "created_at": None, "started_at": None, "finished_at": None,
+        })
+
+        job = report_jobs.get_report_job("abc123")
+        assert job["status"] == "failed" and job["finished_at"]
+        assert report_jobs.get_report_job("abc123")["status"] == "failed"
+
+    def test_prune_removes_job_and_report_file(self, reports_dir, monkeypatch):
+        """Test expired jobs are pruned together with the PDF they produced"""
+        path = reports_dir / "old.pdf"
+        path.write_bytes(b"%PDF")
+        job = report_jobs.submit_report_job(1, 1, "Hashfile Analytics", lambda: (str(path), "old.pdf"))
+        for _ in range(200):
+            if report_jobs.get_report_job(job["job_id"])["status"] == "completed":
+                break
+            time.sleep(0.02)
+
+        monkeypatch.setattr(settings, "REPORT_JOB_RETENTION_HOURS", 0)
+        report_jobs.submit_report_job(1, 1, "Hashfile Analytics", lambda: (str(path), "old.pdf"))
+
+        assert report_jobs.get_report_job(job["job_id"]) is None
+        assert not path.exists()
@@ -0,0 +1,113 @@
+"""
+SDP Catalog Unit Tests
+Test the converted SDP file catalog
+"""
+
+import fcntl
+import json
+import threading
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.analytics.device_management.models import ConvertedSdpFile
+from app.analytics.utils import sdp_catalog
+from app.analytics.utils.sdp_catalog import import_legacy_metadata, list_conversions, record_conversion
+from app.analytics.utils.sdp_crypto import encrypt_to_sdp, generate_keypair
+
+
+@pytest.fixture
+def catalog_db():
+    engine = create_engine("sqlite://")
+    ConvertedSdpFile.__table__.create(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+class TestSDPCatalog:
+    """Test SDP catalog"""
+
+    def test_record_and_filtered_listing(self, catalog_db, tmp_path):
+        """Test conversions are recorded with their SDP summary and listed newest first"""
+        _, public_key = generate_keypair()
+        for name in ("contacts.xlsx", "calls.csv", "contacts_2.xlsx"):
+            source = tmp_path / name
+            source.write_bytes(b"x" * 2500)
+            encrypt_to_sdp(public_key, str(source), str(tmp_path / f"{name}.sdp"), chunk_size=1000)
+            record_conversion(catalog_db, str(tmp_path), name, f"{name}.sdp")
+
+        rows, total = list_conversions(catalog_db, skip=0, limit=1, search="contacts")
+        assert total == 2
+        assert [row.original_filename for row in rows] == ["contacts_2.xlsx"]
+        assert rows[0].original_size == 2500
+        assert rows[0].total_chunks == 3
+        assert len(rows[0].sha256) == 64
+
+    def test_legacy_metadata_imported_once(self, catalog_db, tmp_path):
+        """Test entries from converted_files.json are imported and the file is retired"""
+        metadata = tmp_path / "converted_files.json"
+        metadata.write_text(json.dumps([
+            {"original_filename": "old.xlsx", "converted_filename": "old_1.xlsx.sdp", "timestamp": "2025-01-02T10:00:00"}
+        ]))
+
+        assert import_legacy_metadata(catalog_db, str(tmp_path)) == 1
+        assert not metadata.exists()
+        assert import_legacy_metadata(catalog_db, str(tmp_path)) == 0
+
+        rows, total = list_conversions(catalog_db)
+        assert total == 1
+        assert rows[0].converted_filename == "old_1.xlsx.sdp"
+
+    def test_legacy_import_keeps_entries_around_a_conflict(self, tmp_path, monkeypatch):
+        """Test a name recorded by another worker during the import only skips that entry"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'catalog.db'}")
+        ConvertedSdpFile.__table__.create(bind=engine)
+        factory = sessionmaker(bind=engine)
+        converted_dir = tmp_path / "converted"
+        converted_dir.mkdir()
+        metadata = converted_dir / "converted_files.json"
+        metadata.write_text(json.dumps([
+            {"original_filename": name, "converted_filename": f"{name}.sdp", "timestamp": "2025-01-02T10:00:00"}
+            for name in ("a.csv", "b.csv", "c.csv")
+        ]))
+
+        def summary_with_concurrent_insert(file_path):
+            if file_path.endswith("b.csv.sdp"):
+                other = factory()
+                other.add(ConvertedSdpFile(original_filename="b.csv", converted_filename="b.csv.sdp"))
+                other.commit()
+                other.close()
+            return {}
+
+        monkeypatch.setattr(sdp_catalog, "_sdp_summary", summary_with_concurrent_insert)
+        db = factory()
+        assert import_legacy_metadata(db, str(converted_dir)) == 2
+        assert not metadata.exists()
+        assert (converted_dir / "converted_files.json.imported").exists()
+
+        rows, total = list_conversions(db)
+        db.close()
+        assert total == 3
+        assert sorted(row.converted_filename for row in rows) == ["a.csv.sdp", "b.csv.sdp", "c.csv.sdp"]
+
+    def test_legacy_import_after_another_worker(self, catalog_db, tmp_path):
+        """Test a worker that finds the file already retired imports nothing instead of failing"""
+        metadata = tmp_path / "converted_files.json"
+        metadata.write_text(json.dumps([{"original_filename": "old.xlsx", "converted_filename": "old_1.xlsx.sdp"}]))
+
+        # Another worker process holds the import lock and retires the file meanwhile.
+        results = []
+        with open(tmp_path / "converted_files.json.lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            worker = threading.Thread(target=lambda: results.append(import_legacy_metadata(catalog_db, str(tmp_path))))
+            worker.start()
+            time.sleep(0.1)
+            metadata.rename(tmp_path / "converted_files.json.imported")
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+        worker.join(5)
+
+        assert results == [0]
+        assert list_conversions(catalog_db)[1] == 0
@@ -0,0 +1,126 @@
+"""
+SDP Convert Unit Tests
+Test single and batch SDP conversion uploads and their progress endpoints
+"""
+
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.analytics.device_management.models import ConvertedSdpFile
+from app.analytics.utils.sdp_crypto import decrypt_from_sdp
+from app.api.v1 import analytics_sdp_routes
+from app.core.config import settings
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(analytics_sdp_routes, "CONVERT_PROGRESS", {})
+    monkeypatch.setattr(analytics_sdp_routes, "CONVERT_BATCHES", {})
+
+    # Conversions record their catalog entries from worker threads, each on its own connection.
+    engine = create_engine(f"sqlite:///{tmp_path / 'catalog.db'}", connect_args={"check_same_thread": False})
+    ConvertedSdpFile.__table__.create(bind=engine)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(analytics_sdp_routes, "SessionLocal", factory)
+    return factory
+
+
+@pytest.fixture
+def client(session_factory):
+    api = FastAPI()
+    api.include_router(analytics_sdp_routes.router)
+    return TestClient(api)
+
+
+def wait_until(poll, done):
+    for _ in range(250):
+        data = poll()
+        if done(data):
+            return data
+        time.sleep(0.02)
+    raise AssertionError(f"conversion did not finish: {data}")
+
+
+def decrypt(tmp_path, converted_filename):
+    private_key = (tmp_path / "keys" / "private.key").read_bytes()
+    output_path = decrypt_from_sdp(private_key, str(tmp_path / "data" / "uploads" / "converted" / converted_filename), str(tmp_path / "decrypted"))
+    with open(output_path, "rb") as f:
+        return f.read()
+
+
+class TestSDPConvert:
+    """Test SDP conversion endpoints"""
+
+    def test_single_upload_progress(self, client, session_factory, tmp_path):
+        """Test an upload is converted once its progress is polled and its temp file is removed"""
+        response = client.post("/file-encryptor/convert-to-sdp", files={"file": ("contacts list.csv", b"name,phone\nBudi,0811\n")})
+        assert response.status_code == 200
+        upload_id = response.json()["data"]["upload_id"]
+        assert (tmp_path / "data" / "uploads" / "tmp" / upload_id).exists()
+
+        progress = wait_until(
+            lambda: client.get("/file-encryptor/progress", params={"upload_id": upload_id}).json()["data"],
+            lambda data: data["status"] in ("converted", "error"),
+        )
+        assert (progress["status"], progress["progress"]) == ("converted", 100)
+        assert list((tmp_path / "data" / "uploads" / "tmp").iterdir()) == []
+
+        db = session_factory()
+        entry = db.query(ConvertedSdpFile).one()
+        db.close()
+        assert entry.original_filename == "contacts_list.csv"
+        assert entry.format_version == "2.0"
+        assert decrypt(tmp_path, entry.converted_filename) == b"name,phone\nBudi,0811\n"
+        assert client.get("/file-encryptor/progress", params={"upload_id": "missing.csv"}).status_code == 404
+
+    def test_batch_upload_progress(self, client, session_factory, tmp_path):
+        """Test a batch converts every valid file, reports rejected ones and aggregates progress"""
+        response = client.post("/file-encryptor/convert-to-sdp/batch", files=[
+            ("files", ("calls.csv", b"a" * 3000)),
+            ("files", ("calls.csv", b"b" * 3000)),
+            ("files", ("notes.exe", b"MZ")),
+        ])
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert [item["filename"] for item in data["files"]] == ["calls.csv", "calls.csv"]
+        assert [item["filename"] for item in data["rejected"]] == ["notes.exe"]
+
+        batch = wait_until(
+            lambda: client.get("/file-encryptor/batch-progress", params={"batch_id": data["batch_id"]}).json()["data"],
+            lambda batch: batch["done"],
+        )
+        assert (batch["progress"], batch["finished"], batch["total"]) == (100, 2, 2)
+        assert {item["status"] for item in batch["files"]} == {"converted"}
+        assert list((tmp_path / "data" / "uploads" / "tmp").iterdir()) == []
+
+        db = session_factory()
+        names = [entry.converted_filename for entry in db.query(ConvertedSdpFile).all()]
+        db.close()
+        assert sorted(decrypt(tmp_path, name) for name in names) == [b"a" * 3000, b"b" * 3000]
+
+        assert client.get("/file-encryptor/batch-progress", params={"batch_id": "unknown"}).status_code == 404
+        too_many = [("files", (f"f{i}.csv", b"x")) for i in range(settings.SDP_BATCH_MAX_FILES + 1)]
+        assert client.post("/file-encryptor/convert-to-sdp/batch", files=too_many).status_code == 400
+
+    def test_finished_batches_are_pruned(self, client, monkeypatch):
+        """Test finished batches and their progress are dropped after the retention period"""
+        batch_id = client.post("/file-encryptor/convert-to-sdp/batch", files=[("files", ("calls.csv", b"x" * 100))]).json()["data"]["batch_id"]
+        wait_until(
+            lambda: client.get("/file-encryptor/batch-progress", params={"batch_id": batch_id}).json()["data"],
+            lambda batch: batch["done"],
+        )
+        upload_id = analytics_sdp_routes.CONVERT_BATCHES[batch_id][0]
+
+        monkeypatch.setattr(settings, "SDP_PROGRESS_RETENTION_HOURS", 0)
+        client.post("/file-encryptor/convert-to-sdp", files={"file": ("other.csv", b"y")})
+
+        assert batch_id not in analytics_sdp_routes.CONVERT_BATCHES
+        assert upload_id not in analytics_sdp_routes.CONVERT_PROGRESS
+        assert "other.csv" in analytics_sdp_routes.CONVERT_PROGRESS
+        assert client.get("/file-encryptor/batch-progress", params={"batch_id": batch_id}).status_code == 404
@@ -0,0 +1,74 @@
+"""
+SDP Parallel Crypto Unit Tests
+Test multi-threaded SDP chunk encryption and decryption
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from app.analytics.utils.sdp_crypto import SDPCrypto, decrypt_from_sdp, encrypt_to_sdp, generate_keypair
+
+
+def _chunk_section(data):
+    header_len = int.from_bytes(data[:SDPCrypto.HEADER_SIZE_BYTES], "big")
+    return data[SDPCrypto.HEADER_SIZE_BYTES + header_len:]
+
+
+class TestSDPParallel:
+    """Test parallel SDP engine"""
+
+    def test_parallel_output_matches_sequential(self, tmp_path, monkeypatch):
+        """Test chunk data and trailing hash are byte-identical for any worker count"""
+        private_key, public_key = generate_keypair()
+        ephemeral = generate_keypair()
+        monkeypatch.setattr(SDPCrypto, "generate_keypair", staticmethod(lambda: ephemeral))
+        monkeypatch.setattr(os, "urandom", lambda n: b"\x01" * n)
+
+        payload = bytes(range(256)) * 40
+        source = tmp_path / "report.bin"
+        source.write_bytes(payload)
+
+        outputs = {}
+        for workers in (1, 4):
+            sdp_path = tmp_path / f"report_{workers}.sdp"
+            encrypt_to_sdp(public_key, str(source), str(sdp_path), chunk_size=1000, workers=workers)
+            outputs[workers] = _chunk_section(sdp_path.read_bytes())
+
+            decrypted = decrypt_from_sdp(private_key, str(sdp_path), str(tmp_path / f"out_{workers}"), workers=workers)
+            assert open(decrypted, "rb").read() == payload
+
+        assert outputs[1] == outputs[4]
+
+    def test_output_names_are_claimed_atomically(self, tmp_path):
+        """Test concurrent decrypts of the same original filename each get their own output file"""
+        barrier = threading.Barrier(16)
+
+        def claim(_):
+            barrier.wait()
+            path, outfile = SDPCrypto.create_unique_output(str(tmp_path / "data.xlsx"))
+            with outfile:
+                outfile.write(path.encode())
+            return path
+
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            paths = list(pool.map(claim, range(16)))
+
+        assert len(set(paths)) == 16
+        assert sorted(os.listdir(tmp_path)) == sorted(["data.xlsx"] + [f"data_{i}.xlsx" for i in range(1, 16)])
+        assert all(open(path, "rb").read() == path.encode() for path in paths)
+
+    def test_decrypt_does_not_overwrite_existing_output(self, tmp_path):
+        """Test decrypting next to an existing file of the same name writes a numbered copy"""
+        private_key, public_key = generate_keypair()
+        source = tmp_path / "data.xlsx"
+        source.write_bytes(b"new")
+        encrypt_to_sdp(public_key, str(source), str(tmp_path / "data.sdp"))
+        (tmp_path / "out").mkdir()
+        (tmp_path / "out" / "data.xlsx").write_bytes(b"existing")
+
+        decrypted = decrypt_from_sdp(private_key, str(tmp_path / "data.sdp"), str(tmp_path / "out"))
+
+        assert os.path.basename(decrypted) == "data_1.xlsx"
+        assert (tmp_path / "out" / "data.xlsx").read_bytes() == b"existing"
+        assert (tmp_path / "out" / "data_1.xlsx").read_bytes() == b"new"
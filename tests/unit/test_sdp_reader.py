@@ -0,0 +1,74 @@
+"""
+SDP Reader Unit Tests
+Test random access into encrypted SDP containers
+"""
+
+import io
+import os
+import zipfile
+
+import pytest
+
+from app.analytics.utils.sdp_crypto import SDPReader, decrypt_from_sdp, encrypt_to_sdp, generate_keypair
+
+
+@pytest.fixture
+def keys():
+    return generate_keypair()
+
+
+def _encrypt(tmp_path, public_key, payload, version="3.0", name="export.bin"):
+    source = tmp_path / name
+    source.write_bytes(payload)
+    sdp_path = tmp_path / f"{name}.sdp"
+    encrypt_to_sdp(public_key, str(source), str(sdp_path), chunk_size=1000, version=version)
+    return sdp_path
+
+
+class TestSDPReader:
+    """Test SDP reader"""
+
+    @pytest.mark.parametrize("version", ["3.0", "2.0"])
+    def test_read_at_spans_chunks(self, tmp_path, keys, version):
+        """Test byte ranges crossing chunk boundaries match the plaintext for v3 and v2"""
+        private_key, public_key = keys
+        payload = os.urandom(4321)
+        sdp_path = _encrypt(tmp_path, public_key, payload, version=version)
+
+        with SDPReader(str(sdp_path), private_key) as reader:
+            assert reader.size == len(payload)
+            assert reader.read_at(990, 1500) == payload[990:2490]
+            assert reader.read_at(4300, 100) == payload[4300:]
+            reader.seek(-21, io.SEEK_END)
+            assert reader.read() == payload[-21:]
+            assert reader.verify()
+
+        assert open(decrypt_from_sdp(private_key, str(sdp_path), str(tmp_path / version)), "rb").read() == payload
+
+    def test_zip_members_without_full_decrypt(self, tmp_path, keys):
+        """Test an encrypted workbook-style zip can be listed through the file-like reader"""
+        private_key, public_key = keys
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as archive:
+            archive.writestr("xl/workbook.xml", "<workbook/>")
+            archive.writestr("xl/worksheets/sheet1.xml", "x" * 5000)
+        sdp_path = _encrypt(tmp_path, public_key, buffer.getvalue(), name="report.xlsx")
+
+        with SDPReader(str(sdp_path), private_key) as reader:
+            with zipfile.ZipFile(reader) as archive:
+                assert archive.read("xl/workbook.xml") == b"<workbook/>"
+                assert "xl/worksheets/sheet1.xml" in archive.namelist()
+
+    def test_tampered_chunk_is_rejected(self, tmp_path, keys):
+        """Test a modified chunk fails authentication when it is read"""
+        private_key, public_key = keys
+        sdp_path = _encrypt(tmp_path, public_key, os.urandom(3000))
+        data = bytearray(sdp_path.read_bytes())
+        header_len = int.from_bytes(data[:4], "big")
+        data[4 + header_len + 10] ^= 1
+        sdp_path.write_bytes(bytes(data))
+
+        with SDPReader(str(sdp_path), private_key) as reader:
+            assert reader.read_at(2500, 10)
+            with pytest.raises(ValueError, match="chunk 0"):
+                reader.read_at(0, 10)
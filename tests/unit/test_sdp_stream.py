@@ -0,0 +1,110 @@
+"""
+SDP Stream Decryptor Unit Tests
+Test incremental decryption of SDP uploads
+"""
+
+import base64
+import io
+import json
+import os
+
+import pytest
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from app.analytics.utils.sdp_crypto import SDPStreamDecryptor, decrypt_from_sdp, encrypt_to_sdp, generate_keypair
+from app.analytics.utils.sdp_crypto.container import describe_sdp, parse_trailer, write_trailer
+from app.analytics.utils.sdp_crypto.core import SDPCrypto
+
+
+def _encrypt(tmp_path, payload, chunk_size=1000, version="3.0"):
+    private_key, public_key = generate_keypair()
+    source = tmp_path / "contacts.xlsx"
+    source.write_bytes(payload)
+    sdp_path = tmp_path / "contacts.xlsx.sdp"
+    encrypt_to_sdp(public_key, str(source), str(sdp_path), chunk_size=chunk_size, version=version)
+    return private_key, sdp_path.read_bytes()
+
+
+def _shift_index_entry(encrypted, private_key, position):
+    # Re-encrypts the chunk index with one entry's offset moved; chunks and hashes are untouched.
+    header_len = int.from_bytes(encrypted[:4], "big")
+    header = json.loads(encrypted[4:4 + header_len])
+    aesgcm = AESGCM(SDPCrypto.derive_symmetric_key(
+        private_key, base64.b64decode(header["ephemeral_public_key"]), base64.b64decode(header["salt"]),
+    ))
+    base_nonce = base64.b64decode(header["base_nonce"])
+    entries, file_hash, index_offset = parse_trailer(encrypted, aesgcm, base_nonce)
+
+    offset, encrypted_size, plain_size, digest = entries[position]
+    entries[position] = (offset + 1, encrypted_size, plain_size, digest)
+    tampered = io.BytesIO()
+    tampered.write(encrypted[:index_offset])
+    write_trailer(tampered, entries, aesgcm, base_nonce, file_hash)
+    return tampered.getvalue()
+
+
+class TestSDPStreamDecryptor:
+    """Test SDP stream decryptor"""
+
+    def test_decrypts_arbitrary_slices(self, tmp_path):
+        """Test plaintext matches the original when fed in slices that cut across chunks"""
+        payload = os.urandom(4500)
+        private_key, encrypted = _encrypt(tmp_path, payload)
+        output_path = tmp_path / "data" / "contacts.xlsx"
+
+        decryptor = SDPStreamDecryptor(private_key, str(output_path))
+        for i in range(0, len(encrypted), 333):
+            decryptor.feed(encrypted[i:i + 333])
+
+        assert decryptor.finish() == str(output_path)
+        assert output_path.read_bytes() == payload
+        assert decryptor.chunk_index == 5
+
+    def test_tampered_hash_removes_output(self, tmp_path):
+        """Test a hash mismatch fails and leaves no partial plaintext behind"""
+        private_key, encrypted = _encrypt(tmp_path, os.urandom(2500))
+        output_path = tmp_path / "contacts.xlsx"
+
+        decryptor = SDPStreamDecryptor(private_key, str(output_path))
+        # The plaintext SHA-256 sits just before the 4-byte v3 footer magic.
+        tampered = bytearray(encrypted)
+        tampered[-5] ^= 1
+        decryptor.feed(bytes(tampered))
+
+        with pytest.raises(ValueError, match="hash mismatch"):
+            decryptor.finish()
+        assert not output_path.exists()
+
+    def test_decrypts_v2_files(self, tmp_path):
+        """Test v2 containers, still the default output, decrypt with their bare trailing hash"""
+        private_key, public_key = generate_keypair()
+        payload = os.urandom(2500)
+        source = tmp_path / "contacts.xlsx"
+        source.write_bytes(payload)
+        sdp_path = tmp_path / "contacts.xlsx.sdp"
+        encrypt_to_sdp(public_key, str(source), str(sdp_path), chunk_size=1000)
+        assert describe_sdp(str(sdp_path))["version"] == "2.0"
+
+        output_path = tmp_path / "out" / "contacts.xlsx"
+        decryptor = SDPStreamDecryptor(private_key, str(output_path))
+        decryptor.feed(sdp_path.read_bytes())
+
+        assert decryptor.finish() == str(output_path)
+        assert output_path.read_bytes() == payload
+
+    def test_chunk_offsets_are_checked_against_index(self, tmp_path):
+        """Test a chunk index entry pointing at the wrong offset is rejected by both decryptors"""
+        private_key, encrypted = _encrypt(tmp_path, os.urandom(3500))
+        tampered = _shift_index_entry(encrypted, private_key, 1)
+        output_path = tmp_path / "out" / "contacts.xlsx"
+
+        decryptor = SDPStreamDecryptor(private_key, str(output_path))
+        decryptor.feed(tampered)
+        with pytest.raises(ValueError, match="chunk 1 does not match the chunk index"):
+            decryptor.finish()
+        assert not output_path.exists()
+
+        sdp_path = tmp_path / "tampered.xlsx.sdp"
+        sdp_path.write_bytes(tampered)
+        with pytest.raises(ValueError, match="chunk 1 does not match the chunk index"):
+            decrypt_from_sdp(private_key, str(sdp_path), str(tmp_path / "decrypted"))
@@ -0,0 +1,87 @@
+"""
+Sheet Mapping Unit Tests
+Test declarative tool/sheet column mappings
+"""
+
+import pandas as pd
+
+from app.analytics.utils.sheet_mapping import AXIOM, count_rows, find_count, find_mapping
+
+
+class TestSheetMapping:
+    """Test sheet mapping registry and pipeline"""
+
+    def test_find_mapping_by_sheet_name(self):
+        """Test registry lookup by tool, sheet and target"""
+        mapping = find_mapping("Magnet Axiom", "Facebook Contacts (2)", target="social_media")
+        assert mapping is not None
+        assert mapping.sheet == "Facebook Contacts"
+        assert find_mapping("Magnet Axiom", "Unknown Sheet") is None
+
+    def test_social_media_mapping(self):
+        """Test coalescing, joining and required source columns"""
+        df = pd.DataFrame({
+            "Profile ID": ["100", None, "300"],
+            "Display Name": ["alice", "bob", " nan "],
+            "First Name": ["Alice", "Bob", None],
+            "Last Name": [None, "B", None],
+            "Phone Numbers": ["+62811", None, None],
+        })
+        mapping = find_mapping("Magnet Axiom", "Facebook Contacts", target="social_media")
+        records = mapping.records(df, file_id=1, sheet_name="Facebook Contacts")
+
+        assert len(records) == 2
+        assert records[0]["facebook_id"] == "100"
+        assert records[0]["full_name"] == "Alice"
+        assert records[0]["source"] == "Facebook"
+        assert records[1]["account_name"] is None
+        assert records[1]["full_name"] == ""
+
+    def test_chat_message_mapping(self):
+        """Test filters, derived columns and fallback message ids"""
+        df = pd.DataFrame({
+            "Text": ["hello", "", "skipped", "reply"],
+            "Direction": ["Sent", "Sent", "Unknown", "Received"],
+            "Sender ID": ["b", "a", "a", None],
+            "Recipient ID(s)": ["a", "b", "b", None],
+            "_ThreadID": [None, None, None, "t-1"],
+            "Item ID": ["m-1", None, None, None],
+        })
+        mapping = find_mapping("Magnet Axiom", "Twitter Direct Messages", target="chat_messages")
+        records = mapping.records(df, file_id=7, sheet_name="Twitter Direct Messages")
+
+        assert [r["message_text"] for r in records] == ["hello", "reply"]
+        assert records[0]["direction"] == "Outgoing"
+        assert records[0]["thread_id"] == "a_b"
+        assert records[0]["message_id"] == "m-1"
+        assert records[1]["direction"] == "Incoming"
+        assert records[1]["chat_id"] == "t-1"
+        assert records[1]["message_id"] == "twitter_7_3"
+        assert records[1]["sender_number"] == ""
+
+    def test_thread_id_keeps_underscores_in_ids(self):
+        """Test participant IDs with leading/trailing underscores are preserved"""
+        df = pd.DataFrame({
+            "Text": ["hi", "solo"],
+            "Direction": ["Sent", "Sent"],
+            "Sender ID": ["_user_", "_me_"],
+            "Recipient ID(s)": ["bob", None],
+        })
+        mapping = find_mapping("Magnet Axiom", "Twitter Direct Messages", target="chat_messages")
+        records = mapping.records(df, file_id=1, sheet_name="Twitter Direct Messages")
+
+        assert records[0]["thread_id"] == "_user__bob"
+        assert records[1]["thread_id"] == "_me_"
+
+    def test_count_rows_uses_each_sheets_count_column(self, tmp_path):
+        """Test Axiom rows are counted on the registered column of each matching sheet"""
+        path = tmp_path / "axiom.xlsx"
+        with pd.ExcelWriter(path, engine="openpyxl") as writer:
+            pd.DataFrame({"User ID": ["1", None, "3"], "User Name": ["a", "b", None]}).to_excel(writer, sheet_name="Instagram Profiles", index=False)
+            pd.DataFrame({"ID": ["w1", "w2"]}).to_excel(writer, sheet_name="Android WhatsApp Contacts", index=False)
+            pd.DataFrame({"Name": ["no id column"]}).to_excel(writer, sheet_name="TikTok Contacts", index=False)
+            pd.DataFrame({"ID": ["x"]}).to_excel(writer, sheet_name="Unmapped", index=False)
+
+        assert find_count(AXIOM, "Android WhatsApp Contacts").column == "ID"
+        assert find_count(AXIOM, "Unmapped") is None
+        assert count_rows(AXIOM, str(path)) == 4
@@ -0,0 +1,87 @@
+"""
+Sheet Scheduler Unit Tests
+Test process pool fan-out, batching and sequential fallback
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from app.analytics.utils import sheet_scheduler
+from app.analytics.utils.sheet_scheduler import SheetTask, run_sheet_tasks
+from app.core.config import settings
+
+
+def make_rows(sheet_name, count):
+    return [{"sheet_name": sheet_name, "row": i} for i in range(count)]
+
+
+def fail_in_worker(sheet_name, count):
+    if multiprocessing.parent_process() is not None:
+        raise RuntimeError("worker failure")
+    return make_rows(sheet_name, count)
+
+
+def always_fail(sheet_name, count):
+    raise ValueError(f"bad sheet {sheet_name}")
+
+
+def task(sheet_name, count, func=make_rows):
+    return SheetTask(sheet_name, func, (sheet_name, count))
+
+
+def collect(tasks, batch_size=3):
+    return [(task.sheet_name, [row["row"] for row in batch]) for task, batch in run_sheet_tasks(tasks, batch_size)]
+
+
+@pytest.fixture
+def pooled(monkeypatch):
+    monkeypatch.setattr(settings, "SHEET_PARSER_WORKERS", 2)
+    yield
+    sheet_scheduler.shutdown_sheet_pool()
+
+
+class TestSheetScheduler:
+    """Test sheet scheduler"""
+
+    def test_inline_batches(self, monkeypatch):
+        """Test the sequential path yields each sheet in batches"""
+        monkeypatch.setattr(settings, "SHEET_PARSER_WORKERS", 1)
+        assert collect([task("A", 7), task("B", 0), task("C", 2)]) == [
+            ("A", [0, 1, 2]), ("A", [3, 4, 5]), ("A", [6]), ("C", [0, 1]),
+        ]
+
+    def test_pool_matches_inline_order(self, pooled):
+        """Test pooled sheets come back in submission order, batch by batch"""
+        assert collect([task("A", 4), task("B", 3)]) == [("A", [0, 1, 2]), ("A", [3]), ("B", [0, 1, 2])]
+
+    def test_worker_and_pickling_failures_fall_back(self, pooled):
+        """Test a sheet that fails in the worker or cannot be pickled is parsed inline"""
+        unpicklable = SheetTask("L", lambda sheet_name, count: make_rows(sheet_name, count), ("L", 2))
+        assert collect([task("A", 2, fail_in_worker), unpicklable, task("B", 1)]) == [
+            ("A", [0, 1]), ("L", [0, 1]), ("B", [0]),
+        ]
+
+    def test_parse_errors_still_raise(self, pooled):
+        """Test a sheet that also fails inline propagates its error"""
+        with pytest.raises(ValueError, match="bad sheet A"):
+            collect([task("A", 1, always_fail), task("B", 1)])
+
+    def test_broken_pool_discards_finished_spools(self, pooled, monkeypatch):
+        """Test spools of sheets that finished before the pool broke are removed"""
+        spool, _ = sheet_scheduler.run_spooled(make_rows, ("B", 2), 3)
+        broken, finished = Future(), Future()
+        broken.set_exception(BrokenProcessPool("worker died"))
+        finished.set_result((spool, 2))
+        outcomes = iter([broken, finished])
+
+        class BrokenPool:
+            def submit(self, *args):
+                return next(outcomes)
+
+        monkeypatch.setattr(sheet_scheduler, "_get_pool", BrokenPool)
+        assert collect([task("A", 1), task("B", 2)]) == [("A", [0]), ("B", [0, 1])]
+        assert not os.path.exists(spool)
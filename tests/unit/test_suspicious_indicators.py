@@ -0,0 +1,70 @@
+"""
+Suspicious Indicators Unit Tests
+Test the compiled suspicious-indicator index and its reload behaviour
+"""
+
+import json
+import os
+
+from app.analytics.utils.scan_apk import classify_reports
+from app.analytics.utils.suspicious_indicators import EMPTY_INDEX, get_indicator_index
+
+INDICATORS = [
+    {"name": "android.permission.READ_SMS", "platform": "android", "type": "permission"},
+    {"name": "android.permission.BIND_ACCESSIBILITY_SERVICE", "platform": "android", "type": "permission"},
+    {"name": "Landroid/telephony/SmsManager;->sendTextMessage", "platform": "android", "type": "api"},
+    {"name": "su -c", "platform": "android", "type": "string"},
+    {"name": "/system/xbin/su", "platform": "android", "type": "string"},
+    {"name": "NSPhotoLibraryUsageDescription", "platform": "ios", "type": "permission"},
+]
+
+
+def write_indicators(path, items, mtime_ns=None):
+    path.write_text(json.dumps(items))
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+    return str(path)
+
+
+class TestSuspiciousIndicators:
+    """Test suspicious indicator index"""
+
+    def test_index_matches_by_type(self, tmp_path):
+        """Test permission, API and string indicators are matched separately"""
+        index = get_indicator_index(write_indicators(tmp_path / "suspicious_indicators.json", INDICATORS))
+
+        assert index.match_permissions(["android.permission.INTERNET", "android.permission.READ_SMS"]) == [
+            "android.permission.READ_SMS"
+        ]
+        assert index.match_apis(["Landroid/telephony/SmsManager;->sendTextMessage"]) == [
+            "Landroid/telephony/SmsManager;->sendTextMessage"
+        ]
+        assert index.match_strings("exec('SU -C id'); ls /system/xbin/su") == ["/system/xbin/su", "su -c"]
+        assert "NSPhotoLibraryUsageDescription" not in index.permissions
+
+    def test_reloads_only_on_mtime_change(self, tmp_path):
+        """Test the index is cached until the file's mtime changes"""
+        path = write_indicators(tmp_path / "suspicious_indicators.json", INDICATORS[:1], mtime_ns=1_000_000_000)
+        first = get_indicator_index(path)
+        assert get_indicator_index(path) is first
+
+        write_indicators(tmp_path / "suspicious_indicators.json", INDICATORS, mtime_ns=2_000_000_000)
+        reloaded = get_indicator_index(path)
+        assert reloaded is not first
+        assert "android.permission.BIND_ACCESSIBILITY_SERVICE" in reloaded.permissions
+
+        assert get_indicator_index(str(tmp_path / "missing.json")) is EMPTY_INDEX
+
+    def test_batch_classification(self, tmp_path):
+        """Test several reports are classified against one index"""
+        index = get_indicator_index(write_indicators(tmp_path / "suspicious_indicators.json", INDICATORS))
+        reports = [
+            {"package_name": "com.example.clean", "permissions": {"android.permission.INTERNET": {"status": "normal"}}},
+            {"package_name": "com.example.sms", "permissions": {"android.permission.READ_SMS": {}}},
+        ]
+
+        results = classify_reports(reports, index)
+
+        assert [r["package_name"] for r in results] == ["com.example.clean", "com.example.sms"]
+        assert results[0]["permission_analysis"]["suspicious_permissions"] == []
+        assert results[1]["permission_analysis"]["dangerous_permissions"] == ["android.permission.READ_SMS"]
@@ -0,0 +1,41 @@
+"""
+Tabular Export Unit Tests
+Test streaming CSV, JSONL and XLSX writers
+"""
+
+import csv
+import io
+import json
+
+from openpyxl import load_workbook
+
+from app.analytics.utils.tabular_export import iter_csv, iter_jsonl, write_xlsx
+
+
+COLUMNS = ["Contact Number", "Device A"]
+ROWS = [["628123", "Budi"], ["628456", None]]
+
+
+class TestTabularExport:
+    """Test tabular export writers"""
+
+    def test_csv_and_jsonl(self):
+        """Test rows are streamed with a header and empty values for None"""
+        text = b"".join(iter_csv(COLUMNS, iter(ROWS))).decode("utf-8-sig")
+        assert list(csv.reader(io.StringIO(text))) == [COLUMNS, ["628123", "Budi"], ["628456", ""]]
+
+        lines = b"".join(iter_jsonl(COLUMNS, iter(ROWS))).decode("utf-8").splitlines()
+        assert [json.loads(line) for line in lines] == [
+            {"Contact Number": "628123", "Device A": "Budi"},
+            {"Contact Number": "628456", "Device A": None},
+        ]
+
+    def test_xlsx_strips_illegal_characters(self):
+        """Test write-only workbook output drops characters Excel rejects"""
+        file_path = io.BytesIO()
+        total = write_xlsx(file_path, COLUMNS, iter([["628123", "hi\x07there"]]), sheet_title="Contacts")
+
+        sheet = load_workbook(file_path).active
+        assert total == 1
+        assert sheet.title == "Contacts"
+        assert [cell.value for cell in sheet[2]] == ["628123", "hithere"]
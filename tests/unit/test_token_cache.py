@@ -0,0 +1,106 @@
+"""
+Token Cache Unit Tests
+Test the verified-token cache used by AuthMiddleware
+"""
+
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.auth.models import AuthCacheVersion, User
+from app.auth import token_cache
+from app.auth.token_cache import TokenCache, bump_auth_version
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    AuthCacheVersion.__table__.create(bind=engine)
+    return sessionmaker(bind=engine)
+
+
+def make_user(user_id=1, role="admin"):
+    return User(id=user_id, email=f"user{user_id}@example.com", fullname="Test User", tag="Admin",
+                hashed_password="x", role=role, is_active=True)
+
+
+def cache_for(session_factory, **kwargs):
+    options = {"maxsize": 100, "ttl": 300, "check_interval": 60}
+    options.update(kwargs)
+    return TokenCache(session_factory=session_factory, **options)
+
+
+class TestTokenCache:
+    """Test token cache"""
+
+    def test_hit_returns_detached_copy(self, session_factory):
+        """Test a cached token returns a fresh user instance without touching the DB"""
+        cache = cache_for(session_factory)
+        assert cache.get("token-a") is None
+        cache.put("token-a", make_user(), time.time() + 600, cache.generation)
+
+        first = cache.get("token-a")
+        second = cache.get("token-a")
+        assert (first.id, first.email, first.role) == (1, "user1@example.com", "admin")
+        assert first is not second
+
+    def test_entry_bounded_by_token_expiry(self, session_factory):
+        """Test entries never outlive the token's exp claim"""
+        cache = cache_for(session_factory)
+        cache.get("warm-up")
+        cache.put("token-a", make_user(), time.time() - 1, cache.generation)
+        assert cache.get("token-a") is None
+
+    def test_lru_eviction(self, session_factory):
+        """Test the least recently used token is evicted first"""
+        cache = cache_for(session_factory, maxsize=2)
+        cache.get("warm-up")
+        for token in ("a", "b"):
+            cache.put(token, make_user(), None, cache.generation)
+        cache.get("a")
+        cache.put("c", make_user(), None, cache.generation)
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+
+    def test_version_bump_invalidates_other_workers(self, session_factory):
+        """Test a bump committed elsewhere clears this worker's cache on its next check"""
+        worker_a = cache_for(session_factory, check_interval=0)
+        worker_a.get("warm-up")
+        worker_a.put("token-a", make_user(), None, worker_a.generation)
+        assert worker_a.get("token-a") is not None
+
+        db = session_factory()
+        bump_auth_version(db)
+        db.commit()
+        db.close()
+
+        assert worker_a.get("token-a") is None
+
+    def test_stale_put_is_dropped(self, session_factory):
+        """Test a verification that raced an invalidation is not cached"""
+        cache = cache_for(session_factory)
+        cache.get("warm-up")
+        generation = cache.generation
+        cache.invalidate()
+
+        cache.put("token-a", make_user(), None, generation)
+        assert cache.get("token-a") is None
+
+    def test_bump_invalidates_after_commit(self, session_factory, monkeypatch):
+        """Test a token cached between the bump and its commit is dropped once the commit lands"""
+        cache = cache_for(session_factory)
+        monkeypatch.setattr(token_cache, "token_cache", cache)
+        cache.get("warm-up")
+
+        db = session_factory()
+        bump_auth_version(db)
+        cache.put("token-a", make_user(), None, cache.generation)
+        assert cache.get("token-a") is not None
+
+        db.commit()
+        db.close()
+        assert cache.get("token-a") is None